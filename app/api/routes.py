@@ -3,26 +3,54 @@ FastAPI Routes
 API endpoints for daycare search service
 """
 
+import secrets
 import sys
 from pathlib import Path
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from pydantic import BaseModel, Field
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from database import get_session, DaycareCenter
-from workflows.graph_builder import run_search_workflow_sync
-from sqlalchemy import func
+from config import settings
+from database import async_session_scope, get_query_log
+from database.fulltext import search_fulltext_async
+from database.projection import project_record, resolve_fields, serialize_row
+from database.queries import fetch_daycare, fetch_daycares, fetch_vacancies
+from services.analysis_cache import get_analysis_cache
+from services.history import normalize_date, state_as_of, time_series
+from services.stats_cube import (
+    DIMENSIONS,
+    cube_statistics,
+    fetch_stats_cube,
+    name_counts,
+    rollup,
+    validate_dimensions,
+)
+from utils.filters import resolve_vacancy_columns
+from workflows.graph_builder import run_search_workflow
+from workflows.nodes.retriever import EXPANSION_LABELS, build_filter_conditions
 
 router = APIRouter()
 
 
+def _resolve_fields(fields: Optional[str], default: str) -> List[str]:
+    """Resolve a fields parameter, answering 400 for unknown names"""
+    try:
+        return resolve_fields(fields, default)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # Request/Response Models
 class SearchRequest(BaseModel):
     """Search request model"""
 
     query: str = Field(..., description="User search query", min_length=1)
     filters: Optional[dict] = Field(default={}, description="Additional filters")
+    fields: Optional[str] = Field(
+        default="card",
+        description="Result fields: preset (card, compare, detail, full) and/or field names, comma-separated",
+    )
 
 
 class SearchResponse(BaseModel):
@@ -35,24 +63,6 @@ class SearchResponse(BaseModel):
     metadata: dict
 
 
-class DaycareDetail(BaseModel):
-    """Daycare center detail model"""
-
-    stcode: str
-    crname: str
-    crtypename: Optional[str] = None
-    crstatusname: Optional[str] = None
-    craddr: Optional[str] = None
-    sigunname: Optional[str] = None
-    la: Optional[float] = None
-    lo: Optional[float] = None
-    crtelno: Optional[str] = None
-    crcapat: Optional[int] = None
-    crchcnt: Optional[int] = None
-    plgrdco: Optional[int] = None
-    cctvinstlcnt: Optional[int] = None
-
-
 @router.post("/search", response_model=SearchResponse)
 async def search_daycares(request: SearchRequest):
     """
@@ -62,59 +72,220 @@ async def search_daycares(request: SearchRequest):
         request: Search request with query and optional filters
 
     Returns:
-        Search results with AI-generated answer
+        Search results (projected to the requested fields) with AI-generated answer
     """
+    fields = _resolve_fields(request.fields, "card")
+
     try:
-        # Run LangGraph workflow
-        result = run_search_workflow_sync(request.query)
+        # Run LangGraph workflow (awaited, so other requests are served meanwhile)
+        result = await run_search_workflow(request.query, request.filters)
+        search_results = result.get("search_results", [])
+
+        # result_summary repeats the results; clients get them once
+        metadata = {
+            key: value
+            for key, value in result.get("metadata", {}).items()
+            if key != "result_summary"
+        }
 
         return SearchResponse(
             query=request.query,
             answer=result.get("answer", ""),
-            results=result.get("search_results", []),
-            total=len(result.get("search_results", [])),
-            metadata=result.get("metadata", {}),
+            results=[
+                {**project_record(r, fields), **{k: r[k] for k in EXPANSION_LABELS if k in r}}
+                for r in search_results
+            ],
+            total=len(search_results),
+            metadata=metadata,
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
 
 
-@router.get("/daycares/{stcode}", response_model=DaycareDetail)
-async def get_daycare_detail(stcode: str):
+@router.get("/daycares/search")
+async def search_daycares_fulltext(
+    q: str = Query(..., min_length=1, description="Name, address or service text"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum results"),
+    include_closed: bool = Query(False, description="Include non-operating centers"),
+):
+    """
+    Full-text search over daycare names, addresses and services (FTS5)
+
+    Args:
+        q: Search text
+        limit: Maximum number of results
+        include_closed: Include centers whose status is not 정상
+
+    Returns:
+        Ranked hits with highlighted snippets
+    """
+    try:
+        async with async_session_scope() as session:
+            hits = await search_fulltext_async(
+                session, q, limit=limit, active_only=not include_closed
+            )
+
+        return {"query": q, "results": hits, "total": len(hits)}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/daycares/vacancies")
+async def get_daycare_vacancies(
+    age: str = Query(..., description="Age class (e.g. 만1세, 영아, 만3세,만4세)"),
+    region: Optional[str] = Query(None, description="Region (시도) filter, e.g. 부산 or 26"),
+    district: Optional[str] = Query(None, description="District filter"),
+    type: Optional[str] = Query(None, description="Daycare type filter"),
+    min_vacancy: int = Query(1, ge=0, description="Minimum estimated spare places"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum results"),
+    fields: Optional[str] = Query(None, description="Preset (vacancy, card, ...) and/or field names"),
+):
+    """
+    Centers most likely to have a place for an age, most spare places first
+
+    Uses the per-age vacancy estimates computed at ingest time (반 수 x 반 정원
+    - 현원, capped by 정원 - 현원); multi-age filters sum the ages' estimates.
+
+    Args:
+        age: Age class filter
+        region, district, type: Location and type filters
+        min_vacancy: Minimum estimated spare places
+        limit: Maximum number of results
+        fields: Field projection (default: vacancy preset)
+
+    Returns:
+        Centers with their estimate for the requested ages as "vacancy"
+    """
+    vacancy_columns = resolve_vacancy_columns(age)
+    if not vacancy_columns:
+        raise HTTPException(status_code=400, detail=f"Unknown age class: {age}")
+    field_names = _resolve_fields(fields, "vacancy")
+
+    filters = {"region": region, "district": district, "type": type}
+    filters = {key: value for key, value in filters.items() if value is not None}
+
+    try:
+        async with async_session_scope() as session:
+            rows = await fetch_vacancies(
+                session,
+                vacancy_columns,
+                conditions=build_filter_conditions(filters),
+                min_vacancy=min_vacancy,
+                limit=limit,
+                fields=field_names,
+            )
+
+        results = [{**serialize_row(row, field_names), "vacancy": row.vacancy} for row in rows]
+        return {"age": age, "filters": filters, "results": results, "total": len(results)}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/daycares/{stcode}")
+async def get_daycare_detail(
+    stcode: str,
+    fields: Optional[str] = Query(None, description="Preset (detail, card, compare, full) and/or field names"),
+):
     """
     Get detailed information for a specific daycare center
 
     Args:
         stcode: Daycare center code
+        fields: Field projection (default: detail preset)
 
     Returns:
         Detailed daycare center information
     """
-    session = get_session()
+    field_names = _resolve_fields(fields, "detail")
 
     try:
-        daycare = (
-            session.query(DaycareCenter)
-            .filter(DaycareCenter.stcode == stcode)
-            .first()
-        )
+        async with async_session_scope() as session:
+            daycare = await fetch_daycare(session, stcode, field_names)
 
         if not daycare:
             raise HTTPException(status_code=404, detail="Daycare center not found")
 
-        result = daycare.to_dict()
-        session.close()
-
-        return DaycareDetail(**result)
+        return serialize_row(daycare, field_names)
 
     except HTTPException:
         raise
     except Exception as e:
-        session.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@router.get("/daycares/{stcode}/history")
+async def get_daycare_history(
+    stcode: str,
+    columns: str = Query("crchcnt,crcapat", description="Comma-separated tracked columns"),
+    start: Optional[str] = Query(None, description="From date (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, description="To date (YYYY-MM-DD)"),
+):
+    """
+    Time series of a daycare center's columns across published snapshots
+
+    Args:
+        stcode: Daycare center code
+        columns: Columns to follow (default: 현원, 정원)
+        start, end: Optional date range
+
+    Returns:
+        One point per snapshot in which a requested column changed
+    """
+    names = [name.strip() for name in columns.split(",") if name.strip()]
+    start_date, end_date = normalize_date(start), normalize_date(end)
+    if (start and not start_date) or (end and not end_date):
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+
+    try:
+        async with async_session_scope() as session:
+            points = await session.run_sync(
+                time_series, stcode, names, start_date, end_date
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    if not points:
+        raise HTTPException(status_code=404, detail="No history for this daycare center")
+
+    return {"stcode": stcode, "columns": names, "points": points, "total": len(points)}
+
+
+@router.get("/daycares/{stcode}/as-of")
+async def get_daycare_as_of(
+    stcode: str,
+    date: str = Query(..., description="Date (YYYY-MM-DD)"),
+):
+    """
+    State of a daycare center as published on a given date
+
+    Args:
+        stcode: Daycare center code
+        date: As-of date
+
+    Returns:
+        Tracked column values from the latest snapshot on or before the date
+    """
+    as_of_date = normalize_date(date)
+    if not as_of_date:
+        raise HTTPException(status_code=400, detail="Date must be YYYY-MM-DD")
+
+    try:
+        async with async_session_scope() as session:
+            state = await session.run_sync(state_as_of, stcode, as_of_date)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    if state is None:
+        raise HTTPException(status_code=404, detail="No history on or before this date")
+
+    return state
+
+
 @router.get("/districts")
 async def get_districts():
     """
@@ -123,26 +294,13 @@ async def get_districts():
     Returns:
         List of district names with counts
     """
-    session = get_session()
-
     try:
-        districts = (
-            session.query(
-                DaycareCenter.sigunname, func.count(DaycareCenter.id).label("count")
-            )
-            .filter(DaycareCenter.crstatusname == "정상")
-            .group_by(DaycareCenter.sigunname)
-            .order_by(func.count(DaycareCenter.id).desc())
-            .all()
-        )
-
-        result = [{"name": d[0], "count": d[1]} for d in districts if d[0]]
+        async with async_session_scope() as session:
+            result = name_counts(await fetch_stats_cube(session), "district")
 
-        session.close()
         return {"districts": result, "total": len(result)}
 
     except Exception as e:
-        session.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
@@ -154,61 +312,47 @@ async def get_types():
     Returns:
         List of daycare types with counts
     """
-    session = get_session()
-
     try:
-        types = (
-            session.query(
-                DaycareCenter.crtypename, func.count(DaycareCenter.id).label("count")
-            )
-            .filter(DaycareCenter.crstatusname == "정상")
-            .group_by(DaycareCenter.crtypename)
-            .order_by(func.count(DaycareCenter.id).desc())
-            .all()
-        )
-
-        result = [{"name": t[0], "count": t[1]} for t in types if t[0]]
+        async with async_session_scope() as session:
+            result = name_counts(await fetch_stats_cube(session), "type")
 
-        session.close()
         return {"types": result, "total": len(result)}
 
     except Exception as e:
-        session.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
 @router.post("/compare")
-async def compare_daycares(stcodes: List[str] = Query(..., description="Daycare codes to compare")):
+async def compare_daycares(
+    stcodes: List[str] = Query(..., description="Daycare codes to compare"),
+    fields: Optional[str] = Query(None, description="Preset (compare, card, detail, full) and/or field names"),
+):
     """
     Compare multiple daycare centers
 
     Args:
         stcodes: List of daycare center codes
+        fields: Field projection (default: compare preset)
 
     Returns:
         Comparison table data
     """
-    session = get_session()
+    field_names = _resolve_fields(fields, "compare")
 
     try:
-        daycares = (
-            session.query(DaycareCenter)
-            .filter(DaycareCenter.stcode.in_(stcodes))
-            .all()
-        )
+        async with async_session_scope() as session:
+            daycares = await fetch_daycares(session, stcodes, field_names)
 
         if not daycares:
             raise HTTPException(status_code=404, detail="No daycare centers found")
 
-        results = [d.to_dict() for d in daycares]
-        session.close()
+        results = [serialize_row(d, field_names) for d in daycares]
 
         return {"daycares": results, "total": len(results)}
 
     except HTTPException:
         raise
     except Exception as e:
-        session.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
@@ -220,44 +364,127 @@ async def get_statistics():
     Returns:
         Database statistics
     """
-    session = get_session()
+    try:
+        async with async_session_scope() as session:
+            return cube_statistics(await fetch_stats_cube(session))
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/stats/drilldown")
+async def get_statistics_drilldown(
+    by: str = Query("district", description=f"Comma-separated dimensions: {', '.join(DIMENSIONS)}"),
+    region: Optional[str] = Query(None, description="Region (시도) filter, e.g. 부산 or 26"),
+    district: Optional[str] = Query(None, description="District filter"),
+    type: Optional[str] = Query(None, description="Daycare type filter"),
+    age: Optional[str] = Query(None, description="Age class filter (e.g. 만1세, 영아)"),
+    has_playground: Optional[bool] = Query(None, description="Playground filter"),
+    has_vehicle: Optional[bool] = Query(None, description="School bus filter"),
+    has_cctv: Optional[bool] = Query(None, description="CCTV filter"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum groups"),
+):
+    """
+    Drill-down statistics from the aggregate cube
+
+    Args:
+        by: Dimensions to group by (empty for a grand total)
+        region, district, type, age, has_playground, has_vehicle, has_cctv: Filters
+        limit: Maximum number of groups
+
+    Returns:
+        Groups with center count, capacity, enrollment, staff sums and occupancy rate
+    """
+    dimensions = [d.strip() for d in by.split(",") if d.strip()]
+    filters = {
+        "region": region,
+        "district": district,
+        "type": type,
+        "age": age,
+        "has_playground": has_playground,
+        "has_vehicle": has_vehicle,
+        "has_cctv": has_cctv,
+    }
+    filters = {key: value for key, value in filters.items() if value is not None}
 
     try:
-        total = session.query(DaycareCenter).filter(
-            DaycareCenter.crstatusname == "정상"
-        ).count()
-
-        # By district
-        by_district = (
-            session.query(
-                DaycareCenter.sigunname, func.count(DaycareCenter.id).label("count")
-            )
-            .filter(DaycareCenter.crstatusname == "정상")
-            .group_by(DaycareCenter.sigunname)
-            .order_by(func.count(DaycareCenter.id).desc())
-            .limit(10)
-            .all()
-        )
+        validate_dimensions(dimensions, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # By type
-        by_type = (
-            session.query(
-                DaycareCenter.crtypename, func.count(DaycareCenter.id).label("count")
-            )
-            .filter(DaycareCenter.crstatusname == "정상")
-            .group_by(DaycareCenter.crtypename)
-            .order_by(func.count(DaycareCenter.id).desc())
-            .all()
-        )
+    try:
+        async with async_session_scope() as session:
+            groups = rollup(await fetch_stats_cube(session), dimensions, filters)
 
-        session.close()
+        if limit:
+            groups = groups[:limit]
 
-        return {
-            "total": total,
-            "by_district": [{"name": d[0], "count": d[1]} for d in by_district],
-            "by_type": [{"name": t[0], "count": t[1]} for t in by_type],
-        }
+        return {"by": dimensions, "filters": filters, "groups": groups, "total": len(groups)}
 
     except Exception as e:
-        session.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """
+    Guard for admin endpoints
+
+    Admin endpoints expose bound SQL and cache internals: they answer 404
+    unless settings.ADMIN_TOKEN is set, and 401 without a matching
+    X-Admin-Token header.
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = (x_admin_token or "").encode("utf-8")
+    if not secrets.compare_digest(token, settings.ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/admin/slow-queries", dependencies=[Depends(require_admin_token)])
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=500, description="Maximum fingerprints"),
+    sort: str = Query("total_ms", description="total_ms, max_ms, count or slow_count"),
+    include_fast: bool = Query(False, description="Also list fingerprints that were never slow"),
+):
+    """
+    Statement statistics from the slow-query log
+
+    Args:
+        limit: Maximum number of fingerprints
+        sort: Ordering key
+        include_fast: Include fingerprints without slow executions
+
+    Returns:
+        Totals plus per-fingerprint count, timings, slowest bound SQL,
+        EXPLAIN QUERY PLAN and plan flags (full_scan, temp_btree)
+    """
+    try:
+        return get_query_log().report(limit=limit, sort=sort, slow_only=not include_fast)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/admin/slow-queries", dependencies=[Depends(require_admin_token)])
+async def reset_slow_queries():
+    """Clear the slow-query log"""
+    get_query_log().reset()
+    return {"status": "reset"}
+
+
+@router.get("/admin/analyzer-cache", dependencies=[Depends(require_admin_token)])
+async def get_analyzer_cache_stats():
+    """
+    Query analysis cache statistics
+
+    Returns:
+        Entries, hit rate, expired/evicted counts and the LLM latency saved
+        by hits (total and per hit)
+    """
+    return get_analysis_cache().report()
+
+
+@router.delete("/admin/analyzer-cache", dependencies=[Depends(require_admin_token)])
+async def reset_analyzer_cache():
+    """Clear the query analysis cache and its statistics"""
+    get_analysis_cache().reset()
+    return {"status": "reset"}
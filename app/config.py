@@ -30,12 +30,40 @@ class Settings(BaseSettings):
     AOAI_DEPLOY_GPT4O: Optional[str] = None
     AOAI_EMBEDDING_DEPLOYMENT: Optional[str] = None
 
+    # OpenAI Client Pool (services/openai_clients.py)
+    OPENAI_MAX_CONNECTIONS: int = 32  # sockets per client pool (sync and async each)
+    OPENAI_MAX_KEEPALIVE: int = 16  # idle keep-alive connections kept open
+    OPENAI_KEEPALIVE_EXPIRY: float = 60.0  # seconds an idle connection is kept
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_ANALYZER_TIMEOUT: float = 15.0  # short JSON completion
+    OPENAI_ANALYZER_RETRIES: int = 2
+    OPENAI_GENERATOR_TIMEOUT: float = 60.0  # up to 1000 generated tokens
+    OPENAI_GENERATOR_RETRIES: int = 1
+    OPENAI_EMBEDDING_TIMEOUT: float = 30.0  # batches of BATCH_SIZE texts
+    OPENAI_EMBEDDING_RETRIES: int = 3
+
     # Database Configuration
     DB_PATH: str = "data/processed/daycare.db"
+    DB_POOL_SIZE: int = 8  # pooled connections kept open
+    DB_MAX_OVERFLOW: int = 16  # extra connections under burst load
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_READ_ONLY: bool = False  # serving mode: PRAGMA query_only
+
+    # SQLite Pragmas
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB memory-mapped I/O
+    SQLITE_CACHE_SIZE: int = -65536  # negative = KiB (64 MiB page cache)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_IMMUTABLE: bool = False  # with DB_READ_ONLY: open the file as immutable
 
     # Vector Index Configuration
     VECTOR_INDEX_PATH: str = "data/vector_index/faiss.index"
     VECTOR_METADATA_PATH: str = "data/vector_index/metadata.json"
+    VECTOR_REGION_DIR: str = "data/vector_index/regions"  # per-region (시도) indexes
+    VECTOR_MAX_LOADED_REGIONS: Optional[int] = None  # region indexes kept open (LRU; default: all 17)
+    VECTOR_INDEX_MMAP: bool = True  # memory-map region indexes instead of reading them
+    VECTOR_FANOUT_WORKERS: int = 4  # threads searching regions in parallel
 
     # API Configuration
     API_HOST: str = "localhost"
@@ -48,12 +76,75 @@ class Settings(BaseSettings):
     TOP_K: int = 10
     SIMILARITY_THRESHOLD: float = 0.7
 
+    # Retrieval Planner Configuration (costs in estimated milliseconds)
+    PLANNER_EMBEDDING_COST_MS: float = 300.0  # one query embedding round trip
+    PLANNER_SQL_ROW_COST_MS: float = 0.005  # fetch + hydrate one row
+    PLANNER_VECTOR_COST_MS: float = 0.001  # one exact distance computation
+    PLANNER_FILTER_FIRST_MAX_ROWS: int = 5000  # cap on exact re-scoring subset
+
+    # Ranking Configuration (services/features.py)
+    RANKING_WEIGHTS: str = "staffing=0.3,space=0.25,tenure=0.2,cctv=0.15,occupancy=0.1"
+    RANKING_QUALITY_WEIGHT: float = 0.3  # share of quality vs relevance (0 = relevance only)
+    RANKING_RERANK_DEPTH: int = 30  # most relevant candidates re-ordered by quality
+
+    # Neighbouring District Expansion (services/districts.py)
+    DISTRICT_EXPANSION_ENABLED: bool = True  # widen thin district results to nearby districts
+    DISTRICT_EXPANSION_MAX_NEIGHBORS: int = 4  # nearest districts tried, closest first
+    DISTRICT_EXPANSION_MAX_KM: float = 10.0  # centroid distance limit
+
+    # Query Analyzer Fast Path (services/rule_analyzer.py)
+    ANALYZER_RULES_ENABLED: bool = True  # answer formulaic queries without the LLM
+    ANALYZER_RULES_MIN_CONFIDENCE: float = 0.85  # share of the query the rules must explain
+
+    # Local Query Model (services/query_model.py)
+    ANALYZER_LOG_ENABLED: bool = False  # log LLM analyzer outputs (user queries) as training data
+    ANALYZER_LOG_PATH: str = "data/processed/analyzer_log.jsonl"
+    ANALYZER_MODEL_ENABLED: bool = True  # use the trained model between rules and LLM
+    ANALYZER_MODEL_MIN_CONFIDENCE: float = 0.8  # intent x weakest token tag probability
+    QUERY_MODEL_PATH: Optional[str] = None  # default: query_model.npz next to the vector index
+    QUERY_MODEL_DIMENSION: int = 65536  # hashed feature space
+
+    # Query Analysis Cache (services/analysis_cache.py)
+    ANALYZER_CACHE_ENABLED: bool = True  # reuse LLM analyses of canonically equal queries
+    ANALYZER_CACHE_MAX_ENTRIES: int = 10000
+    ANALYZER_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Standing Query Configuration (services/standing_queries.py)
+    STANDING_QUERY_MAX_DISTANCE: float = 1.0  # squared L2 for query-text matches (unit vectors)
+
     # Embedding Configuration
+    EMBEDDING_BACKEND: str = "openai"  # openai | hashing (offline, synthetic data)
     EMBEDDING_DIMENSION: int = 3072  # text-embedding-3-large dimension
     BATCH_SIZE: int = 100
 
+    # Ingest Configuration
+    INGEST_CHUNK_SIZE: int = 10000  # records per columnar chunk / transaction
+    HISTORY_KEYFRAME_INTERVAL: int = 8  # full snapshot every N changes per center
+
+    # Seoul Open Data API (scripts/fetch_daycare_data.py)
+    SEOUL_OPENAPI_KEY: Optional[str] = None
+    SEOUL_OPENAPI_URL: str = "http://openapi.seoul.go.kr:8088"
+    SEOUL_OPENAPI_SERVICE: str = "ChildCareInfo"
+    OPENAPI_PAGE_SIZE: int = 1000  # rows per request (API maximum)
+    OPENAPI_CONCURRENCY: int = 4  # pages fetched in parallel
+    OPENAPI_RETRIES: int = 3  # retries per page on timeouts / 5xx
+    OPENAPI_TIMEOUT: float = 30.0  # seconds per request
+
+    # In-memory Snapshot Configuration
+    SNAPSHOT_ENABLED: bool = True  # serve search filters from a NumPy snapshot
+    SNAPSHOT_VERSION_CHECK_SECONDS: float = 5.0  # data version poll interval
+
     # Logging
     LOG_LEVEL: str = "INFO"
+    SQL_ECHO: bool = False  # log every SQL statement (SQLAlchemy echo)
+    SLOW_QUERY_LOG_ENABLED: bool = False  # time statements, aggregate by fingerprint
+    SLOW_QUERY_THRESHOLD_MS: float = 50.0  # capture SQL + EXPLAIN QUERY PLAN above this
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 500
+
+    # Admin endpoints (/api/v1/admin/*): disabled unless a token is set,
+    # then called with the X-Admin-Token header
+    ADMIN_TOKEN: Optional[str] = None
 
     class Config:
         env_file = str(Path(__file__).parent.parent / ".env")
@@ -66,12 +157,39 @@ class Settings(BaseSettings):
             return Path(self.DB_PATH)
         return self.PROJECT_ROOT / self.DB_PATH
 
+    def get_raw_data_path(self) -> Path:
+        """Default raw dump: the fetcher's JSON Lines output, else the manual JSON export"""
+        jsonl_path = self.RAW_DATA_DIR / "seoul_daycare_raw.jsonl"
+        if jsonl_path.exists():
+            return jsonl_path
+        return self.RAW_DATA_DIR / "seoul_daycare_raw.json"
+
     def get_vector_index_path(self) -> Path:
         """Get absolute vector index path"""
         if Path(self.VECTOR_INDEX_PATH).is_absolute():
             return Path(self.VECTOR_INDEX_PATH)
         return self.PROJECT_ROOT / self.VECTOR_INDEX_PATH
 
+    def get_analyzer_log_path(self) -> Path:
+        """Get absolute analyzer log path"""
+        if Path(self.ANALYZER_LOG_PATH).is_absolute():
+            return Path(self.ANALYZER_LOG_PATH)
+        return self.PROJECT_ROOT / self.ANALYZER_LOG_PATH
+
+    def get_query_model_path(self) -> Path:
+        """Get absolute query model path (next to the vector index by default)"""
+        if self.QUERY_MODEL_PATH is None:
+            return self.get_vector_index_path().parent / "query_model.npz"
+        if Path(self.QUERY_MODEL_PATH).is_absolute():
+            return Path(self.QUERY_MODEL_PATH)
+        return self.PROJECT_ROOT / self.QUERY_MODEL_PATH
+
+    def get_vector_region_dir(self) -> Path:
+        """Get absolute directory of the per-region vector indexes"""
+        if Path(self.VECTOR_REGION_DIR).is_absolute():
+            return Path(self.VECTOR_REGION_DIR)
+        return self.PROJECT_ROOT / self.VECTOR_REGION_DIR
+
     def get_vector_metadata_path(self) -> Path:
         """Get absolute vector metadata path"""
         if Path(self.VECTOR_METADATA_PATH).is_absolute():
@@ -1,5 +1,75 @@
 """Database package"""
-from .models import Base, DaycareCenter
-from .database import get_engine, get_session, init_db
+from .models import (
+    Base,
+    DaycareCenter,
+    DaycareFeatures,
+    DaycareHistory,
+    DatasetMeta,
+    DistrictCentroid,
+    FilterStatistic,
+    StandingQuery,
+    StandingQueryEvent,
+    StandingQueryMatch,
+    StatsCube,
+)
+from .database import (
+    create_db_engine,
+    dispose_engine,
+    get_engine,
+    get_session,
+    session_scope,
+    init_db,
+    migrate_schema,
+)
+from .async_database import (
+    create_async_db_engine,
+    dispose_async_engine,
+    get_async_engine,
+    get_async_session,
+    async_session_scope,
+)
+from .fulltext import (
+    ensure_fulltext_index,
+    rebuild_fulltext_index,
+    search_fulltext,
+    search_fulltext_async,
+)
+from .query_log import SlowQueryLog, get_query_log, instrument_engine
+from .meta import get_meta, set_meta, get_data_version, bump_data_version
 
-__all__ = ["Base", "DaycareCenter", "get_engine", "get_session", "init_db"]
+__all__ = [
+    "Base",
+    "DaycareCenter",
+    "DaycareFeatures",
+    "DaycareHistory",
+    "DatasetMeta",
+    "DistrictCentroid",
+    "FilterStatistic",
+    "StandingQuery",
+    "StandingQueryEvent",
+    "StandingQueryMatch",
+    "StatsCube",
+    "create_db_engine",
+    "dispose_engine",
+    "get_engine",
+    "get_session",
+    "session_scope",
+    "init_db",
+    "migrate_schema",
+    "create_async_db_engine",
+    "dispose_async_engine",
+    "get_async_engine",
+    "get_async_session",
+    "async_session_scope",
+    "ensure_fulltext_index",
+    "rebuild_fulltext_index",
+    "search_fulltext",
+    "search_fulltext_async",
+    "SlowQueryLog",
+    "get_query_log",
+    "instrument_engine",
+    "get_meta",
+    "set_meta",
+    "get_data_version",
+    "bump_data_version",
+]
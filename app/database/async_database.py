@@ -0,0 +1,129 @@
+"""
+Async database connection and session management (aiosqlite)
+Used by the FastAPI routes so DB calls do not block the event loop
+"""
+
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from database.database import _apply_pragmas
+from database.query_log import instrument_engine
+
+# Process-wide async engine and session factory
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_engine_lock = threading.Lock()
+
+
+def create_async_db_engine(db_path: Path = None, read_only: bool = None) -> AsyncEngine:
+    """
+    Create a new async SQLAlchemy engine (aiosqlite) with tuned pragmas
+
+    Args:
+        db_path: Database file (default from settings)
+        read_only: Open in serving mode (default from settings)
+
+    Returns:
+        Async SQLAlchemy engine
+    """
+    if db_path is None:
+        db_path = settings.get_db_path()
+    if read_only is None:
+        read_only = settings.DB_READ_ONLY
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if read_only and settings.SQLITE_IMMUTABLE:
+        url = f"sqlite+aiosqlite:///file:{db_path}?immutable=1&uri=true"
+    else:
+        url = f"sqlite+aiosqlite:///{db_path}"
+
+    engine = create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        echo=settings.SQL_ECHO,
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        _apply_pragmas(dbapi_connection, read_only)
+
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        instrument_engine(engine.sync_engine)
+
+    return engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the process-wide async engine (created on first use)
+    """
+    global _async_engine, _async_session_factory
+
+    if _async_engine is None:
+        with _async_engine_lock:
+            if _async_engine is None:
+                _async_engine = create_async_db_engine()
+                _async_session_factory = async_sessionmaker(
+                    _async_engine, autoflush=False, expire_on_commit=False
+                )
+
+    return _async_engine
+
+
+async def dispose_async_engine():
+    """Close pooled async connections and drop the shared async engine"""
+    global _async_engine, _async_session_factory
+
+    engine = _async_engine
+    _async_engine = None
+    _async_session_factory = None
+    if engine is not None:
+        await engine.dispose()
+
+
+def get_async_session() -> AsyncSession:
+    """
+    Create and return a new async session on the shared async engine
+
+    The caller must close the session; prefer async_session_scope().
+    """
+    get_async_engine()
+    return _async_session_factory()
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Provide a transactional async session scope
+
+    Example:
+        async with async_session_scope() as session:
+            await fetch_districts(session)
+    """
+    session = get_async_session()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
@@ -2,9 +2,13 @@
 Database connection and session management
 """
 
-from sqlalchemy import create_engine
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
 from pathlib import Path
 import sys
 
@@ -13,44 +17,205 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import settings
 from database.models import Base
+from database.fulltext import ensure_fulltext_index
+from database.query_log import instrument_engine
+
+# Process-wide engine and session factory (created lazily, shared by all threads)
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_engine_lock = threading.Lock()
+
+
+def _apply_pragmas(dbapi_connection, read_only: bool):
+    """Apply configured SQLite pragmas to a new DB-API connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        else:
+            # journal_mode persists in the file and needs write access
+            cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(db_path: Path = None, read_only: bool = None) -> Engine:
+    """
+    Create a new SQLAlchemy engine with a connection pool and tuned pragmas
 
+    Most callers should use get_engine(), which returns the shared engine.
 
-def get_engine():
-    """
-    Create and return SQLAlchemy engine
+    Args:
+        db_path: Database file (default from settings)
+        read_only: Open in serving mode - query_only, and immutable if
+            SQLITE_IMMUTABLE is set (default from settings)
+
+    Returns:
+        SQLAlchemy engine
     """
-    db_path = settings.get_db_path()
+    if db_path is None:
+        db_path = settings.get_db_path()
+    if read_only is None:
+        read_only = settings.DB_READ_ONLY
 
     # Ensure parent directory exists
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Create SQLite engine
+    if read_only and settings.SQLITE_IMMUTABLE:
+        # immutable=1 skips all locking and change detection
+        url = f"sqlite:///file:{db_path}?immutable=1&uri=true"
+    else:
+        url = f"sqlite:///{db_path}"
+
+    # Create SQLite engine (file databases get a QueuePool: one connection per
+    # concurrent reader instead of a single connection shared across threads)
     engine = create_engine(
-        f"sqlite:///{db_path}",
+        url,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=False,  # Set to True for SQL query logging
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        echo=settings.SQL_ECHO,
     )
 
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        _apply_pragmas(dbapi_connection, read_only)
+
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        instrument_engine(engine)
+
     return engine
 
 
+def get_engine() -> Engine:
+    """
+    Return the process-wide SQLAlchemy engine (created on first use)
+    """
+    global _engine, _session_factory
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_db_engine()
+                _session_factory = sessionmaker(
+                    autocommit=False, autoflush=False, bind=_engine
+                )
+
+    return _engine
+
+
+def dispose_engine():
+    """
+    Close all pooled connections and drop the shared engine
+
+    The next get_engine()/get_session() call creates a fresh engine, e.g.
+    after the database file was replaced or settings changed.
+    """
+    global _engine, _session_factory
+
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _session_factory = None
+
+
 def get_session() -> Session:
     """
-    Create and return a new database session
+    Create and return a new database session on the shared engine
+
+    The caller must close the session; prefer session_scope().
     """
-    engine = get_engine()
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    get_engine()
+    return _session_factory()
 
 
-def init_db():
+@contextmanager
+def session_scope() -> Iterator[Session]:
     """
-    Initialize database - create all tables
+    Provide a transactional session scope
+
+    Commits on success, rolls back on error and always returns the
+    connection to the pool.
+
+    Example:
+        with session_scope() as session:
+            session.query(DaycareCenter).count()
+    """
+    session = get_session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def migrate_schema(engine: Engine = None) -> list:
+    """
+    Add columns and indexes that were introduced after the database was created
+
+    create_all() only creates missing tables; existing tables get new model
+    columns via ALTER TABLE ADD COLUMN (left NULL until the next ingest or
+    backfill) and any missing indexes.
+
+    Returns:
+        List of added "table.column" names
+    """
+    if engine is None:
+        engine = get_engine()
+
+    added = []
+    inspector = inspect(engine)
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                )
+                added.append(f"{table.name}.{column.name}")
+
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+
+    return added
+
+
+def init_db() -> list:
+    """
+    Initialize database - create all tables, migrate existing ones and
+    ensure the full-text index
+
+    Returns:
+        List of columns added to existing tables
     """
     engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    added = migrate_schema(engine)
+    fts_created = ensure_fulltext_index(engine)
     print(f"[OK] Database initialized at: {settings.get_db_path()}")
+    if added:
+        print(f"   - Added columns: {', '.join(added)}")
+    if fts_created:
+        print("   - Full-text index (FTS5) created")
+    return added
 
 
 def drop_all_tables():
@@ -65,6 +230,6 @@ def drop_all_tables():
 if __name__ == "__main__":
     # Test database connection
     init_db()
-    session = get_session()
-    print(f"[OK] Database connection successful")
-    session.close()
+    with session_scope() as session:
+        journal_mode = session.connection().exec_driver_sql("PRAGMA journal_mode").scalar()
+    print(f"[OK] Database connection successful (journal_mode={journal_mode})")
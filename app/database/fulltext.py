@@ -0,0 +1,203 @@
+"""
+SQLite FTS5 full-text index over daycare names, addresses and services
+Trigram tokenizer: works for Korean without a morphological analyzer
+"""
+
+import re
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+FTS_TABLE = "daycare_fts"
+CONTENT_TABLE = "daycare_centers"
+FTS_COLUMNS = ["crname", "craddr", "crspec"]
+
+# bm25 column weights: name matches outrank address, address outranks services
+BM25_WEIGHTS = (10.0, 3.0, 1.0)
+
+# Trigram index answers terms of at least 3 characters
+MIN_TRIGRAM_LENGTH = 3
+
+_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {", ".join(FTS_COLUMNS)},
+        content='{CONTENT_TABLE}',
+        content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    # External-content triggers keep the index in sync with every write path
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {", ".join(FTS_COLUMNS)})
+        VALUES (new.id, {", ".join(f"new.{c}" for c in FTS_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {", ".join(FTS_COLUMNS)})
+        VALUES ('delete', old.id, {", ".join(f"old.{c}" for c in FTS_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF {", ".join(FTS_COLUMNS)} ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {", ".join(FTS_COLUMNS)})
+        VALUES ('delete', old.id, {", ".join(f"old.{c}" for c in FTS_COLUMNS)});
+        INSERT INTO {FTS_TABLE}(rowid, {", ".join(FTS_COLUMNS)})
+        VALUES (new.id, {", ".join(f"new.{c}" for c in FTS_COLUMNS)});
+    END
+    """,
+]
+
+
+def ensure_fulltext_index(engine: Engine) -> bool:
+    """
+    Create the FTS5 table and sync triggers if missing
+
+    A newly created index is populated from existing rows.
+
+    Returns:
+        True if the index was created
+    """
+    with engine.begin() as connection:
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        ).first()
+        for statement in _DDL:
+            connection.exec_driver_sql(statement)
+        if not exists:
+            connection.exec_driver_sql(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+
+    return not exists
+
+
+def rebuild_fulltext_index(engine: Engine):
+    """Rebuild the whole index from the content table (e.g. after bulk repair)"""
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def split_terms(query: str) -> List[str]:
+    """Split a query into whitespace-separated terms"""
+    return [term for term in re.split(r"\s+", query or "") if term]
+
+
+def _match_expression(terms: List[str]) -> str:
+    """FTS5 MATCH expression: every term as a quoted phrase (implicit AND)"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def fulltext_statement(
+    query: str,
+    limit: int = 10,
+    active_only: bool = True,
+    highlight: tuple = ("<b>", "</b>"),
+    snippet_tokens: int = 12,
+):
+    """
+    Build a ranked full-text search statement
+
+    Terms of 3+ characters are matched through the trigram index; shorter
+    terms (e.g. 2-syllable words) are applied as LIKE filters on the matched
+    rows. Without any long term the search degrades to a LIKE scan.
+
+    Args:
+        query: Free text (name, address fragment, service)
+        limit: Maximum rows
+        active_only: Only 운영중(정상) centers
+        highlight: Opening/closing markers for snippets
+        snippet_tokens: Snippet length in tokens
+
+    Returns:
+        (TextClause, params) or (None, None) for an empty query
+    """
+    terms = split_terms(query)
+    if not terms:
+        return None, None
+
+    long_terms = [t for t in terms if len(t) >= MIN_TRIGRAM_LENGTH]
+    short_terms = [t for t in terms if len(t) < MIN_TRIGRAM_LENGTH]
+
+    params = {"limit": limit, "hl_open": highlight[0], "hl_close": highlight[1]}
+    where = []
+
+    for i, term in enumerate(short_terms):
+        params[f"short_{i}"] = f"%{term}%"
+        where.append(
+            "(" + " OR ".join(f"d.{c} LIKE :short_{i}" for c in FTS_COLUMNS) + ")"
+        )
+    if active_only:
+        where.append("d.crstatusname = '정상'")
+
+    select_columns = (
+        "d.stcode, d.crname, d.crtypename, d.crstatusname, d.sigunname, d.craddr, d.crspec"
+    )
+
+    if long_terms:
+        params["match"] = _match_expression(long_terms)
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        snippets = ", ".join(
+            f"snippet({FTS_TABLE}, {i}, :hl_open, :hl_close, '…', {snippet_tokens}) "
+            f"AS {column}_snippet"
+            for i, column in enumerate(FTS_COLUMNS)
+        )
+        sql = (
+            f"SELECT {select_columns}, bm25({FTS_TABLE}, {weights}) AS score, {snippets} "
+            f"FROM {FTS_TABLE} JOIN {CONTENT_TABLE} d ON d.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match "
+            + "".join(f"AND {condition} " for condition in where)
+            + "ORDER BY score LIMIT :limit"
+        )
+    else:
+        snippets = ", ".join(f"d.{column} AS {column}_snippet" for column in FTS_COLUMNS)
+        sql = (
+            f"SELECT {select_columns}, 0.0 AS score, {snippets} "
+            f"FROM {CONTENT_TABLE} d WHERE {' AND '.join(where)} "
+            "ORDER BY length(d.crname) LIMIT :limit"
+        )
+
+    return text(sql), params
+
+
+def _row_to_hit(row) -> dict:
+    mapping = row._mapping
+    return {
+        "stcode": mapping["stcode"],
+        "crname": mapping["crname"],
+        "crtypename": mapping["crtypename"],
+        "crstatusname": mapping["crstatusname"],
+        "sigunname": mapping["sigunname"],
+        "craddr": mapping["craddr"],
+        "score": float(mapping["score"]),
+        "snippets": {column: mapping[f"{column}_snippet"] for column in FTS_COLUMNS},
+    }
+
+
+def search_fulltext(session, query: str, limit: int = 10, active_only: bool = True) -> List[dict]:
+    """
+    Ranked full-text search (sync session)
+
+    Returns:
+        List of hits with stcode, basic fields, bm25 score (lower is better)
+        and per-column snippets
+    """
+    statement, params = fulltext_statement(query, limit, active_only)
+    if statement is None:
+        return []
+    return [_row_to_hit(row) for row in session.execute(statement, params)]
+
+
+async def search_fulltext_async(
+    session, query: str, limit: int = 10, active_only: bool = True
+) -> List[dict]:
+    """Ranked full-text search (async session)"""
+    statement, params = fulltext_statement(query, limit, active_only)
+    if statement is None:
+        return []
+    result = await session.execute(statement, params)
+    return [_row_to_hit(row) for row in result]
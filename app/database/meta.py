@@ -0,0 +1,47 @@
+"""
+Dataset metadata helpers
+Tracks the data version that derived structures (statistics, caches) key on
+"""
+
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from database.models import DatasetMeta
+
+DATA_VERSION_KEY = "data_version"
+
+
+def get_meta(session: Session, key: str) -> Optional[str]:
+    """Get a metadata value (None if missing)"""
+    row = session.get(DatasetMeta, key)
+    return row.value if row else None
+
+
+def set_meta(session: Session, key: str, value: str):
+    """Insert or update a metadata value (caller commits)"""
+    row = session.get(DatasetMeta, key)
+    if row is None:
+        session.add(DatasetMeta(key=key, value=value))
+    else:
+        row.value = value
+
+
+def get_data_version(session: Session) -> int:
+    """Get current data version (0 if the dataset was never versioned)"""
+    value = get_meta(session, DATA_VERSION_KEY)
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        return 0
+
+
+def bump_data_version(session: Session) -> int:
+    """
+    Increment the data version after an ingest (caller commits)
+
+    Returns:
+        New data version
+    """
+    version = get_data_version(session) + 1
+    set_meta(session, DATA_VERSION_KEY, str(version))
+    return version
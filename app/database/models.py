@@ -2,7 +2,7 @@
 SQLAlchemy ORM models for Seoul Daycare database
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, Float, Text, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -13,6 +13,16 @@ class DaycareCenter(Base):
     """어린이집 정보 모델"""
 
     __tablename__ = "daycare_centers"
+    __table_args__ = (
+        Index("ix_daycare_status_district_type", "crstatusname", "district_code", "type_code"),
+        Index("ix_daycare_region_status_type", "region_code", "crstatusname", "type_code"),
+        Index("ix_daycare_status_dong", "crstatusname", "dong_name"),
+        Index("ix_daycare_status_road", "crstatusname", "road_name"),
+        *(
+            Index(f"ix_daycare_status_vacancy_{age}", "crstatusname", f"vacancy_{age}")
+            for age in ("00", "01", "02", "03", "04", "05")
+        ),
+    )
 
     # Primary Key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -97,6 +107,22 @@ class DaycareCenter(Base):
     datastdrdt = Column(String(20))  # 데이터기준일자
     work_dttm = Column(String(20))  # 데이터수집일
 
+    # 파생 컬럼 (적재 시 계산, 인덱스 필터용)
+    region_code = Column(String(2))  # 시도코드 (stcode 앞 2자리, 파티션 키)
+    district_code = Column(String(10))  # 시군구코드 (stcode 앞 5자리)
+    road_name = Column(String(50))  # 도로명 (주소에서 추출, 번호 붙은 길은 본 도로명)
+    dong_name = Column(String(30))  # 동명 (주소에서 추출, 행정동 번호 제거)
+    type_code = Column(Integer)  # 유형코드 (utils.filters.TYPE_CODES)
+    age_mask = Column(Integer, default=0)  # 연령반 비트마스크 (만0세=1, 만1세=2, ...)
+    service_mask = Column(Integer, default=0)  # 제공서비스 비트마스크 (utils.filters.SERVICE_FLAGS)
+    vacancy_00 = Column(Integer)  # 만0세 추정 여석 (NULL: 반 정보 없음)
+    vacancy_01 = Column(Integer)  # 만1세 추정 여석
+    vacancy_02 = Column(Integer)  # 만2세 추정 여석
+    vacancy_03 = Column(Integer)  # 만3세 추정 여석
+    vacancy_04 = Column(Integer)  # 만4세 추정 여석
+    vacancy_05 = Column(Integer)  # 만5세 추정 여석
+    content_hash = Column(String(32))  # 원본 레코드 해시 (변경 감지용)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -114,6 +140,8 @@ class DaycareCenter(Base):
             "crstatusname": self.crstatusname,
             "craddr": self.craddr,
             "sigunname": self.sigunname,
+            "road_name": self.road_name,
+            "dong_name": self.dong_name,
             "zipcode": self.zipcode,
             "la": self.la,
             "lo": self.lo,
@@ -150,6 +178,12 @@ class DaycareCenter(Base):
             "class_cnt_03": self.class_cnt_03,
             "class_cnt_04": self.class_cnt_04,
             "class_cnt_05": self.class_cnt_05,
+            "vacancy_00": self.vacancy_00,
+            "vacancy_01": self.vacancy_01,
+            "vacancy_02": self.vacancy_02,
+            "vacancy_03": self.vacancy_03,
+            "vacancy_04": self.vacancy_04,
+            "vacancy_05": self.vacancy_05,
             "datastdrdt": self.datastdrdt,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
@@ -171,3 +205,177 @@ class DaycareCenter(Base):
             parts.append(self.crspec)
 
         return " ".join(parts)
+
+
+class DatasetMeta(Base):
+    """데이터셋 메타데이터 (키-값)"""
+
+    __tablename__ = "dataset_meta"
+
+    key = Column(String(50), primary_key=True)
+    value = Column(String(255))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DatasetMeta(key={self.key}, value={self.value})>"
+
+
+class FilterStatistic(Base):
+    """필터 선택도 통계 (속성값별 운영중 어린이집 수)"""
+
+    __tablename__ = "filter_statistics"
+
+    attribute = Column(String(50), primary_key=True)  # district, type, age, ...
+    value = Column(String(255), primary_key=True)  # 강남구, 국공립, 만1세, ...
+    row_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<FilterStatistic(attribute={self.attribute}, value={self.value}, row_count={self.row_count})>"
+
+
+class StatsCube(Base):
+    """집계 큐브 (시도 × 시군구 × 유형 × 연령 구분 × 시설 여부별 운영중 어린이집 합계)"""
+
+    __tablename__ = "stats_cube"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # 차원
+    region_code = Column(String(2))  # 시도코드
+    sigunname = Column(String(50))  # 시군구명
+    crtypename = Column(String(50))  # 어린이집유형
+    age_mask = Column(Integer, nullable=False, default=0)  # 연령 구분 (0: 전체, 연령반 비트 1개, 영아/유아 비트 묶음)
+    has_playground = Column(Boolean, nullable=False, default=False)  # 놀이터 있음
+    has_vehicle = Column(Boolean, nullable=False, default=False)  # 통학차량 운영
+    has_cctv = Column(Boolean, nullable=False, default=False)  # CCTV 설치
+
+    # 측정값
+    center_count = Column(Integer, nullable=False, default=0)  # 어린이집 수
+    capacity_sum = Column(Integer, nullable=False, default=0)  # 정원 합계
+    enrollment_sum = Column(Integer, nullable=False, default=0)  # 현원 합계
+    staff_sum = Column(Integer, nullable=False, default=0)  # 보육교직원 합계
+
+    def __repr__(self):
+        return f"<StatsCube(sigunname={self.sigunname}, crtypename={self.crtypename}, center_count={self.center_count})>"
+
+
+class DaycareFeatures(Base):
+    """품질·인력 지표 (적재 시 계산, 시군구 내 백분위 포함)"""
+
+    __tablename__ = "daycare_features"
+
+    stcode = Column(String(20), primary_key=True)  # 어린이집코드
+    district_code = Column(String(10))  # 시군구코드 (백분위 기준 그룹)
+
+    # 지표
+    children_per_teacher = Column(Float)  # 보육교사 1인당 현원
+    room_area_per_child = Column(Float)  # 아동 1인당 보육실면적
+    long_tenure_share = Column(Float)  # 근속 4년 이상 교직원 비율
+    occupancy_rate = Column(Float)  # 정원 대비 현원
+    cctv_per_room = Column(Float)  # 보육실당 CCTV 수
+
+    # 시군구 내 백분위 (0~1, 1이 가장 좋음)
+    staffing_pct = Column(Float)
+    space_pct = Column(Float)
+    tenure_pct = Column(Float)
+    occupancy_pct = Column(Float)
+    cctv_pct = Column(Float)
+
+    def __repr__(self):
+        return f"<DaycareFeatures(stcode={self.stcode}, staffing_pct={self.staffing_pct})>"
+
+
+class DistrictCentroid(Base):
+    """시군구 중심점 (운영중 어린이집 좌표의 중앙값, 인접 시군구 확장용)"""
+
+    __tablename__ = "district_centroids"
+
+    district_code = Column(String(10), primary_key=True)  # 시군구코드
+    region_code = Column(String(2))  # 시도코드
+    sigunname = Column(String(50))  # 시군구명
+    la = Column(Float)  # 중심 위도
+    lo = Column(Float)  # 중심 경도
+    center_count = Column(Integer, nullable=False, default=0)  # 좌표가 있는 어린이집 수
+
+    def __repr__(self):
+        return f"<DistrictCentroid(district_code={self.district_code}, sigunname={self.sigunname})>"
+
+
+class DaycareHistory(Base):
+    """어린이집 이력 (키프레임: 전체 값, 델타: 바뀐 컬럼만)"""
+
+    __tablename__ = "daycare_history"
+    __table_args__ = (
+        Index("ix_daycare_history_stcode_version", "stcode", "data_version"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stcode = Column(String(20), nullable=False)  # 어린이집코드
+    data_version = Column(Integer, nullable=False)  # 적재 시 데이터 버전
+    snapshot_date = Column(String(10), nullable=False)  # 기준일자 (YYYY-MM-DD)
+    is_keyframe = Column(Boolean, nullable=False, default=False)  # 키프레임 여부
+    chain_length = Column(Integer, nullable=False, default=0)  # 직전 키프레임 이후 델타 수
+    payload = Column(Text, nullable=False)  # JSON {컬럼: 값}
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DaycareHistory(stcode={self.stcode}, data_version={self.data_version}, is_keyframe={self.is_keyframe})>"
+
+
+class StandingQuery(Base):
+    """저장된 검색 (데이터 갱신 시 바뀐 어린이집만 증분 매칭)"""
+
+    __tablename__ = "standing_queries"
+    __table_args__ = (
+        Index("ix_standing_queries_active_partition", "active", "partition_key"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100))  # 검색 이름
+    subscriber = Column(String(100))  # 알림 받을 사용자 식별자
+    filters = Column(Text, nullable=False)  # JSON 필터 (검색 필터와 동일)
+    query = Column(Text)  # 자유 텍스트 질의 (선택)
+    embedding = Column(Text)  # 질의 임베딩 JSON (선택)
+    max_distance = Column(Float)  # 임베딩 매칭 최대 거리 (L2 제곱)
+    partition_key = Column(String(10), nullable=False, default="*")  # d:시군구코드 / r:시도코드 / *
+    active = Column(Boolean, nullable=False, default=True)  # 사용 여부
+    data_version = Column(Integer)  # 마지막 평가 데이터 버전
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<StandingQuery(id={self.id}, name={self.name}, partition_key={self.partition_key})>"
+
+
+class StandingQueryMatch(Base):
+    """저장된 검색의 현재 매칭 어린이집"""
+
+    __tablename__ = "standing_query_matches"
+    __table_args__ = (
+        Index("ix_standing_query_matches_stcode", "stcode"),
+    )
+
+    query_id = Column(Integer, primary_key=True)  # 저장된 검색 ID
+    stcode = Column(String(20), primary_key=True)  # 어린이집코드
+    data_version = Column(Integer)  # 매칭된 데이터 버전
+
+    def __repr__(self):
+        return f"<StandingQueryMatch(query_id={self.query_id}, stcode={self.stcode})>"
+
+
+class StandingQueryEvent(Base):
+    """저장된 검색 알림 이벤트 (match: 새로 매칭, unmatch: 매칭 해제)"""
+
+    __tablename__ = "standing_query_events"
+    __table_args__ = (
+        Index("ix_standing_query_events_query", "query_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    query_id = Column(Integer, nullable=False)  # 저장된 검색 ID
+    stcode = Column(String(20), nullable=False)  # 어린이집코드
+    event = Column(String(10), nullable=False)  # match / unmatch
+    data_version = Column(Integer)  # 발생 데이터 버전
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<StandingQueryEvent(query_id={self.query_id}, stcode={self.stcode}, event={self.event})>"
@@ -0,0 +1,137 @@
+"""
+Column projection for API responses
+Named field presets, Core column lists and slim row serializers
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from database.models import DaycareCenter
+
+# Every field DaycareCenter.to_dict() returns
+FULL_FIELDS = list(DaycareCenter().to_dict().keys())
+
+FIELD_PRESETS = {
+    # Search result cards (list, map and summary tabs)
+    "card": [
+        "stcode",
+        "crname",
+        "crtypename",
+        "sigunname",
+        "craddr",
+        "la",
+        "lo",
+        "crtelno",
+        "crcapat",
+        "crchcnt",
+        "plgrdco",
+        "cctvinstlcnt",
+    ],
+    # Side-by-side comparison table
+    "compare": [
+        "stcode",
+        "crname",
+        "crtypename",
+        "sigunname",
+        "craddr",
+        "crtelno",
+        "crcapat",
+        "crchcnt",
+        "nrtrroomcnt",
+        "nrtrroomsize",
+        "plgrdco",
+        "cctvinstlcnt",
+        "chcrtescnt",
+        "crcargbname",
+        "crspec",
+    ],
+    # Detail endpoint default (former DaycareDetail model)
+    "detail": [
+        "stcode",
+        "crname",
+        "crtypename",
+        "crstatusname",
+        "craddr",
+        "sigunname",
+        "la",
+        "lo",
+        "crtelno",
+        "crcapat",
+        "crchcnt",
+        "plgrdco",
+        "cctvinstlcnt",
+    ],
+    # Availability list (estimated spare places per age class)
+    "vacancy": [
+        "stcode",
+        "crname",
+        "crtypename",
+        "sigunname",
+        "craddr",
+        "crtelno",
+        "crcapat",
+        "crchcnt",
+        "vacancy_00",
+        "vacancy_01",
+        "vacancy_02",
+        "vacancy_03",
+        "vacancy_04",
+        "vacancy_05",
+    ],
+    "full": FULL_FIELDS,
+}
+
+
+def resolve_fields(fields: Optional[str], default: str = "full") -> List[str]:
+    """
+    Resolve a fields= parameter into an ordered list of field names
+
+    Accepts preset names and individual field names, comma-separated
+    (e.g. "card", "card,crspec", "stcode,crname"). stcode is always included.
+
+    Args:
+        fields: Raw parameter value (None or empty selects the default preset)
+        default: Preset used when fields is empty
+
+    Returns:
+        Field names in request order, without duplicates
+
+    Raises:
+        ValueError: If a name is neither a preset nor a known field
+    """
+    tokens = [token.strip() for token in (fields or default).split(",") if token.strip()]
+
+    resolved = []
+    for token in tokens:
+        if token in FIELD_PRESETS:
+            names = FIELD_PRESETS[token]
+        elif token in FULL_FIELDS:
+            names = [token]
+        else:
+            raise ValueError(
+                f"Unknown field '{token}' (presets: {', '.join(FIELD_PRESETS)})"
+            )
+        resolved.extend(name for name in names if name not in resolved)
+
+    if "stcode" not in resolved:
+        resolved.insert(0, "stcode")
+    return resolved
+
+
+def projected_columns(fields: Iterable[str]) -> list:
+    """Table columns for the given field names (for Core select)"""
+    return [DaycareCenter.__table__.c[name] for name in fields]
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def serialize_row(row, fields: Iterable[str]) -> dict:
+    """Serialize a Core row (or ORM entity) to a dict of the given fields"""
+    return {name: _json_value(getattr(row, name, None)) for name in fields}
+
+
+def project_record(record: dict, fields: Iterable[str]) -> dict:
+    """Project an already serialized record (e.g. a workflow search result)"""
+    return {name: record.get(name) for name in fields}
@@ -0,0 +1,140 @@
+"""
+Shared read queries for the API
+Core select statements plus async fetch helpers used by the FastAPI routes
+"""
+
+from typing import List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import DaycareCenter
+from database.projection import FIELD_PRESETS, projected_columns
+
+ACTIVE_STATUS = "정상"
+
+
+def district_counts_statement(limit: int = None):
+    """Active daycare count per district, largest first"""
+    count = func.count(DaycareCenter.id).label("count")
+    statement = (
+        select(DaycareCenter.sigunname, count)
+        .where(DaycareCenter.crstatusname == ACTIVE_STATUS)
+        .group_by(DaycareCenter.sigunname)
+        .order_by(count.desc())
+    )
+    return statement.limit(limit) if limit else statement
+
+
+def type_counts_statement():
+    """Active daycare count per type, largest first"""
+    count = func.count(DaycareCenter.id).label("count")
+    return (
+        select(DaycareCenter.crtypename, count)
+        .where(DaycareCenter.crstatusname == ACTIVE_STATUS)
+        .group_by(DaycareCenter.crtypename)
+        .order_by(count.desc())
+    )
+
+
+def active_count_statement():
+    """Total number of active daycare centers"""
+    return select(func.count(DaycareCenter.id)).where(
+        DaycareCenter.crstatusname == ACTIVE_STATUS
+    )
+
+
+def detail_statement(stcode: str, fields: List[str] = None):
+    """Single daycare center by code (only the projected columns)"""
+    columns = projected_columns(fields or FIELD_PRESETS["full"])
+    return select(*columns).where(DaycareCenter.stcode == stcode).limit(1)
+
+
+def compare_statement(stcodes: List[str], fields: List[str] = None):
+    """Daycare centers for a list of codes (only the projected columns)"""
+    columns = projected_columns(fields or FIELD_PRESETS["full"])
+    return select(*columns).where(DaycareCenter.stcode.in_(stcodes))
+
+
+def vacancy_score_expression(vacancy_columns: List[str]):
+    """Estimated spare places summed over the given vacancy columns (NULL counts as 0)"""
+    score = None
+    for name in vacancy_columns:
+        term = func.coalesce(DaycareCenter.__table__.c[name], 0)
+        score = term if score is None else score + term
+    return score
+
+
+def vacancy_statement(
+    vacancy_columns: List[str],
+    conditions: list = None,
+    min_vacancy: int = 1,
+    limit: int = 20,
+    fields: List[str] = None,
+):
+    """
+    Centers most likely to have a place for the given ages, most spare places first
+
+    Args:
+        vacancy_columns: vacancy_* columns of the requested ages
+        conditions: Extra WHERE conditions (e.g. build_filter_conditions())
+        min_vacancy: Minimum summed estimate
+        limit: Maximum rows
+        fields: Projected fields (default: vacancy preset)
+    """
+    score = vacancy_score_expression(vacancy_columns).label("vacancy")
+    columns = projected_columns(fields or FIELD_PRESETS["vacancy"])
+    return (
+        select(*columns, score)
+        .where(DaycareCenter.crstatusname == ACTIVE_STATUS, *(conditions or []))
+        .where(score >= min_vacancy)
+        .order_by(score.desc(), DaycareCenter.id)
+        .limit(limit)
+    )
+
+
+def _name_counts(rows) -> List[dict]:
+    return [{"name": name, "count": count} for name, count in rows if name]
+
+
+async def fetch_districts(session: AsyncSession) -> List[dict]:
+    """List districts with active daycare counts"""
+    result = await session.execute(district_counts_statement())
+    return _name_counts(result.all())
+
+
+async def fetch_types(session: AsyncSession) -> List[dict]:
+    """List daycare types with active daycare counts"""
+    result = await session.execute(type_counts_statement())
+    return _name_counts(result.all())
+
+
+async def fetch_statistics(session: AsyncSession) -> dict:
+    """Overall statistics: total, top 10 districts, all types"""
+    total = (await session.execute(active_count_statement())).scalar() or 0
+    by_district = (await session.execute(district_counts_statement(limit=10))).all()
+    by_type = (await session.execute(type_counts_statement())).all()
+
+    return {
+        "total": total,
+        "by_district": [{"name": d[0], "count": d[1]} for d in by_district],
+        "by_type": [{"name": t[0], "count": t[1]} for t in by_type],
+    }
+
+
+async def fetch_daycare(session: AsyncSession, stcode: str, fields: List[str] = None):
+    """Get one daycare center row with the given fields (None if not found)"""
+    result = await session.execute(detail_statement(stcode, fields))
+    return result.first()
+
+
+async def fetch_vacancies(session: AsyncSession, vacancy_columns: List[str], **options) -> list:
+    """Get vacancy_statement() rows (options as in vacancy_statement)"""
+    result = await session.execute(vacancy_statement(vacancy_columns, **options))
+    return list(result.all())
+
+
+async def fetch_daycares(session: AsyncSession, stcodes: List[str], fields: List[str] = None):
+    """Get daycare center rows with the given fields for a list of codes"""
+    result = await session.execute(compare_statement(stcodes, fields))
+    return list(result.all())
@@ -0,0 +1,305 @@
+"""
+Slow-query Log
+Engine instrumentation that times every statement, aggregates by fingerprint
+and captures EXPLAIN QUERY PLAN for statements over a threshold
+"""
+
+import hashlib
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+
+# Statement kinds SQLite can EXPLAIN without side effects
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\([^)]*\))(?:\s*,\s*\([^)]*\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_MAX_PARAMETER_CHARS = 80
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so executions that differ only in values group together
+
+    Literals become ?, IN lists and multi-row VALUES collapse to one
+    placeholder group, whitespace is collapsed.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _IN_LIST.sub("(?+)", normalized)
+    return _VALUES_LIST.sub(r"\1, ...", normalized)
+
+
+def fingerprint_id(normalized: str) -> str:
+    """Short stable id of a fingerprint (for URLs and log lines)"""
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return repr(value)
+    text = str(value)
+    if len(text) > _MAX_PARAMETER_CHARS:
+        text = text[:_MAX_PARAMETER_CHARS] + "..."
+    return "'" + text.replace("'", "''") + "'"
+
+
+def bind_parameters(statement: str, parameters) -> str:
+    """Inline qmark parameters into a statement for display (not for execution)"""
+    if not parameters or not isinstance(parameters, (list, tuple)):
+        return statement
+    values = iter(parameters)
+
+    def substitute(match):
+        try:
+            return _literal(next(values))
+        except StopIteration:
+            return match.group(0)
+
+    # Skip ? inside string literals
+    parts = re.split(r"('(?:[^']|'')*')", statement)
+    return "".join(
+        part if part.startswith("'") else re.sub(r"\?", substitute, part) for part in parts
+    )
+
+
+def plan_flags(plan: List[str]) -> List[str]:
+    """Problems visible in an EXPLAIN QUERY PLAN (full scans, temp b-trees)"""
+    flags = []
+    for detail in plan:
+        if detail.startswith("SCAN ") and "USING" not in detail and "VIRTUAL TABLE" not in detail:
+            flags.append(f"full_scan:{detail[5:].split()[0]}")
+        if "USE TEMP B-TREE" in detail:
+            flags.append("temp_btree")
+        if "LIST SUBQUERY" in detail:
+            flags.append("list_subquery")
+    return sorted(set(flags))
+
+
+class SlowQueryLog:
+    """
+    Thread-safe statement statistics keyed by fingerprint
+
+    Every statement updates count/total/max for its fingerprint; statements
+    at or above threshold_ms also count as slow and keep the bound SQL and
+    query plan of the slowest execution seen.
+    """
+
+    def __init__(self, threshold_ms: float = 50.0, max_fingerprints: int = 500, explain: bool = True):
+        self.threshold_ms = threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self.explain = explain
+        self._entries: Dict[str, dict] = {}
+        self._explaining = set()  # fingerprints whose plan is being captured
+        self._lock = threading.Lock()
+        self.statements = 0
+        self.total_ms = 0.0
+        self.dropped = 0
+        self.started_at = datetime.utcnow()
+
+    def record(self, statement: str, parameters, elapsed_ms: float, explain_fn=None):
+        """
+        Account one executed statement
+
+        Args:
+            statement: SQL text as sent to the driver
+            parameters: Driver parameters (tuple, or list of tuples for executemany)
+            elapsed_ms: Execution time
+            explain_fn: Callable returning the query plan rows, used only for
+                new slowest executions
+        """
+        normalized = fingerprint(statement)
+        slow = elapsed_ms >= self.threshold_ms
+
+        with self._lock:
+            self.statements += 1
+            self.total_ms += elapsed_ms
+
+            entry = self._entries.get(normalized)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    self.dropped += 1
+                    return
+                entry = self._entries[normalized] = {
+                    "id": fingerprint_id(normalized),
+                    "fingerprint": normalized,
+                    "count": 0,
+                    "slow_count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "slowest_sql": None,
+                    "plan": None,
+                    "flags": [],
+                    "last_seen": None,
+                }
+
+            slowest = slow and elapsed_ms >= entry["max_ms"]
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_seen"] = datetime.utcnow().isoformat()
+            if slow:
+                entry["slow_count"] += 1
+            if not slowest:
+                return
+            entry["slowest_sql"] = bind_parameters(statement, parameters)
+
+            # Captured once per fingerprint since values rarely change the plan;
+            # claimed under the lock so concurrent slow executions explain once
+            if not self.explain or explain_fn is None or entry["plan"] is not None:
+                return
+            if normalized in self._explaining:
+                return
+            self._explaining.add(normalized)
+
+        # Plan outside the lock (runs another statement on the connection)
+        try:
+            plan = explain_fn()
+        except Exception as e:
+            plan = [f"EXPLAIN failed: {e}"]
+        with self._lock:
+            entry["plan"] = plan
+            entry["flags"] = plan_flags(plan)
+            self._explaining.discard(normalized)
+
+    def report(self, limit: int = 20, sort: str = "total_ms", slow_only: bool = True) -> dict:
+        """
+        Aggregated statistics, worst fingerprints first
+
+        Args:
+            limit: Maximum fingerprints returned
+            sort: total_ms, max_ms, count or slow_count
+            slow_only: Only fingerprints with at least one slow execution
+
+        Raises:
+            ValueError: If sort is not a known key
+        """
+        if sort not in ("total_ms", "max_ms", "count", "slow_count"):
+            raise ValueError(f"Unknown sort key '{sort}'")
+
+        with self._lock:
+            entries = [
+                {
+                    **entry,
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 3),
+                    "total_ms": round(entry["total_ms"], 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                }
+                for entry in self._entries.values()
+                if entry["slow_count"] or not slow_only
+            ]
+            summary = {
+                "since": self.started_at.isoformat(),
+                "threshold_ms": self.threshold_ms,
+                "statements": self.statements,
+                "total_ms": round(self.total_ms, 3),
+                "fingerprints": len(self._entries),
+                "dropped": self.dropped,
+            }
+
+        entries.sort(key=lambda e: e[sort], reverse=True)
+        return {**summary, "queries": entries[:limit]}
+
+    def reset(self):
+        """Forget all statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._explaining.clear()
+            self.statements = 0
+            self.total_ms = 0.0
+            self.dropped = 0
+            self.started_at = datetime.utcnow()
+
+
+# Shared log for every instrumented engine in the process
+_query_log: Optional[SlowQueryLog] = None
+_query_log_lock = threading.Lock()
+
+
+def get_query_log() -> SlowQueryLog:
+    """Return the process-wide slow-query log (configured from settings)"""
+    global _query_log
+
+    if _query_log is None:
+        with _query_log_lock:
+            if _query_log is None:
+                _query_log = SlowQueryLog(
+                    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+                    max_fingerprints=settings.SLOW_QUERY_MAX_FINGERPRINTS,
+                    explain=settings.SLOW_QUERY_EXPLAIN,
+                )
+    return _query_log
+
+
+def _explain(connection, statement: str, parameters) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines, run on the statement's own connection"""
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine: Engine, query_log: SlowQueryLog = None) -> Engine:
+    """
+    Time every statement executed on an engine
+
+    Pass engine.sync_engine for async engines.
+
+    Args:
+        engine: Sync SQLAlchemy engine
+        query_log: Log to record into (default: process-wide log)
+
+    Returns:
+        The same engine
+    """
+    if query_log is None:
+        query_log = get_query_log()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        started = connection.info["query_started"].pop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        explain_fn = None
+        if not executemany and statement.lstrip().upper().startswith(_EXPLAINABLE):
+            explain_fn = lambda: _explain(connection, statement, parameters)  # noqa: E731
+
+        query_log.record(
+            statement,
+            parameters[0] if executemany and parameters else parameters,
+            elapsed_ms,
+            explain_fn,
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+    return engine
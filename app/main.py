@@ -3,17 +3,37 @@ FastAPI Main Application
 Seoul Daycare Search & Recommendation AI Service
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from config import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load the columnar snapshot so the first search does not pay for it;
+    close the pooled OpenAI connections on shutdown
+    """
+    from services.openai_clients import aclose_openai_clients, close_openai_clients
+    from services.snapshot import get_snapshot
+
+    await asyncio.to_thread(get_snapshot)
+    yield
+    await aclose_openai_clients()
+    close_openai_clients()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Seoul Daycare Search AI",
     description="AI-powered daycare search and recommendation service for Seoul",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -1,5 +1,12 @@
 """Services package"""
-from .embeddings import EmbeddingService
-from .vector_store import VectorStoreService, get_vector_store
+from .embeddings import EmbeddingService, HashingEmbeddingService, create_embedding_service
+from .vector_store import PartitionedVectorStore, VectorStoreService, get_vector_store
 
-__all__ = ["EmbeddingService", "VectorStoreService", "get_vector_store"]
+__all__ = [
+    "EmbeddingService",
+    "HashingEmbeddingService",
+    "create_embedding_service",
+    "PartitionedVectorStore",
+    "VectorStoreService",
+    "get_vector_store",
+]
@@ -0,0 +1,190 @@
+"""
+Query Analysis Cache
+Bounded TTL cache of LLM analyzer results keyed on a canonical form of the
+query (NFC, particles stripped, synonyms mapped to one spelling, spacing
+ignored) plus the analyzer prompt version, with hit-rate and saved-latency
+statistics
+"""
+
+import copy
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+from services.rule_analyzer import (
+    AGE_VARIANTS,
+    CCTV_VARIANTS,
+    DISTRICT_VARIANTS,
+    PLAYGROUND_VARIANTS,
+    SERVICE_VARIANTS,
+    TYPE_VARIANTS,
+    VACANCY_VARIANTS,
+    VEHICLE_VARIANTS,
+    strip_particle,
+    tokenize_query,
+)
+from utils.prompts import QUERY_ANALYZER_PROMPT
+
+# 동의어 -> 대표 표기 (rule analyzer 사전의 변형을 그대로 사용)
+SYNONYMS: Dict[str, str] = {
+    variant.replace(" ", ""): canonical
+    for variants in (DISTRICT_VARIANTS, TYPE_VARIANTS, AGE_VARIANTS, SERVICE_VARIANTS)
+    for canonical, names in variants.items()
+    for variant in names
+}
+SYNONYMS.update(
+    {
+        variant: canonical
+        for canonical, names in [
+            ("놀이터", PLAYGROUND_VARIANTS),
+            ("cctv", CCTV_VARIANTS),
+            ("통학차량", VEHICLE_VARIANTS),
+            ("빈자리", VACANCY_VARIANTS),
+        ]
+        for variant in names
+    }
+)
+
+# Words split off a token before lookup ("국립어린이집" -> "국립" + "어린이집")
+_HEAD_NOUNS = ("어린이집",)
+
+# Changes whenever the analyzer prompt does, so cached answers of an old
+# prompt are never served
+PROMPT_VERSION = hashlib.sha1(QUERY_ANALYZER_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+
+def _canonical_words(token: str):
+    stem = strip_particle(token)
+    for noun in _HEAD_NOUNS:
+        if stem.endswith(noun) and len(stem) > len(noun):
+            yield SYNONYMS.get(stem[: -len(noun)], stem[: -len(noun)])
+            yield noun
+            return
+    yield SYNONYMS.get(stem, stem)
+
+
+def canonicalize_query(query: str) -> str:
+    """
+    Canonical form of a query for exact-match caching
+
+    NFC + lower-case, particles stripped, dictionary synonyms mapped to the
+    canonical spelling (국립 -> 국공립, 강남 -> 강남구), and spacing removed, so
+    "강남구 국공립 어린이집 추천해줘" and "강남구  국공립어린이집 추천 해줘" share a key.
+    """
+    return "".join(word for token in tokenize_query(query) for word in _canonical_words(token))
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU cache with per-entry expiry
+
+    Each entry remembers how long the LLM call took, so hits can report the
+    latency they saved.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.saved_ms = 0.0
+        self.started_at = datetime.utcnow()
+
+    @staticmethod
+    def key(query: str) -> Tuple[str, str]:
+        return canonicalize_query(query), PROMPT_VERSION
+
+    def get(self, query: str) -> Optional[dict]:
+        """Cached analysis of a query (None on a miss or an expired entry)"""
+        key = self.key(query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_ms += entry[1]
+            return copy.deepcopy(entry[2])
+
+    def put(self, query: str, result: dict, elapsed_ms: float):
+        """
+        Cache an analysis
+
+        Args:
+            query: User query
+            result: Parsed analyzer answer (search_intent, filters, keywords)
+            elapsed_ms: Time the analysis took (reported as saved on hits)
+        """
+        key = self.key(query)
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl_seconds
+            self._entries[key] = (expires_at, elapsed_ms, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def report(self) -> dict:
+        """Hit rate, saved latency and size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "since": self.started_at.isoformat(),
+                "prompt_version": PROMPT_VERSION,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "lookups": lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "saved_ms": round(self.saved_ms, 3),
+                "avg_saved_ms": round(self.saved_ms / self.hits, 3) if self.hits else None,
+            }
+
+    def reset(self):
+        """Drop all entries and statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.reset_stats()
+
+
+# Shared cache for the analyzer nodes in the process
+_analysis_cache: Optional[AnalysisCache] = None
+_analysis_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Return the process-wide analysis cache (configured from settings)"""
+    global _analysis_cache
+
+    if _analysis_cache is None:
+        with _analysis_cache_lock:
+            if _analysis_cache is None:
+                _analysis_cache = AnalysisCache(
+                    max_entries=settings.ANALYZER_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.ANALYZER_CACHE_TTL_SECONDS,
+                )
+    return _analysis_cache
@@ -0,0 +1,193 @@
+"""
+District Graph
+District centroids from center coordinates and a cached nearest-district
+graph used to widen thin district searches
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from database import DaycareCenter, DistrictCentroid, get_session, get_data_version
+
+ACTIVE_STATUS = "정상"
+EARTH_RADIUS_KM = 6371.0
+
+# Coordinates outside Korea are data errors (swapped or zero la/lo)
+_LATITUDE_RANGE = (33.0, 39.0)
+_LONGITUDE_RANGE = (124.0, 132.0)
+
+_SOURCE_COLUMNS = ["district_code", "region_code", "sigunname", "la", "lo"]
+
+
+def compute_district_centroids(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Median coordinates of the centers of each district
+
+    The median keeps a few mis-geocoded centers from dragging a centroid
+    into the next district.
+
+    Args:
+        frame: DaycareCenter columns (at least _SOURCE_COLUMNS)
+
+    Returns:
+        DataFrame with DistrictCentroid columns
+    """
+    values = frame.reindex(columns=_SOURCE_COLUMNS)
+    la = pd.to_numeric(values["la"], errors="coerce")
+    lo = pd.to_numeric(values["lo"], errors="coerce")
+    valid = (
+        values["district_code"].notna()
+        & la.between(*_LATITUDE_RANGE)
+        & lo.between(*_LONGITUDE_RANGE)
+    )
+    values = values[valid].assign(la=la[valid], lo=lo[valid])
+
+    groups = values.groupby("district_code", sort=True)
+    centroids = groups.agg(
+        region_code=("region_code", "first"),
+        sigunname=("sigunname", lambda names: names.mode().iat[0] if names.notna().any() else None),
+        la=("la", "median"),
+        lo=("lo", "median"),
+        center_count=("la", "size"),
+    )
+    return centroids.reset_index()
+
+
+def refresh_district_centroids(session: Session) -> int:
+    """
+    Recompute the district_centroids table from active centers (caller commits)
+
+    Returns:
+        Number of districts written
+    """
+    columns = [getattr(DaycareCenter, name) for name in _SOURCE_COLUMNS]
+    rows = session.execute(select(*columns).where(DaycareCenter.crstatusname == ACTIVE_STATUS)).all()
+    centroids = compute_district_centroids(pd.DataFrame.from_records(rows, columns=_SOURCE_COLUMNS))
+    records = centroids.astype(object).where(centroids.notna(), None).to_dict("records")
+
+    session.execute(delete(DistrictCentroid))
+    if records:
+        session.execute(insert(DistrictCentroid), records)
+    return len(records)
+
+
+def haversine_km(la1, lo1, la2, lo2) -> np.ndarray:
+    """Great-circle distance in km (broadcasts over arrays)"""
+    la1, lo1, la2, lo2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (la1, lo1, la2, lo2))
+    a = np.sin((la2 - la1) / 2) ** 2 + np.cos(la1) * np.cos(la2) * np.sin((lo2 - lo1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class DistrictGraph:
+    """
+    Complete district graph weighted by centroid distance
+
+    Built once per data version; each district's neighbours are pre-sorted
+    by distance, so a lookup is a slice of a row.
+    """
+
+    def __init__(self, centroids: pd.DataFrame, data_version: int = 0):
+        self.data_version = data_version
+        centroids = centroids.reset_index(drop=True)
+        self.codes = centroids["district_code"].astype(str).tolist()
+        self.names = centroids["sigunname"].tolist()
+        self.regions = centroids["region_code"].tolist()
+        self.index = {code: i for i, code in enumerate(self.codes)}
+
+        la = centroids["la"].to_numpy(dtype=np.float64)
+        lo = centroids["lo"].to_numpy(dtype=np.float64)
+        self.distances = haversine_km(la[:, None], lo[:, None], la[None, :], lo[None, :])
+        np.fill_diagonal(self.distances, np.inf)
+        self.order = np.argsort(self.distances, axis=1, kind="stable")
+
+    @classmethod
+    def load(cls, session: Session) -> "DistrictGraph":
+        """Read the stored centroids (computed from the centers if the table is empty)"""
+        columns = [getattr(DistrictCentroid, name) for name in _SOURCE_COLUMNS]
+        rows = session.execute(select(*columns)).all()
+        if rows:
+            centroids = pd.DataFrame.from_records(rows, columns=_SOURCE_COLUMNS)
+        else:
+            source = [getattr(DaycareCenter, name) for name in _SOURCE_COLUMNS]
+            rows = session.execute(select(*source).where(DaycareCenter.crstatusname == ACTIVE_STATUS)).all()
+            centroids = compute_district_centroids(pd.DataFrame.from_records(rows, columns=_SOURCE_COLUMNS))
+        return cls(centroids, get_data_version(session))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code_for(self, district: str, region_code: str = None) -> Optional[str]:
+        """District code for a name ("해운대구"), None if unknown or ambiguous across regions"""
+        matches = [
+            code
+            for code, name, region in zip(self.codes, self.names, self.regions)
+            if name == district and (region_code is None or region == region_code)
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+    def name(self, code: str) -> Optional[str]:
+        i = self.index.get(code)
+        return None if i is None else self.names[i]
+
+    def neighbors(self, code: str, limit: int = None, max_km: float = None) -> List[Tuple[str, str, float]]:
+        """
+        Nearest districts of a district, closest first
+
+        Args:
+            code: District code
+            limit: Maximum neighbours
+            max_km: Centroid distance limit
+
+        Returns:
+            List of (district_code, sigunname, distance_km)
+        """
+        i = self.index.get(code)
+        if i is None:
+            return []
+
+        neighbors = []
+        for j in self.order[i][: len(self.codes) - 1]:
+            distance = float(self.distances[i, j])
+            if max_km is not None and distance > max_km:
+                break
+            neighbors.append((self.codes[j], self.names[j], distance))
+            if limit is not None and len(neighbors) >= limit:
+                break
+        return neighbors
+
+
+# Global graph cache
+_graph: Optional[DistrictGraph] = None
+
+
+def get_district_graph(session: Session = None) -> DistrictGraph:
+    """
+    Get the cached graph, rebuilding it when the data version changes
+
+    Args:
+        session: Optional database session (a new one is opened if omitted)
+    """
+    global _graph
+
+    own_session = session is None
+    if own_session:
+        session = get_session()
+
+    try:
+        version = get_data_version(session)
+        if _graph is None or _graph.data_version != version:
+            _graph = DistrictGraph.load(session)
+        return _graph
+    except Exception as e:
+        print(f"[WARN]  District graph unavailable: {e}")
+        return DistrictGraph(pd.DataFrame(columns=_SOURCE_COLUMNS))
+    finally:
+        if own_session:
+            session.close()
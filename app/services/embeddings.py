@@ -1,44 +1,41 @@
 """
 OpenAI Embedding Service
-Handles text embedding generation using Azure OpenAI
+Handles text embedding generation using Azure OpenAI, or an offline hashing
+backend for synthetic data and load tests
 """
 
+import hashlib
 import sys
 from pathlib import Path
 from typing import List
 import numpy as np
-from openai import OpenAI, AzureOpenAI
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import settings
+from services.openai_clients import CALL_EMBEDDING, embedding_model, get_openai_client, use_azure
 
 
 class EmbeddingService:
     """Service for generating text embeddings using OpenAI or Azure OpenAI"""
 
+    backend = "openai"
+
     def __init__(self):
-        """Initialize OpenAI client (OpenAI or Azure)"""
-        # Check if using regular OpenAI or Azure OpenAI
-        if settings.OPENAI_API_KEY:
-            # Use regular OpenAI
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            self.model = settings.OPENAI_EMBEDDING_MODEL
-            self.use_azure = False
-        elif settings.AOAI_API_KEY:
-            # Use Azure OpenAI
-            self.client = AzureOpenAI(
-                api_key=settings.AOAI_API_KEY,
-                api_version=settings.AOAI_API_VERSION,
-                azure_endpoint=settings.AOAI_ENDPOINT,
-            )
-            self.model = settings.AOAI_EMBEDDING_DEPLOYMENT
-            self.use_azure = True
-        else:
+        """Use the shared pooled OpenAI client (OpenAI or Azure)"""
+        if not (settings.OPENAI_API_KEY or settings.AOAI_API_KEY):
             raise ValueError("Either OPENAI_API_KEY or AOAI_API_KEY must be set in .env file")
 
+        self.client = get_openai_client(CALL_EMBEDDING)
+        self.model = embedding_model()
+        self.use_azure = use_azure()
         self.dimension = settings.EMBEDDING_DIMENSION
 
+    @property
+    def async_client(self):
+        """Shared async client (its pool is only opened by async callers)"""
+        return get_openai_client(CALL_EMBEDDING, asynchronous=True)
+
     def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text
@@ -64,6 +61,21 @@ class EmbeddingService:
             print(f"[WARN]  Embedding error for text '{text[:50]}...': {e}")
             return np.zeros(self.dimension)
 
+    async def aembed_text(self, text: str) -> np.ndarray:
+        """Async variant of embed_text (awaits the API without blocking the event loop)"""
+        if not text or not text.strip():
+            return np.zeros(self.dimension)
+
+        try:
+            response = await self.async_client.embeddings.create(
+                input=text, model=self.model
+            )
+            return np.array(response.data[0].embedding, dtype=np.float32)
+
+        except Exception as e:
+            print(f"[WARN]  Embedding error for text '{text[:50]}...': {e}")
+            return np.zeros(self.dimension)
+
     def embed_batch(self, texts: List[str], batch_size: int = None) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batches
@@ -113,6 +125,54 @@ class EmbeddingService:
         return np.array(embeddings, dtype=np.float32)
 
 
+class HashingEmbeddingService:
+    """
+    Offline embedding backend: hashed character n-grams
+
+    Texts sharing n-grams (names, districts, types, services) land close
+    together, which is enough to exercise indexes and retrieval at scale
+    without API calls. Same interface as EmbeddingService.
+    """
+
+    backend = "hashing"
+
+    def __init__(self, dimension: int = None, ngram_sizes=(2, 3)):
+        self.dimension = dimension or settings.EMBEDDING_DIMENSION
+        self.ngram_sizes = ngram_sizes
+        self.model = f"hashing-{self.dimension}"
+
+    def _bucket(self, gram: str) -> int:
+        digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.dimension
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """L2-normalized n-gram count vector of shape (dimension,)"""
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in (text or "").split():
+            for size in self.ngram_sizes:
+                for start in range(max(len(token) - size + 1, 1)):
+                    vector[self._bucket(token[start : start + size])] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def aembed_text(self, text: str) -> np.ndarray:
+        """Same as embed_text (local and cheap, nothing to await)"""
+        return self.embed_text(text)
+
+    def embed_batch(self, texts: List[str], batch_size: int = None) -> np.ndarray:
+        """Embeddings of shape (len(texts), dimension)"""
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.stack([self.embed_text(text) for text in texts])
+
+
+def create_embedding_service():
+    """Embedding service for the configured EMBEDDING_BACKEND (openai or hashing)"""
+    if settings.EMBEDDING_BACKEND == "hashing":
+        return HashingEmbeddingService()
+    return EmbeddingService()
+
+
 if __name__ == "__main__":
     # Test embedding service
     print("Testing EmbeddingService...")
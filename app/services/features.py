@@ -0,0 +1,221 @@
+"""
+Quality and Staffing Features
+Vectorized per-center indicators with district percentiles and a weighted
+ranking score
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+from database import DaycareCenter, DaycareFeatures
+
+ACTIVE_STATUS = "정상"
+
+# Ranking feature -> (indicator column, percentile column, lower is better)
+FEATURES = {
+    "staffing": ("children_per_teacher", "staffing_pct", True),
+    "space": ("room_area_per_child", "space_pct", False),
+    "tenure": ("long_tenure_share", "tenure_pct", False),
+    "occupancy": ("occupancy_rate", "occupancy_pct", False),
+    "cctv": ("cctv_per_room", "cctv_pct", False),
+}
+# Percentile assumed for centers missing an indicator (district median)
+NEUTRAL_PERCENTILE = 0.5
+
+_SOURCE_COLUMNS = [
+    "stcode",
+    "district_code",
+    "crcapat",
+    "crchcnt",
+    "nrtrroomcnt",
+    "nrtrroomsize",
+    "cctvinstlcnt",
+    "em_cnt_a2",
+    "em_cnt_0y",
+    "em_cnt_1y",
+    "em_cnt_2y",
+    "em_cnt_4y",
+    "em_cnt_6y",
+]
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """numerator / denominator, NaN where the denominator is missing or zero"""
+    return numerator / denominator.where(denominator > 0)
+
+
+def compute_features(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute indicators and district percentiles for active centers
+
+    - children_per_teacher: 현원 / 보육교사 (lower is better)
+    - room_area_per_child: 보육실면적 / 현원
+    - long_tenure_share: 근속 4년 이상 / 근속 인원 합계
+    - occupancy_rate: 현원 / 정원 (demand signal)
+    - cctv_per_room: CCTV / 보육실수
+
+    Percentiles are ranks within the center's district_code, oriented so
+    that 1.0 is the best center of the district; missing indicators stay NaN.
+
+    Args:
+        frame: DaycareCenter columns (at least _SOURCE_COLUMNS)
+
+    Returns:
+        DataFrame with DaycareFeatures columns
+    """
+    values = frame.reindex(columns=_SOURCE_COLUMNS)
+    numbers = values.drop(columns=["stcode", "district_code"]).apply(pd.to_numeric, errors="coerce")
+
+    tenure = numbers[["em_cnt_0y", "em_cnt_1y", "em_cnt_2y", "em_cnt_4y", "em_cnt_6y"]]
+    long_tenure = numbers["em_cnt_4y"].fillna(0) + numbers["em_cnt_6y"].fillna(0)
+
+    features = pd.DataFrame(
+        {
+            "stcode": values["stcode"],
+            "district_code": values["district_code"],
+            "children_per_teacher": _ratio(numbers["crchcnt"], numbers["em_cnt_a2"]),
+            "room_area_per_child": _ratio(numbers["nrtrroomsize"], numbers["crchcnt"]),
+            "long_tenure_share": _ratio(long_tenure, tenure.sum(axis=1, min_count=1)),
+            "occupancy_rate": _ratio(numbers["crchcnt"], numbers["crcapat"]),
+            "cctv_per_room": _ratio(numbers["cctvinstlcnt"], numbers["nrtrroomcnt"]),
+        }
+    )
+
+    groups = features.groupby(features["district_code"].fillna(""), sort=False)
+    for indicator, percentile, lower_is_better in FEATURES.values():
+        features[percentile] = groups[indicator].rank(pct=True, ascending=not lower_is_better)
+
+    return features.replace([np.inf, -np.inf], np.nan)
+
+
+def refresh_feature_table(session: Session) -> int:
+    """
+    Recompute the daycare_features table for active centers (caller commits)
+
+    Returns:
+        Number of feature rows written
+    """
+    columns = [getattr(DaycareCenter, name) for name in _SOURCE_COLUMNS]
+    rows = session.execute(
+        select(*columns).where(DaycareCenter.crstatusname == ACTIVE_STATUS)
+    ).all()
+    frame = pd.DataFrame.from_records(rows, columns=_SOURCE_COLUMNS)
+
+    features = compute_features(frame)
+    records = features.astype(object).where(features.notna(), None).to_dict("records")
+
+    session.execute(delete(DaycareFeatures))
+    if records:
+        session.execute(insert(DaycareFeatures), records)
+    return len(records)
+
+
+def parse_ranking_weights(spec: str = None) -> Dict[str, float]:
+    """
+    Parse "staffing=0.3,space=0.2,..." into {feature: weight}
+
+    Args:
+        spec: Weight spec (default: RANKING_WEIGHTS setting)
+
+    Returns:
+        Non-zero weights normalized to sum to 1 ({} if all are zero)
+
+    Raises:
+        ValueError: If a feature is unknown or a weight is not a number
+    """
+    spec = settings.RANKING_WEIGHTS if spec is None else spec
+    weights = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        name = name.strip()
+        if name not in FEATURES:
+            raise ValueError(f"Unknown ranking feature '{name}' (available: {', '.join(FEATURES)})")
+        try:
+            weights[name] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid weight for '{name}': {value!r}") from None
+
+    total = sum(abs(w) for w in weights.values())
+    return {name: w / total for name, w in weights.items() if w} if total else {}
+
+
+def quality_score_expression(weights: Dict[str, float] = None):
+    """
+    SQL expression of the weighted percentile score (0~1) for an outer join
+    of daycare_centers with daycare_features
+
+    Centers without features score NEUTRAL_PERCENTILE on every feature.
+    """
+    weights = parse_ranking_weights() if weights is None else weights
+    if not weights:
+        return literal(NEUTRAL_PERCENTILE)
+
+    score = None
+    for name, weight in weights.items():
+        term = func.coalesce(getattr(DaycareFeatures, FEATURES[name][1]), NEUTRAL_PERCENTILE) * weight
+        score = term if score is None else score + term
+    return score
+
+
+def quality_scores(percentiles: Dict[str, np.ndarray], weights: Dict[str, float] = None) -> np.ndarray:
+    """
+    Weighted percentile scores for arrays of percentiles (NaN -> neutral)
+
+    Args:
+        percentiles: {percentile column: float array}, all the same length
+        weights: Feature weights (default: RANKING_WEIGHTS setting)
+    """
+    weights = parse_ranking_weights() if weights is None else weights
+    size = len(next(iter(percentiles.values()))) if percentiles else 0
+    if not weights:
+        return np.full(size, NEUTRAL_PERCENTILE)
+
+    score = np.zeros(size)
+    for name, weight in weights.items():
+        values = percentiles.get(FEATURES[name][1], np.full(size, np.nan))
+        score += np.where(np.isnan(values), NEUTRAL_PERCENTILE, values) * weight
+    return score
+
+
+def blend_with_relevance(
+    relevance_order: list, quality: Dict[str, float], weight: float = None, depth: int = None
+) -> list:
+    """
+    Reorder the most relevant stcodes by relevance blended with quality
+
+    Within the first depth items relevance falls linearly from 1 to 0 and the
+    final score is (1 - weight) * relevance + weight * quality; items beyond
+    depth keep their relevance order, so weak matches never jump ahead on
+    quality alone.
+
+    Args:
+        relevance_order: stcodes, most relevant first
+        quality: stcode -> quality score (missing = neutral)
+        weight: Share of quality in the final score (default: RANKING_QUALITY_WEIGHT)
+        depth: Items re-ordered (default: RANKING_RERANK_DEPTH)
+
+    Returns:
+        stcodes, best first (ties keep relevance order)
+    """
+    weight = settings.RANKING_QUALITY_WEIGHT if weight is None else weight
+    depth = settings.RANKING_RERANK_DEPTH if depth is None else depth
+    if weight <= 0 or not relevance_order:
+        return list(relevance_order)
+
+    head, tail = list(relevance_order[:depth]), list(relevance_order[depth:])
+    scored = [
+        ((1 - weight) * (1 - i / len(head)) + weight * quality.get(stcode, NEUTRAL_PERCENTILE), -i, stcode)
+        for i, stcode in enumerate(head)
+    ]
+    scored.sort(reverse=True)
+    return [stcode for _, _, stcode in scored] + tail
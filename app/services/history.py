@@ -0,0 +1,281 @@
+"""
+History Store
+Per-center change history as column deltas with periodic keyframes
+"""
+
+import json
+import re
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+from database import DaycareCenter, DaycareHistory, get_engine
+from services.ingest import HASH_COLUMNS
+
+# Columns tracked over time (raw values; dump bookkeeping dates excluded)
+TRACKED_COLUMNS = [column for column in HASH_COLUMNS if column != "stcode"]
+
+_IN_CHUNK = 500
+_DIGITS = re.compile(r"\D")
+
+
+@dataclass
+class HistoryReport:
+    """Entries written by one record_history() call"""
+
+    keyframes: int = 0
+    deltas: int = 0
+    unchanged: int = 0
+
+    def to_dict(self) -> dict:
+        return {"keyframes": self.keyframes, "deltas": self.deltas, "unchanged": self.unchanged}
+
+
+def normalize_date(value) -> Optional[str]:
+    """'20240115', '2024-01-15', '2024.01.15 10:00' -> '2024-01-15' (None if unparsable)"""
+    digits = _DIGITS.sub("", str(value or ""))[:8]
+    if len(digits) != 8:
+        return None
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+
+
+def _chunks(items: list, size: int = _IN_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def replay(entries) -> dict:
+    """Apply a keyframe and the deltas after it, oldest first"""
+    state: dict = {}
+    for entry in entries:
+        values = json.loads(entry.payload)
+        if entry.is_keyframe:
+            state = values
+        else:
+            state.update(values)
+    return state
+
+
+def _entries_since_last_keyframe(session: Session, stcodes: List[str]) -> Dict[str, list]:
+    """Latest keyframe and following deltas per center"""
+    last_keyframe = (
+        select(
+            DaycareHistory.stcode.label("stcode"),
+            func.max(DaycareHistory.data_version).label("data_version"),
+        )
+        .where(DaycareHistory.is_keyframe.is_(True))
+        .group_by(DaycareHistory.stcode)
+        .subquery()
+    )
+
+    chains: Dict[str, list] = {}
+    for chunk in _chunks(stcodes):
+        statement = (
+            select(DaycareHistory)
+            .join(last_keyframe, last_keyframe.c.stcode == DaycareHistory.stcode)
+            .where(
+                DaycareHistory.stcode.in_(chunk),
+                DaycareHistory.data_version >= last_keyframe.c.data_version,
+            )
+            .order_by(DaycareHistory.stcode, DaycareHistory.data_version, DaycareHistory.id)
+        )
+        for entry in session.scalars(statement):
+            chains.setdefault(entry.stcode, []).append(entry)
+    return chains
+
+
+def _current_rows(session: Session, stcodes: List[str]) -> Dict[str, dict]:
+    columns = [DaycareCenter.stcode, DaycareCenter.datastdrdt] + [
+        getattr(DaycareCenter, name) for name in TRACKED_COLUMNS
+    ]
+    rows = {}
+    for chunk in _chunks(stcodes):
+        for row in session.execute(select(*columns).where(DaycareCenter.stcode.in_(chunk))):
+            rows[row.stcode] = dict(row._mapping)
+    return rows
+
+
+def record_history(
+    stcodes: List[str] = None,
+    data_version: int = 0,
+    engine: Engine = None,
+    keyframe_interval: int = None,
+) -> HistoryReport:
+    """
+    Append the current state of centers to the history store
+
+    A center without history gets a keyframe (all tracked columns). Otherwise
+    only the columns that differ from its replayed last state are stored;
+    every keyframe_interval-th change is written as a keyframe again so that
+    reads replay a bounded chain.
+
+    Args:
+        stcodes: Centers to record (default: every center - use for bootstrap)
+        data_version: Data version the state belongs to
+        engine: SQLAlchemy engine (default: shared engine)
+        keyframe_interval: Deltas between keyframes (default from settings)
+
+    Returns:
+        HistoryReport
+    """
+    if engine is None:
+        engine = get_engine()
+    if keyframe_interval is None:
+        keyframe_interval = settings.HISTORY_KEYFRAME_INTERVAL
+
+    report = HistoryReport()
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+
+    with Session(engine) as session:
+        if stcodes is None:
+            stcodes = list(session.scalars(select(DaycareCenter.stcode)))
+        stcodes = sorted(set(stcodes))
+
+        current = _current_rows(session, stcodes)
+        chains = _entries_since_last_keyframe(session, list(current))
+
+        for stcode, row in current.items():
+            values = {name: row[name] for name in TRACKED_COLUMNS}
+            snapshot_date = normalize_date(row["datastdrdt"]) or today
+            chain = chains.get(stcode)
+
+            if chain and chain[-1].chain_length + 1 < keyframe_interval:
+                previous = replay(chain)
+                delta = {
+                    name: value for name, value in values.items() if previous.get(name) != value
+                }
+                if not delta:
+                    report.unchanged += 1
+                    continue
+                entry = DaycareHistory(
+                    is_keyframe=False,
+                    chain_length=chain[-1].chain_length + 1,
+                    payload=json.dumps(delta, ensure_ascii=False),
+                )
+                report.deltas += 1
+            else:
+                if chain and replay(chain) == values:
+                    report.unchanged += 1
+                    continue
+                entry = DaycareHistory(
+                    is_keyframe=True,
+                    chain_length=0,
+                    payload=json.dumps(values, ensure_ascii=False),
+                )
+                report.keyframes += 1
+
+            entry.stcode = stcode
+            entry.data_version = data_version
+            entry.snapshot_date = snapshot_date
+            session.add(entry)
+
+        session.commit()
+
+    return report
+
+
+def _entries_as_of(session: Session, stcode: str, date: str = None) -> list:
+    """History entries needed to rebuild a center's state as of a date"""
+    conditions = [DaycareHistory.stcode == stcode]
+    if date:
+        conditions.append(DaycareHistory.snapshot_date <= date)
+
+    keyframe_version = session.execute(
+        select(func.max(DaycareHistory.data_version)).where(
+            *conditions, DaycareHistory.is_keyframe.is_(True)
+        )
+    ).scalar()
+    if keyframe_version is None:
+        return []
+
+    statement = (
+        select(DaycareHistory)
+        .where(*conditions, DaycareHistory.data_version >= keyframe_version)
+        .order_by(DaycareHistory.data_version, DaycareHistory.id)
+    )
+    return list(session.scalars(statement))
+
+
+def state_as_of(session: Session, stcode: str, date: str = None) -> Optional[dict]:
+    """
+    Rebuild a center's tracked columns as of a date
+
+    Reads only the latest keyframe on or before the date and the deltas after it.
+
+    Args:
+        session: Database session
+        stcode: Daycare center code
+        date: YYYY-MM-DD (default: latest recorded state)
+
+    Returns:
+        {"stcode", "as_of", "data_version", "values"} or None if no history
+    """
+    entries = _entries_as_of(session, stcode, date)
+    if not entries:
+        return None
+    return {
+        "stcode": stcode,
+        "as_of": entries[-1].snapshot_date,
+        "data_version": entries[-1].data_version,
+        "values": replay(entries),
+    }
+
+
+def time_series(
+    session: Session,
+    stcode: str,
+    columns: List[str],
+    start: str = None,
+    end: str = None,
+) -> List[dict]:
+    """
+    Values of the given columns at every recorded change of a center
+
+    Args:
+        session: Database session
+        stcode: Daycare center code
+        columns: Tracked column names (e.g. ["crchcnt", "crcapat"])
+        start, end: Optional YYYY-MM-DD bounds on snapshot_date
+
+    Returns:
+        [{"date", "data_version", <column>: value, ...}] where a column changed
+
+    Raises:
+        ValueError: If a column is not tracked
+    """
+    unknown = [name for name in columns if name not in TRACKED_COLUMNS]
+    if unknown:
+        raise ValueError(f"Untracked column(s): {', '.join(unknown)}")
+
+    conditions = [DaycareHistory.stcode == stcode]
+    if end:
+        conditions.append(DaycareHistory.snapshot_date <= end)
+    entries = session.scalars(
+        select(DaycareHistory)
+        .where(*conditions)
+        .order_by(DaycareHistory.data_version, DaycareHistory.id)
+    )
+
+    points = []
+    state: dict = {}
+    previous = None
+    for entry in entries:
+        values = json.loads(entry.payload)
+        state = values if entry.is_keyframe else {**state, **values}
+        selected = {name: state.get(name) for name in columns}
+        in_range = not start or entry.snapshot_date >= start
+        # The first point in range carries the starting values
+        if in_range and (selected != previous or not points):
+            points.append(
+                {"date": entry.snapshot_date, "data_version": entry.data_version, **selected}
+            )
+        previous = selected
+    return points
@@ -0,0 +1,708 @@
+"""
+Bulk Ingest Service
+Streams raw daycare records from JSON and upserts them in columnar chunks
+"""
+
+import hashlib
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, Integer
+from sqlalchemy.engine import Engine
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+from database import DaycareCenter, get_engine
+from utils.address import (
+    DONG_IN_PARENTHESES_PATTERN,
+    DONG_TOKEN_PATTERN,
+    ROAD_PATTERN,
+    normalize_dong,
+)
+from utils.filters import (
+    AGE_CLASS_COLUMNS,
+    AGE_VACANCY_COLUMNS,
+    SEOUL_DISTRICT_CODES,
+    TYPE_CODES,
+    region_code_for,
+    service_mask_for,
+)
+
+# Columns computed at ingest time from the raw columns
+DERIVED_COLUMNS = [
+    "region_code",
+    "district_code",
+    "type_code",
+    "age_mask",
+    "service_mask",
+    "road_name",
+    "dong_name",
+    *AGE_VACANCY_COLUMNS.values(),
+]
+
+# Children per class by age (보육교사 1인당 법정 아동 수; one teacher per class)
+CLASS_CAPACITY = {"00": 3, "01": 5, "02": 7, "03": 15, "04": 20, "05": 20}
+# Mixed classes -> (ages they take, children per class)
+MIXED_CLASSES = {"m2": (["00", "01", "02"], 5), "m5": (["03", "04", "05"], 18)}
+
+# Raw columns derive_columns() reads
+DERIVED_SOURCE_COLUMNS = [
+    "stcode",
+    "sigunname",
+    "craddr",
+    "crtypename",
+    "crspec",
+    "crcapat",
+    "crchcnt",
+    *(f"class_cnt_{age}" for age in [*CLASS_CAPACITY, *MIXED_CLASSES]),
+    *(f"child_cnt_{age}" for age in [*CLASS_CAPACITY, *MIXED_CLASSES]),
+]
+
+# Hash of the raw record, compared by diff_ingest() to detect changes
+HASH_COLUMN = "content_hash"
+
+# Columns populated from raw records (everything except surrogate key, timestamps
+# and derived columns)
+_MANAGED_COLUMNS = {"id", "created_at", "updated_at", HASH_COLUMN, *DERIVED_COLUMNS}
+RAW_COLUMNS: List[str] = [
+    column.name
+    for column in DaycareCenter.__table__.columns
+    if column.name not in _MANAGED_COLUMNS
+]
+# Columns written by the upsert
+WRITE_COLUMNS = RAW_COLUMNS + DERIVED_COLUMNS + [HASH_COLUMN]
+INT_COLUMNS = [
+    c.name for c in DaycareCenter.__table__.columns
+    if c.name in RAW_COLUMNS and isinstance(c.type, Integer)
+]
+FLOAT_COLUMNS = [
+    c.name for c in DaycareCenter.__table__.columns
+    if c.name in RAW_COLUMNS and isinstance(c.type, Float)
+]
+STR_COLUMNS = [c for c in RAW_COLUMNS if c not in INT_COLUMNS and c not in FLOAT_COLUMNS]
+
+# Placeholder values the source uses for missing numbers/coordinates
+INVALID_FLOATS = (0.0, 37.566470, 126.977963)
+
+# Dump bookkeeping fields that change without the record changing
+_UNHASHED_COLUMNS = {"datastdrdt", "work_dttm"}
+HASH_COLUMNS = [c for c in RAW_COLUMNS if c not in _UNHASHED_COLUMNS]
+
+# Source fields of DaycareCenter.get_embedding_text()
+EMBEDDING_COLUMNS = ["crname", "craddr", "crtypename", "crspec"]
+
+ACTIVE_STATUS = "정상"
+CLOSED_STATUS = "폐지"
+
+_READ_SIZE = 1 << 20  # 1 MiB
+_DATA_ARRAY = re.compile(r'"DATA"\s*:\s*\[')
+_WHITESPACE = re.compile(r"[\s,]*")
+
+
+@dataclass
+class IngestReport:
+    """Summary of one ingest run"""
+
+    rows_read: int = 0
+    rows_written: int = 0
+    rows_invalid: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "rows_read": self.rows_read,
+            "rows_written": self.rows_written,
+            "rows_invalid": self.rows_invalid,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def iter_json_records(file_path: Path, read_size: int = _READ_SIZE) -> Iterator[dict]:
+    """
+    Stream records from a raw daycare dump without loading it into memory
+
+    Supported formats:
+    - {"DESCRIPTION": {...}, "DATA": [{...}, ...]}  (Seoul Open Data export)
+    - [{...}, ...]                                  (plain array)
+    - one JSON object per line                      (.jsonl)
+
+    Args:
+        file_path: Path to the raw file
+        read_size: Characters read per refill
+
+    Yields:
+        Record dicts in file order
+    """
+    file_path = Path(file_path)
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        if file_path.suffix == ".jsonl":
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        buffer = f.read(read_size)
+        eof = not buffer
+
+        # Locate the start of the record array
+        stripped = buffer.lstrip()
+        if stripped.startswith("["):
+            pos = len(buffer) - len(stripped) + 1
+        else:
+            match = _DATA_ARRAY.search(buffer)
+            while match is None and not eof:
+                chunk = f.read(read_size)
+                eof = not chunk
+                buffer += chunk
+                match = _DATA_ARRAY.search(buffer)
+            if match is None:
+                raise ValueError("Invalid JSON format: 'DATA' key not found")
+            pos = match.end()
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError("Invalid JSON format: unterminated 'DATA' array")
+                buffer = buffer[pos:] + f.read(read_size)
+                eof = len(buffer) == 0
+                pos = 0
+                continue
+
+            if buffer[pos] == "]":
+                return
+
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Record spans the buffer boundary: drop consumed text, read more
+                chunk = f.read(read_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            yield record
+            pos = end
+
+
+def iter_chunks(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    """Group an iterable of records into lists of at most `size`"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _column_values(series: pd.Series) -> list:
+    """Convert a pandas column to a list of Python values with None for missing"""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def normalize_chunk(records: List[dict]) -> Dict[str, list]:
+    """
+    Clean a chunk of raw records column by column
+
+    Mirrors the per-value rules of the original loader: strings are stripped
+    (empty -> None), integers must parse exactly, and placeholder floats
+    (0.0 and the Seoul City Hall default coordinates) become None.
+
+    Args:
+        records: Raw record dicts
+
+    Returns:
+        {column: [values]} for RAW_COLUMNS
+    """
+    frame = pd.DataFrame.from_records(records, columns=RAW_COLUMNS)
+    columns: Dict[str, list] = {}
+
+    for name in STR_COLUMNS:
+        values = frame[name].astype("string").str.strip()
+        columns[name] = _column_values(values.mask(values == ""))
+
+    for name in INT_COLUMNS:
+        numbers = pd.to_numeric(frame[name], errors="coerce")
+        integral = numbers.where(numbers == numbers.round())
+        columns[name] = _column_values(integral.astype("Int64"))
+
+    for name in FLOAT_COLUMNS:
+        numbers = pd.to_numeric(frame[name], errors="coerce")
+        columns[name] = _column_values(numbers.mask(numbers.isin(INVALID_FLOATS)))
+
+    columns.update(derive_columns(columns))
+    columns[HASH_COLUMN] = content_hashes(columns)
+    return columns
+
+
+def _digest(values) -> str:
+    text = "\x1f".join("" if value is None else str(value) for value in values)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def content_hashes(columns: Dict[str, list]) -> List[str]:
+    """
+    Per-row hash of the cleaned raw values (HASH_COLUMNS)
+
+    datastdrdt/work_dttm are left out so that a re-export of an unchanged
+    record hashes the same.
+    """
+    return [_digest(values) for values in zip(*(columns[name] for name in HASH_COLUMNS))]
+
+
+def embedding_fingerprint(values) -> str:
+    """Hash of the EMBEDDING_COLUMNS values (detects embedding text changes)"""
+    return _digest(values)
+
+
+def estimate_vacancies(columns: Dict[str, list]) -> Dict[str, pd.Series]:
+    """
+    Estimate spare places per age class
+
+    Places for an age are its classes times CLASS_CAPACITY, minus enrolled
+    children of that age, plus the spare places of the mixed classes that
+    take the age. The estimate is capped by the center-wide spare capacity
+    (crcapat - crchcnt) when both are known. Centers that report no class
+    counts at all get NULL (unknown) rather than 0.
+
+    Args:
+        columns: {column: values} with the class_cnt_*/child_cnt_* columns
+
+    Returns:
+        {vacancy column: nullable Int64 Series}
+    """
+
+    def numbers(name: str) -> pd.Series:
+        return pd.Series(columns[name], dtype="float64")
+
+    def spare(age: str, per_class: int) -> pd.Series:
+        places = numbers(f"class_cnt_{age}").fillna(0) * per_class
+        return (places - numbers(f"child_cnt_{age}").fillna(0)).clip(lower=0)
+
+    class_counts = pd.concat(
+        [numbers(f"class_cnt_{age}") for age in [*CLASS_CAPACITY, *MIXED_CLASSES]], axis=1
+    )
+    known = class_counts.notna().any(axis=1)
+    center_spare = (numbers("crcapat") - numbers("crchcnt")).clip(lower=0)
+
+    mixed_spare = {name: spare(name, per_class) for name, (_, per_class) in MIXED_CLASSES.items()}
+
+    vacancies = {}
+    for age, per_class in CLASS_CAPACITY.items():
+        estimate = spare(age, per_class)
+        for name, (ages, _) in MIXED_CLASSES.items():
+            if age in ages:
+                estimate = estimate + mixed_spare[name]
+        estimate = pd.Series(np.fmin(estimate, center_spare), index=estimate.index)
+        vacancies[f"vacancy_{age}"] = estimate.where(known).round().astype("Int64")
+    return vacancies
+
+
+def derive_columns(columns: Dict[str, list]) -> Dict[str, list]:
+    """
+    Compute indexed filter columns from cleaned raw columns
+
+    - region_code: 시도 code (partition key) from district_code, legacy codes
+      mapped to the current ones
+    - district_code: first 5 digits of stcode (시군구 code), falling back to the
+      Seoul name table when stcode is not numeric
+    - type_code: TYPE_CODES[crtypename]
+    - age_mask: bit i set when class_cnt_0i > 0
+    - service_mask: SERVICE_FLAGS bits found in crspec
+    - road_name / dong_name: main road and 동 parsed from craddr (utils/address.py)
+    - vacancy_00..vacancy_05: estimated spare places per age (estimate_vacancies)
+
+    Args:
+        columns: {column: values} with at least DERIVED_SOURCE_COLUMNS
+
+    Returns:
+        {derived column: values}
+    """
+    stcodes = pd.Series(columns["stcode"], dtype="string")
+    prefixes = stcodes.str.slice(0, 5)
+    by_name = pd.Series(columns["sigunname"], dtype="object").map(SEOUL_DISTRICT_CODES)
+    district_codes = prefixes.where(prefixes.str.fullmatch(r"\d{5}").fillna(False), by_name)
+
+    type_codes = pd.Series(columns["crtypename"], dtype="object").map(TYPE_CODES)
+
+    age_masks = pd.Series(0, index=stcodes.index, dtype="int64")
+    for bit, column in enumerate(AGE_CLASS_COLUMNS.values()):
+        has_class = pd.Series(columns[column], dtype="float64").fillna(0) > 0
+        age_masks |= has_class.astype("int64") * (1 << bit)
+
+    crspecs = pd.Series(columns["crspec"], dtype="object")
+    service_masks = crspecs.map({v: service_mask_for(v) for v in crspecs.dropna().unique()})
+
+    region_codes = district_codes.map(region_code_for, na_action="ignore")
+
+    addresses = pd.Series(columns["craddr"], dtype="string")
+    road_names = addresses.str.extract(ROAD_PATTERN, expand=False)
+    dong_names = addresses.str.extract(DONG_IN_PARENTHESES_PATTERN, expand=False).fillna(
+        addresses.str.extract(DONG_TOKEN_PATTERN, expand=False)
+    )
+    dong_names = dong_names.map(normalize_dong, na_action="ignore")
+
+    return {
+        "region_code": _column_values(region_codes),
+        "district_code": _column_values(district_codes),
+        "type_code": _column_values(type_codes.astype("Int64")),
+        "age_mask": [int(v) for v in age_masks],
+        "service_mask": _column_values(service_masks.fillna(0).astype("int64")),
+        "road_name": _column_values(road_names),
+        "dong_name": _column_values(dong_names),
+        **{name: _column_values(values) for name, values in estimate_vacancies(columns).items()},
+    }
+
+
+def columns_to_rows(columns: Dict[str, list], timestamp: str) -> List[tuple]:
+    """
+    Transpose {column: values} into parameter tuples for upsert_sql()
+
+    Rows without stcode or crname (both NOT NULL) are dropped.
+    """
+    stamps = [timestamp] * len(columns["stcode"])
+    rows = zip(*(columns[name] for name in WRITE_COLUMNS), stamps, stamps)
+    stcode_at, crname_at = WRITE_COLUMNS.index("stcode"), WRITE_COLUMNS.index("crname")
+    return [row for row in rows if row[stcode_at] and row[crname_at]]
+
+
+def upsert_sql() -> str:
+    """
+    INSERT ... ON CONFLICT(stcode) DO UPDATE for daycare rows
+
+    Executed directly through the DB-API executemany so that per-row
+    parameter processing in the ORM/Core layer stays off the hot path.
+    created_at is kept for existing rows; updated_at is refreshed.
+    """
+    names = WRITE_COLUMNS + ["created_at", "updated_at"]
+    placeholders = ", ".join("?" for _ in names)
+    updates = ", ".join(
+        f"{name} = excluded.{name}" for name in WRITE_COLUMNS + ["updated_at"] if name != "stcode"
+    )
+    return (
+        f"INSERT INTO {DaycareCenter.__tablename__} ({', '.join(names)}) "
+        f"VALUES ({placeholders}) "
+        f"ON CONFLICT(stcode) DO UPDATE SET {updates}"
+    )
+
+
+def bulk_upsert(
+    records: Iterable[dict],
+    engine: Engine = None,
+    chunk_size: int = None,
+    verbose: bool = True,
+) -> IngestReport:
+    """
+    Upsert raw records in columnar chunks, one transaction per chunk
+
+    Args:
+        records: Iterable of raw record dicts (e.g. iter_json_records())
+        engine: SQLAlchemy engine (default: shared engine)
+        chunk_size: Records per chunk/transaction (default from settings)
+        verbose: Print progress
+
+    Returns:
+        IngestReport with row counts and throughput
+    """
+    if engine is None:
+        engine = get_engine()
+    if chunk_size is None:
+        chunk_size = settings.INGEST_CHUNK_SIZE
+
+    report = IngestReport()
+    started = time.perf_counter()
+    sql = upsert_sql()
+    # Same text format SQLAlchemy's SQLite DateTime type stores
+    timestamp = datetime.utcnow().isoformat(sep=" ")
+
+    for chunk in iter_chunks(records, chunk_size):
+        rows = columns_to_rows(normalize_chunk(chunk), timestamp)
+        report.rows_read += len(chunk)
+        report.rows_invalid += len(chunk) - len(rows)
+
+        if rows:
+            with engine.begin() as connection:
+                connection.exec_driver_sql(sql, rows)
+            report.rows_written += len(rows)
+
+        if verbose:
+            elapsed = time.perf_counter() - started
+            print(
+                f"  ✓ Upserted {report.rows_written:,} rows "
+                f"({report.rows_read / elapsed:,.0f} rows/s)"
+            )
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def ingest_file(file_path: Path, engine: Engine = None, chunk_size: int = None) -> IngestReport:
+    """
+    Stream a raw dump into the database
+
+    Args:
+        file_path: Raw JSON / JSON Lines file
+        engine: SQLAlchemy engine (default: shared engine)
+        chunk_size: Records per chunk/transaction (default from settings)
+
+    Returns:
+        IngestReport
+    """
+    return bulk_upsert(iter_json_records(file_path), engine=engine, chunk_size=chunk_size)
+
+
+class StoredState(NamedTuple):
+    """What diff_ingest() needs to know about a stored row"""
+
+    content_hash: str
+    datastdrdt: str
+    crstatusname: str
+    embedding: str
+    region_code: str = None
+
+
+@dataclass
+class ChangeManifest:
+    """Changes applied by one diff ingest"""
+
+    inserted: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    closed: List[str] = field(default_factory=list)
+    embedding_changed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    stale: int = 0
+    data_version: int = None
+    report: IngestReport = field(default_factory=IngestReport)
+
+    @property
+    def changed_stcodes(self) -> List[str]:
+        return self.inserted + self.updated + self.closed
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.inserted or self.updated or self.closed)
+
+    def to_dict(self) -> dict:
+        return {
+            "data_version": self.data_version,
+            "counts": {
+                "inserted": len(self.inserted),
+                "updated": len(self.updated),
+                "closed": len(self.closed),
+                "embedding_changed": len(self.embedding_changed),
+                "unchanged": self.unchanged,
+                "stale": self.stale,
+            },
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "closed": self.closed,
+            "embedding_changed": self.embedding_changed,
+            "report": self.report.to_dict(),
+        }
+
+    def save(self, path: Path) -> Path:
+        """Write the manifest as JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+def load_stored_state(engine: Engine) -> Dict[str, StoredState]:
+    """Read hash, reference date, status and embedding fingerprint of every stored row"""
+    source = ["stcode", HASH_COLUMN, "datastdrdt", "crstatusname", "region_code", *EMBEDDING_COLUMNS]
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            f"SELECT {', '.join(source)} FROM {DaycareCenter.__tablename__}"
+        ).all()
+    return {
+        row[0]: StoredState(row[1], row[2], row[3], embedding_fingerprint(row[5:]), row[4])
+        for row in rows
+    }
+
+
+def diff_ingest(
+    records: Iterable[dict],
+    engine: Engine = None,
+    chunk_size: int = None,
+    close_missing: bool = False,
+    verbose: bool = True,
+) -> ChangeManifest:
+    """
+    Apply a new raw dump as a set of changes against the stored rows
+
+    Each incoming record is compared with the stored row by content hash:
+    unchanged rows are not written, rows whose datastdrdt is older than the
+    stored one are skipped as stale, and everything else is inserted or
+    updated in bulk. A transition from 정상 to another status counts as a
+    closure.
+
+    Args:
+        records: Iterable of raw record dicts (e.g. iter_json_records())
+        engine: SQLAlchemy engine (default: shared engine)
+        chunk_size: Records per chunk/transaction (default from settings)
+        close_missing: Treat the dump as complete for the regions it contains
+            and mark their active rows missing from it as 폐지 (other regions'
+            rows are left alone, so regions can be loaded from separate files)
+        verbose: Print progress
+
+    Returns:
+        ChangeManifest listing changed stcodes and embedding text changes
+    """
+    if engine is None:
+        engine = get_engine()
+    if chunk_size is None:
+        chunk_size = settings.INGEST_CHUNK_SIZE
+
+    manifest = ChangeManifest()
+    report = manifest.report
+    started = time.perf_counter()
+    sql = upsert_sql()
+    timestamp = datetime.utcnow().isoformat(sep=" ")
+
+    stored = load_stored_state(engine)
+    seen = set()
+    seen_regions = set()
+    at = {
+        name: WRITE_COLUMNS.index(name)
+        for name in ["stcode", HASH_COLUMN, "datastdrdt", "crstatusname", "region_code"]
+    }
+    embedding_at = [WRITE_COLUMNS.index(name) for name in EMBEDDING_COLUMNS]
+
+    for chunk in iter_chunks(records, chunk_size):
+        rows = columns_to_rows(normalize_chunk(chunk), timestamp)
+        report.rows_read += len(chunk)
+        report.rows_invalid += len(chunk) - len(rows)
+
+        writes = []
+        for row in rows:
+            stcode = row[at["stcode"]]
+            seen.add(stcode)
+            seen_regions.add(row[at["region_code"]])
+            previous = stored.get(stcode)
+            embedding = embedding_fingerprint(row[i] for i in embedding_at)
+
+            if previous is None:
+                manifest.inserted.append(stcode)
+                manifest.embedding_changed.append(stcode)
+            elif (
+                previous.datastdrdt
+                and row[at["datastdrdt"]]
+                and row[at["datastdrdt"]] < previous.datastdrdt
+            ):
+                manifest.stale += 1
+                continue
+            elif previous.content_hash == row[at[HASH_COLUMN]]:
+                manifest.unchanged += 1
+                continue
+            else:
+                status = row[at["crstatusname"]]
+                if previous.crstatusname == ACTIVE_STATUS and status != ACTIVE_STATUS:
+                    manifest.closed.append(stcode)
+                else:
+                    manifest.updated.append(stcode)
+                if previous.embedding != embedding:
+                    manifest.embedding_changed.append(stcode)
+
+            stored[stcode] = StoredState(
+                row[at[HASH_COLUMN]],
+                row[at["datastdrdt"]],
+                row[at["crstatusname"]],
+                embedding,
+                row[at["region_code"]],
+            )
+            writes.append(row)
+
+        if writes:
+            with engine.begin() as connection:
+                connection.exec_driver_sql(sql, writes)
+            report.rows_written += len(writes)
+
+        if verbose:
+            elapsed = time.perf_counter() - started
+            print(
+                f"  ✓ Compared {report.rows_read:,} rows, wrote {report.rows_written:,} "
+                f"({report.rows_read / elapsed:,.0f} rows/s)"
+            )
+
+    if close_missing:
+        missing = [
+            stcode
+            for stcode, state in stored.items()
+            if stcode not in seen
+            and state.crstatusname == ACTIVE_STATUS
+            and state.region_code in seen_regions
+        ]
+        if missing:
+            # Clearing the hash makes a later reappearance count as a change
+            close_sql = (
+                f"UPDATE {DaycareCenter.__tablename__} "
+                f"SET crstatusname = ?, {HASH_COLUMN} = NULL, updated_at = ? WHERE stcode = ?"
+            )
+            with engine.begin() as connection:
+                connection.exec_driver_sql(
+                    close_sql, [(CLOSED_STATUS, timestamp, stcode) for stcode in missing]
+                )
+            manifest.closed.extend(missing)
+            report.rows_written += len(missing)
+
+    report.elapsed = time.perf_counter() - started
+    return manifest
+
+
+def refresh_derived_columns(engine: Engine = None, chunk_size: int = None) -> int:
+    """
+    Recompute derived columns for every stored row
+
+    Needed once after migrate_schema() adds derived columns to an existing
+    database; regular ingests compute them on the way in.
+
+    Returns:
+        Number of rows updated
+    """
+    if engine is None:
+        engine = get_engine()
+    if chunk_size is None:
+        chunk_size = settings.INGEST_CHUNK_SIZE
+
+    table = DaycareCenter.__tablename__
+    source = DERIVED_SOURCE_COLUMNS
+    assignments = ", ".join(f"{name} = ?" for name in DERIVED_COLUMNS)
+    update_sql = f"UPDATE {table} SET {assignments} WHERE stcode = ?"
+
+    updated = 0
+    with engine.begin() as connection:
+        rows = connection.exec_driver_sql(f"SELECT {', '.join(source)} FROM {table}").all()
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            columns = {name: [row[i] for row in chunk] for i, name in enumerate(source)}
+            derived = derive_columns(columns)
+            params = list(zip(*(derived[name] for name in DERIVED_COLUMNS), columns["stcode"]))
+            connection.exec_driver_sql(update_sql, params)
+            updated += len(params)
+
+    return updated
@@ -0,0 +1,143 @@
+"""
+Shared OpenAI Clients
+One client per provider (OpenAI, or Azure OpenAI without an OpenAI key) and
+mode (sync/async), each owning a sized keep-alive connection pool; analyzer,
+generator and embedding calls get their own timeout and retry budget
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+from openai import (
+    DEFAULT_CONNECTION_LIMITS,
+    AsyncAzureOpenAI,
+    AsyncOpenAI,
+    AzureOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+    Timeout,
+)
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+
+# Call types (timeout / retry settings)
+CALL_ANALYZER = "analyzer"
+CALL_GENERATOR = "generator"
+CALL_EMBEDDING = "embedding"
+
+_CALL_SETTINGS = {
+    CALL_ANALYZER: ("OPENAI_ANALYZER_TIMEOUT", "OPENAI_ANALYZER_RETRIES"),
+    CALL_GENERATOR: ("OPENAI_GENERATOR_TIMEOUT", "OPENAI_GENERATOR_RETRIES"),
+    CALL_EMBEDDING: ("OPENAI_EMBEDDING_TIMEOUT", "OPENAI_EMBEDDING_RETRIES"),
+}
+
+# Connection limits class of the HTTP library the SDK is built on
+Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+# Process-wide pooled clients: base client per mode, call-type views per (type, mode)
+_base_clients: Dict[bool, object] = {}
+_clients: Dict[Tuple[str, bool], object] = {}
+_clients_lock = threading.Lock()
+
+
+def use_azure() -> bool:
+    """Azure OpenAI is used when no OpenAI API key is configured"""
+    return not settings.OPENAI_API_KEY
+
+
+def chat_model() -> str:
+    """Chat model (OpenAI) or deployment name (Azure)"""
+    return settings.AOAI_DEPLOY_GPT4O if use_azure() else settings.OPENAI_MODEL
+
+
+def embedding_model() -> str:
+    """Embedding model (OpenAI) or deployment name (Azure)"""
+    return settings.AOAI_EMBEDDING_DEPLOYMENT if use_azure() else settings.OPENAI_EMBEDDING_MODEL
+
+
+def _limits():
+    return Limits(
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE,
+        keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def _create_base_client(asynchronous: bool):
+    """New SDK client with its own pooled keep-alive HTTP client"""
+    http_client_class = DefaultAsyncHttpxClient if asynchronous else DefaultHttpxClient
+    http_client = http_client_class(limits=_limits())
+
+    if not use_azure():
+        client_class = AsyncOpenAI if asynchronous else OpenAI
+        return client_class(api_key=settings.OPENAI_API_KEY, http_client=http_client)
+
+    client_class = AsyncAzureOpenAI if asynchronous else AzureOpenAI
+    return client_class(
+        api_key=settings.AOAI_API_KEY,
+        api_version=settings.AOAI_API_VERSION,
+        azure_endpoint=settings.AOAI_ENDPOINT,
+        http_client=http_client,
+    )
+
+
+def call_options(call_type: str) -> dict:
+    """Timeout and retries of a call type"""
+    timeout_setting, retries_setting = _CALL_SETTINGS[call_type]
+    return {
+        "timeout": Timeout(
+            getattr(settings, timeout_setting), connect=settings.OPENAI_CONNECT_TIMEOUT
+        ),
+        "max_retries": getattr(settings, retries_setting),
+    }
+
+
+def get_openai_client(call_type: str, asynchronous: bool = False):
+    """
+    Return the shared client for a call type (created on first use)
+
+    Call-type clients are views of one base client per mode: they share its
+    connection pool and differ only in timeout and retries.
+
+    Args:
+        call_type: CALL_ANALYZER, CALL_GENERATOR or CALL_EMBEDDING
+        asynchronous: AsyncOpenAI / AsyncAzureOpenAI instead of the sync client
+
+    Returns:
+        OpenAI, AzureOpenAI, AsyncOpenAI or AsyncAzureOpenAI client
+    """
+    key = (call_type, asynchronous)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                base = _base_clients.get(asynchronous)
+                if base is None:
+                    base = _base_clients[asynchronous] = _create_base_client(asynchronous)
+                client = _clients[key] = base.with_options(**call_options(call_type))
+    return client
+
+
+def close_openai_clients():
+    """Close the sync connection pool and drop the shared sync clients"""
+    with _clients_lock:
+        base = _base_clients.pop(False, None)
+        for key in [key for key in _clients if not key[1]]:
+            del _clients[key]
+    if base is not None:
+        base.close()
+
+
+async def aclose_openai_clients():
+    """Close the async connection pool and drop the shared async clients"""
+    with _clients_lock:
+        base = _base_clients.pop(True, None)
+        for key in [key for key in _clients if key[1]]:
+            del _clients[key]
+    if base is not None:
+        await base.close()
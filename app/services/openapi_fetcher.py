@@ -0,0 +1,329 @@
+"""
+Seoul Open Data Fetcher
+Pages through the daycare Open API concurrently with retries, resumable page
+checkpoints and conditional refresh, writing JSON Lines
+"""
+
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+
+# Result codes of the Seoul Open API
+RESULT_OK = "INFO-000"
+RESULT_NO_DATA = "INFO-200"
+# Server-side errors worth retrying (ERROR-5xx: 서버 오류 / DB 연결 오류)
+_RETRY_RESULT_PREFIX = "ERROR-5"
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class OpenApiError(Exception):
+    """Open API returned an error result or the page could not be fetched"""
+
+
+@dataclass
+class FetchReport:
+    """Summary of one fetch run"""
+
+    status: str = "fetched"  # fetched | unchanged
+    total: int = 0
+    records: int = 0
+    pages: int = 0
+    pages_resumed: int = 0
+    retries: int = 0
+    datastdrdt: Optional[str] = None
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "total": self.total,
+            "records": self.records,
+            "pages": self.pages,
+            "pages_resumed": self.pages_resumed,
+            "retries": self.retries,
+            "datastdrdt": self.datastdrdt,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+def state_path_for(output_path: Path) -> Path:
+    """Refresh state written next to the output (total, datastdrdt, validators)"""
+    return output_path.with_name(output_path.name + ".state.json")
+
+
+def parts_dir_for(output_path: Path) -> Path:
+    """Directory holding completed pages of an interrupted fetch"""
+    return output_path.with_name(output_path.name + ".parts")
+
+
+def _read_json(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, data: dict):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def normalize_row(row: dict) -> dict:
+    """API rows use upper-case keys (STCODE); raw dumps and the loader use lower case"""
+    return {key.lower(): value for key, value in row.items()}
+
+
+class OpenApiFetcher:
+    """
+    Concurrent pager for one Seoul Open Data service
+
+    Requests look like {base_url}/{key}/json/{service}/{start}/{end}/ with
+    1-based inclusive row ranges of at most page_size rows.
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = None,
+        service: str = None,
+        page_size: int = None,
+        concurrency: int = None,
+        retries: int = None,
+        timeout: float = None,
+        backoff: float = 0.5,
+    ):
+        self.api_key = api_key or settings.SEOUL_OPENAPI_KEY
+        if not self.api_key:
+            raise ValueError("SEOUL_OPENAPI_KEY must be set in .env file")
+        self.base_url = (base_url or settings.SEOUL_OPENAPI_URL).rstrip("/")
+        self.service = service or settings.SEOUL_OPENAPI_SERVICE
+        self.page_size = page_size or settings.OPENAPI_PAGE_SIZE
+        self.concurrency = concurrency or settings.OPENAPI_CONCURRENCY
+        self.retries = settings.OPENAPI_RETRIES if retries is None else retries
+        self.timeout = timeout or settings.OPENAPI_TIMEOUT
+        self.backoff = backoff
+        self.retry_count = 0
+
+    def page_url(self, start: int, end: int) -> str:
+        return f"{self.base_url}/{self.api_key}/json/{self.service}/{start}/{end}/"
+
+    def _result(self, payload: dict) -> Tuple[dict, str]:
+        """(body, result code); errors come back without the service wrapper"""
+        body = payload.get(self.service, payload)
+        return body, body.get("RESULT", {}).get("CODE", RESULT_OK)
+
+    def _parse(self, payload: dict) -> Tuple[int, List[dict]]:
+        """(list_total_count, rows) of a response body"""
+        body, code = self._result(payload)
+        result = body.get("RESULT", {})
+        if code == RESULT_NO_DATA:
+            return 0, []
+        if code != RESULT_OK:
+            raise OpenApiError(f"{code}: {result.get('MESSAGE', '')}")
+        return int(body.get("list_total_count", 0)), body.get("row", [])
+
+    async def request(
+        self, client: httpx.AsyncClient, start: int, end: int, headers: dict = None
+    ) -> httpx.Response:
+        """
+        GET one row range, retrying timeouts, transport errors, 429/5xx and
+        ERROR-5xx results with jittered exponential backoff
+
+        Returns:
+            Response (status 200 or 304)
+
+        Raises:
+            OpenApiError: If the range still fails after all retries
+        """
+        url = self.page_url(start, end)
+        for attempt in range(self.retries + 1):
+            error = None
+            try:
+                response = await client.get(url, headers=headers)
+                if response.status_code == 304:
+                    return response
+                if response.status_code in _RETRY_STATUS:
+                    error = f"HTTP {response.status_code}"
+                else:
+                    response.raise_for_status()
+                    _, code = self._result(response.json())
+                    if not code.startswith(_RETRY_RESULT_PREFIX):
+                        return response
+                    error = code
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                error = f"{type(e).__name__}: {e}"
+            except httpx.HTTPStatusError as e:
+                raise OpenApiError(f"rows {start}-{end}: {e}") from e
+
+            if attempt == self.retries:
+                raise OpenApiError(f"rows {start}-{end} failed after {attempt + 1} attempts ({error})")
+            self.retry_count += 1
+            await asyncio.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+
+    async def probe(self, client: httpx.AsyncClient, state: dict) -> Optional[dict]:
+        """
+        Fetch the first row with the previous validators
+
+        Returns:
+            None if the server answered 304 Not Modified, otherwise
+            {"total", "datastdrdt", "etag", "last_modified"} of the current data
+        """
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        response = await self.request(client, 1, 1, headers)
+        if response.status_code == 304:
+            return None
+
+        total, rows = self._parse(response.json())
+        return {
+            "total": total,
+            "datastdrdt": normalize_row(rows[0]).get("datastdrdt") if rows else None,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    async def fetch_page(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, page: int, parts_dir: Path
+    ) -> int:
+        """Fetch one page into parts_dir/<page>.jsonl (atomic rename = checkpoint)"""
+        start = page * self.page_size + 1
+        end = start + self.page_size - 1
+        async with semaphore:
+            response = await self.request(client, start, end)
+        _, rows = self._parse(response.json())
+
+        part_path = parts_dir / f"{page:06d}.jsonl"
+        tmp_path = part_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(normalize_row(row), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, part_path)
+        return len(rows)
+
+    async def fetch(self, output_path: Path, force: bool = False, verbose: bool = True) -> FetchReport:
+        """
+        Download the whole service into output_path as JSON Lines
+
+        The run is skipped when the server answers 304 to the previous
+        ETag/Last-Modified, or when the total row count and the first row's
+        datastdrdt match the previous run (the Seoul API sends no validators).
+        Completed pages are kept in <output>.parts/ so an interrupted run
+        resumes where it stopped, as long as the data did not change meanwhile.
+
+        Args:
+            output_path: Target .jsonl file
+            force: Fetch even if the data looks unchanged
+            verbose: Print progress
+
+        Returns:
+            FetchReport
+        """
+        started = time.perf_counter()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path = state_path_for(output_path)
+        parts_dir = parts_dir_for(output_path)
+        state = _read_json(state_path)
+        report = FetchReport()
+        self.retry_count = 0
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            current = await self.probe(client, state if output_path.exists() and not force else {})
+            if current is None or (
+                not force
+                and output_path.exists()
+                and current["total"] == state.get("total")
+                and current["datastdrdt"] == state.get("datastdrdt")
+            ):
+                report.status = "unchanged"
+                report.total = state.get("total", 0)
+                report.datastdrdt = state.get("datastdrdt")
+                report.elapsed = time.perf_counter() - started
+                return report
+
+            report.total = current["total"]
+            report.datastdrdt = current["datastdrdt"]
+            pages = -(-report.total // self.page_size)
+            report.pages = pages
+
+            # Resume only pages fetched for the same data and paging
+            checkpoint = {
+                "total": current["total"],
+                "datastdrdt": current["datastdrdt"],
+                "page_size": self.page_size,
+            }
+            checkpoint_path = parts_dir / "checkpoint.json"
+            if parts_dir.exists() and _read_json(checkpoint_path) != checkpoint:
+                shutil.rmtree(parts_dir)
+            parts_dir.mkdir(parents=True, exist_ok=True)
+            _write_json(checkpoint_path, checkpoint)
+
+            done = {int(path.stem) for path in parts_dir.glob("*.jsonl")}
+            todo = [page for page in range(pages) if page not in done]
+            report.pages_resumed = pages - len(todo)
+            if verbose:
+                print(
+                    f"  ✓ {report.total:,} rows in {pages} pages "
+                    f"({report.pages_resumed} already fetched, concurrency {self.concurrency})"
+                )
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            await asyncio.gather(
+                *(self.fetch_page(client, semaphore, page, parts_dir) for page in todo)
+            )
+
+        # Concatenate pages in order, then swap the output in atomically
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for page in range(pages):
+                with open(parts_dir / f"{page:06d}.jsonl", "r", encoding="utf-8") as f:
+                    for line in f:
+                        out.write(line)
+                        report.records += 1
+        os.replace(tmp_path, output_path)
+
+        if report.records != report.total:
+            print(
+                f"[WARN]  Fetched {report.records:,} rows but the API reported {report.total:,} "
+                "(data may have changed during the fetch)"
+            )
+
+        _write_json(
+            state_path,
+            {
+                **checkpoint,
+                "etag": current["etag"],
+                "last_modified": current["last_modified"],
+                "records": report.records,
+                "fetched_at": datetime.utcnow().isoformat(),
+            },
+        )
+        shutil.rmtree(parts_dir)
+
+        report.retries = self.retry_count
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+def fetch_dataset(output_path: Path, force: bool = False, **options) -> FetchReport:
+    """Synchronous wrapper: OpenApiFetcher(**options).fetch(output_path, force)"""
+    return asyncio.run(OpenApiFetcher(**options).fetch(output_path, force=force))
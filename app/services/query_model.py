@@ -0,0 +1,430 @@
+"""
+Local Query Model
+Lightweight analyzer tier between the rules and the LLM, distilled from
+logged LLM analyzer outputs:
+
+- intent classifier: softmax regression over hashed character n-grams
+- slot tagger: per-token softmax regression over hashed token, character
+  n-gram, neighbour and previous-tag features, decoded left to right
+
+Both run on CPU in tens of microseconds per query.
+"""
+
+import json
+import sys
+import threading
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+from services.rule_analyzer import (
+    FLAG_KEYWORDS,
+    FILLER_WORDS,
+    QueryAnalysis,
+    normalize_query,
+    strip_particle,
+    token_slots,
+    tokenize_query,
+)
+
+MODEL_VERSION = 1
+
+# Token tags besides the filter slots
+TAG_OTHER = "O"
+TAG_KEYWORD = "KW"
+
+# Filter slots whose value is taken from the tagged token
+STRING_SLOTS = ["region", "district", "dong", "road", "type", "age", "special_service"]
+
+_log_lock = threading.Lock()
+_model_cache = None
+_model_cache_lock = threading.Lock()
+
+
+# ----------------------------------------------------------------------------
+# Analyzer log (training data)
+# ----------------------------------------------------------------------------
+
+
+def record_analysis(query: str, result: dict, path: Path = None):
+    """
+    Append one LLM analyzer output to the analyzer log (JSON Lines)
+
+    Args:
+        query: User query
+        result: Parsed LLM answer (search_intent, filters, keywords)
+        path: Log file (default from settings)
+    """
+    if not settings.ANALYZER_LOG_ENABLED:
+        return
+    path = path or settings.get_analyzer_log_path()
+    record = {
+        "query": query,
+        "search_intent": result.get("search_intent", "unknown"),
+        "filters": result.get("filters") or {},
+        "keywords": result.get("keywords") or [],
+    }
+    try:
+        with _log_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"[WARN] Analyzer log write failed: {e}")
+
+
+def read_analysis_log(path: Path = None) -> List[dict]:
+    """Logged (query, analyzer output) records, later duplicates of a query winning"""
+    path = path or settings.get_analyzer_log_path()
+    records = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("query"):
+                records[normalize_query(record["query"])] = record
+    return list(records.values())
+
+
+def is_holdout(query: str, holdout: float) -> bool:
+    """Deterministic train/evaluation split by query text"""
+    bucket = zlib.crc32(normalize_query(query).encode("utf-8")) % 1000
+    return bucket < holdout * 1000
+
+
+# ----------------------------------------------------------------------------
+# Features
+# ----------------------------------------------------------------------------
+
+
+def _char_ngrams(text: str, sizes=(1, 2, 3)) -> List[str]:
+    text = f"<{text}>"
+    return [text[i : i + n] for n in sizes for i in range(len(text) - n + 1)]
+
+
+def query_features(query: str) -> List[str]:
+    """Intent features: character n-grams of the compact query and its words"""
+    tokens = tokenize_query(query)
+    features = [f"c:{gram}" for gram in _char_ngrams("".join(tokens))]
+    features += [f"w:{strip_particle(token)}" for token in tokens]
+    return features or ["empty"]
+
+
+def token_features(stems: List[str], i: int, prev_tag: str) -> List[str]:
+    """Tagger features of token i (its stem, n-grams, neighbours, previous tag)"""
+    stem = stems[i]
+    features = [
+        "bias",
+        f"w:{stem}",
+        f"p:{stems[i - 1] if i > 0 else '<s>'}",
+        f"n:{stems[i + 1] if i + 1 < len(stems) else '</s>'}",
+        f"t:{prev_tag}",
+        f"s2:{stem[-2:]}",
+        f"s1:{stem[-1:]}",
+        f"d:{any(char.isdigit() for char in stem)}",
+        f"f:{stem in FILLER_WORDS}",
+    ]
+    features += [f"g:{gram}" for gram in _char_ngrams(stem, (2, 3))]
+    features += [f"r:{slot}" for slot in token_slots(stem)]
+    return features
+
+
+@lru_cache(maxsize=200_000)
+def _feature_hash(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8"))
+
+
+def _hash(features: Iterable[str], dimension: int) -> np.ndarray:
+    return np.fromiter((_feature_hash(feature) % dimension for feature in features), dtype=np.int64)
+
+
+class SoftmaxModel:
+    """Multinomial logistic regression over hashed sparse binary features"""
+
+    def __init__(self, labels: List[str], dimension: int, weights: np.ndarray = None):
+        self.labels = list(labels)
+        self.dimension = dimension
+        self.weights = (
+            weights
+            if weights is not None
+            else np.zeros((dimension, len(self.labels)), dtype=np.float32)
+        )
+
+    def probabilities(self, indices: np.ndarray) -> np.ndarray:
+        scores = self.weights[indices].sum(axis=0)
+        scores = np.exp(scores - scores.max())
+        return scores / scores.sum()
+
+    def predict(self, features: List[str]) -> Tuple[str, float]:
+        probabilities = self.probabilities(_hash(features, self.dimension))
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def fit(self, examples: List[Tuple[List[str], str]], epochs: int = 10, learning_rate: float = 0.2, seed: int = 0):
+        """SGD on (features, label) examples"""
+        label_ids = {label: i for i, label in enumerate(self.labels)}
+        hashed = [(_hash(features, self.dimension), label_ids[label]) for features, label in examples]
+        rng = np.random.default_rng(seed)
+
+        for epoch in range(epochs):
+            rate = learning_rate / (1 + epoch)
+            for position in rng.permutation(len(hashed)):
+                indices, label = hashed[position]
+                gradient = self.probabilities(indices)
+                gradient[label] -= 1.0
+                np.subtract.at(self.weights, indices, (rate * gradient).astype(np.float32))
+        return self
+
+
+# ----------------------------------------------------------------------------
+# Training alignment and decoding
+# ----------------------------------------------------------------------------
+
+
+def _matches_value(stem: str, slots: dict, slot: str, value) -> bool:
+    """Whether a token expresses the LLM's value of a filter slot"""
+    if slot in slots:
+        if isinstance(value, bool) or slot == "min_cctv":
+            return bool(value)
+        return str(slots[slot]) in str(value).split(",")
+    if isinstance(value, bool) or not isinstance(value, str) or len(stem) < 2:
+        return False
+    return any(stem in part or part in stem for part in value.split(",") if part)
+
+
+def tag_tokens(record: dict) -> Tuple[List[str], List[str]]:
+    """
+    Token stems and tags of a logged query, aligned with the LLM's filters
+
+    A token is tagged with the filter it expresses (value match, or the
+    dictionaries mapping it to the LLM's value), KW if the LLM listed it as a
+    keyword, O otherwise.
+    """
+    stems = [strip_particle(token) for token in tokenize_query(record["query"])]
+    filters = {key: value for key, value in (record.get("filters") or {}).items() if value not in (None, "", False)}
+    keywords = [str(keyword).lower() for keyword in record.get("keywords") or []]
+
+    tags = []
+    for stem in stems:
+        slots = token_slots(stem)
+        tag = next(
+            (slot for slot, value in filters.items() if _matches_value(stem, slots, slot, value)),
+            None,
+        )
+        if tag is None:
+            keyword = any(stem == k or (len(stem) >= 2 and (stem in k or k in stem)) for k in keywords)
+            tag = TAG_KEYWORD if keyword and stem not in FILLER_WORDS else TAG_OTHER
+        tags.append(tag)
+    return stems, tags
+
+
+def _slot_value(slot: str, stem: str):
+    """Filter value of a token tagged with a slot"""
+    known = token_slots(stem).get(slot)
+    if slot == "min_cctv":
+        digits = "".join(char for char in stem if char.isdigit())
+        return int(digits) if digits else 1
+    if slot in STRING_SLOTS:
+        return known if isinstance(known, str) else stem
+    return True
+
+
+class QueryModel:
+    """Intent classifier + slot tagger, persisted as one .npz file"""
+
+    def __init__(self, intent_model: SoftmaxModel, tagger: SoftmaxModel, meta: dict = None):
+        self.intent_model = intent_model
+        self.tagger = tagger
+        self.meta = meta or {}
+
+    def tag(self, stems: List[str]) -> List[Tuple[str, float]]:
+        """Greedy left-to-right tags (with probabilities) of token stems"""
+        tagged = []
+        prev_tag = "<s>"
+        for i in range(len(stems)):
+            tag, probability = self.tagger.predict(token_features(stems, i, prev_tag))
+            tagged.append((tag, probability))
+            prev_tag = tag
+        return tagged
+
+    def analyze(self, query: str) -> QueryAnalysis:
+        """
+        Analyze a query in the LLM analyzer's schema
+
+        Confidence is the intent probability times the least certain token
+        tag probability.
+        """
+        stems = [strip_particle(token) for token in tokenize_query(query)]
+        if not stems:
+            return QueryAnalysis("unknown", source="model")
+
+        intent, confidence = self.intent_model.predict(query_features(query))
+        weakest = 1.0
+        filters = {}
+        keywords = []
+        for stem, (tag, probability) in zip(stems, self.tag(stems)):
+            weakest = min(weakest, probability)
+            if tag == TAG_KEYWORD:
+                keywords.append(stem)
+            elif tag == "age" and "age" in filters:
+                value = _slot_value(tag, stem)
+                if value not in filters["age"].split(","):
+                    filters["age"] = f"{filters['age']},{value}"
+            elif tag != TAG_OTHER and tag not in filters:
+                filters[tag] = _slot_value(tag, stem)
+                if tag in ("type", "special_service"):
+                    keywords.append(filters[tag])
+                elif tag in FLAG_KEYWORDS:
+                    keywords.append(FLAG_KEYWORDS[tag])
+
+        return QueryAnalysis(
+            intent, filters, list(dict.fromkeys(keywords)), round(confidence * weakest, 3), "model"
+        )
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                intent_weights=self.intent_model.weights,
+                tagger_weights=self.tagger.weights,
+                meta=np.array(
+                    json.dumps(
+                        {
+                            **self.meta,
+                            "version": MODEL_VERSION,
+                            "dimension": self.intent_model.dimension,
+                            "intents": self.intent_model.labels,
+                            "tags": self.tagger.labels,
+                        },
+                        ensure_ascii=False,
+                    )
+                ),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "QueryModel":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != MODEL_VERSION:
+                raise ValueError(f"Unsupported query model version: {meta.get('version')}")
+            intent_model = SoftmaxModel(meta["intents"], meta["dimension"], data["intent_weights"])
+            tagger = SoftmaxModel(meta["tags"], meta["dimension"], data["tagger_weights"])
+        return cls(intent_model, tagger, meta)
+
+
+def train_query_model(
+    records: List[dict], dimension: int = None, epochs: int = 10, learning_rate: float = 0.2
+) -> QueryModel:
+    """
+    Train the intent classifier and slot tagger on logged analyzer outputs
+
+    Args:
+        records: Analyzer log records (query, search_intent, filters, keywords)
+        dimension: Hashed feature space size (default from settings)
+        epochs: SGD passes over the data
+        learning_rate: Initial SGD step (decays per epoch)
+
+    Returns:
+        Trained QueryModel
+    """
+    dimension = dimension or settings.QUERY_MODEL_DIMENSION
+
+    intent_examples = [(query_features(r["query"]), r.get("search_intent", "unknown")) for r in records]
+    tag_examples = []
+    for record in records:
+        stems, tags = tag_tokens(record)
+        prev_tag = "<s>"
+        for i, tag in enumerate(tags):
+            tag_examples.append((token_features(stems, i, prev_tag), tag))
+            prev_tag = tag
+
+    intents = sorted({label for _, label in intent_examples})
+    tags = sorted({label for _, label in tag_examples} | {TAG_OTHER})
+
+    intent_model = SoftmaxModel(intents, dimension).fit(intent_examples, epochs, learning_rate)
+    tagger = SoftmaxModel(tags, dimension).fit(tag_examples, epochs, learning_rate)
+    return QueryModel(intent_model, tagger, {"examples": len(records)})
+
+
+def get_query_model() -> Optional[QueryModel]:
+    """
+    Trained query model next to the vector index (None if not trained yet)
+
+    Reloaded when the file changes.
+    """
+    global _model_cache
+
+    path = settings.get_query_model_path()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+
+    with _model_cache_lock:
+        if _model_cache is None or _model_cache[0] != mtime:
+            try:
+                _model_cache = (mtime, QueryModel.load(path))
+            except Exception as e:
+                print(f"[WARN] Query model unavailable: {e}")
+                _model_cache = (mtime, None)
+        return _model_cache[1]
+
+
+def evaluate_query_model(model: QueryModel, records: List[dict], min_confidence: float = None) -> dict:
+    """
+    Agreement of the model with logged LLM outputs
+
+    Args:
+        model: Trained query model
+        records: Held-out analyzer log records
+        min_confidence: Serving threshold (default from settings)
+
+    Returns:
+        Intent accuracy, exact filter match, per-slot accuracy, coverage and
+        accuracy above the threshold, mean latency (µs)
+    """
+    min_confidence = settings.ANALYZER_MODEL_MIN_CONFIDENCE if min_confidence is None else min_confidence
+    intent_hits = filter_hits = covered = covered_hits = 0
+    slot_totals: Dict[str, List[int]] = {}
+    elapsed = 0.0
+
+    for record in records:
+        started = time.perf_counter()
+        analysis = model.analyze(record["query"])
+        elapsed += time.perf_counter() - started
+
+        expected = {k: v for k, v in (record.get("filters") or {}).items() if v not in (None, "", False)}
+        intent_hit = analysis.search_intent == record.get("search_intent", "unknown")
+        filter_hit = analysis.filters == expected
+        intent_hits += intent_hit
+        filter_hits += filter_hit
+        for slot in set(expected) | set(analysis.filters):
+            totals = slot_totals.setdefault(slot, [0, 0])
+            totals[0] += analysis.filters.get(slot) == expected.get(slot)
+            totals[1] += 1
+        if analysis.confidence >= min_confidence:
+            covered += 1
+            covered_hits += intent_hit and filter_hit
+
+    count = max(len(records), 1)
+    return {
+        "examples": len(records),
+        "intent_accuracy": intent_hits / count,
+        "filter_exact_match": filter_hits / count,
+        "slot_accuracy": {slot: hits / total for slot, (hits, total) in sorted(slot_totals.items())},
+        "coverage": covered / count,
+        "covered_accuracy": covered_hits / covered if covered else None,
+        "latency_us": elapsed / count * 1e6,
+    }
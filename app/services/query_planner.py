@@ -0,0 +1,240 @@
+"""
+Cost-based Retrieval Planner
+Chooses between SQL-only, filter-first and vector-first retrieval per request
+"""
+
+import math
+import re
+import sys
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+from services.selectivity import SelectivityStats
+from utils.filters import (
+    AGE_CLASS_COLUMNS,
+    AGE_GROUPS,
+    GENERIC_KEYWORDS,
+    TYPE_CODES,
+    resolve_district_code,
+    resolve_region_code,
+)
+
+PLAN_SQL_ONLY = "sql_only"
+PLAN_FILTER_FIRST = "filter_first"
+PLAN_VECTOR_FIRST = "vector_first"
+PLAN_FULLTEXT = "fulltext"
+
+# "해맑은어린이집" -> "해맑은"; quoted text is taken verbatim
+_NAME_PATTERN = re.compile(r"(\S{2,}?)어린이집")
+_QUOTED_PATTERN = re.compile(r"[\"'“”‘’]([^\"'“”‘’]{2,})[\"'“”‘’]")
+
+
+@dataclass
+class RetrievalPlan:
+    """Chosen retrieval strategy with its cost estimate"""
+
+    strategy: str
+    estimated_rows: float
+    estimated_cost_ms: float
+    reason: str
+    vector_top_k: int = 0
+    alternatives: dict = field(default_factory=dict)
+    fulltext_terms: List[str] = field(default_factory=list)
+    fallback: Optional["RetrievalPlan"] = None
+
+    def to_dict(self) -> dict:
+        """Convert plan to a metadata-friendly dict"""
+        result = asdict(self)
+        result["estimated_rows"] = round(self.estimated_rows, 1)
+        result["estimated_cost_ms"] = round(self.estimated_cost_ms, 3)
+        result["alternatives"] = {
+            name: round(cost, 3) for name, cost in self.alternatives.items()
+        }
+        result["fallback"] = self.fallback.to_dict() if self.fallback else None
+        return result
+
+
+def _is_vocabulary_term(term: str) -> bool:
+    """Whether a term is a known region, district, type, age or generic word"""
+    return (
+        term in GENERIC_KEYWORDS
+        or term in AGE_CLASS_COLUMNS
+        or term in AGE_GROUPS
+        or any(term in name for name in TYPE_CODES)
+        or resolve_district_code(term) is not None
+        or resolve_region_code(term) is not None
+    )
+
+
+def extract_name_terms(query: str, keywords: List[str] = None) -> List[str]:
+    """
+    Extract daycare name fragments from a request
+
+    Matches quoted text and words glued to "어린이집" (e.g. "해맑은어린이집"),
+    skipping fragments that are filter vocabulary ("국공립어린이집",
+    "강남어린이집").
+
+    Args:
+        query: Raw user query
+        keywords: Keywords extracted by the query analyzer
+
+    Returns:
+        Unique name fragments in order of appearance
+    """
+    terms = []
+    sources = [query or ""] + [str(k) for k in (keywords or [])]
+
+    for source in sources:
+        candidates = _QUOTED_PATTERN.findall(source) + _NAME_PATTERN.findall(source)
+        for candidate in candidates:
+            candidate = candidate.strip()
+            if candidate.endswith("어린이집"):
+                candidate = candidate[: -len("어린이집")].strip()
+            if len(candidate) < 2 or _is_vocabulary_term(candidate):
+                continue
+            if candidate not in terms:
+                terms.append(candidate)
+
+    return terms
+
+
+def has_semantic_content(query: str, keywords: List[str], filters: dict) -> bool:
+    """
+    Check whether the request carries meaning beyond its structured filters
+
+    Keywords that merely restate a filter value (e.g. "국공립" with type=국공립)
+    or generic request words ("추천", "어린이집") do not count.
+
+    Args:
+        query: Raw user query
+        keywords: Keywords extracted by the query analyzer
+        filters: Structured filters
+
+    Returns:
+        True if a vector search could add ranking signal
+    """
+    terms = keywords if keywords else (query or "").split()
+    filter_values = [str(v) for v in (filters or {}).values() if isinstance(v, str) and v]
+
+    for term in terms:
+        term = str(term).strip()
+        if not term or term in GENERIC_KEYWORDS:
+            continue
+        if any(term in value or value in term for value in filter_values):
+            continue
+        return True
+
+    return False
+
+
+def choose_plan(
+    query: str,
+    keywords: List[str],
+    filters: dict,
+    stats: SelectivityStats,
+    vector_available: bool,
+    total_vectors: int = 0,
+    top_k: int = None,
+    use_fulltext: bool = True,
+) -> RetrievalPlan:
+    """
+    Pick the cheapest retrieval strategy for a request
+
+    Args:
+        query: Raw user query
+        keywords: Keywords extracted by the query analyzer
+        filters: Structured filters
+        stats: Filter selectivity statistics
+        vector_available: Whether the FAISS index is loaded
+        total_vectors: Number of vectors in the index
+        top_k: Number of results requested (default from settings)
+        use_fulltext: Consider the full-text plan for named daycares
+
+    Returns:
+        RetrievalPlan
+    """
+    if top_k is None:
+        top_k = settings.TOP_K
+
+    estimated_rows = stats.estimate_rows(filters) if stats.available else float(
+        total_vectors or top_k
+    )
+    row_cost = settings.PLANNER_SQL_ROW_COST_MS
+    vector_cost = settings.PLANNER_VECTOR_COST_MS
+    embed_cost = settings.PLANNER_EMBEDDING_COST_MS
+
+    sql_only_cost = min(estimated_rows, top_k) * row_cost
+
+    # A named daycare is a lookup, not a similarity search: try the full-text
+    # index first and keep the cost-based plan as fallback
+    name_terms = extract_name_terms(query, keywords) if use_fulltext else []
+    if name_terms:
+        fallback = choose_plan(
+            query, keywords, filters, stats, vector_available, total_vectors, top_k,
+            use_fulltext=False,
+        )
+        return RetrievalPlan(
+            PLAN_FULLTEXT,
+            estimated_rows,
+            sql_only_cost,
+            "daycare name in request",
+            fulltext_terms=name_terms,
+            fallback=fallback,
+        )
+
+    if not vector_available:
+        return RetrievalPlan(
+            PLAN_SQL_ONLY, estimated_rows, sql_only_cost, "vector index unavailable"
+        )
+
+    if not has_semantic_content(query, keywords, filters):
+        return RetrievalPlan(
+            PLAN_SQL_ONLY, estimated_rows, sql_only_cost, "no semantic content beyond filters"
+        )
+
+    if stats.available and estimated_rows <= top_k:
+        return RetrievalPlan(
+            PLAN_SQL_ONLY, estimated_rows, sql_only_cost, "filters alone fit in top_k"
+        )
+
+    # Filter-first: fetch every matching row, score each exactly
+    filter_first_cost = embed_cost + estimated_rows * (row_cost + vector_cost)
+
+    # Vector-first: scan the whole index, then filter; widen k so that enough
+    # candidates survive the filters
+    selectivity = estimated_rows / stats.total if stats.available else 1.0
+    vector_top_k = top_k * 2
+    if selectivity > 0:
+        vector_top_k = max(vector_top_k, math.ceil(top_k / selectivity))
+    vector_top_k = min(vector_top_k, max(total_vectors, top_k))
+    vector_first_cost = embed_cost + total_vectors * vector_cost + vector_top_k * row_cost
+
+    alternatives = {
+        PLAN_FILTER_FIRST: filter_first_cost,
+        PLAN_VECTOR_FIRST: vector_first_cost,
+    }
+
+    if (
+        stats.available
+        and estimated_rows <= settings.PLANNER_FILTER_FIRST_MAX_ROWS
+        and filter_first_cost <= vector_first_cost
+    ):
+        return RetrievalPlan(
+            PLAN_FILTER_FIRST,
+            estimated_rows,
+            filter_first_cost,
+            "selective filters, exact scoring over subset",
+            alternatives=alternatives,
+        )
+
+    return RetrievalPlan(
+        PLAN_VECTOR_FIRST,
+        estimated_rows,
+        vector_first_cost,
+        "broad filters, approximate candidates first",
+        vector_top_k=vector_top_k,
+        alternatives=alternatives,
+    )
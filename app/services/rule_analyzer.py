@@ -0,0 +1,427 @@
+"""
+Rule-based Query Analyzer
+Deterministic fast path of the query analyzer: dictionaries of Seoul's 25 구,
+daycare types, age expressions, facility and service keywords (with spacing
+variants and common typos) produce the LLM analyzer's intent/filters/keywords
+schema plus a confidence score
+"""
+
+import re
+import sys
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.address import normalize_dong, normalize_road
+from utils.filters import (
+    AGE_CLASS_COLUMNS,
+    GENERIC_KEYWORDS,
+    REGION_ALIASES,
+    REGION_CODES,
+    SEOUL_DISTRICT_CODES,
+    SEOUL_REGION_CODE,
+)
+
+# 자치구 -> 표기 변형 (구 생략, 흔한 오타)
+DISTRICT_VARIANTS = {
+    **{name: [name] for name in SEOUL_DISTRICT_CODES},
+    "강남구": ["강남구", "강남", "강난구"],
+    "강동구": ["강동구", "강동"],
+    "강북구": ["강북구", "강북"],
+    "강서구": ["강서구", "강서"],
+    "관악구": ["관악구", "관악", "관약구"],
+    "광진구": ["광진구", "광진"],
+    "구로구": ["구로구", "구로"],
+    "금천구": ["금천구", "금천", "금전구"],
+    "노원구": ["노원구", "노원"],
+    "도봉구": ["도봉구", "도봉"],
+    "동대문구": ["동대문구", "동대문", "동대뮨구"],
+    "동작구": ["동작구", "동작"],
+    "마포구": ["마포구", "마포"],
+    "서대문구": ["서대문구", "서대문"],
+    "서초구": ["서초구", "서초", "서쵸구"],
+    "성동구": ["성동구", "성동"],
+    "성북구": ["성북구", "성북", "성붘구"],
+    "송파구": ["송파구", "송파", "송퍄구"],
+    "양천구": ["양천구", "양천"],
+    "영등포구": ["영등포구", "영등포", "영등표구", "영드포구"],
+    "용산구": ["용산구", "용산"],
+    "은평구": ["은평구", "은평"],
+    "종로구": ["종로구", "종로", "중로구"],
+    "중구": ["중구"],
+    "중랑구": ["중랑구", "중랑", "중량구"],
+}
+
+# 시도 -> 표기 변형 (서울 이외; "서울"은 기본 지역이라 요청어로 처리)
+REGION_VARIANTS = {
+    name: [name] + [alias for alias, alias_code in REGION_ALIASES.items() if alias_code == code]
+    for name, code in REGION_CODES.items()
+    if code != SEOUL_REGION_CODE
+}
+
+# 유형 -> 표기 변형 ("회사"는 "회사 근처"처럼 위치로도 쓰여 제외)
+TYPE_VARIANTS = {
+    "국공립": ["국공립", "국립", "공립", "구립", "시립", "국공림", "국콩립"],
+    "사회복지법인": ["사회복지법인", "사회복지", "복지법인"],
+    "법인·단체등": ["법인단체", "법인·단체", "단체"],
+    "민간": ["민간", "사립"],
+    "가정": ["가정", "가정식", "가졍"],
+    "협동": ["협동", "부모협동"],
+    "직장": ["직장", "직장내"],
+}
+
+# 연령 -> 표기 변형 ("만 2세", "2살", "두살"; "영세"는 "영세한"과 겹쳐 제외,
+# "아기"/"아가"는 연령 구분 없이 아이를 가리키고 "유아"는 "유아용"처럼 넓게 쓰여 반 이름만 사용)
+AGE_VARIANTS = {
+    "만0세": ["만0세", "0세", "0살", "신생아", "돌전", "돌 전"],
+    "만1세": ["만1세", "1세", "1살", "한살", "돌쟁이"],
+    "만2세": ["만2세", "2세", "2살", "두살"],
+    "만3세": ["만3세", "3세", "3살", "세살"],
+    "만4세": ["만4세", "4세", "4살", "네살"],
+    "만5세": ["만5세", "5세", "5살", "다섯살"],
+    "영아": ["영아", "영아반"],
+    "유아": ["유아반"],
+}
+
+# 제공서비스 -> 표기 변형 (filter 값은 SERVICE_FLAGS 이름의 부분 문자열;
+# "장애", "휴일", "주말", "토요일"은 "주말에 상담"처럼 서비스가 아닌 문맥에도 쓰여 제외)
+SERVICE_VARIANTS = {
+    "장애아통합": ["장애아통합", "통합보육"],
+    "장애아전담": ["장애아전담"],
+    "장애아": ["장애아", "장애아동"],
+    "야간연장": ["야간연장", "야간", "밤늦게", "늦게까지"],
+    "시간연장": ["시간연장", "연장보육"],
+    "휴일보육": ["휴일보육", "주말보육", "토요보육", "휴일운영", "주말운영"],
+    "24시간": ["24시간"],
+    "방과후": ["방과후"],
+    "영아전담": ["영아전담"],
+    "시간제보육": ["시간제보육", "시간제"],
+}
+
+PLAYGROUND_VARIANTS = ["놀이터", "놀이텨", "놀이시설", "바깥놀이"]
+CCTV_VARIANTS = ["cctv", "씨씨티비", "시시티비", "cc티비"]
+# 차량 ("차량 많은 도로"처럼 통학차량이 아닌 문맥이 있어 단독 "차량"은 제외)
+VEHICLE_VARIANTS = ["통학차량", "통학버스", "차량운행", "셔틀", "등원차량", "등하원차량"]
+VACANCY_VARIANTS = ["빈자리", "자리있는", "자리가있는", "입소가능", "입소가능한", "바로입소", "대기없는", "여석"]
+COMPARE_VARIANTS = ["비교", "차이", "vs"]
+INFO_VARIANTS = ["몇개", "몇 곳", "몇곳", "개수", "평균", "통계", "얼마나많"]
+
+# 지역 다음에 오는 조사·어미, 요청어 (의미를 더하지 않는 잔여 토큰)
+FILLER_WORDS = GENERIC_KEYWORDS | {
+    "은", "는", "이", "가", "을", "를", "에", "에서", "의", "로", "으로", "도", "만", "와", "과",
+    "랑", "이랑", "하고", "중", "중에", "중에서", "및", "또는", "그리고", "좀", "꼭",
+    "해줘", "해주세요", "줘", "주세요", "보여줘", "보여주세요", "알려주세요", "찾아주세요",
+    "추천해주세요", "추천좀", "어디", "어디야", "어디있어", "있나요", "있어", "있나", "있을까",
+    "있고", "있는데", "이고", "되는", "된", "하는", "가능한", "운영", "운영하는", "보내기",
+    "어린이집은", "어린이집을", "어린이집이", "어린이집도", "곳을", "곳이", "곳은", "데",
+    "주변", "인근", "부근", "쪽", "많은", "이상", "대", "개", "반", "아이", "우리아이",
+    "보낼", "다닐", "만한", "괜찮은", "좋은", "새로", "서울", "서울시", "서울특별시",
+    "야", "요", "나요", "까", "줄래", "받는", "받아주는", "가능", "정보",
+}
+
+PARTICLE_SUFFIXES = ("에서", "으로", "이랑", "에", "의", "은", "는", "이", "가", "을", "를", "로", "도", "만", "랑")
+
+_TOKEN = re.compile(r"[가-힣A-Za-z0-9·]+")
+_CCTV_COUNT = re.compile(r"(?:cctv|씨씨티비|시시티비)\D{0,6}?(\d+)\s*대|(\d+)\s*대\s*이상")
+_DISTRICT_LIKE = re.compile(r"[가-힣]{2,4}구")
+
+
+@dataclass
+class QueryAnalysis:
+    """Analyzer output in the LLM's schema, with the share of the query explained"""
+
+    search_intent: str
+    filters: dict = field(default_factory=dict)
+    keywords: List[str] = field(default_factory=list)
+    confidence: float = 0.0
+    source: str = "rules"
+
+    def to_dict(self) -> dict:
+        return {
+            "search_intent": self.search_intent,
+            "filters": self.filters,
+            "keywords": self.keywords,
+            "confidence": self.confidence,
+            "source": self.source,
+        }
+
+
+def _spaced_pattern(term: str) -> str:
+    """
+    Regex matching term with optional whitespace between its characters
+
+    Numbers match whole ("1살" does not match inside "11살").
+    """
+    pattern = r"\s*".join(re.escape(char) for char in term if not char.isspace())
+    if term[0].isdigit():
+        pattern = r"(?<!\d)" + pattern
+    if term[-1].isdigit():
+        pattern += r"(?!\d)"
+    return pattern
+
+
+def _vocabulary(
+    variants: Dict[str, List[str]], word_start: bool = False
+) -> Tuple[re.Pattern, Dict[str, str]]:
+    """
+    One alternation per slot (longest variant first) and variant -> canonical value
+
+    With word_start, variants only match at the start of a word (대구 in
+    "대구 중구", not in "해운대구").
+    """
+    lookup = {}
+    for canonical, names in variants.items():
+        for name in names:
+            lookup[re.sub(r"\s+", "", name.lower())] = canonical
+    terms = sorted(lookup, key=len, reverse=True)
+    alternation = "|".join(_spaced_pattern(term) for term in terms)
+    if word_start:
+        alternation = rf"(?<![가-힣A-Za-z0-9])(?:{alternation})"
+    return re.compile(alternation), lookup
+
+
+_DISTRICTS = _vocabulary(DISTRICT_VARIANTS)
+_REGIONS = _vocabulary(REGION_VARIANTS, word_start=True)
+_TYPES = _vocabulary(TYPE_VARIANTS)
+_AGES = _vocabulary(AGE_VARIANTS)
+_SERVICES = _vocabulary(SERVICE_VARIANTS)
+_FLAGS = _vocabulary(
+    {
+        "has_playground": PLAYGROUND_VARIANTS,
+        "min_cctv": CCTV_VARIANTS,
+        "has_vehicle": VEHICLE_VARIANTS,
+        "has_vacancy": VACANCY_VARIANTS,
+        "compare": COMPARE_VARIANTS,
+        "general_info": INFO_VARIANTS,
+    }
+)
+
+# Keyword reported for a matched facility flag (as the LLM analyzer does)
+FLAG_KEYWORDS = {
+    "has_playground": "놀이터",
+    "min_cctv": "CCTV",
+    "has_vehicle": "통학차량",
+    "has_vacancy": "빈자리",
+}
+
+
+def normalize_query(query: str) -> str:
+    """NFC, lower-case, collapsed whitespace"""
+    query = unicodedata.normalize("NFC", query or "").lower()
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def _one_edit_district(token: str) -> Optional[str]:
+    """구 name one substitution away from a token ending in 구 (e.g. 마표구 -> 마포구)"""
+    if not _DISTRICT_LIKE.fullmatch(token):
+        return None
+    candidates = [
+        name
+        for name in SEOUL_DISTRICT_CODES
+        if len(name) == len(token) and sum(a != b for a, b in zip(name, token)) == 1
+    ]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def strip_particle(token: str) -> str:
+    """Token without a trailing particle ("강남구에서" -> "강남구")"""
+    for suffix in PARTICLE_SUFFIXES:
+        if token.endswith(suffix) and len(token) > len(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize_query(query: str) -> List[str]:
+    """Word tokens of a normalized query"""
+    return _TOKEN.findall(normalize_query(query))
+
+
+def token_slots(token: str) -> Dict[str, object]:
+    """
+    Filter values the dictionaries assign to one token
+
+    ("강남에" -> {"district": "강남구"}, "놀이터가" -> {"has_playground": True})
+    """
+    text = normalize_query(token)
+    slots = {}
+    for slot, vocabulary in [
+        ("region", _REGIONS),
+        ("district", _DISTRICTS),
+        ("type", _TYPES),
+        ("age", _AGES),
+        ("special_service", _SERVICES),
+    ]:
+        pattern, lookup = vocabulary
+        match = pattern.search(text)
+        if match:
+            slots[slot] = lookup[re.sub(r"\s+", "", match.group(0))]
+    pattern, lookup = _FLAGS
+    match = pattern.search(text)
+    if match and lookup[re.sub(r"\s+", "", match.group(0))] in FLAG_KEYWORDS:
+        slots[lookup[re.sub(r"\s+", "", match.group(0))]] = True
+    if "district" not in slots:
+        district = _one_edit_district(strip_particle(text))
+        if district:
+            slots["district"] = district
+    return slots
+
+
+class _Matcher:
+    """Marks matched characters of one normalized query"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.covered = [False] * len(text)
+
+    def find(self, vocabulary) -> List[str]:
+        """Canonical values of every non-overlapping match of a slot, in query order"""
+        pattern, lookup = vocabulary
+        values = []
+        for match in pattern.finditer(self.text):
+            if self.mark(match.start(), match.end()):
+                values.append(lookup[re.sub(r"\s+", "", match.group(0))])
+        return values
+
+    def mark(self, start: int, end: int) -> bool:
+        """Mark text[start:end] as explained (False if it overlaps an earlier match)"""
+        if any(self.covered[start:end]):
+            return False
+        self.covered[start:end] = [True] * (end - start)
+        return True
+
+    def token_parts(self) -> List[Tuple[bool, List[str]]]:
+        """Per word of the query: whether a slot matched part of it, and its unmatched pieces"""
+        parts = []
+        for match in _TOKEN.finditer(self.text):
+            covered = self.covered[match.start() : match.end()]
+            residual = "".join(" " if hit else char for char, hit in zip(match.group(0), covered))
+            parts.append((any(covered), _TOKEN.findall(residual)))
+        return parts
+
+
+def _dedupe(values: list) -> list:
+    return list(dict.fromkeys(values))
+
+
+def analyze_with_rules(query: str, address_filters: dict = None) -> QueryAnalysis:
+    """
+    Analyze a query with the dictionaries only (no LLM)
+
+    Confidence is the share of the query's content words (words that are not
+    only particles or request words) explained by matched vocabulary and
+    resolved 동/road names; a word with any unknown part (a non-Seoul 구,
+    free-text preferences) counts as unexplained, however short it is.
+
+    Args:
+        query: User query
+        address_filters: 동/road filters already resolved from the address
+            dictionary (their words count as explained)
+
+    Returns:
+        QueryAnalysis in the LLM analyzer's schema
+    """
+    address_filters = address_filters or {}
+    text = normalize_query(query)
+    if not text:
+        return QueryAnalysis("unknown")
+
+    matcher = _Matcher(text)
+    flags = matcher.find(_FLAGS)
+    cctv_count = _CCTV_COUNT.search(text) if "min_cctv" in flags else None
+    if cctv_count:
+        # "CCTV 5대 이상": the count next to the (already matched) CCTV word
+        matcher.mark(cctv_count.start(1) if cctv_count.group(1) else cctv_count.start(), cctv_count.end())
+    services = matcher.find(_SERVICES)
+    ages = matcher.find(_AGES)
+    types = matcher.find(_TYPES)
+    districts = matcher.find(_DISTRICTS)
+    regions = matcher.find(_REGIONS)
+
+    filters = {}
+    keywords = []
+    content_words = 0
+    explained_words = 0
+    place_found = bool(address_filters)
+
+    for matched, pieces in matcher.token_parts():
+        content = matched
+        unknown = False
+        for piece in pieces:
+            stem = strip_particle(piece)
+            district = _one_edit_district(stem)
+            if district:
+                districts.append(district)
+                content = True
+            elif piece in FILLER_WORDS or stem in FILLER_WORDS:
+                pass
+            elif address_filters and any(
+                normalize_dong(word) in address_filters.values()
+                or normalize_road(word) in address_filters.values()
+                for word in (piece, stem)
+            ):
+                place_found = True
+                content = True
+            else:
+                unknown = True
+                keywords.append(stem)
+        if unknown or content:
+            content_words += 1
+            explained_words += not unknown
+
+    regions = _dedupe(regions)
+    if regions:
+        filters["region"] = regions[0]
+    districts = _dedupe(districts)
+    if districts:
+        filters["district"] = districts[0]
+    types = _dedupe(types)
+    if types:
+        filters["type"] = types[0]
+        keywords.insert(0, types[0])
+    ages = _dedupe(ages)
+    if any(age in AGE_CLASS_COLUMNS for age in ages):
+        # "두살 아기": the specific age, not every 영아 class
+        ages = [age for age in ages if age in AGE_CLASS_COLUMNS]
+    if ages:
+        filters["age"] = ",".join(ages)
+    services = _dedupe(services)
+    if services:
+        filters["special_service"] = services[0]
+        keywords.append(services[0])
+
+    for flag in _dedupe(flags):
+        if flag == "min_cctv":
+            filters["min_cctv"] = (
+                int(cctv_count.group(1) or cctv_count.group(2)) if cctv_count else 1
+            )
+        elif flag in FLAG_KEYWORDS:
+            filters[flag] = True
+        if flag in FLAG_KEYWORDS:
+            keywords.append(FLAG_KEYWORDS[flag])
+
+    # Several regions, districts or types cannot be expressed as one filter
+    ambiguity = max(len(regions) - 1, 0) + max(len(districts) - 1, 0) + max(len(types) - 1, 0)
+
+    if "compare" in flags:
+        intent = "compare"
+    elif "general_info" in flags:
+        intent = "general_info"
+    elif districts or regions or place_found:
+        intent = "find_nearby"
+    elif types:
+        intent = "filter_type"
+    elif ages:
+        intent = "filter_age"
+    elif services or any(flag in FLAG_KEYWORDS for flag in flags):
+        intent = "filter_facility"
+    else:
+        intent = "unknown"
+
+    confidence = explained_words / content_words if content_words else 0.0
+    if intent == "unknown":
+        confidence = 0.0
+    confidence = max(confidence - 0.25 * ambiguity, 0.0)
+
+    return QueryAnalysis(intent, filters, _dedupe(keywords), round(confidence, 3))
@@ -0,0 +1,247 @@
+"""
+Filter Selectivity Statistics
+Per-attribute row counts used by the retrieval planner to estimate result sizes
+"""
+
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from database import DaycareCenter, FilterStatistic, get_session, get_data_version
+from utils.address import normalize_dong, normalize_road
+from utils.filters import AGE_CLASS_COLUMNS, resolve_age_classes, resolve_region_code
+
+TOTAL_ATTRIBUTE = "_total"
+ACTIVE_STATUS = "정상"
+
+# Selectivity assumed for filters without statistics
+DEFAULT_SELECTIVITY = 0.5
+
+
+def compute_filter_statistics(session: Session) -> Dict[str, Dict[str, int]]:
+    """
+    Count active daycare centers per filterable attribute value
+
+    Args:
+        session: Database session
+
+    Returns:
+        {attribute: {value: row_count}}
+    """
+    active = DaycareCenter.crstatusname == ACTIVE_STATUS
+    counts: Dict[str, Dict[str, int]] = defaultdict(dict)
+
+    total = session.query(func.count(DaycareCenter.id)).filter(active).scalar() or 0
+    counts[TOTAL_ATTRIBUTE]["active"] = total
+
+    for attribute, column in (
+        ("region", DaycareCenter.region_code),
+        ("district", DaycareCenter.sigunname),
+        ("dong", DaycareCenter.dong_name),
+        ("road", DaycareCenter.road_name),
+        ("type", DaycareCenter.crtypename),
+        ("cctv", DaycareCenter.cctvinstlcnt),
+    ):
+        rows = (
+            session.query(column, func.count(DaycareCenter.id))
+            .filter(active, column.isnot(None))
+            .group_by(column)
+            .all()
+        )
+        counts[attribute] = {str(value): count for value, count in rows}
+
+    for age, column_name in AGE_CLASS_COLUMNS.items():
+        column = getattr(DaycareCenter, column_name)
+        counts["age"][age] = (
+            session.query(func.count(DaycareCenter.id)).filter(active, column > 0).scalar()
+            or 0
+        )
+
+    counts["has_playground"]["true"] = (
+        session.query(func.count(DaycareCenter.id))
+        .filter(active, DaycareCenter.plgrdco > 0)
+        .scalar()
+        or 0
+    )
+    counts["has_vehicle"]["true"] = (
+        session.query(func.count(DaycareCenter.id))
+        .filter(active, DaycareCenter.crcargbname.isnot(None))
+        .scalar()
+        or 0
+    )
+
+    # crspec holds comma-separated service names; count each service once per row
+    services: Dict[str, int] = defaultdict(int)
+    rows = (
+        session.query(DaycareCenter.crspec, func.count(DaycareCenter.id))
+        .filter(active, DaycareCenter.crspec.isnot(None))
+        .group_by(DaycareCenter.crspec)
+        .all()
+    )
+    for crspec, count in rows:
+        for service in {s.strip() for s in crspec.split(",") if s.strip()}:
+            services[service] += count
+    counts["special_service"] = dict(services)
+
+    return dict(counts)
+
+
+def refresh_filter_statistics(session: Session) -> int:
+    """
+    Recompute and store filter statistics (called after ingest, caller commits)
+
+    Returns:
+        Number of statistic rows written
+    """
+    counts = compute_filter_statistics(session)
+
+    session.query(FilterStatistic).delete()
+    rows = [
+        FilterStatistic(attribute=attribute, value=value, row_count=count)
+        for attribute, values in counts.items()
+        for value, count in values.items()
+    ]
+    session.add_all(rows)
+
+    return len(rows)
+
+
+class SelectivityStats:
+    """In-memory view of filter statistics with row-count estimation"""
+
+    def __init__(self, counts: Dict[str, Dict[str, int]], data_version: int = 0):
+        self.counts = counts
+        self.data_version = data_version
+        self.total = counts.get(TOTAL_ATTRIBUTE, {}).get("active", 0)
+
+    @classmethod
+    def load(cls, session: Session) -> "SelectivityStats":
+        """Load statistics stored by the last ingest"""
+        counts: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for stat in session.query(FilterStatistic).all():
+            counts[stat.attribute][stat.value] = stat.row_count
+        return cls(dict(counts), get_data_version(session))
+
+    @property
+    def available(self) -> bool:
+        """Whether statistics exist"""
+        return self.total > 0
+
+    def _fraction(self, count: float) -> float:
+        return min(1.0, count / self.total) if self.total else DEFAULT_SELECTIVITY
+
+    def _substring_fraction(self, attribute: str, needle: str) -> float:
+        """Fraction of rows matching LIKE '%needle%' on the attribute"""
+        values = self.counts.get(attribute)
+        if not values:
+            return DEFAULT_SELECTIVITY
+        matched = sum(count for value, count in values.items() if needle in value)
+        return self._fraction(matched)
+
+    def selectivity(self, attribute: str, value) -> float:
+        """
+        Estimate the fraction of active rows passing a single filter
+
+        Args:
+            attribute: Filter name as produced by the query analyzer
+            value: Filter value
+
+        Returns:
+            Selectivity in [0, 1]
+        """
+        if not self.available:
+            return DEFAULT_SELECTIVITY
+
+        if attribute == "region":
+            region_code = resolve_region_code(str(value))
+            if not region_code:
+                return 1.0
+            return self._fraction(self.counts.get("region", {}).get(region_code, 0))
+
+        if attribute in ("district", "type", "special_service"):
+            return self._substring_fraction(attribute, str(value))
+
+        if attribute in ("dong", "road"):
+            normalize = normalize_dong if attribute == "dong" else normalize_road
+            return self._fraction(self.counts.get(attribute, {}).get(normalize(str(value)), 0))
+
+        if attribute == "age":
+            ages = resolve_age_classes(str(value))
+            if not ages:
+                return 1.0
+            # Union of age classes (independence assumption)
+            miss = 1.0
+            for age in ages:
+                miss *= 1.0 - self._fraction(self.counts.get("age", {}).get(age, 0))
+            return 1.0 - miss
+
+        if attribute in ("has_playground", "has_vehicle"):
+            if not value:
+                return 1.0
+            return self._fraction(self.counts.get(attribute, {}).get("true", 0))
+
+        if attribute == "min_cctv":
+            try:
+                threshold = int(value)
+            except (TypeError, ValueError):
+                return 1.0
+            histogram = self.counts.get("cctv", {})
+            matched = sum(
+                count for cctv, count in histogram.items() if int(float(cctv)) >= threshold
+            )
+            return self._fraction(matched)
+
+        return 1.0
+
+    def estimate_rows(self, filters: dict) -> float:
+        """
+        Estimate the number of active rows matching all filters
+
+        Args:
+            filters: Filter dict from the query analyzer
+
+        Returns:
+            Estimated row count
+        """
+        estimate = float(self.total)
+        for attribute, value in (filters or {}).items():
+            if value in (None, "", False):
+                continue
+            estimate *= self.selectivity(attribute, value)
+        return estimate
+
+
+# Global statistics cache
+_stats_cache: Optional[SelectivityStats] = None
+
+
+def get_selectivity_stats(session: Session = None) -> SelectivityStats:
+    """
+    Get cached statistics, reloading when the data version changes
+
+    Args:
+        session: Optional database session (a new one is opened if omitted)
+    """
+    global _stats_cache
+
+    own_session = session is None
+    if own_session:
+        session = get_session()
+
+    try:
+        version = get_data_version(session)
+        if _stats_cache is None or _stats_cache.data_version != version:
+            _stats_cache = SelectivityStats.load(session)
+        return _stats_cache
+    except Exception as e:
+        # Database predates the statistics tables: plan without estimates
+        print(f"[WARN]  Filter statistics unavailable: {e}")
+        return SelectivityStats({})
+    finally:
+        if own_session:
+            session.close()
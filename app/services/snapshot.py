@@ -0,0 +1,334 @@
+"""
+In-memory Columnar Snapshot
+Read-only NumPy copy of the daycare table for vectorized filtering
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, Integer, String, Text, select
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+from database import DaycareCenter, DaycareFeatures, get_session, get_data_version
+from database.projection import FULL_FIELDS
+from services.features import FEATURES, quality_scores
+from utils.address import normalize_dong, normalize_road
+from utils.filters import (
+    AGE_CLASS_COLUMNS,
+    age_bit,
+    age_mask_for_filter,
+    resolve_location,
+    resolve_service_mask,
+    resolve_type_codes,
+    resolve_vacancy_columns,
+)
+
+ACTIVE_STATUS = "정상"
+_IN_CHUNK = 500
+
+
+class DaycareSnapshot:
+    """
+    Columnar snapshot of the daycare_centers table
+
+    String columns are dictionary-encoded (int32 codes into a vocabulary,
+    -1 for NULL), numeric columns are float64 arrays (NaN for NULL), and
+    status/facility/age flags are precomputed boolean masks. Filters are
+    evaluated as mask operations; rows are only materialized for the final
+    results. Quality scores (services/features.py) are aligned to the rows.
+    """
+
+    def __init__(self, frame: pd.DataFrame, data_version: int = 0, features: pd.DataFrame = None):
+        self.data_version = data_version
+        self.size = len(frame)
+        self.loaded_at = time.time()
+
+        self.codes: Dict[str, np.ndarray] = {}
+        self.vocabularies: Dict[str, np.ndarray] = {}
+        self.numbers: Dict[str, np.ndarray] = {}
+        self.objects: Dict[str, np.ndarray] = {}
+        self.integer_columns = set()
+
+        for column in DaycareCenter.__table__.columns:
+            values = frame[column.name] if column.name in frame else pd.Series(
+                [None] * self.size, dtype=object
+            )
+            if isinstance(column.type, (String, Text)):
+                codes, vocabulary = pd.factorize(values, use_na_sentinel=True)
+                self.codes[column.name] = codes.astype(np.int32)
+                self.vocabularies[column.name] = np.asarray(vocabulary, dtype=object)
+            elif isinstance(column.type, (Integer, Float)):
+                self.numbers[column.name] = pd.to_numeric(values, errors="coerce").to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                )
+                if isinstance(column.type, Integer):
+                    self.integer_columns.add(column.name)
+            else:
+                self.objects[column.name] = values.to_numpy(dtype=object)
+
+        self.stcodes = self.column_values("stcode")
+        self.positions = {stcode: i for i, stcode in enumerate(self.stcodes)}
+
+        # Bit columns as integers for bitwise tests
+        self.age_masks = np.nan_to_num(self.numbers["age_mask"]).astype(np.int64)
+        self.service_masks = np.nan_to_num(self.numbers["service_mask"]).astype(np.int64)
+        self.type_codes = np.nan_to_num(self.numbers["type_code"], nan=-1).astype(np.int64)
+
+        # Precomputed boolean masks
+        self.masks: Dict[str, np.ndarray] = {
+            "active": self.equals("crstatusname", ACTIVE_STATUS),
+            "has_playground": np.nan_to_num(self.numbers["plgrdco"]) > 0,
+            "has_vehicle": self.codes["crcargbname"] >= 0,
+        }
+        for age in AGE_CLASS_COLUMNS:
+            self.masks[f"age:{age}"] = (self.age_masks & age_bit(age)) != 0
+
+        # District percentiles aligned to rows (NaN for centers without features)
+        percentile_columns = [percentile for _, percentile, _ in FEATURES.values()]
+        if features is None:
+            features = pd.DataFrame(columns=["stcode"] + percentile_columns)
+        aligned = features.set_index("stcode").reindex(index=self.stcodes, columns=percentile_columns)
+        self.percentiles = {
+            name: pd.to_numeric(aligned[name], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            for name in percentile_columns
+        }
+        self.quality_scores = quality_scores(self.percentiles)
+
+    @classmethod
+    def load(
+        cls, session: Session, data_version: int = None, stcodes: List[str] = None
+    ) -> "DaycareSnapshot":
+        """
+        Read the whole table into a snapshot
+
+        Args:
+            session: Database session
+            data_version: Version to record (default: current data version)
+            stcodes: Only read these centers (e.g. the rows changed by an ingest)
+        """
+        if data_version is None:
+            data_version = get_data_version(session)
+        columns = list(DaycareCenter.__table__.columns)
+        feature_columns = [DaycareFeatures.stcode] + [
+            getattr(DaycareFeatures, percentile) for _, percentile, _ in FEATURES.values()
+        ]
+        statement = select(*columns).order_by(DaycareCenter.id)
+        feature_statement = select(*feature_columns)
+
+        if stcodes is None:
+            rows = session.execute(statement).all()
+            feature_rows = session.execute(feature_statement).all()
+        else:
+            rows, feature_rows = [], []
+            for start in range(0, len(stcodes), _IN_CHUNK):
+                chunk = list(stcodes[start : start + _IN_CHUNK])
+                rows += session.execute(statement.where(DaycareCenter.stcode.in_(chunk))).all()
+                feature_rows += session.execute(
+                    feature_statement.where(DaycareFeatures.stcode.in_(chunk))
+                ).all()
+
+        frame = pd.DataFrame.from_records(rows, columns=[c.name for c in columns])
+        features = pd.DataFrame.from_records(feature_rows, columns=[c.name for c in feature_columns])
+        return cls(frame, data_version, features)
+
+    def column_values(self, name: str) -> np.ndarray:
+        """Decode a dictionary-encoded column into an object array"""
+        codes = self.codes[name]
+        vocabulary = np.append(self.vocabularies[name], None)
+        return vocabulary[codes]  # code -1 selects the trailing None
+
+    def equals(self, name: str, value: str) -> np.ndarray:
+        """Rows whose string column equals value"""
+        matches = np.flatnonzero(self.vocabularies[name] == value)
+        if len(matches) == 0:
+            return np.zeros(self.size, dtype=bool)
+        return self.codes[name] == matches[0]
+
+    def contains(self, name: str, needle: str) -> np.ndarray:
+        """Rows whose string column contains needle (LIKE '%needle%')"""
+        needle = needle.lower()
+        matching_codes = [
+            code
+            for code, value in enumerate(self.vocabularies[name])
+            if needle in str(value).lower()
+        ]
+        return np.isin(self.codes[name], matching_codes)
+
+    def filter_mask(self, filters: dict) -> np.ndarray:
+        """
+        Evaluate analyzer filters as a boolean row mask
+
+        Mirrors build_filter_conditions() in the retriever: code columns for
+        known values, substring matches on the raw text otherwise.
+
+        Args:
+            filters: Filter dict (region, district, type, age, has_playground, ...)
+
+        Returns:
+            Boolean array, True for matching active centers
+        """
+        filters = filters or {}
+        mask = self.masks["active"].copy()
+
+        region_code, district, district_code = resolve_location(filters)
+        if district_code:
+            mask &= self.equals("district_code", district_code)
+        else:
+            if region_code:
+                mask &= self.equals("region_code", region_code)
+            if district:
+                mask &= self.contains("sigunname", district)
+
+        if filters.get("dong"):
+            mask &= self.equals("dong_name", normalize_dong(str(filters["dong"])))
+        if filters.get("road"):
+            mask &= self.equals("road_name", normalize_road(str(filters["road"])))
+
+        type_name = filters.get("type")
+        if type_name:
+            type_codes = resolve_type_codes(type_name)
+            if type_codes:
+                mask &= np.isin(self.type_codes, type_codes)
+            else:
+                mask &= self.contains("crtypename", type_name)
+
+        age_mask = age_mask_for_filter(filters.get("age"))
+        if age_mask:
+            mask &= (self.age_masks & age_mask) != 0
+
+        if filters.get("has_vacancy"):
+            with np.errstate(invalid="ignore"):
+                mask &= np.logical_or.reduce(
+                    [self.numbers[name] > 0 for name in resolve_vacancy_columns(filters.get("age"))]
+                )
+
+        if filters.get("has_playground"):
+            mask &= self.masks["has_playground"]
+
+        if filters.get("min_cctv"):
+            with np.errstate(invalid="ignore"):
+                mask &= self.numbers["cctvinstlcnt"] >= int(filters["min_cctv"])
+
+        if filters.get("has_vehicle"):
+            mask &= self.masks["has_vehicle"]
+
+        special_service = filters.get("special_service")
+        if special_service:
+            service_mask = resolve_service_mask(special_service)
+            if service_mask:
+                mask &= (self.service_masks & service_mask) != 0
+            else:
+                mask &= self.contains("crspec", special_service)
+
+        return mask
+
+    def positions_for(self, stcodes: List[str]) -> np.ndarray:
+        """Row positions of the given stcodes (unknown codes are skipped)"""
+        return np.array(
+            [self.positions[s] for s in stcodes if s in self.positions], dtype=np.int64
+        )
+
+    def _value(self, name: str, i: int):
+        if name in self.codes:
+            code = self.codes[name][i]
+            return None if code < 0 else self.vocabularies[name][code]
+        if name in self.numbers:
+            value = self.numbers[name][i]
+            if np.isnan(value):
+                return None
+            return int(value) if name in self.integer_columns else float(value)
+        value = self.objects[name][i]
+        return None if pd.isna(value) else value
+
+    def row(self, i: int, fields: List[str] = None) -> dict:
+        """Materialize one row (default: same shape as DaycareCenter.to_dict())"""
+        row = {name: self._value(name, i) for name in (fields or FULL_FIELDS)}
+        for name in ("created_at", "updated_at"):
+            if row.get(name) is not None:
+                row[name] = pd.Timestamp(row[name]).to_pydatetime().isoformat()
+        return row
+
+    def order_by_quality(self, positions: np.ndarray) -> np.ndarray:
+        """Positions sorted by quality score, best first (stable)"""
+        return positions[np.argsort(-self.quality_scores[positions], kind="stable")]
+
+    def rows(self, positions, fields: List[str] = None) -> List[dict]:
+        """Materialize rows in the given order, optionally only some fields"""
+        return [self.row(int(i), fields) for i in positions]
+
+
+# Global snapshot cache
+_snapshot: Optional[DaycareSnapshot] = None
+_checked_at: Optional[float] = None  # last version check, successful or not
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot(session: Session = None) -> Optional[DaycareSnapshot]:
+    """
+    Get the cached snapshot, reloading when the data version changes
+
+    The data version is checked at most every SNAPSHOT_VERSION_CHECK_SECONDS,
+    so most calls touch no database at all. A failed load counts as a check:
+    the previous snapshot (or None) is served until the next interval.
+
+    Args:
+        session: Optional database session (a new one is opened if omitted)
+
+    Returns:
+        DaycareSnapshot, or None if disabled or no snapshot could be loaded yet
+    """
+    global _snapshot, _checked_at
+
+    if not settings.SNAPSHOT_ENABLED:
+        return None
+
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at < settings.SNAPSHOT_VERSION_CHECK_SECONDS:
+        return _snapshot
+
+    with _snapshot_lock:
+        if _checked_at is not None and now - _checked_at < settings.SNAPSHOT_VERSION_CHECK_SECONDS:
+            return _snapshot
+
+        own_session = session is None
+        if own_session:
+            session = get_session()
+
+        try:
+            version = get_data_version(session)
+            if _snapshot is None or _snapshot.data_version != version:
+                started = time.perf_counter()
+                _snapshot = DaycareSnapshot.load(session, version)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"[OK] Columnar snapshot loaded: {_snapshot.size:,} rows "
+                    f"(data version {version}, {elapsed:.2f}s)"
+                )
+            _checked_at = now
+            return _snapshot
+        except Exception as e:
+            _checked_at = now
+            if _snapshot is not None:
+                print(f"[WARN]  Columnar snapshot reload failed, serving data version {_snapshot.data_version}: {e}")
+            else:
+                print(f"[WARN]  Columnar snapshot unavailable: {e}")
+            return _snapshot
+        finally:
+            if own_session:
+                session.close()
+
+
+def reset_snapshot():
+    """Drop the cached snapshot (the next get_snapshot() reloads it)"""
+    global _snapshot, _checked_at
+
+    with _snapshot_lock:
+        _snapshot = None
+        _checked_at = None
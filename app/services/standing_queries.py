@@ -0,0 +1,333 @@
+"""
+Standing Queries
+Saved searches re-evaluated incrementally against the rows an ingest changed
+"""
+
+import json
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+from database import StandingQuery, StandingQueryEvent, StandingQueryMatch, get_data_version
+from services.embeddings import create_embedding_service
+from services.ingest import EMBEDDING_COLUMNS
+from services.snapshot import DaycareSnapshot
+from utils.filters import resolve_location
+
+EVENT_MATCH = "match"
+EVENT_UNMATCH = "unmatch"
+GLOBAL_PARTITION = "*"
+
+_IN_CHUNK = 500
+
+
+@dataclass
+class StandingQueryReport:
+    """Work done by one match_changes() call"""
+
+    changed_rows: int = 0
+    candidate_queries: int = 0
+    filter_groups: int = 0
+    matches: int = 0
+    unmatches: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "changed_rows": self.changed_rows,
+            "candidate_queries": self.candidate_queries,
+            "filter_groups": self.filter_groups,
+            "matches": self.matches,
+            "unmatches": self.unmatches,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+def canonical_filters(filters: dict) -> dict:
+    """Drop empty values and sort keys, so equal searches share one evaluation"""
+    return {key: filters[key] for key in sorted(filters or {}) if filters[key]}
+
+
+def partition_key(filters: dict) -> str:
+    """Narrowest partition a search can match in: d:<district code>, r:<region code> or *"""
+    region_code, _, district_code = resolve_location(filters)
+    if district_code:
+        return f"d:{district_code}"
+    if region_code:
+        return f"r:{region_code}"
+    return GLOBAL_PARTITION
+
+
+def _chunks(items: list, size: int = _IN_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class _RowEmbeddings:
+    """Embeddings of a snapshot's rows, computed once on first use"""
+
+    def __init__(self, snapshot: DaycareSnapshot, embedding_service=None):
+        self.snapshot = snapshot
+        self.embedding_service = embedding_service
+        self.vectors = None
+
+    def distances(self, query_embedding: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Squared L2 distances of the rows at positions to a query embedding"""
+        if self.vectors is None:
+            if self.embedding_service is None:
+                self.embedding_service = create_embedding_service()
+            texts = [
+                " ".join(str(row[name]) for name in EMBEDDING_COLUMNS if row[name])
+                for row in self.snapshot.rows(range(self.snapshot.size), EMBEDDING_COLUMNS)
+            ]
+            self.vectors = np.asarray(self.embedding_service.embed_batch(texts), dtype=np.float32)
+        return ((self.vectors[positions] - query_embedding) ** 2).sum(axis=1)
+
+
+def _evaluate(
+    snapshot: DaycareSnapshot, standing: StandingQuery, masks: Dict[str, np.ndarray], embeddings: _RowEmbeddings
+) -> Set[str]:
+    """stcodes of the snapshot rows a standing query matches"""
+    if standing.filters not in masks:
+        masks[standing.filters] = np.flatnonzero(snapshot.filter_mask(json.loads(standing.filters)))
+    positions = masks[standing.filters]
+
+    if standing.embedding and len(positions):
+        max_distance = (
+            settings.STANDING_QUERY_MAX_DISTANCE if standing.max_distance is None else standing.max_distance
+        )
+        query_embedding = np.asarray(json.loads(standing.embedding), dtype=np.float32)
+        positions = positions[embeddings.distances(query_embedding, positions) <= max_distance]
+
+    return set(snapshot.stcodes[positions].tolist())
+
+
+def register_standing_query(
+    session: Session,
+    filters: dict = None,
+    query: str = None,
+    name: str = None,
+    subscriber: str = None,
+    max_distance: float = None,
+    embedding_service=None,
+) -> StandingQuery:
+    """
+    Save a search and record the centers it matches now (caller commits)
+
+    Current matches are stored without events; later ingests only report
+    centers that start or stop matching.
+
+    Args:
+        session: Database session
+        filters: Search filters (district, type, age, has_vacancy, ...)
+        query: Optional free text, matched by embedding distance
+        name: Display name
+        subscriber: Who to notify
+        max_distance: Squared L2 limit for query matches (default: STANDING_QUERY_MAX_DISTANCE)
+        embedding_service: Embedding service for query text (default: configured backend)
+
+    Returns:
+        The saved StandingQuery
+
+    Raises:
+        ValueError: If neither filters nor query are given
+    """
+    filters = canonical_filters(filters)
+    if not filters and not query:
+        raise ValueError("A standing query needs filters or query text")
+
+    embedding_service = embedding_service or (create_embedding_service() if query else None)
+    embedding = None
+    if query:
+        vector = embedding_service.embed_text(query)
+        embedding = json.dumps([round(float(value), 6) for value in vector])
+
+    version = get_data_version(session)
+    standing = StandingQuery(
+        name=name,
+        subscriber=subscriber,
+        filters=json.dumps(filters, ensure_ascii=False, sort_keys=True),
+        query=query,
+        embedding=embedding,
+        max_distance=max_distance,
+        partition_key=partition_key(filters),
+        active=True,
+        data_version=version,
+    )
+    session.add(standing)
+    session.flush()
+
+    snapshot = DaycareSnapshot.load(session, version)
+    matched = _evaluate(snapshot, standing, {}, _RowEmbeddings(snapshot, embedding_service))
+    if matched:
+        session.execute(
+            insert(StandingQueryMatch),
+            [{"query_id": standing.id, "stcode": stcode, "data_version": version} for stcode in sorted(matched)],
+        )
+    return standing
+
+
+def match_changes(
+    session: Session, stcodes: Iterable[str], data_version: int = None, embedding_service=None
+) -> StandingQueryReport:
+    """
+    Re-evaluate standing queries against changed rows and emit events (caller commits)
+
+    Only the changed rows are read into a small snapshot. Candidate queries
+    are those registered in a partition (district, region or global) one of
+    the rows falls in, plus those a changed row currently matches, and
+    queries with identical filters share one mask evaluation - so the work
+    grows with the changed rows, not with table size x registered queries.
+
+    Args:
+        session: Database session
+        stcodes: Centers inserted, updated or closed (ChangeManifest.changed_stcodes)
+        data_version: Version recorded on events (default: current data version)
+        embedding_service: Used only if a candidate query has query text
+
+    Returns:
+        StandingQueryReport
+    """
+    report = StandingQueryReport()
+    started = time.perf_counter()
+    stcodes = list(dict.fromkeys(stcodes or []))
+    report.changed_rows = len(stcodes)
+    if not stcodes:
+        return report
+
+    if data_version is None:
+        data_version = get_data_version(session)
+    snapshot = DaycareSnapshot.load(session, data_version, stcodes)
+
+    partitions = {GLOBAL_PARTITION}
+    partitions.update(f"d:{code}" for code in snapshot.column_values("district_code") if code)
+    partitions.update(f"r:{code}" for code in snapshot.column_values("region_code") if code)
+
+    # Matches the changed rows had before this ingest, per query
+    previous: Dict[int, Set[str]] = defaultdict(set)
+    for chunk in _chunks(stcodes):
+        rows = session.execute(
+            select(StandingQueryMatch.query_id, StandingQueryMatch.stcode).where(
+                StandingQueryMatch.stcode.in_(chunk)
+            )
+        )
+        for query_id, stcode in rows:
+            previous[query_id].add(stcode)
+
+    candidates = session.scalars(
+        select(StandingQuery)
+        .where(
+            StandingQuery.active.is_(True),
+            or_(StandingQuery.partition_key.in_(partitions), StandingQuery.id.in_(list(previous))),
+        )
+        .order_by(StandingQuery.id)
+    ).all()
+
+    masks: Dict[str, np.ndarray] = {}
+    embeddings = _RowEmbeddings(snapshot, embedding_service)
+    events, added = [], []
+    for standing in candidates:
+        matched = _evaluate(snapshot, standing, masks, embeddings)
+        before = previous.get(standing.id, set())
+
+        for stcode in sorted(matched - before):
+            events.append(
+                {"query_id": standing.id, "stcode": stcode, "event": EVENT_MATCH, "data_version": data_version}
+            )
+            added.append({"query_id": standing.id, "stcode": stcode, "data_version": data_version})
+
+        removed = sorted(before - matched)
+        for stcode in removed:
+            events.append(
+                {"query_id": standing.id, "stcode": stcode, "event": EVENT_UNMATCH, "data_version": data_version}
+            )
+        if removed:
+            session.execute(
+                delete(StandingQueryMatch).where(
+                    StandingQueryMatch.query_id == standing.id, StandingQueryMatch.stcode.in_(removed)
+                )
+            )
+
+        standing.data_version = data_version
+        report.unmatches += len(removed)
+
+    if added:
+        session.execute(insert(StandingQueryMatch), added)
+    if events:
+        session.execute(insert(StandingQueryEvent), events)
+
+    report.candidate_queries = len(candidates)
+    report.filter_groups = len(masks)
+    report.matches = len(added)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def remove_standing_query(session: Session, query_id: int) -> bool:
+    """Delete a standing query with its matches and events (caller commits)"""
+    standing = session.get(StandingQuery, query_id)
+    if standing is None:
+        return False
+    session.execute(delete(StandingQueryMatch).where(StandingQueryMatch.query_id == query_id))
+    session.execute(delete(StandingQueryEvent).where(StandingQueryEvent.query_id == query_id))
+    session.delete(standing)
+    return True
+
+
+def list_standing_queries(session: Session) -> List[dict]:
+    """Registered standing queries with their current match counts"""
+    counts = dict(
+        session.execute(
+            select(StandingQueryMatch.query_id, func.count()).group_by(StandingQueryMatch.query_id)
+        ).all()
+    )
+    return [
+        {
+            "id": standing.id,
+            "name": standing.name,
+            "subscriber": standing.subscriber,
+            "filters": json.loads(standing.filters),
+            "query": standing.query,
+            "partition_key": standing.partition_key,
+            "active": standing.active,
+            "data_version": standing.data_version,
+            "matches": counts.get(standing.id, 0),
+        }
+        for standing in session.scalars(select(StandingQuery).order_by(StandingQuery.id))
+    ]
+
+
+def fetch_events(session: Session, query_id: int = None, after_id: int = 0, limit: int = 100) -> List[dict]:
+    """
+    Events after a given event id, oldest first (poll with the last id seen)
+
+    Args:
+        session: Database session
+        query_id: Only events of this standing query
+        after_id: Return events with a larger id
+        limit: Maximum events
+    """
+    statement = select(StandingQueryEvent).where(StandingQueryEvent.id > after_id)
+    if query_id is not None:
+        statement = statement.where(StandingQueryEvent.query_id == query_id)
+    events = session.scalars(statement.order_by(StandingQueryEvent.id).limit(limit))
+    return [
+        {
+            "id": event.id,
+            "query_id": event.query_id,
+            "stcode": event.stcode,
+            "event": event.event,
+            "data_version": event.data_version,
+            "created_at": event.created_at.isoformat() if event.created_at else None,
+        }
+        for event in events
+    ]
@@ -0,0 +1,315 @@
+"""
+Materialized Statistics Cube
+Pre-aggregated counts and sums per region x district x type x age slice x facility flags
+"""
+
+import sys
+import threading
+import weakref
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from database import DaycareCenter, StatsCube, get_data_version, get_meta, set_meta
+from utils.filters import (
+    AGE_CLASS_COLUMNS,
+    AGE_GROUPS,
+    age_bit,
+    age_mask_for_filter,
+    resolve_region_code,
+)
+
+ACTIVE_STATUS = "정상"
+# Meta key holding the data version the stored cube (age-slice layout) was built for
+CUBE_VERSION_KEY = "stats_cube_slice_version"
+
+# Drill-down dimension -> cube column
+DIMENSIONS = {
+    "region": "region_code",
+    "district": "sigunname",
+    "type": "crtypename",
+    "age": "age_mask",
+    "has_playground": "has_playground",
+    "has_vehicle": "has_vehicle",
+    "has_cctv": "has_cctv",
+}
+MEASURES = ["center_count", "capacity_sum", "enrollment_sum", "staff_sum"]
+FLAG_DIMENSIONS = ["has_playground", "has_vehicle", "has_cctv"]
+
+# Age slices of the cube (age_mask column): 0 counts every center once, a single
+# bit counts the centers with that age class, a group mask (영아/유아) the centers
+# with any class of the group
+CLASS_SLICES = {age_bit(age): age for age in AGE_CLASS_COLUMNS}
+GROUP_SLICES = {age_mask_for_filter(group): group for group in AGE_GROUPS}
+
+# Cube cells per engine for the data version they were loaded for:
+# {engine: (data version, cells)}
+_cells_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_cells_lock = threading.Lock()
+
+
+def _age_slices(age_mask: int) -> List[int]:
+    """Cube age slices a center with the given age classes belongs to"""
+    slices = [0]
+    slices.extend(bit for bit in CLASS_SLICES if age_mask & bit)
+    slices.extend(mask for mask in GROUP_SLICES if age_mask & mask)
+    return slices
+
+
+def compute_stats_cube(session: Session) -> List[dict]:
+    """
+    Aggregate active daycare centers into cube cells (one GROUP BY scan)
+
+    The scan groups by the full age class mask; each group is then folded
+    into the age slices it belongs to, so the cube has at most
+    1 + 6 + 2 age values per combination of the other dimensions.
+
+    Returns:
+        List of cell dicts (dimension columns + measures)
+    """
+    flags = {
+        "has_playground": case((DaycareCenter.plgrdco > 0, True), else_=False),
+        "has_vehicle": case((DaycareCenter.crcargbname.isnot(None), True), else_=False),
+        "has_cctv": case((DaycareCenter.cctvinstlcnt > 0, True), else_=False),
+    }
+    age_mask = func.coalesce(DaycareCenter.age_mask, 0)
+    keys = [
+        DaycareCenter.region_code.label("region_code"),
+        DaycareCenter.sigunname.label("sigunname"),
+        DaycareCenter.crtypename.label("crtypename"),
+        age_mask.label("age_mask"),
+        *(expression.label(name) for name, expression in flags.items()),
+    ]
+    statement = (
+        select(
+            *keys,
+            func.count(DaycareCenter.id).label("center_count"),
+            func.coalesce(func.sum(DaycareCenter.crcapat), 0).label("capacity_sum"),
+            func.coalesce(func.sum(DaycareCenter.crchcnt), 0).label("enrollment_sum"),
+            func.coalesce(func.sum(DaycareCenter.chcrtescnt), 0).label("staff_sum"),
+        )
+        .where(DaycareCenter.crstatusname == ACTIVE_STATUS)
+        .group_by(*keys)
+    )
+
+    cells: Dict[tuple, dict] = {}
+    for row in session.execute(statement):
+        group = dict(row._mapping)
+        for name in FLAG_DIMENSIONS:
+            group[name] = bool(group[name])
+        dimensions = {column: group[column] for column in DIMENSIONS.values()}
+        for age_slice in _age_slices(group["age_mask"]):
+            dimensions["age_mask"] = age_slice
+            cell_key = tuple(dimensions.values())
+            cell = cells.get(cell_key)
+            if cell is None:
+                cell = cells[cell_key] = dict(dimensions, **dict.fromkeys(MEASURES, 0))
+            for measure in MEASURES:
+                cell[measure] += group[measure] or 0
+    return list(cells.values())
+
+
+def refresh_stats_cube(session: Session, data_version: int = None, cells: List[dict] = None) -> int:
+    """
+    Rebuild the stats_cube table for the current data (caller commits)
+
+    Called from the ingest/preprocess scripts after the data version is bumped;
+    read paths never write the cube.
+
+    Args:
+        session: Database session
+        data_version: Version the cube is built for (default: current)
+        cells: Already computed cells (default: computed here)
+
+    Returns:
+        Number of cube cells written
+    """
+    if data_version is None:
+        data_version = get_data_version(session)
+
+    if cells is None:
+        cells = compute_stats_cube(session)
+    session.query(StatsCube).delete()
+    session.add_all(StatsCube(**cell) for cell in cells)
+    set_meta(session, CUBE_VERSION_KEY, str(data_version))
+
+    with _cells_lock:
+        _cells_cache.pop(session.get_bind().engine, None)
+
+    return len(cells)
+
+
+def _stored_cells(session: Session) -> List[dict]:
+    columns = [getattr(StatsCube, name) for name in list(DIMENSIONS.values()) + MEASURES]
+    return [dict(row._mapping) for row in session.execute(select(*columns))]
+
+
+def load_stats_cube(session: Session) -> List[dict]:
+    """
+    Cube cells for the current data version, kept in memory per version
+
+    The stored cube is read once per data version. If it predates the
+    current version (ingest ran without refreshing it, or the cube layout
+    changed), the cells are computed in memory for that version instead;
+    the table is only rewritten by refresh_stats_cube at ingest time.
+
+    Returns:
+        List of cube cell dicts
+    """
+    version = str(get_data_version(session))
+    engine = session.get_bind().engine
+    with _cells_lock:
+        entry = _cells_cache.get(engine)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    if get_meta(session, CUBE_VERSION_KEY) == version:
+        cells = _stored_cells(session)
+    else:
+        print(
+            f"[WARN]  Stats cube is not built for data version {version}, "
+            "serving computed cells from memory (run scripts/preprocess_data.py to store it)"
+        )
+        cells = compute_stats_cube(session)
+
+    with _cells_lock:
+        _cells_cache[engine] = (version, cells)
+    return cells
+
+
+def _matches(cell: dict, filters: dict) -> bool:
+    """Whether a cube cell satisfies drill-down filters"""
+    region = filters.get("region")
+    if region and cell["region_code"] != (resolve_region_code(region) or region):
+        return False
+
+    district = filters.get("district")
+    if district and district not in (cell["sigunname"] or ""):
+        return False
+
+    type_name = filters.get("type")
+    if type_name and type_name not in (cell["crtypename"] or ""):
+        return False
+
+    for name in FLAG_DIMENSIONS:
+        if filters.get(name) is not None and cell[name] != bool(filters[name]):
+            return False
+
+    return True
+
+
+def _group_key(cell: dict, by: List[str]) -> tuple:
+    """Group key of a cell (age cells are single age class slices)"""
+    return tuple(
+        CLASS_SLICES[cell["age_mask"]] if dimension == "age" else cell[DIMENSIONS[dimension]]
+        for dimension in by
+    )
+
+
+def _age_slice_filter(by: List[str], filters: dict) -> List[int]:
+    """
+    Age slices a rollup reads
+
+    Grouping by age reads the single class slices (those the age filter
+    covers); otherwise the slice matching the age filter, or 0 for all centers.
+    Age classes are not exclusive, so a center with 만1세 and 만2세 classes is
+    counted once per class but once in 영아.
+
+    Raises:
+        ValueError: If the age filter matches no single slice
+    """
+    age = filters.get("age")
+    age_mask = age_mask_for_filter(age)
+    if "age" in by:
+        return [bit for bit in CLASS_SLICES if not age_mask or age_mask & bit]
+    if not age_mask:
+        return [0]
+    if age_mask in CLASS_SLICES or age_mask in GROUP_SLICES:
+        return [age_mask]
+    raise ValueError(
+        f"Age filter '{age}' spans several age classes; use one class "
+        f"({', '.join(AGE_CLASS_COLUMNS)}), {' or '.join(AGE_GROUPS)}, or group by age"
+    )
+
+
+def validate_dimensions(by: List[str], filters: dict = None):
+    """Raise ValueError for dimensions (or an age filter) the cube does not have"""
+    unknown = [dimension for dimension in by if dimension not in DIMENSIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown dimension(s) {', '.join(unknown)} (available: {', '.join(DIMENSIONS)})"
+        )
+    _age_slice_filter(by, filters or {})
+
+
+def rollup(cells: List[dict], by: List[str] = None, filters: dict = None) -> List[dict]:
+    """
+    Aggregate cube cells by the given dimensions
+
+    Args:
+        cells: Cube cells
+        by: Dimensions to group by (keys of DIMENSIONS); empty for a grand total
+        filters: Drill-down filters (region, district, type, age, has_playground, ...)
+
+    Returns:
+        One dict per group (dimension values + summed measures + occupancy_rate),
+        largest center_count first
+
+    Raises:
+        ValueError: If a dimension is unknown or the age filter spans several classes
+    """
+    by = by or []
+    filters = filters or {}
+    validate_dimensions(by)
+    age_slices = _age_slice_filter(by, filters)
+
+    groups: Dict[tuple, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+    for cell in cells:
+        if cell["age_mask"] not in age_slices or not _matches(cell, filters):
+            continue
+        totals = groups[_group_key(cell, by)]
+        for measure in MEASURES:
+            totals[measure] += cell[measure] or 0
+
+    results = []
+    for key, totals in groups.items():
+        group = dict(zip(by, key))
+        group.update(totals)
+        capacity = totals["capacity_sum"]
+        group["occupancy_rate"] = (
+            round(totals["enrollment_sum"] / capacity, 4) if capacity else None
+        )
+        results.append(group)
+
+    results.sort(key=lambda g: (-g["center_count"], tuple(str(g[d]) for d in by)))
+    return results
+
+
+def name_counts(cells: List[dict], dimension: str, limit: int = None) -> List[dict]:
+    """[{"name", "count"}] per district/type, largest first (unnamed groups skipped)"""
+    counts = [
+        {"name": group[dimension], "count": group["center_count"]}
+        for group in rollup(cells, [dimension])
+        if group[dimension]
+    ]
+    return counts[:limit] if limit else counts
+
+
+def cube_statistics(cells: List[dict]) -> dict:
+    """Overall statistics: total, top 10 districts, all types"""
+    total = sum(cell["center_count"] for cell in cells if cell["age_mask"] == 0)
+    return {
+        "total": total,
+        "by_district": name_counts(cells, "district", limit=10),
+        "by_type": name_counts(cells, "type"),
+    }
+
+
+async def fetch_stats_cube(session: AsyncSession) -> List[dict]:
+    """Load the cube cells for the current data version on an async session"""
+    return await session.run_sync(load_stats_cube)
@@ -0,0 +1,330 @@
+"""
+Synthetic Dataset Generator
+Realistic daycare records with distributions fitted from real data, for
+scale and load tests
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, Integer
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from database import DaycareCenter
+from services.ingest import DERIVED_COLUMNS
+from utils.filters import (
+    REGION_CODES,
+    SEOUL_DISTRICT_CODES,
+    region_code_for,
+)
+
+ACTIVE_STATUS = "정상"
+
+# Numeric columns copied from a real "template" row and jittered together,
+# which keeps capacity, enrollment, classes and staff consistent
+PROFILE_COLUMNS = [
+    column.name
+    for column in DaycareCenter.__table__.columns
+    if isinstance(column.type, (Integer, Float))
+    and column.name not in {"id", "la", "lo", *DERIVED_COLUMNS}
+]
+_INTEGER_COLUMNS = {
+    c.name for c in DaycareCenter.__table__.columns if isinstance(c.type, Integer)
+}
+
+# Built-in priors used when no real data is available
+_DEFAULT_TYPE_WEIGHTS = {
+    "국공립": 0.30,
+    "민간": 0.22,
+    "가정": 0.33,
+    "직장": 0.06,
+    "사회복지법인": 0.02,
+    "법인·단체등": 0.02,
+    "협동": 0.05,
+}
+_DEFAULT_CAPACITY = {"가정": 18, "협동": 20, "민간": 60, "국공립": 70, "직장": 80}
+_DEFAULT_STEMS = [
+    "해맑은", "푸른", "햇살", "꿈나무", "새싹", "아이사랑", "무지개", "별빛", "숲속",
+    "행복한", "튼튼", "사랑", "은빛", "하늘", "솔잎", "다솜", "늘푸른", "참좋은",
+]
+_SEOUL_CENTER = (37.5519, 126.9918)
+_REGION_NAMES = {code: name for name, code in REGION_CODES.items()}
+
+
+class DatasetProfile:
+    """
+    Distributions a synthetic dataset is drawn from
+
+    Districts and types are sampled jointly, coordinates from a per-district
+    normal around the observed centroid, numeric attributes from real rows
+    of the same type (jittered), services and names from observed values.
+    """
+
+    def __init__(
+        self,
+        districts: List[tuple],
+        pairs: List[tuple],
+        pair_weights: np.ndarray,
+        coordinates: Dict[int, tuple],
+        templates: Dict[str, np.ndarray],
+        services: tuple,
+        vehicle_rate: float,
+        status_weights: Dict[str, float],
+        name_stems: List[str],
+        roads: Dict[int, List[str]],
+        reference_date: str,
+    ):
+        self.districts = districts  # [(district_code, sigunname, sido name)]
+        self.pairs = pairs  # [(district index, crtypename)]
+        self.pair_weights = pair_weights
+        self.coordinates = coordinates  # district index -> (lat, lat_sd, lon, lon_sd)
+        self.templates = templates  # crtypename -> (rows, len(PROFILE_COLUMNS))
+        self.services = services  # (values, weights)
+        self.vehicle_rate = vehicle_rate
+        self.status_weights = status_weights
+        self.name_stems = name_stems
+        self.roads = roads
+        self.reference_date = reference_date
+
+    def summary(self) -> dict:
+        return {
+            "districts": len(self.districts),
+            "district_type_pairs": len(self.pairs),
+            "templates": {name: len(rows) for name, rows in self.templates.items()},
+            "services": len(self.services[0]),
+            "name_stems": len(self.name_stems),
+        }
+
+
+def _weights(counts: pd.Series) -> tuple:
+    counts = counts[counts > 0]
+    return list(counts.index), (counts / counts.sum()).to_numpy()
+
+
+def _sido_name(district_code: str, craddr_values: pd.Series) -> str:
+    first_tokens = craddr_values.dropna().str.split().str[0]
+    if not first_tokens.empty:
+        return first_tokens.mode().iloc[0]
+    return _REGION_NAMES.get(region_code_for(district_code), "")
+
+
+def fit_profile(frame: pd.DataFrame, max_templates: int = 2000, seed: int = 0) -> DatasetProfile:
+    """
+    Fit generator distributions from real daycare rows
+
+    Args:
+        frame: DaycareCenter columns (e.g. read from the database or a raw dump
+            after normalize_chunk/derive_columns)
+        max_templates: Numeric template rows kept per type
+        seed: Seed for template subsampling
+
+    Returns:
+        DatasetProfile
+    """
+    rng = np.random.default_rng(seed)
+    status_weights = frame["crstatusname"].fillna(ACTIVE_STATUS).value_counts(normalize=True)
+
+    active = frame[frame["crstatusname"] == ACTIVE_STATUS].copy()
+    active = active[active["district_code"].notna() & active["crtypename"].notna()]
+    if active.empty:
+        raise ValueError("No active rows with district and type to fit from")
+
+    districts = []
+    coordinates = {}
+    roads = {}
+    district_index = {}
+    for i, ((code, name), group) in enumerate(active.groupby(["district_code", "sigunname"])):
+        district_index[(code, name)] = i
+        districts.append((code, name, _sido_name(code, group["craddr"])))
+
+        la, lo = group["la"].dropna(), group["lo"].dropna()
+        if len(la) and len(lo):
+            coordinates[i] = (la.mean(), la.std() or 0.01, lo.mean(), lo.std() or 0.01)
+
+        tokens = group["craddr"].dropna().str.split()
+        roads[i] = sorted({t[2] for t in tokens if len(t) > 3 and t[2][-1] in "로길"})
+
+    pair_counts = active.groupby(["district_code", "sigunname", "crtypename"]).size()
+    pairs = [(district_index[(code, name)], type_name) for code, name, type_name in pair_counts.index]
+    pair_weights = (pair_counts / pair_counts.sum()).to_numpy()
+
+    templates = {}
+    for type_name, group in active.groupby("crtypename"):
+        values = group.reindex(columns=PROFILE_COLUMNS).apply(pd.to_numeric, errors="coerce")
+        if len(values) > max_templates:
+            values = values.iloc[rng.choice(len(values), max_templates, replace=False)]
+        templates[type_name] = values.to_numpy(dtype=np.float64)
+
+    services = _weights(active["crspec"].fillna("").value_counts())
+    vehicle_rate = float(active["crcargbname"].notna().mean())
+
+    names = active["crname"].dropna().str.replace("어린이집", "", regex=False).str.strip()
+    stems = sorted({name for name in names if 2 <= len(name) <= 8}) or list(_DEFAULT_STEMS)
+
+    reference_date = (
+        frame["datastdrdt"].dropna().mode().iloc[0]
+        if "datastdrdt" in frame and frame["datastdrdt"].notna().any()
+        else date.today().isoformat()
+    )
+
+    return DatasetProfile(
+        districts,
+        pairs,
+        pair_weights,
+        coordinates,
+        templates,
+        services,
+        vehicle_rate,
+        status_weights.to_dict(),
+        stems,
+        roads,
+        reference_date,
+    )
+
+
+def default_profile() -> DatasetProfile:
+    """Profile from built-in priors (Seoul districts, national type mix)"""
+    districts = [(code, name, "서울특별시") for name, code in SEOUL_DISTRICT_CODES.items()]
+    pairs, weights = [], []
+    for i in range(len(districts)):
+        for type_name, weight in _DEFAULT_TYPE_WEIGHTS.items():
+            pairs.append((i, type_name))
+            weights.append(weight / len(districts))
+
+    # District centroids unknown: spread around the city center
+    lat, lon = _SEOUL_CENTER
+    coordinates = {i: (lat, 0.06, lon, 0.09) for i in range(len(districts))}
+
+    templates = {}
+    column = PROFILE_COLUMNS.index("crcapat")
+    enrolled = PROFILE_COLUMNS.index("crchcnt")
+    for type_name in _DEFAULT_TYPE_WEIGHTS:
+        capacity = _DEFAULT_CAPACITY.get(type_name, 40)
+        rows = np.full((1, len(PROFILE_COLUMNS)), np.nan)
+        rows[0, column] = capacity
+        rows[0, enrolled] = round(capacity * 0.85)
+        templates[type_name] = rows
+
+    services = (["일반", "일반,시간연장", "일반,장애아통합", "영아전담", ""], np.array([0.55, 0.2, 0.05, 0.05, 0.15]))
+
+    return DatasetProfile(
+        districts,
+        pairs,
+        np.array(weights) / sum(weights),
+        coordinates,
+        templates,
+        services,
+        0.3,
+        {ACTIVE_STATUS: 1.0},
+        list(_DEFAULT_STEMS),
+        {},
+        date.today().isoformat(),
+    )
+
+
+def _parse_date(value):
+    """'20240115' or '2024-01-15' -> date (None if unparsable)"""
+    digits = "".join(ch for ch in str(value or "") if ch.isdigit())[:8]
+    try:
+        return date(int(digits[:4]), int(digits[4:6]), int(digits[6:8]))
+    except ValueError:
+        return None
+
+
+def _name(rng: np.random.Generator, stems: List[str]) -> str:
+    """Splice two observed stems ("해맑" + "사랑" -> "해맑사랑어린이집")"""
+    first = stems[rng.integers(len(stems))]
+    second = stems[rng.integers(len(stems))]
+    head = first[: max(1, (len(first) + 1) // 2)]
+    tail = second[len(second) // 2 :]
+    return f"{head}{tail}어린이집"
+
+
+def generate_records(
+    profile: DatasetProfile,
+    count: int,
+    seed: int = 0,
+    start: int = 0,
+    chunk_size: int = 50000,
+) -> Iterator[dict]:
+    """
+    Yield synthetic raw records (same keys as the Open API dump)
+
+    stcodes are the district code followed by "S" and a serial number, so
+    they never collide with real codes while the district/region prefix keeps
+    derived columns and partitioning working.
+
+    Args:
+        profile: Fitted or default profile
+        count: Number of records
+        seed: Random seed (same seed and profile give the same records)
+        start: First serial number (to extend an existing synthetic set)
+        chunk_size: Records drawn per vectorized batch
+    """
+    rng = np.random.default_rng(seed)
+    statuses = list(profile.status_weights)
+    status_p = np.array([profile.status_weights[s] for s in statuses])
+    status_p = status_p / status_p.sum()
+    service_values, service_p = profile.services
+    reference = _parse_date(profile.reference_date) or date.today()
+
+    for offset in range(0, count, chunk_size):
+        size = min(chunk_size, count - offset)
+        pair_ids = rng.choice(len(profile.pairs), size=size, p=profile.pair_weights)
+        status_ids = rng.choice(len(statuses), size=size, p=status_p)
+        service_ids = rng.choice(len(service_values), size=size, p=service_p)
+        vehicles = rng.random(size) < profile.vehicle_rate
+        jitter = rng.lognormal(0.0, 0.12, size=size)
+        gaussian = rng.standard_normal((size, 2))
+        opened = rng.integers(0, 365 * 30, size=size)
+
+        for i in range(size):
+            serial = start + offset + i
+            district_id, type_name = profile.pairs[pair_ids[i]]
+            code, sigunname, sido = profile.districts[district_id]
+
+            templates = profile.templates.get(type_name)
+            values = (
+                templates[rng.integers(len(templates))] * jitter[i]
+                if templates is not None and len(templates)
+                else np.full(len(PROFILE_COLUMNS), np.nan)
+            )
+            record = {}
+            for name, value in zip(PROFILE_COLUMNS, values):
+                if np.isnan(value):
+                    continue
+                record[name] = int(round(value)) if name in _INTEGER_COLUMNS else round(float(value), 2)
+            if "crchcnt" in record and "crcapat" in record:
+                record["crchcnt"] = min(record["crchcnt"], record["crcapat"])
+
+            coordinates = profile.coordinates.get(district_id)
+            if coordinates:
+                lat, lat_sd, lon, lon_sd = coordinates
+                record["la"] = round(float(lat + gaussian[i, 0] * lat_sd), 6)
+                record["lo"] = round(float(lon + gaussian[i, 1] * lon_sd), 6)
+
+            roads = profile.roads.get(district_id) or [f"{sigunname[:-1]}로"]
+            road = roads[rng.integers(len(roads))]
+
+            record.update(
+                {
+                    "stcode": f"{code}S{serial:08d}",
+                    "crname": _name(rng, profile.name_stems),
+                    "crtypename": type_name,
+                    "crstatusname": statuses[status_ids[i]],
+                    "sigunname": sigunname,
+                    "craddr": f"{sido} {sigunname} {road} {rng.integers(1, 300)}".strip(),
+                    "zipcode": f"{rng.integers(1000, 99999):05d}",
+                    "crtelno": f"0{rng.integers(2, 70)}-{rng.integers(200, 999)}-{rng.integers(1000, 9999)}",
+                    "crspec": service_values[service_ids[i]] or None,
+                    "crcargbname": "운영" if vehicles[i] else None,
+                    "crcnfmdt": (reference - timedelta(days=int(opened[i]))).isoformat(),
+                    "datastdrdt": str(profile.reference_date),
+                }
+            )
+            yield record
+
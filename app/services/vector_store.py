@@ -1,37 +1,101 @@
 """
 FAISS Vector Store Service
-Handles vector similarity search for daycare centers
+Handles vector similarity search for daycare centers, from one index or from
+per-region (시도) indexes
 """
 
+import heapq
 import json
 import sys
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import numpy as np
 import faiss
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import settings
-from services.embeddings import EmbeddingService
+from services.embeddings import EmbeddingService, create_embedding_service
+from utils.filters import REGION_CODES, region_code_for
+
+# Region totals written by create_index.py --partition
+REGION_MANIFEST = "regions.json"
+
+
+def region_index_paths(region: str, root_dir: Path = None) -> Tuple[Path, Path]:
+    """(index path, metadata path) of a region's index"""
+    region_dir = (root_dir or settings.get_vector_region_dir()) / region
+    return region_dir / "faiss.index", region_dir / "metadata.json"
+
+
+def read_region_manifest(root_dir: Path = None) -> Dict[str, int]:
+    """{region code: vector count} of the built region indexes ({} if none)"""
+    path = (root_dir or settings.get_vector_region_dir()) / REGION_MANIFEST
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["regions"]
+
+
+def write_region_manifest(totals: Dict[str, int], dimension: int, root_dir: Path = None) -> Path:
+    """Store region vector counts (read by PartitionedVectorStore without loading indexes)"""
+    root_dir = root_dir or settings.get_vector_region_dir()
+    root_dir.mkdir(parents=True, exist_ok=True)
+    path = root_dir / REGION_MANIFEST
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"regions": dict(sorted(totals.items())), "dimension": dimension}, f, indent=2)
+    return path
 
 
 class VectorStoreService:
     """Service for FAISS vector similarity search"""
 
-    def __init__(self):
-        """Initialize vector store and load FAISS index"""
-        self.embedding_service = EmbeddingService()
+    def __init__(
+        self,
+        index_path: Path = None,
+        metadata_path: Path = None,
+        embedding_service: EmbeddingService = None,
+        mmap: bool = False,
+        label: str = "Vector store",
+    ):
+        """
+        Initialize vector store and load FAISS index
+
+        Args:
+            index_path: FAISS index file (default from settings)
+            metadata_path: stcode mapping file (default from settings)
+            embedding_service: Shared embedding service (a new one if omitted)
+            mmap: Memory-map the index file instead of reading it into memory
+            label: Name used in log lines
+        """
+        self.embedding_service = embedding_service or create_embedding_service()
+        self.index_path = index_path or settings.get_vector_index_path()
+        self.metadata_path = metadata_path or settings.get_vector_metadata_path()
+        self.mmap = mmap
+        self.label = label
         self.index: Optional[faiss.Index] = None
         self.metadata: Optional[dict] = None
         self.stcodes: Optional[List[str]] = None
+        self.positions: Dict[str, int] = {}
 
         # Try to load existing index
         self.load_index()
 
+    def _read_index(self) -> faiss.Index:
+        if self.mmap:
+            try:
+                flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+                return faiss.read_index(str(self.index_path), flag)
+            except RuntimeError:
+                pass  # index type without mmap support
+        return faiss.read_index(str(self.index_path))
+
     def load_index(self):
         """Load FAISS index and metadata from disk"""
-        index_path = settings.get_vector_index_path()
-        metadata_path = settings.get_vector_metadata_path()
+        index_path = self.index_path
+        metadata_path = self.metadata_path
 
         if not index_path.exists():
             print(f"[WARN]  FAISS index not found at: {index_path}")
@@ -44,14 +108,22 @@ class VectorStoreService:
 
         try:
             # Load FAISS index
-            self.index = faiss.read_index(str(index_path))
+            self.index = self._read_index()
 
             # Load metadata
             with open(metadata_path, "r", encoding="utf-8") as f:
                 self.metadata = json.load(f)
                 self.stcodes = self.metadata["stcodes"]
+                self.positions = {stcode: i for i, stcode in enumerate(self.stcodes)}
+
+            backend = self.metadata.get("embedding_backend", "openai")
+            if backend != self.embedding_service.backend:
+                print(
+                    f"[WARN]  {self.label} was built with the '{backend}' embedding backend, "
+                    f"queries use '{self.embedding_service.backend}'"
+                )
 
-            print(f"[OK] Vector store loaded:")
+            print(f"[OK] {self.label} loaded:")
             print(f"   - Total vectors: {self.index.ntotal}")
             print(f"   - Dimension: {self.index.d}")
 
@@ -61,8 +133,44 @@ class VectorStoreService:
             print(f"[ERROR] Failed to load vector store: {e}")
             return False
 
+    def total_vectors(self, regions: List[str] = None) -> int:
+        """
+        Vectors a search has to scan
+
+        The single index always scans everything, so regions are ignored.
+        """
+        return self.index.ntotal if self.index is not None else 0
+
+    def search_embedding(
+        self, query_embedding: np.ndarray, top_k: int
+    ) -> List[Tuple[str, float]]:
+        """
+        Nearest neighbours of an already computed query embedding
+
+        Returns:
+            List of (stcode, distance) tuples, closest first
+        """
+        if self.index.ntotal == 0:
+            return []
+
+        query_embedding = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        distances, indices = self.index.search(query_embedding, min(top_k, self.index.ntotal))
+
+        results = []
+        for idx, dist in zip(indices[0], distances[0]):
+            # Convert L2 distance to similarity score (lower is better)
+            # For filtering, we can use a distance threshold
+            if 0 <= idx < len(self.stcodes):
+                results.append((self.stcodes[idx], float(dist)))
+        return results
+
     def search(
-        self, query: str, top_k: int = None, threshold: float = None
+        self,
+        query: str,
+        top_k: int = None,
+        threshold: float = None,
+        regions: List[str] = None,
+        query_embedding: np.ndarray = None,
     ) -> List[Tuple[str, float]]:
         """
         Search for similar daycare centers
@@ -71,6 +179,10 @@ class VectorStoreService:
             query: Search query text
             top_k: Number of results to return (default from settings)
             threshold: Similarity threshold (default from settings)
+            regions: Region codes to search (a single index covers all of them;
+                the retriever's filters narrow the results)
+            query_embedding: Embedding of query if already computed (e.g.
+                awaited by the async retriever); embedded here otherwise
 
         Returns:
             List of (stcode, distance) tuples
@@ -87,25 +199,64 @@ class VectorStoreService:
 
         try:
             # Generate query embedding
-            query_embedding = self.embedding_service.embed_text(query)
-            query_embedding = np.array([query_embedding])  # Shape: (1, dimension)
+            if query_embedding is None:
+                query_embedding = self.embedding_service.embed_text(query)
+            return self.search_embedding(query_embedding, top_k)
 
-            # Search
-            distances, indices = self.index.search(query_embedding, top_k)
+        except Exception as e:
+            print(f"[ERROR] Search error: {e}")
+            return []
 
-            # Filter by threshold and return results
-            results = []
-            for idx, dist in zip(indices[0], distances[0]):
-                # Convert L2 distance to similarity score (lower is better)
-                # For filtering, we can use a distance threshold
-                if idx < len(self.stcodes):
-                    stcode = self.stcodes[idx]
-                    results.append((stcode, float(dist)))
+    def score_embedding(
+        self, query_embedding: np.ndarray, stcodes: List[str]
+    ) -> List[Tuple[str, float]]:
+        """Exact distances of the given stcodes to a query embedding, closest first"""
+        known = [stcode for stcode in stcodes if stcode in self.positions]
+        if not known:
+            return []
+
+        query_embedding = np.asarray(query_embedding, dtype=np.float32)
+        ids = np.array([self.positions[stcode] for stcode in known], dtype=np.int64)
+        vectors = self.index.reconstruct_batch(ids)
+
+        distances = ((vectors - query_embedding) ** 2).sum(axis=1)
+        order = np.argsort(distances)
+
+        return [(known[i], float(distances[i])) for i in order]
+
+    def score_stcodes(
+        self, query: str, stcodes: List[str], query_embedding: np.ndarray = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Exactly score a subset of daycare centers against a query
+
+        Used by filter-first retrieval: vectors of the given stcodes are
+        reconstructed from the flat index and compared directly, so no
+        candidate is lost to a top-k cut-off.
+
+        Args:
+            query: Search query text
+            stcodes: Daycare codes to score
+            query_embedding: Embedding of query if already computed
+
+        Returns:
+            List of (stcode, distance) tuples sorted by distance; stcodes
+            missing from the index are omitted
+        """
+        if self.index is None:
+            print("[WARN]  Vector store not loaded")
+            return []
+
+        if not any(stcode in self.positions for stcode in stcodes):
+            return []
 
-            return results
+        try:
+            if query_embedding is None:
+                query_embedding = self.embedding_service.embed_text(query)
+            return self.score_embedding(query_embedding, stcodes)
 
         except Exception as e:
-            print(f"[ERROR] Search error: {e}")
+            print(f"[ERROR] Subset scoring error: {e}")
             return []
 
     def search_batch(
@@ -166,15 +317,225 @@ class VectorStoreService:
         }
 
 
+class PartitionedVectorStore:
+    """
+    Per-region FAISS indexes with lazy loading
+
+    Region indexes are opened on first use (memory-mapped by default) and at
+    most VECTOR_MAX_LOADED_REGIONS stay open (every region by default), least
+    recently used evicted first. A region-pinned query touches one index; a
+    region-less query embeds once, searches every region in parallel and
+    merges the per-region top-k. Indexes are read under a per-region lock, so
+    a cold fan-out loads regions in parallel, and regions in use by a running
+    fan-out are never evicted.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path = None,
+        embedding_service: EmbeddingService = None,
+        max_loaded: int = None,
+    ):
+        self.root_dir = root_dir or settings.get_vector_region_dir()
+        self.embedding_service = embedding_service or create_embedding_service()
+        self.max_loaded = max_loaded or settings.VECTOR_MAX_LOADED_REGIONS or len(REGION_CODES)
+        self.region_totals = read_region_manifest(self.root_dir)
+        self._loaded: "OrderedDict[str, VectorStoreService]" = OrderedDict()
+        self._lock = threading.Lock()  # guards _loaded, _region_locks and _in_use only
+        self._region_locks: Dict[str, threading.Lock] = {}
+        self._in_use: Dict[str, int] = defaultdict(int)
+        self._executor = ThreadPoolExecutor(max_workers=settings.VECTOR_FANOUT_WORKERS)
+
+        print(
+            f"[OK] Partitioned vector store: {len(self.region_totals)} regions, "
+            f"{sum(self.region_totals.values()):,} vectors (loaded on demand)"
+        )
+
+    @property
+    def regions(self) -> List[str]:
+        return list(self.region_totals)
+
+    def _targets(self, regions: List[str] = None) -> List[str]:
+        """Regions a request visits (all of them when regions is empty)"""
+        if not regions:
+            return self.regions
+        return [region for region in regions if region in self.region_totals]
+
+    def total_vectors(self, regions: List[str] = None) -> int:
+        """Vectors a search over the given regions scans (no index is loaded)"""
+        return sum(self.region_totals[region] for region in self._targets(regions))
+
+    def _cached(self, region: str) -> Optional[VectorStoreService]:
+        """Open index of a region, marked most recently used (None if not open)"""
+        with self._lock:
+            store = self._loaded.get(region)
+            if store is not None:
+                self._loaded.move_to_end(region)
+            return store
+
+    def _evict(self):
+        """Close least recently used indexes over max_loaded (caller holds _lock)"""
+        for region in list(self._loaded):
+            if len(self._loaded) <= self.max_loaded:
+                break
+            if not self._in_use.get(region):
+                del self._loaded[region]
+
+    def _store(self, region: str) -> Optional[VectorStoreService]:
+        """Open a region index (or reuse it), evicting the least recently used"""
+        store = self._cached(region)
+        if store is not None:
+            return store
+
+        with self._lock:
+            region_lock = self._region_locks.setdefault(region, threading.Lock())
+
+        # Read outside the global lock: other regions load concurrently, and a
+        # second caller for this region waits for the first load instead of repeating it
+        with region_lock:
+            store = self._cached(region)
+            if store is not None:
+                return store
+
+            index_path, metadata_path = region_index_paths(region, self.root_dir)
+            store = VectorStoreService(
+                index_path,
+                metadata_path,
+                self.embedding_service,
+                mmap=settings.VECTOR_INDEX_MMAP,
+                label=f"Region {region} index",
+            )
+            if store.index is None:
+                return None
+
+            with self._lock:
+                self._loaded[region] = store
+                self._evict()
+            return store
+
+    def _map(self, function, regions: List[str]) -> list:
+        """Run function(region) for each region, in parallel when there are several"""
+        with self._lock:
+            for region in regions:
+                self._in_use[region] += 1
+        try:
+            if len(regions) == 1:
+                return [function(regions[0])]
+            return list(self._executor.map(function, regions))
+        finally:
+            with self._lock:
+                for region in regions:
+                    self._in_use[region] -= 1
+                    if not self._in_use[region]:
+                        del self._in_use[region]
+                self._evict()
+
+    def search(
+        self,
+        query: str,
+        top_k: int = None,
+        threshold: float = None,
+        regions: List[str] = None,
+        query_embedding: np.ndarray = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Search the region indexes a request is routed to
+
+        Args:
+            query: Search query text
+            top_k: Number of results to return (default from settings)
+            threshold: Similarity threshold (default from settings)
+            regions: Region codes to search (default: fan-out over all)
+            query_embedding: Embedding of query if already computed
+
+        Returns:
+            List of (stcode, distance) tuples merged across regions
+        """
+        if top_k is None:
+            top_k = settings.TOP_K
+
+        targets = self._targets(regions)
+        if not targets:
+            return []
+
+        try:
+            if query_embedding is None:
+                query_embedding = self.embedding_service.embed_text(query)
+
+            def search_region(region):
+                store = self._store(region)
+                return store.search_embedding(query_embedding, top_k) if store else []
+
+            merged = [hit for hits in self._map(search_region, targets) for hit in hits]
+            return heapq.nsmallest(top_k, merged, key=lambda hit: hit[1])
+
+        except Exception as e:
+            print(f"[ERROR] Search error: {e}")
+            return []
+
+    def score_stcodes(
+        self, query: str, stcodes: List[str], query_embedding: np.ndarray = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Exactly score a subset of daycare centers against a query
+
+        stcodes are grouped by region and scored against each region's index.
+
+        Returns:
+            List of (stcode, distance) tuples sorted by distance
+        """
+        by_region: Dict[str, List[str]] = defaultdict(list)
+        for stcode in stcodes:
+            region = region_code_for(stcode)
+            if region in self.region_totals:
+                by_region[region].append(stcode)
+        if not by_region:
+            return []
+
+        try:
+            if query_embedding is None:
+                query_embedding = self.embedding_service.embed_text(query)
+
+            def score_region(region):
+                store = self._store(region)
+                return store.score_embedding(query_embedding, by_region[region]) if store else []
+
+            scored = [hit for hits in self._map(score_region, list(by_region)) for hit in hits]
+            scored.sort(key=lambda hit: hit[1])
+            return scored
+
+        except Exception as e:
+            print(f"[ERROR] Subset scoring error: {e}")
+            return []
+
+    def get_stats(self) -> dict:
+        """Get vector store statistics"""
+        return {
+            "loaded": bool(self.region_totals),
+            "partitioned": True,
+            "total_vectors": self.total_vectors(),
+            "regions": self.region_totals,
+            "open_regions": list(self._loaded),
+        }
+
+
 # Global vector store instance
 vector_store = None
 
 
-def get_vector_store() -> VectorStoreService:
-    """Get or create global vector store instance"""
+def get_vector_store():
+    """
+    Get or create global vector store instance
+
+    Uses the per-region indexes when create_index.py --partition has built
+    them, the single index otherwise.
+    """
     global vector_store
     if vector_store is None:
-        vector_store = VectorStoreService()
+        if read_region_manifest():
+            vector_store = PartitionedVectorStore()
+        else:
+            vector_store = VectorStoreService()
     return vector_store
 
 
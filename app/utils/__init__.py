@@ -1,4 +1,12 @@
 """Utils package"""
 from .prompts import QUERY_ANALYZER_PROMPT, ANSWER_GENERATOR_PROMPT
+from .filters import AGE_CLASS_COLUMNS, AGE_GROUPS, GENERIC_KEYWORDS, resolve_age_classes
 
-__all__ = ["QUERY_ANALYZER_PROMPT", "ANSWER_GENERATOR_PROMPT"]
+__all__ = [
+    "QUERY_ANALYZER_PROMPT",
+    "ANSWER_GENERATOR_PROMPT",
+    "AGE_CLASS_COLUMNS",
+    "AGE_GROUPS",
+    "GENERIC_KEYWORDS",
+    "resolve_age_classes",
+]
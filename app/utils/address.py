@@ -0,0 +1,88 @@
+"""
+Address components
+Road name (도로명) and 동 parsing of craddr, and dictionary lookup of both in
+free-text queries
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+
+# "돌곶이로30길 23" -> 돌곶이로 (numbered side streets belong to their main road;
+# "을지로3가" is a 동, not a road)
+ROAD_PATTERN = re.compile(
+    r"(?:^|\s)([가-힣][가-힣A-Za-z0-9·.]*?(?:대로|로|길))(?:\d+(?:번|가)?길)?(?!\d+가)(?=[\s\d,(]|$)"
+)
+# Legal 동 in the trailing parentheses of road addresses: "(석관동, 래미안아파트)"
+DONG_IN_PARENTHESES_PATTERN = re.compile(r"\(([가-힣][가-힣0-9·]*?(?:동|가|읍|면))[,\s)]")
+# 동 token of lot-number addresses: "서울특별시 강남구 역삼동 123-4"
+DONG_TOKEN_PATTERN = re.compile(r"(?:^|\s)([가-힣][가-힣0-9·]*?(?:동|가|읍|면))(?=[\s\d]|$)")
+
+# Administrative 동 numbers: 역삼1동 -> 역삼동 (가 numbers are part of the name: 종로1가)
+_ADMIN_NUMBER = re.compile(r"(?<=[가-힣])\d+동$")
+_SIDE_STREET = re.compile(r"(?<=[로길])\d+(?:번|가)?길$")
+
+# Words that follow a place name in a query ("돌곶이로 근처", "역삼동에서")
+_PLACE_SUFFIXES = ("근처", "주변", "인근", "부근", "에서", "쪽", "에", "의")
+_QUERY_TOKEN = re.compile(r"[가-힣A-Za-z0-9·]+")
+
+
+def normalize_dong(name: Optional[str]) -> Optional[str]:
+    """역삼1동 -> 역삼동 (None for empty values)"""
+    name = (name or "").strip()
+    return _ADMIN_NUMBER.sub("동", name) or None
+
+
+def normalize_road(name: Optional[str]) -> Optional[str]:
+    """돌곶이로30길 -> 돌곶이로 (None for empty values)"""
+    name = (name or "").strip()
+    return _SIDE_STREET.sub("", name) or None
+
+
+def parse_address(address: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Extract the road name and 동 of one address
+
+    Args:
+        address: craddr text
+
+    Returns:
+        {"road": main road name or None, "dong": 동 name or None}
+    """
+    address = address or ""
+    road = ROAD_PATTERN.search(address)
+    dong = DONG_IN_PARENTHESES_PATTERN.search(address) or DONG_TOKEN_PATTERN.search(address)
+    return {
+        "road": normalize_road(road.group(1)) if road else None,
+        "dong": normalize_dong(dong.group(1)) if dong else None,
+    }
+
+
+def _strip_place_suffix(token: str) -> str:
+    for suffix in _PLACE_SUFFIXES:
+        if token.endswith(suffix) and len(token) > len(suffix) + 1:
+            return token[: -len(suffix)]
+    return token
+
+
+def extract_address_filters(text: str, dongs: Iterable[str], roads: Iterable[str]) -> dict:
+    """
+    Find known 동 and road names in a query without an LLM
+
+    Args:
+        text: Free-text query ("돌곶이로 근처 국공립", "역삼1동에서 가까운 곳")
+        dongs: Known (normalized) 동 names, e.g. the "dong" filter statistics
+        roads: Known (normalized) road names
+
+    Returns:
+        {"dong": ..., "road": ...} with the first match of each (may be empty)
+    """
+    dongs, roads = set(dongs or ()), set(roads or ())
+    found = {}
+    for token in _QUERY_TOKEN.findall(text or ""):
+        token = _strip_place_suffix(token)
+        dong, road = normalize_dong(token), normalize_road(token)
+        if "dong" not in found and dong in dongs:
+            found["dong"] = dong
+        elif "road" not in found and road in roads:
+            found["road"] = road
+    return found
@@ -0,0 +1,341 @@
+"""
+Shared filter vocabulary
+Maps analyzer filter values to database columns
+"""
+
+from typing import List, Optional, Tuple
+
+# 연령 -> 반 컬럼
+AGE_CLASS_COLUMNS = {
+    "만0세": "class_cnt_00",
+    "만1세": "class_cnt_01",
+    "만2세": "class_cnt_02",
+    "만3세": "class_cnt_03",
+    "만4세": "class_cnt_04",
+    "만5세": "class_cnt_05",
+}
+
+# 연령 -> 추정 여석 컬럼 (적재 시 계산)
+AGE_VACANCY_COLUMNS = {
+    age: column.replace("class_cnt_", "vacancy_") for age, column in AGE_CLASS_COLUMNS.items()
+}
+
+# 연령 그룹 -> 포함 연령
+AGE_GROUPS = {
+    "영아": ["만0세", "만1세", "만2세"],
+    "유아": ["만3세", "만4세", "만5세"],
+}
+
+# Keywords that carry no meaning beyond the structured filters
+GENERIC_KEYWORDS = {
+    "어린이집",
+    "추천",
+    "추천해줘",
+    "찾아줘",
+    "알려줘",
+    "검색",
+    "곳",
+    "있는",
+    "있는곳",
+    "근처",
+    "목록",
+    "리스트",
+}
+
+
+def resolve_age_classes(age: str) -> List[str]:
+    """
+    Resolve an age filter value into the age classes it covers
+
+    Args:
+        age: Age filter value (e.g. "만1세", "영아", "만1세,만2세")
+
+    Returns:
+        List of age class names (e.g. ["만0세", "만1세", "만2세"])
+    """
+    if not age:
+        return []
+
+    ages = []
+    for name in AGE_CLASS_COLUMNS:
+        group_match = any(
+            group in age and name in members for group, members in AGE_GROUPS.items()
+        )
+        if name in age or group_match:
+            ages.append(name)
+
+    return ages
+
+
+def resolve_vacancy_columns(age: str = None) -> List[str]:
+    """
+    Estimated vacancy columns for an age filter value
+
+    Args:
+        age: Age filter value ("영아" -> vacancy_00..vacancy_02); empty selects every age
+
+    Returns:
+        List of vacancy column names
+    """
+    if not age:
+        return list(AGE_VACANCY_COLUMNS.values())
+    return [AGE_VACANCY_COLUMNS[name] for name in resolve_age_classes(age)]
+
+
+# 서울시 자치구 -> 행정표준 시군구 코드 (stcode 앞 5자리와 동일)
+SEOUL_DISTRICT_CODES = {
+    "종로구": "11110",
+    "중구": "11140",
+    "용산구": "11170",
+    "성동구": "11200",
+    "광진구": "11215",
+    "동대문구": "11230",
+    "중랑구": "11260",
+    "성북구": "11290",
+    "강북구": "11305",
+    "도봉구": "11320",
+    "노원구": "11350",
+    "은평구": "11380",
+    "서대문구": "11410",
+    "마포구": "11440",
+    "양천구": "11470",
+    "강서구": "11500",
+    "구로구": "11530",
+    "금천구": "11545",
+    "영등포구": "11560",
+    "동작구": "11590",
+    "관악구": "11620",
+    "서초구": "11650",
+    "강남구": "11680",
+    "송파구": "11710",
+    "강동구": "11740",
+}
+
+# 시도 -> 행정표준 시도 코드 (stcode 앞 2자리, 파티션 키)
+REGION_CODES = {
+    "서울특별시": "11",
+    "부산광역시": "26",
+    "대구광역시": "27",
+    "인천광역시": "28",
+    "광주광역시": "29",
+    "대전광역시": "30",
+    "울산광역시": "31",
+    "세종특별자치시": "36",
+    "경기도": "41",
+    "충청북도": "43",
+    "충청남도": "44",
+    "전라남도": "46",
+    "경상북도": "47",
+    "경상남도": "48",
+    "제주특별자치도": "50",
+    "강원특별자치도": "51",
+    "전북특별자치도": "52",
+}
+
+# 약칭 -> 시도 코드
+REGION_ALIASES = {
+    "서울": "11",
+    "부산": "26",
+    "대구": "27",
+    "인천": "28",
+    "광주": "29",
+    "대전": "30",
+    "울산": "31",
+    "세종": "36",
+    "경기": "41",
+    "충북": "43",
+    "충남": "44",
+    "전남": "46",
+    "경북": "47",
+    "경남": "48",
+    "제주": "50",
+    "강원": "51",
+    "강원도": "51",
+    "전북": "52",
+    "전라북도": "52",
+}
+
+SEOUL_REGION_CODE = "11"
+
+# 개편 이전 시도 코드 -> 현재 코드
+LEGACY_REGION_CODES = {"42": "51", "45": "52"}
+
+# 어린이집 유형 -> 유형 코드
+TYPE_CODES = {
+    "국공립": 1,
+    "사회복지법인": 2,
+    "법인·단체등": 3,
+    "민간": 4,
+    "가정": 5,
+    "협동": 6,
+    "직장": 7,
+}
+
+# 제공서비스 (crspec) -> 비트
+SERVICE_FLAGS = {
+    "일반": 1 << 0,
+    "영아전담": 1 << 1,
+    "장애아전담": 1 << 2,
+    "장애아통합": 1 << 3,
+    "방과후": 1 << 4,
+    "시간연장": 1 << 5,
+    "야간연장": 1 << 6,
+    "휴일보육": 1 << 7,
+    "24시간": 1 << 8,
+    "시간제보육": 1 << 9,
+}
+
+
+def age_bit(age: str) -> int:
+    """Bit of an age class in the age_mask column (만0세 -> 1, 만1세 -> 2, ...)"""
+    return 1 << list(AGE_CLASS_COLUMNS).index(age)
+
+
+def age_mask_for_filter(age: str) -> int:
+    """Bitmask covering every age class an age filter value refers to (0 if none)"""
+    mask = 0
+    for name in resolve_age_classes(age):
+        mask |= age_bit(name)
+    return mask
+
+
+def resolve_district_code(district: str, region_code: str = None):
+    """
+    Resolve a district filter value to its code
+
+    Accepts exact names ("강남구"), names embedded in longer text
+    ("서울특별시 강남구") and unambiguous prefixes ("강남").
+
+    Args:
+        district: District filter value
+        region_code: Region the request is pinned to; district names are only
+            resolved for Seoul (other regions reuse names such as 중구, 서구)
+
+    Returns:
+        District code, or None if the value is unknown or ambiguous
+    """
+    if not district:
+        return None
+    if region_code and region_code != SEOUL_REGION_CODE:
+        return None
+
+    district = district.strip()
+    if district in SEOUL_DISTRICT_CODES:
+        return SEOUL_DISTRICT_CODES[district]
+
+    contained = [name for name in SEOUL_DISTRICT_CODES if name in district]
+    if len(contained) == 1:
+        return SEOUL_DISTRICT_CODES[contained[0]]
+
+    prefixed = [name for name in SEOUL_DISTRICT_CODES if name.startswith(district)]
+    if len(prefixed) == 1:
+        return SEOUL_DISTRICT_CODES[prefixed[0]]
+
+    return None
+
+
+def region_code_for(code: str):
+    """Partition key of a stcode or 시군구/시도 code ("11680..." -> "11", "42110" -> "51")"""
+    if not code or not str(code)[:2].isdigit():
+        return None
+    prefix = str(code)[:2]
+    return LEGACY_REGION_CODES.get(prefix, prefix)
+
+
+def resolve_region_code(region: str):
+    """
+    Resolve a region (시도) filter value to its code
+
+    Accepts official names ("부산광역시"), short names ("부산") and
+    addresses starting with either ("경기도 성남시 분당구").
+
+    Returns:
+        Region code, or None if the value is unknown
+    """
+    if not region or not region.strip():
+        return None
+
+    names = {**REGION_CODES, **REGION_ALIASES}
+    return names.get(region.split()[0])
+
+
+def resolve_location(filters: dict) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Resolve the region and district filters together
+
+    A district prefixed with its region ("부산 해운대구") is split, and the
+    district code is only looked up when the region allows it. An explicit
+    district_code (set by neighbouring-district expansion) takes precedence.
+
+    Returns:
+        (region_code, district, district_code) - each None when absent/unknown
+    """
+    filters = filters or {}
+    if filters.get("district_code"):
+        district_code = str(filters["district_code"])
+        return region_code_for(district_code), filters.get("district"), district_code
+
+    region_code = resolve_region_code(filters.get("region"))
+
+    district = (filters.get("district") or "").strip() or None
+    if district:
+        head, _, rest = district.partition(" ")
+        if rest and resolve_region_code(head):
+            region_code = region_code or resolve_region_code(head)
+            district = rest.strip()
+
+    district_code = resolve_district_code(district, region_code)
+    if district_code and not region_code:
+        region_code = region_code_for(district_code)
+
+    return region_code, district, district_code
+
+
+def route_regions(filters: dict) -> List[str]:
+    """
+    Partitions a request has to visit
+
+    An explicit region filter or a district with a known code pins the
+    request to one partition; otherwise every partition is searched.
+
+    Returns:
+        List of region codes, empty for a fan-out over all regions
+    """
+    region_code, _, _ = resolve_location(filters)
+    return [region_code] if region_code else []
+
+
+def resolve_type_codes(type_name: str) -> List[int]:
+    """Type codes whose name contains the filter value (LIKE '%value%' semantics)"""
+    if not type_name:
+        return []
+    type_name = type_name.strip()
+    return [code for name, code in TYPE_CODES.items() if type_name in name]
+
+
+def service_mask_for(crspec: str) -> int:
+    """Bitmask of known services listed in a crspec string"""
+    if not crspec:
+        return 0
+    mask = 0
+    for service, bit in SERVICE_FLAGS.items():
+        if service in crspec:
+            mask |= bit
+    return mask
+
+
+def resolve_service_mask(special_service: str) -> int:
+    """
+    Bitmask of services whose name contains the filter value
+
+    ("장애아" -> 장애아전담 | 장애아통합, matching LIKE '%value%' semantics;
+    0 if no known service matches)
+    """
+    if not special_service:
+        return 0
+    special_service = special_service.strip()
+    mask = 0
+    for name, bit in SERVICE_FLAGS.items():
+        if special_service in name:
+            mask |= bit
+    return mask
@@ -14,13 +14,17 @@ QUERY_ANALYZER_PROMPT = """당신은 어린이집 검색 쿼리를 분석하는
    - general_info: 일반 정보 문의 (예: "몇 개?", "평균")
 
 2. 필터 조건 (filters):
-   - district: 시군구명 (예: "강남구", "성북구", "노원구")
+   - region: 시도명, 서울 이외 지역이거나 명시된 경우 (예: "부산", "경기도", "제주")
+   - district: 시군구명 (예: "강남구", "성북구", "해운대구", "성남시 분당구")
+   - dong: 동명, 시군구가 아닌 동 단위 지역 (예: "역삼동", "석관동")
+   - road: 도로명 (예: "돌곶이로", "테헤란로")
    - type: 어린이집 유형 (예: "국공립", "가정", "직장", "민간")
    - age: 연령 (예: "만0세", "만1세", "영아", "유아")
    - special_service: 특수 서비스 (예: "장애아통합", "야간연장")
    - has_playground: 놀이터 유무 (true/false)
    - min_cctv: 최소 CCTV 수
    - has_vehicle: 통학차량 유무 (true/false)
+   - has_vacancy: 빈자리(입소 가능) 여부, "자리 있는", "입소 가능한" 등 (true/false)
 
 3. 검색 키워드 (keywords): 자유 텍스트 키워드 리스트
 
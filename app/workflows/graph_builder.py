@@ -6,14 +6,19 @@ Defines the 4-stage workflow: Analyzer → Retriever → Generator → Post Proc
 import sys
 from pathlib import Path
 from typing import TypedDict
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from workflows.nodes import (
     query_analyzer_node,
+    aquery_analyzer_node,
     document_retriever_node,
+    adocument_retriever_node,
     answer_generator_node,
+    aanswer_generator_node,
     post_processor_node,
+    apost_processor_node,
 )
 
 
@@ -48,6 +53,10 @@ def build_search_workflow():
     3. Answer Generator: Generate natural language answer
     4. Post Processor: Validate and enhance the answer
 
+    Each node has a sync and an async implementation: invoke() runs the sync
+    ones, ainvoke() awaits the async ones (AsyncOpenAI, aiosqlite), so the
+    API's event loop is never blocked by a search.
+
     Returns:
         Compiled LangGraph workflow
     """
@@ -55,10 +64,14 @@ def build_search_workflow():
     workflow = StateGraph(WorkflowState)
 
     # Add nodes
-    workflow.add_node("query_analyzer", query_analyzer_node)
-    workflow.add_node("document_retriever", document_retriever_node)
-    workflow.add_node("answer_generator", answer_generator_node)
-    workflow.add_node("post_processor", post_processor_node)
+    workflow.add_node("query_analyzer", RunnableLambda(query_analyzer_node, aquery_analyzer_node))
+    workflow.add_node(
+        "document_retriever", RunnableLambda(document_retriever_node, adocument_retriever_node)
+    )
+    workflow.add_node(
+        "answer_generator", RunnableLambda(answer_generator_node, aanswer_generator_node)
+    )
+    workflow.add_node("post_processor", RunnableLambda(post_processor_node, apost_processor_node))
 
     # Define edges (linear flow)
     workflow.set_entry_point("query_analyzer")
@@ -109,7 +122,7 @@ async def run_search_workflow(query: str, filters: dict = None) -> dict:
         "metadata": {},
     }
 
-    # Run workflow
+    # Run workflow (async nodes)
     final_state = await workflow.ainvoke(initial_state)
 
     return final_state
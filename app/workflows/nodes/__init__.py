@@ -1,12 +1,16 @@
 """Workflow nodes package"""
-from .analyzer import query_analyzer_node
-from .retriever import document_retriever_node
-from .generator import answer_generator_node
-from .post_processor import post_processor_node
+from .analyzer import query_analyzer_node, aquery_analyzer_node
+from .retriever import document_retriever_node, adocument_retriever_node
+from .generator import answer_generator_node, aanswer_generator_node
+from .post_processor import post_processor_node, apost_processor_node
 
 __all__ = [
     "query_analyzer_node",
+    "aquery_analyzer_node",
     "document_retriever_node",
+    "adocument_retriever_node",
     "answer_generator_node",
+    "aanswer_generator_node",
     "post_processor_node",
+    "apost_processor_node",
 ]
@@ -1,16 +1,24 @@
 """
 Query Analyzer Node
-Extracts intent, filters, and keywords from user query using LLM
+Extracts intent, filters, and keywords from user query using rules, the
+locally trained query model, or the LLM
 """
 
+import asyncio
 import json
 import sys
+import time
 from pathlib import Path
-from typing import TypedDict
-from openai import OpenAI
+from typing import List, TypedDict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import settings
+from services.analysis_cache import get_analysis_cache
+from services.query_model import get_query_model, record_analysis
+from services.rule_analyzer import QueryAnalysis, analyze_with_rules
+from services.openai_clients import CALL_ANALYZER, chat_model, get_openai_client
+from services.selectivity import get_selectivity_stats
+from utils.address import extract_address_filters
 from utils.prompts import QUERY_ANALYZER_PROMPT
 
 
@@ -28,10 +36,209 @@ class WorkflowState(TypedDict):
     metadata: dict
 
 
+def resolve_address_filters(query: str) -> dict:
+    """
+    동 and road names in the query, looked up in the dictionary built at ingest
+
+    Uses the "dong"/"road" filter statistics, so no LLM call is needed and
+    only names that exist in the data are returned.
+
+    Returns:
+        {"dong": ..., "road": ...} (empty if nothing matched)
+    """
+    try:
+        stats = get_selectivity_stats()
+    except Exception as e:
+        print(f"[WARN] Address dictionary unavailable: {e}")
+        return {}
+    return extract_address_filters(query, stats.counts.get("dong", {}), stats.counts.get("road", {}))
+
+
+def _merge_filters(llm_filters: dict, address_filters: dict, existing_filters: dict) -> dict:
+    """
+    Merge filters: UI filters > dictionary-resolved 동/road > LLM filters
+
+    An LLM "district" that is really a resolved 동 or road is dropped, since
+    it would never match a 시군구 name.
+    """
+    llm_filters = dict(llm_filters or {})
+    if llm_filters.get("district") in address_filters.values():
+        llm_filters.pop("district")
+    return {**llm_filters, **address_filters, **(existing_filters or {})}
+
+
+def _chat_client(asynchronous: bool = False):
+    """Shared pooled chat client and model (see services/openai_clients.py)"""
+    return get_openai_client(CALL_ANALYZER, asynchronous), chat_model()
+
+
+def _completion_kwargs(query: str, model: str) -> dict:
+    """Arguments of the analysis chat completion"""
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": "You are a query analysis expert."},
+            {"role": "user", "content": QUERY_ANALYZER_PROMPT.format(query=query)},
+        ],
+        "temperature": 0.3,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def _empty_query_state(state: WorkflowState) -> WorkflowState:
+    return {
+        **state,
+        "search_intent": "unknown",
+        "filters": state.get("filters", {}),  # Preserve existing filters
+        "keywords": [],
+        "metadata": {"analyzer_error": "Empty query"},
+    }
+
+
+# Metadata key of each local tier's confidence
+_CONFIDENCE_KEYS = {"rules": "rule_confidence", "model": "model_confidence"}
+
+
+def _min_confidence(analysis: QueryAnalysis) -> float:
+    if analysis.source == "model":
+        return settings.ANALYZER_MODEL_MIN_CONFIDENCE
+    return settings.ANALYZER_RULES_MIN_CONFIDENCE
+
+
+def _is_confident(analysis: QueryAnalysis) -> bool:
+    return analysis is not None and analysis.confidence >= _min_confidence(analysis)
+
+
+def _local_analyses(query: str, address_filters: dict) -> List[QueryAnalysis]:
+    """
+    Analyses of the local tiers, cheapest first, stopping at a confident one
+
+    Rules (dictionaries) come first, then the query model trained on logged
+    LLM outputs (when enabled and trained).
+
+    Returns:
+        Tried analyses; the last one is confident if any was
+    """
+    analyses = []
+    if settings.ANALYZER_RULES_ENABLED:
+        analyses.append(analyze_with_rules(query, address_filters))
+        if _is_confident(analyses[-1]):
+            return analyses
+
+    if settings.ANALYZER_MODEL_ENABLED:
+        model = get_query_model()
+        if model is not None:
+            analyses.append(model.analyze(query))
+    return analyses
+
+
+def _best_analysis(analyses: List[QueryAnalysis]) -> QueryAnalysis:
+    """Most confident local analysis (None if no tier ran)"""
+    return max(analyses, key=lambda analysis: analysis.confidence, default=None)
+
+
+def _with_analysis_metadata(state: WorkflowState, source: str, analyses: List[QueryAnalysis]) -> dict:
+    return {
+        **state.get("metadata", {}),
+        "query_analysis": {
+            "source": source,
+            **{_CONFIDENCE_KEYS[analysis.source]: analysis.confidence for analysis in analyses},
+        },
+    }
+
+
+def _local_state(state: WorkflowState, analyses: List[QueryAnalysis], address_filters: dict) -> WorkflowState:
+    """Updated state from a confident local analysis (no LLM call)"""
+    analysis = analyses[-1]
+    merged_filters = _merge_filters(analysis.filters, address_filters, state.get("filters", {}))
+
+    print(f"[OK] Query analyzed by {analysis.source} (confidence {analysis.confidence:.2f}):")
+    print(f"   - Intent: {analysis.search_intent}")
+    print(f"   - Filters: {merged_filters}")
+    print(f"   - Keywords: {analysis.keywords}")
+
+    return {
+        **state,
+        "search_intent": analysis.search_intent,
+        "filters": merged_filters,
+        "keywords": analysis.keywords,
+        "metadata": _with_analysis_metadata(state, analysis.source, analyses),
+    }
+
+
+def _cached_result(query: str) -> dict:
+    """Earlier LLM analysis of a canonically equal query (None on a miss or when disabled)"""
+    if not settings.ANALYZER_CACHE_ENABLED:
+        return None
+    return get_analysis_cache().get(query)
+
+
+def _llm_result(query: str, result_text: str, started: float) -> dict:
+    """
+    Parse the LLM's JSON answer and cache it under the query's canonical form
+
+    The caller logs it as query model training data (record_analysis), off
+    the event loop in the async node.
+    """
+    result = json.loads(result_text)
+    if settings.ANALYZER_CACHE_ENABLED:
+        get_analysis_cache().put(query, result, (time.perf_counter() - started) * 1000)
+    return result
+
+
+def _analysis_state(
+    state: WorkflowState,
+    result: dict,
+    address_filters: dict,
+    analyses: List[QueryAnalysis] = None,
+    source: str = "llm",
+) -> WorkflowState:
+    """Updated state from an LLM answer (fresh or cached)"""
+    # Extract fields
+    search_intent = result.get("search_intent", "unknown")
+    llm_filters = result.get("filters", {})
+    keywords = result.get("keywords", [])
+
+    # Merge filters: existing filters (from UI) take precedence over extracted filters
+    merged_filters = _merge_filters(llm_filters, address_filters, state.get("filters", {}))
+
+    print(f"[OK] Query analyzed ({source}):")
+    print(f"   - Intent: {search_intent}")
+    print(f"   - Filters: {merged_filters}")
+    print(f"   - Keywords: {keywords}")
+
+    return {
+        **state,
+        "search_intent": search_intent,
+        "filters": merged_filters,
+        "keywords": keywords,
+        "metadata": _with_analysis_metadata(state, source, analyses or []),
+    }
+
+
+def _error_state(
+    state: WorkflowState, error: Exception, address_filters: dict, analyses: List[QueryAnalysis] = None
+) -> WorkflowState:
+    """LLM failed: keep whatever the best (unconfident) local analysis found"""
+    print(f"[WARN] Query analyzer error: {error}")
+    analysis = _best_analysis(analyses or []) or QueryAnalysis("unknown")
+    return {
+        **state,
+        "search_intent": analysis.search_intent,
+        "filters": _merge_filters(analysis.filters, address_filters, state.get("filters", {})),
+        "keywords": analysis.keywords,
+        "metadata": {"analyzer_error": str(error)},
+    }
+
+
 def query_analyzer_node(state: WorkflowState) -> WorkflowState:
     """
     Analyze user query and extract intent, filters, and keywords
 
+    Queries the rule-based analyzer or the local query model handle with
+    enough confidence skip the LLM, as do repeats of an earlier LLM-analyzed
+    query (canonical-form cache); the rest are sent to GPT.
+
     Args:
         state: Current workflow state with 'query'
 
@@ -41,73 +248,64 @@ def query_analyzer_node(state: WorkflowState) -> WorkflowState:
     query = state.get("query", "")
 
     if not query or not query.strip():
-        return {
-            **state,
-            "search_intent": "unknown",
-            "filters": state.get("filters", {}),  # Preserve existing filters
-            "keywords": [],
-            "metadata": {"analyzer_error": "Empty query"},
-        }
+        return _empty_query_state(state)
+
+    address_filters = resolve_address_filters(query)
+
+    # Fast path: formulaic queries (rules) and familiar phrasings (query model)
+    analyses = _local_analyses(query, address_filters)
+    if analyses and _is_confident(analyses[-1]):
+        return _local_state(state, analyses, address_filters)
+
+    cached = _cached_result(query)
+    if cached is not None:
+        return _analysis_state(state, cached, address_filters, analyses, source="cache")
 
     try:
-        # Initialize OpenAI client
-        if settings.OPENAI_API_KEY:
-            client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            model = settings.OPENAI_MODEL
-        else:
-            from openai import AzureOpenAI
-
-            client = AzureOpenAI(
-                api_key=settings.AOAI_API_KEY,
-                api_version=settings.AOAI_API_VERSION,
-                azure_endpoint=settings.AOAI_ENDPOINT,
-            )
-            model = settings.AOAI_DEPLOY_GPT4O
+        client, model = _chat_client()
 
         # Call LLM to analyze query
-        prompt = QUERY_ANALYZER_PROMPT.format(query=query)
-
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a query analysis expert."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"},
-        )
-
-        # Parse response
-        result_text = response.choices[0].message.content
-        result = json.loads(result_text)
-
-        # Extract fields
-        search_intent = result.get("search_intent", "unknown")
-        llm_filters = result.get("filters", {})
-        keywords = result.get("keywords", [])
-
-        # Merge filters: existing filters (from UI) take precedence over LLM-extracted filters
-        existing_filters = state.get("filters", {})
-        merged_filters = {**llm_filters, **existing_filters}
-
-        print(f"[OK] Query analyzed:")
-        print(f"   - Intent: {search_intent}")
-        print(f"   - Filters: {merged_filters}")
-        print(f"   - Keywords: {keywords}")
-
-        return {
-            **state,
-            "search_intent": search_intent,
-            "filters": merged_filters,
-            "keywords": keywords,
-        }
+        started = time.perf_counter()
+        response = client.chat.completions.create(**_completion_kwargs(query, model))
+        result = _llm_result(query, response.choices[0].message.content, started)
+        record_analysis(query, result)
+        return _analysis_state(state, result, address_filters, analyses)
+
+    except Exception as e:
+        return _error_state(state, e, address_filters, analyses)
+
+
+async def aquery_analyzer_node(state: WorkflowState) -> WorkflowState:
+    """
+    Async variant of query_analyzer_node
+
+    The chat completion is awaited on AsyncOpenAI, so other requests keep
+    running while the model answers.
+    """
+    query = state.get("query", "")
+
+    if not query or not query.strip():
+        return _empty_query_state(state)
+
+    address_filters = await asyncio.to_thread(resolve_address_filters, query)
+
+    analyses = _local_analyses(query, address_filters)
+    if analyses and _is_confident(analyses[-1]):
+        return _local_state(state, analyses, address_filters)
+
+    cached = _cached_result(query)
+    if cached is not None:
+        return _analysis_state(state, cached, address_filters, analyses, source="cache")
+
+    try:
+        client, model = _chat_client(asynchronous=True)
+
+        started = time.perf_counter()
+        response = await client.chat.completions.create(**_completion_kwargs(query, model))
+        result = _llm_result(query, response.choices[0].message.content, started)
+        if settings.ANALYZER_LOG_ENABLED:
+            await asyncio.to_thread(record_analysis, query, result)
+        return _analysis_state(state, result, address_filters, analyses)
 
     except Exception as e:
-        print(f"[WARN] Query analyzer error: {e}")
-        return {
-            **state,
-            "search_intent": "unknown",
-            "filters": state.get("filters", {}),  # Preserve existing filters on error
-            "keywords": [],
-            "metadata": {"analyzer_error": str(e)},
-        }
+        return _error_state(state, e, address_filters, analyses)
@@ -6,10 +6,9 @@ Generates natural language answer from search results using LLM
 import json
 import sys
 from pathlib import Path
-from openai import OpenAI
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from config import settings
+from services.openai_clients import CALL_GENERATOR, chat_model, get_openai_client
 from utils.prompts import ANSWER_GENERATOR_PROMPT
 
 
@@ -33,11 +32,81 @@ def format_search_results(results: list) -> str:
 - 특수서비스: {result.get('crspec', '')}
 - 전화번호: {result.get('crtelno', 'N/A')}
 """
+        if result.get("expanded_district"):
+            item += (
+                f"- 참고: 요청 지역 결과가 부족해 인접 지역({result['expanded_district']}, "
+                f"약 {result.get('district_distance_km')}km)에서 찾은 곳\n"
+            )
         formatted.append(item.strip())
 
     return "\n\n".join(formatted)
 
 
+def _chat_client(asynchronous: bool = False):
+    """Shared pooled chat client and model (see services/openai_clients.py)"""
+    return get_openai_client(CALL_GENERATOR, asynchronous), chat_model()
+
+
+def _completion_kwargs(query: str, search_results: list, model: str) -> dict:
+    """Arguments of the answer chat completion"""
+    # Format search results
+    formatted_results = format_search_results(search_results)
+
+    prompt = ANSWER_GENERATOR_PROMPT.format(query=query, search_results=formatted_results)
+    return {
+        "model": model,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a helpful daycare information consultant.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.7,
+        "max_tokens": 1000,
+    }
+
+
+def _no_results_state(state: dict) -> dict:
+    return {
+        **state,
+        "answer": "죄송합니다. 검색 조건에 맞는 어린이집을 찾지 못했습니다. 다른 조건으로 검색해보시겠어요?",
+    }
+
+
+def _answer_state(state: dict, answer: str) -> dict:
+    print(f"\n[OK] Answer generated ({len(answer)} chars)")
+
+    return {
+        **state,
+        "answer": answer,
+    }
+
+
+def _fallback_state(state: dict, error: Exception) -> dict:
+    """Template answer from the top results when the LLM call fails"""
+    search_results = state.get("search_results", [])
+    print(f"[WARN] Answer generator error: {error}")
+    # Fallback answer
+    answer = f"""검색 결과 {len(search_results)}개의 어린이집을 찾았습니다.
+
+상위 3개 추천:
+"""
+    for i, result in enumerate(search_results[:3], 1):
+        answer += f"\n{i}. {result.get('crname')} ({result.get('crtypename')})"
+        answer += f"\n   위치: {result.get('sigunname')} - {result.get('craddr')}"
+        answer += f"\n   정원/현원: {result.get('crcapat')}명 / {result.get('crchcnt')}명\n"
+
+    return {
+        **state,
+        "answer": answer,
+        "metadata": {
+            **state.get("metadata", {}),
+            "generator_error": str(error),
+        },
+    }
+
+
 def answer_generator_node(state: dict) -> dict:
     """
     Generate natural language answer from search results
@@ -52,73 +121,37 @@ def answer_generator_node(state: dict) -> dict:
     search_results = state.get("search_results", [])
 
     if not search_results:
-        return {
-            **state,
-            "answer": "죄송합니다. 검색 조건에 맞는 어린이집을 찾지 못했습니다. 다른 조건으로 검색해보시겠어요?",
-        }
+        return _no_results_state(state)
 
     try:
-        # Initialize OpenAI client
-        if settings.OPENAI_API_KEY:
-            client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            model = settings.OPENAI_MODEL
-        else:
-            from openai import AzureOpenAI
-
-            client = AzureOpenAI(
-                api_key=settings.AOAI_API_KEY,
-                api_version=settings.AOAI_API_VERSION,
-                azure_endpoint=settings.AOAI_ENDPOINT,
-            )
-            model = settings.AOAI_DEPLOY_GPT4O
-
-        # Format search results
-        formatted_results = format_search_results(search_results)
+        client, model = _chat_client()
 
         # Generate answer
-        prompt = ANSWER_GENERATOR_PROMPT.format(
-            query=query, search_results=formatted_results
-        )
+        response = client.chat.completions.create(**_completion_kwargs(query, search_results, model))
+        return _answer_state(state, response.choices[0].message.content)
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful daycare information consultant.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-            max_tokens=1000,
-        )
+    except Exception as e:
+        return _fallback_state(state, e)
+
+
+async def aanswer_generator_node(state: dict) -> dict:
+    """
+    Async variant of answer_generator_node (the completion is awaited on
+    AsyncOpenAI)
+    """
+    query = state.get("query", "")
+    search_results = state.get("search_results", [])
 
-        answer = response.choices[0].message.content
+    if not search_results:
+        return _no_results_state(state)
 
-        print(f"\n[OK] Answer generated ({len(answer)} chars)")
+    try:
+        client, model = _chat_client(asynchronous=True)
 
-        return {
-            **state,
-            "answer": answer,
-        }
+        response = await client.chat.completions.create(
+            **_completion_kwargs(query, search_results, model)
+        )
+        return _answer_state(state, response.choices[0].message.content)
 
     except Exception as e:
-        print(f"[WARN] Answer generator error: {e}")
-        # Fallback answer
-        answer = f"""검색 결과 {len(search_results)}개의 어린이집을 찾았습니다.
-
-상위 3개 추천:
-"""
-        for i, result in enumerate(search_results[:3], 1):
-            answer += f"\n{i}. {result.get('crname')} ({result.get('crtypename')})"
-            answer += f"\n   위치: {result.get('sigunname')} - {result.get('craddr')}"
-            answer += f"\n   정원/현원: {result.get('crcapat')}명 / {result.get('crchcnt')}명\n"
-
-        return {
-            **state,
-            "answer": answer,
-            "metadata": {
-                **state.get("metadata", {}),
-                "generator_error": str(e),
-            },
-        }
+        return _fallback_state(state, e)
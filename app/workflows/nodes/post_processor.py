@@ -61,3 +61,8 @@ def post_processor_node(state: dict) -> dict:
         "answer": answer,
         "metadata": metadata,
     }
+
+
+async def apost_processor_node(state: dict) -> dict:
+    """Async variant of post_processor_node (no I/O, runs inline on the event loop)"""
+    return post_processor_node(state)
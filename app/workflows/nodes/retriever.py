@@ -1,34 +1,137 @@
 """
 Document Retriever Node
-Performs hybrid search (FAISS vector + SQLite filter)
+Performs hybrid search (FAISS vector + in-memory snapshot or SQLite filter)
+using a cost-based plan
 """
 
+import asyncio
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import settings
-from database import get_session, DaycareCenter
+from database import session_scope, async_session_scope, DaycareCenter, DaycareFeatures
+from database.fulltext import search_fulltext, search_fulltext_async
+from database.projection import FULL_FIELDS, projected_columns, serialize_row
 from services import get_vector_store
-from sqlalchemy import and_, or_
+from services.districts import get_district_graph
+from services.features import blend_with_relevance, quality_score_expression
+from services.selectivity import get_selectivity_stats
+from services.snapshot import get_snapshot
+from services.query_planner import (
+    choose_plan,
+    PLAN_SQL_ONLY,
+    PLAN_FILTER_FIRST,
+    PLAN_FULLTEXT,
+)
+from utils.address import normalize_dong, normalize_road
+from utils.filters import (
+    age_mask_for_filter,
+    resolve_location,
+    resolve_service_mask,
+    resolve_type_codes,
+    resolve_vacancy_columns,
+    route_regions,
+)
+from sqlalchemy import and_, desc, or_, select
+import numpy as np
 
+# Labels added to results found in a neighbouring district
+EXPANSION_LABELS = ["expanded_district", "district_distance_km"]
 
-def document_retriever_node(state: dict) -> dict:
+
+def build_filter_conditions(filters: dict) -> list:
     """
-    Retrieve relevant daycare centers using hybrid search
+    Compile analyzer filters into SQLAlchemy conditions
+
+    Known regions, districts, types and services become equality/bitmask
+    predicates on the ingest-time code columns (served by the composite
+    indexes); unknown values fall back to LIKE on the raw text columns.
 
     Args:
-        state: Workflow state with 'query', 'filters', 'keywords'
+        filters: Filter dict (district, type, age, has_playground, ...)
 
     Returns:
-        Updated state with 'search_results'
+        List of SQLAlchemy conditions (always includes the active-status filter)
     """
-    query = state.get("query", "")
-    filters = state.get("filters", {})
-    keywords = state.get("keywords", [])
+    conditions = []
+
+    # Status filter (only active daycares)
+    conditions.append(DaycareCenter.crstatusname == "정상")
+
+    # Region (partition) and district filters
+    region_code, district, district_code = resolve_location(filters)
+    if district_code:
+        conditions.append(DaycareCenter.district_code == district_code)
+    else:
+        if region_code:
+            conditions.append(DaycareCenter.region_code == region_code)
+        if district:
+            conditions.append(DaycareCenter.sigunname.like(f"%{district}%"))
+
+    # 동 / road filters (parsed from craddr at ingest)
+    if filters.get("dong"):
+        conditions.append(DaycareCenter.dong_name == normalize_dong(str(filters["dong"])))
+    if filters.get("road"):
+        conditions.append(DaycareCenter.road_name == normalize_road(str(filters["road"])))
+
+    # Type filter
+    type_name = filters.get("type")
+    if type_name:
+        type_codes = resolve_type_codes(type_name)
+        if len(type_codes) == 1:
+            conditions.append(DaycareCenter.type_code == type_codes[0])
+        elif type_codes:
+            conditions.append(DaycareCenter.type_code.in_(type_codes))
+        else:
+            conditions.append(DaycareCenter.crtypename.like(f"%{type_name}%"))
+
+    # Age filter (any requested age class exists)
+    age_mask = age_mask_for_filter(filters.get("age"))
+    if age_mask:
+        conditions.append(DaycareCenter.age_mask.op("&")(age_mask) != 0)
+
+    # Availability filter (estimated spare places for a requested age)
+    if filters.get("has_vacancy"):
+        vacancy_columns = resolve_vacancy_columns(filters.get("age"))
+        conditions.append(or_(*(getattr(DaycareCenter, name) > 0 for name in vacancy_columns)))
+
+    # Facility filters
+    if filters.get("has_playground"):
+        conditions.append(DaycareCenter.plgrdco > 0)
+
+    if filters.get("min_cctv"):
+        min_cctv = int(filters["min_cctv"])
+        conditions.append(DaycareCenter.cctvinstlcnt >= min_cctv)
+
+    if filters.get("has_vehicle"):
+        conditions.append(DaycareCenter.crcargbname.isnot(None))
+
+    # Special service filter
+    special_service = filters.get("special_service")
+    if special_service:
+        service_mask = resolve_service_mask(special_service)
+        if service_mask:
+            conditions.append(DaycareCenter.service_mask.op("&")(service_mask) != 0)
+        else:
+            conditions.append(DaycareCenter.crspec.like(f"%{special_service}%"))
+
+    return conditions
+
+
+def _load_vector_store():
+    """Get the vector store, or None if it cannot be used"""
+    try:
+        vector_store = get_vector_store()
+    except Exception as e:
+        print(f"   [WARN] Vector store unavailable: {e}")
+        return None
+    return vector_store if vector_store.total_vectors() > 0 else None
+
 
-    # Combine query, keywords, and filter values for better vector search
+def _build_search_text(query: str, keywords: list, filters: dict) -> str:
+    """Combine query, keywords, and filter values for better vector search"""
     search_text = query
     if keywords:
         search_text = f"{query} {' '.join(keywords)}"
@@ -39,110 +142,529 @@ def document_retriever_node(state: dict) -> dict:
     if filters.get("type"):
         search_text = f"{search_text} {filters['type']}"
 
+    return search_text
+
+
+def _prepare_retrieval(state: dict) -> dict:
+    """
+    Read the request from the state and choose a retrieval plan
+
+    Returns:
+        Context dict with query, filters, search_text, regions, plan, stats,
+        vector_store and snapshot
+    """
+    query = state.get("query", "")
+    filters = state.get("filters", {})
+    keywords = state.get("keywords", [])
+    search_text = _build_search_text(query, keywords, filters)
+
     print(f"\n[SEARCH] Starting retrieval...")
     print(f"   - Query: {query}")
     print(f"   - Filters: {filters}")
     print(f"   - Search text: {search_text}")
 
+    regions = route_regions(filters)
+    print(f"   - Regions: {', '.join(regions) if regions else 'all (fan-out)'}")
+
+    vector_store = _load_vector_store()
+    stats = get_selectivity_stats()
+
+    plan = choose_plan(
+        query,
+        keywords,
+        filters,
+        stats,
+        vector_available=vector_store is not None,
+        total_vectors=vector_store.total_vectors(regions) if vector_store else 0,
+    )
+    print(f"   [PLAN] {plan.strategy} ({plan.reason}), est. rows={plan.estimated_rows:.0f}")
+
+    return {
+        "filters": filters,
+        "search_text": search_text,
+        "regions": regions,
+        "plan": plan,
+        "stats": stats,
+        "vector_store": vector_store,
+        "snapshot": get_snapshot(),
+    }
+
+
+def _candidate_statement(conditions: list, limit: int = None):
+    """
+    SELECT result columns and quality score of daycare centers matching all
+    conditions (Core rows); limited statements return the best-scored rows
+    """
+    statement = (
+        select(*projected_columns(FULL_FIELDS), quality_score_expression().label("quality_score"))
+        .outerjoin(DaycareFeatures, DaycareFeatures.stcode == DaycareCenter.stcode)
+        .where(and_(*conditions))
+    )
+    if limit:
+        statement = statement.order_by(desc("quality_score"), DaycareCenter.id).limit(limit)
+    return statement
+
+
+def _blend_quality(candidates: list) -> list:
+    """Re-order candidates (most relevant first) with their quality scores"""
+    by_stcode = {d.stcode: d for d in candidates}
+    quality = {d.stcode: d.quality_score for d in candidates}
+    order = blend_with_relevance(list(by_stcode), quality)
+    return [by_stcode[stcode] for stcode in order[: settings.TOP_K]]
+
+
+def _order_by_scores(candidates: list, scored: list) -> list:
+    """Order candidates by exact vector scores and quality (filter-first plan)"""
+    by_stcode = {d.stcode: d for d in candidates}
+    print(f"   [OK] Exact vector scoring: {len(scored)} candidates")
+    return _blend_quality([by_stcode[stcode] for stcode, _ in scored])
+
+
+def _order_by_ranks(candidates: list, ranks: dict) -> list:
+    """Order candidates by vector/full-text rank and quality"""
+    candidates.sort(key=lambda d: ranks.get(d.stcode, len(ranks)))
+    return _blend_quality(candidates)
+
+
+def _result_row(daycare) -> dict:
+    """Serialize a candidate row with its quality score"""
+    return {**serialize_row(daycare, FULL_FIELDS), "quality_score": round(daycare.quality_score, 4)}
+
+
+def _vector_ranks(vector_store, context: dict, top_k: int) -> dict:
+    """Run the vector search on the routed regions and map stcode -> rank"""
+    vector_results = vector_store.search(
+        context["search_text"],
+        top_k=top_k,
+        regions=context["regions"],
+        query_embedding=context.get("query_embedding"),
+    )
+    ranks = {stcode: i for i, (stcode, _) in enumerate(vector_results)}
+    print(f"   [OK] Vector search: {len(ranks)} candidates")
+    return ranks
+
+
+def _fulltext_ranks(hits: list) -> dict:
+    """Map stcode -> full-text rank (bm25 order)"""
+    ranks = {hit["stcode"]: i for i, hit in enumerate(hits)}
+    print(f"   [OK] Full-text search: {len(ranks)} candidates")
+    return ranks
+
+
+def _fulltext_limit() -> int:
+    """Full-text candidates fetched before the structured filters are applied"""
+    return settings.TOP_K * 20
+
+
+def _execute_plan(session, plan, context: dict, conditions: list):
+    """
+    Run a retrieval plan on a sync session
+
+    A full-text plan without hits falls through to its fallback plan.
+
+    Returns:
+        (daycares, rows_examined, executed plan)
+    """
+    vector_store = context["vector_store"]
+    search_text = context["search_text"]
+
+    if plan.strategy == PLAN_FULLTEXT:
+        hits = search_fulltext(session, " ".join(plan.fulltext_terms), _fulltext_limit())
+        ranks = _fulltext_ranks(hits)
+        if ranks:
+            statement = _candidate_statement(
+                conditions + [DaycareCenter.stcode.in_(list(ranks))]
+            )
+            candidates = session.execute(statement).all()
+            if candidates:
+                return _order_by_ranks(candidates, ranks), len(candidates), plan
+        print(f"   [PLAN] No full-text match, falling back to {plan.fallback.strategy}")
+        return _execute_plan(session, plan.fallback, context, conditions)
+
+    if plan.strategy == PLAN_SQL_ONLY:
+        daycares = session.execute(_candidate_statement(conditions, settings.TOP_K)).all()
+        return daycares, len(daycares), plan
+
+    if plan.strategy == PLAN_FILTER_FIRST:
+        # Step 1: Filter in the database, Step 2: exact vector scoring
+        candidates = session.execute(_candidate_statement(conditions)).all()
+        scored = vector_store.score_stcodes(
+            search_text, [d.stcode for d in candidates], context.get("query_embedding")
+        )
+        return _order_by_scores(candidates, scored), len(candidates), plan
+
+    # Step 1: Vector similarity search, Step 2: database filter
+    ranks = _vector_ranks(vector_store, context, plan.vector_top_k)
+    if ranks:
+        conditions = conditions + [DaycareCenter.stcode.in_(list(ranks))]
+    candidates = session.execute(_candidate_statement(conditions)).all()
+    return _order_by_ranks(candidates, ranks), len(candidates), plan
+
+
+def _embed_query(context: dict) -> dict:
+    """Context with the search text embedding (reused by follow-up plan runs)"""
+    vector_store = context["vector_store"]
+    if vector_store is None or context.get("query_embedding") is not None:
+        return context
+    embedding = vector_store.embedding_service.embed_text(context["search_text"])
+    return {**context, "query_embedding": embedding}
+
+
+async def _aembed_query(context: dict) -> dict:
+    """
+    Context with the search text embedding awaited on the async client
+
+    Vector plans then only run the (CPU-bound) index lookups in a worker
+    thread; no embedding API call blocks a thread or the event loop.
+    """
+    vector_store = context["vector_store"]
+    if vector_store is None or context.get("query_embedding") is not None:
+        return context
+    embedding = await vector_store.embedding_service.aembed_text(context["search_text"])
+    return {**context, "query_embedding": embedding}
+
+
+async def _aexecute_plan(session, plan, context: dict, conditions: list):
+    """Async variant of _execute_plan (index lookups run in a worker thread)"""
+    vector_store = context["vector_store"]
+    search_text = context["search_text"]
+
+    if plan.strategy == PLAN_FULLTEXT:
+        hits = await search_fulltext_async(
+            session, " ".join(plan.fulltext_terms), _fulltext_limit()
+        )
+        ranks = _fulltext_ranks(hits)
+        if ranks:
+            statement = _candidate_statement(
+                conditions + [DaycareCenter.stcode.in_(list(ranks))]
+            )
+            candidates = (await session.execute(statement)).all()
+            if candidates:
+                return _order_by_ranks(candidates, ranks), len(candidates), plan
+        print(f"   [PLAN] No full-text match, falling back to {plan.fallback.strategy}")
+        return await _aexecute_plan(session, plan.fallback, context, conditions)
+
+    if plan.strategy == PLAN_SQL_ONLY:
+        result = await session.execute(_candidate_statement(conditions, settings.TOP_K))
+        daycares = result.all()
+        return daycares, len(daycares), plan
+
+    context = await _aembed_query(context)
+
+    if plan.strategy == PLAN_FILTER_FIRST:
+        candidates = (await session.execute(_candidate_statement(conditions))).all()
+        scored = await asyncio.to_thread(
+            vector_store.score_stcodes,
+            search_text,
+            [d.stcode for d in candidates],
+            context["query_embedding"],
+        )
+        return _order_by_scores(candidates, scored), len(candidates), plan
+
+    ranks = await asyncio.to_thread(_vector_ranks, vector_store, context, plan.vector_top_k)
+    if ranks:
+        conditions = conditions + [DaycareCenter.stcode.in_(list(ranks))]
+    candidates = (await session.execute(_candidate_statement(conditions))).all()
+    return _order_by_ranks(candidates, ranks), len(candidates), plan
+
+
+def _execute_snapshot_plan(snapshot, plan, context: dict):
+    """
+    Run a retrieval plan on the in-memory snapshot (no SQL)
+
+    Filters are evaluated as a boolean mask; only the final rows are
+    materialized.
+
+    Returns:
+        (search_results, rows_examined, executed plan)
+    """
+    vector_store = context["vector_store"]
+    search_text = context["search_text"]
+    mask = snapshot.filter_mask(context["filters"])
+
+    if plan.strategy == PLAN_FILTER_FIRST:
+        # Step 1: Filter mask, Step 2: exact vector scoring
+        candidates = np.flatnonzero(mask)
+        scored = vector_store.score_stcodes(
+            search_text, snapshot.stcodes[candidates].tolist(), context.get("query_embedding")
+        )
+        print(f"   [OK] Exact vector scoring: {len(scored)} candidates")
+        positions = _blend_positions(snapshot, snapshot.positions_for([s for s, _ in scored]))
+        return _snapshot_results(snapshot, positions), len(candidates), plan
+
+    if plan.strategy != PLAN_SQL_ONLY:
+        # Step 1: Vector similarity search, Step 2: filter mask
+        ranks = _vector_ranks(vector_store, context, plan.vector_top_k)
+        if ranks:
+            ranked = snapshot.positions_for(list(ranks))
+            candidates = ranked[mask[ranked]]
+            positions = _blend_positions(snapshot, candidates)
+            return _snapshot_results(snapshot, positions), len(candidates), plan
+
+    # No relevance signal: best quality first
+    candidates = np.flatnonzero(mask)
+    return _snapshot_results(snapshot, snapshot.order_by_quality(candidates)), len(candidates), plan
+
+
+def _blend_positions(snapshot, positions: np.ndarray) -> np.ndarray:
+    """Snapshot positions (most relevant first) re-ordered with quality scores"""
+    stcodes = snapshot.stcodes[positions].tolist()
+    quality = dict(zip(stcodes, snapshot.quality_scores[positions].tolist()))
+    return snapshot.positions_for(blend_with_relevance(stcodes, quality))
+
+
+def _snapshot_results(snapshot, positions: np.ndarray) -> list:
+    """Materialize the top rows with their quality scores"""
+    positions = positions[: settings.TOP_K]
+    rows = snapshot.rows(positions)
+    for row, score in zip(rows, snapshot.quality_scores[positions]):
+        row["quality_score"] = round(float(score), 4)
+    return rows
+
+
+def _expansion_targets(filters: dict) -> list:
+    """Neighbouring districts a district search may be widened to, closest first"""
+    if not settings.DISTRICT_EXPANSION_ENABLED:
+        return []
+    region_code, district, district_code = resolve_location(filters)
+    if not district and not district_code:
+        return []
+
+    graph = get_district_graph()
+    code = district_code or graph.code_for(district, region_code)
+    if code is None:
+        return []
+    return graph.neighbors(
+        code, settings.DISTRICT_EXPANSION_MAX_NEIGHBORS, settings.DISTRICT_EXPANSION_MAX_KM
+    )
+
+
+def _neighbor_context(context: dict, code: str, name: str) -> dict:
+    """
+    Retrieval context with the district filter moved to a neighbouring district
+
+    The search text and its embedding are kept, so a neighbour costs one
+    filtered plan run and no embedding call.
+    """
+    filters = {**context["filters"], "district": name, "district_code": code}
+    filters.pop("region", None)
+    return {**context, "filters": filters, "regions": route_regions(filters)}
+
+
+def _add_expanded(results: list, rows: list, name: str, distance: float) -> dict:
+    """Append labelled rows of a neighbouring district until TOP_K results"""
+    seen = {row["stcode"] for row in results}
+    added = [
+        {**row, "expanded_district": name, "district_distance_km": round(distance, 2)}
+        for row in rows
+        if row["stcode"] not in seen
+    ][: settings.TOP_K - len(results)]
+    results.extend(added)
+
+    print(f"   [EXPAND] {name} ({distance:.1f} km): +{len(added)} results")
+    return {"district": name, "distance_km": round(distance, 2), "results": len(added)}
+
+
+def _expand_results(context: dict, results: list, run) -> list:
+    """
+    Fill a district search below TOP_K from the nearest districts, closest first
+
+    Each neighbour runs the same plan with its district filter and the query
+    embedding computed once here; the cached district graph
+    (services/districts.py) supplies the order.
+
+    Args:
+        context: Retrieval context of the original request
+        results: Result rows, extended in place
+        run: Callable context -> result rows
+
+    Returns:
+        Expansion steps [{district, distance_km, results}] (empty if none)
+    """
+    expansion = []
+    if len(results) >= settings.TOP_K:
+        return expansion
+
+    targets = _expansion_targets(context["filters"])
+    if targets and context["plan"].strategy != PLAN_SQL_ONLY:
+        context = _embed_query(context)
+    for code, name, distance in targets:
+        rows = run(_neighbor_context(context, code, name))
+        expansion.append(_add_expanded(results, rows, name, distance))
+        if len(results) >= settings.TOP_K:
+            break
+    return expansion
+
+
+async def _aexpand_results(context: dict, results: list, run) -> list:
+    """Async variant of _expand_results (run is a coroutine function)"""
+    expansion = []
+    if len(results) >= settings.TOP_K:
+        return expansion
+
+    targets = await asyncio.to_thread(_expansion_targets, context["filters"])
+    if targets and context["plan"].strategy != PLAN_SQL_ONLY:
+        context = await _aembed_query(context)
+    for code, name, distance in targets:
+        rows = await run(_neighbor_context(context, code, name))
+        expansion.append(_add_expanded(results, rows, name, distance))
+        if len(results) >= settings.TOP_K:
+            break
+    return expansion
+
+
+def _result_state(
+    state: dict,
+    context: dict,
+    search_results: list,
+    rows_examined: int,
+    started: float,
+    executed_plan=None,
+    source: str = "database",
+    expansion: list = None,
+) -> dict:
+    """Build the updated workflow state from retrieved rows"""
+    print(f"   [OK] {source.capitalize()} filter: {len(search_results)} results")
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    retrieval_plan = {
+        **context["plan"].to_dict(),
+        "executed_strategy": (executed_plan or context["plan"]).strategy,
+        "source": source,
+        "actual_rows": rows_examined,
+        "actual_ms": round(elapsed_ms, 3),
+        "data_version": context["stats"].data_version,
+    }
+
+    metadata = {
+        **state.get("metadata", {}),
+        "total_results": len(search_results),
+        "filters_applied": list(context["filters"].keys()),
+        "retrieval_plan": retrieval_plan,
+    }
+    if expansion:
+        metadata["district_expansion"] = expansion
+
+    return {**state, "search_results": search_results, "metadata": metadata}
+
+
+def _error_state(state: dict, error: Exception) -> dict:
+    print(f"[ERROR] Retriever error: {error}")
+    return {
+        **state,
+        "search_results": [],
+        "metadata": {
+            **state.get("metadata", {}),
+            "retriever_error": str(error),
+        },
+    }
+
+
+def document_retriever_node(state: dict) -> dict:
+    """
+    Retrieve relevant daycare centers using hybrid search
+
+    Args:
+        state: Workflow state with 'query', 'filters', 'keywords'
+
+    Returns:
+        Updated state with 'search_results'
+    """
     try:
-        # Step 1: Vector similarity search (if index exists)
-        vector_stcodes = set()
-        vector_store = get_vector_store()
+        context = _prepare_retrieval(state)
 
-        if vector_store.index is not None:
-            top_k = settings.TOP_K * 2  # Get more results for filtering
-            vector_results = vector_store.search(search_text, top_k=top_k)
-            vector_stcodes = {stcode for stcode, _ in vector_results}
-            print(f"   [OK] Vector search: {len(vector_stcodes)} candidates")
+        plan = context["plan"]
+        snapshot = context["snapshot"]
 
-        # Step 2: Database filtering
-        session = get_session()
+        started = time.perf_counter()
+        if snapshot is not None and plan.strategy != PLAN_FULLTEXT:
+            results, rows_examined, executed = _execute_snapshot_plan(snapshot, plan, context)
+            expansion = _expand_results(
+                context, results, lambda ctx: _execute_snapshot_plan(snapshot, plan, ctx)[0]
+            )
+            return _result_state(
+                state, context, results, rows_examined, started, executed, "snapshot", expansion
+            )
 
-        # Build filter conditions
-        conditions = []
+        # Full-text lookups need the FTS5 index; the snapshot path applies
+        # filters as NumPy masks, so SQL conditions are only compiled here
+        conditions = build_filter_conditions(context["filters"])
+        with session_scope() as session:
+            daycares, rows_examined, executed = _execute_plan(
+                session, plan, context, conditions
+            )
+            results = [_result_row(daycare) for daycare in daycares]
 
-        # Status filter (only active daycares)
-        conditions.append(DaycareCenter.crstatusname == "정상")
+            def run(ctx):
+                rows, _, _ = _execute_plan(session, plan, ctx, build_filter_conditions(ctx["filters"]))
+                return [_result_row(row) for row in rows]
 
-        # District filter
-        if filters.get("district"):
-            conditions.append(DaycareCenter.sigunname.like(f"%{filters['district']}%"))
+            expansion = _expand_results(context, results, run)
 
-        # Type filter
-        if filters.get("type"):
-            type_name = filters["type"]
-            conditions.append(DaycareCenter.crtypename.like(f"%{type_name}%"))
+        return _result_state(
+            state, context, results, rows_examined, started, executed, expansion=expansion
+        )
 
-        # Age filter (check if class exists for specific age)
-        age = filters.get("age")
-        if age:
-            age_conditions = []
-            if "만0세" in age or "영아" in age:
-                age_conditions.append(DaycareCenter.class_cnt_00 > 0)
-            if "만1세" in age or "영아" in age:
-                age_conditions.append(DaycareCenter.class_cnt_01 > 0)
-            if "만2세" in age or "영아" in age:
-                age_conditions.append(DaycareCenter.class_cnt_02 > 0)
-            if "만3세" in age or "유아" in age:
-                age_conditions.append(DaycareCenter.class_cnt_03 > 0)
-            if "만4세" in age or "유아" in age:
-                age_conditions.append(DaycareCenter.class_cnt_04 > 0)
-            if "만5세" in age or "유아" in age:
-                age_conditions.append(DaycareCenter.class_cnt_05 > 0)
-
-            if age_conditions:
-                conditions.append(or_(*age_conditions))
-
-        # Facility filters
-        if filters.get("has_playground"):
-            conditions.append(DaycareCenter.plgrdco > 0)
-
-        if filters.get("min_cctv"):
-            min_cctv = int(filters["min_cctv"])
-            conditions.append(DaycareCenter.cctvinstlcnt >= min_cctv)
-
-        if filters.get("has_vehicle"):
-            conditions.append(DaycareCenter.crcargbname.isnot(None))
-
-        # Special service filter
-        special_service = filters.get("special_service")
-        if special_service:
-            conditions.append(DaycareCenter.crspec.like(f"%{special_service}%"))
+    except Exception as e:
+        return _error_state(state, e)
+
+
+async def adocument_retriever_node(state: dict) -> dict:
+    """
+    Async variant of document_retriever_node
+
+    Database lookups are awaited on the aiosqlite engine and the query
+    embedding on the async embedding client; planning (cached statistics) and
+    index lookups run in a worker thread, so the event loop stays free for
+    other requests.
+
+    Args:
+        state: Workflow state with 'query', 'filters', 'keywords'
+
+    Returns:
+        Updated state with 'search_results'
+    """
+    try:
+        context = await asyncio.to_thread(_prepare_retrieval, state)
+
+        plan = context["plan"]
+        snapshot = context["snapshot"]
+
+        started = time.perf_counter()
+        if snapshot is not None and plan.strategy != PLAN_FULLTEXT:
 
-        # Vector search results filter (if available)
-        if vector_stcodes:
-            conditions.append(DaycareCenter.stcode.in_(vector_stcodes))
+            if plan.strategy != PLAN_SQL_ONLY:
+                context = await _aembed_query(context)
+            results, rows_examined, executed = await asyncio.to_thread(
+                _execute_snapshot_plan, snapshot, plan, context
+            )
 
-        # Execute query
-        query_obj = session.query(DaycareCenter).filter(and_(*conditions))
+            async def run(ctx):
+                return (await asyncio.to_thread(_execute_snapshot_plan, snapshot, plan, ctx))[0]
 
-        # Limit results
-        daycares = query_obj.limit(settings.TOP_K).all()
+            expansion = await _aexpand_results(context, results, run)
+            return _result_state(
+                state, context, results, rows_examined, started, executed, "snapshot", expansion
+            )
 
-        print(f"   [OK] Database filter: {len(daycares)} results")
+        conditions = build_filter_conditions(context["filters"])
+        async with async_session_scope() as session:
+            daycares, rows_examined, executed = await _aexecute_plan(
+                session, plan, context, conditions
+            )
+            results = [_result_row(daycare) for daycare in daycares]
 
-        # Convert to dict
-        search_results = [daycare.to_dict() for daycare in daycares]
+            async def run(ctx):
+                rows, _, _ = await _aexecute_plan(
+                    session, plan, ctx, build_filter_conditions(ctx["filters"])
+                )
+                return [_result_row(row) for row in rows]
 
-        session.close()
+            expansion = await _aexpand_results(context, results, run)
 
-        return {
-            **state,
-            "search_results": search_results,
-            "metadata": {
-                **state.get("metadata", {}),
-                "total_results": len(search_results),
-                "filters_applied": list(filters.keys()),
-            },
-        }
+        return _result_state(
+            state, context, results, rows_examined, started, executed, expansion=expansion
+        )
 
     except Exception as e:
-        print(f"[ERROR] Retriever error: {e}")
-        return {
-            **state,
-            "search_results": [],
-            "metadata": {
-                **state.get("metadata", {}),
-                "retriever_error": str(e),
-            },
-        }
+        return _error_state(state, e)
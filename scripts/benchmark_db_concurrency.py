@@ -0,0 +1,150 @@
+"""
+Database Concurrency Benchmark
+Compares the shared pooled engine against a new engine per request
+"""
+
+import argparse
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add app directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import get_session, DaycareCenter
+from config import settings
+
+
+def legacy_session():
+    """Pre-pooling behaviour: a new engine + StaticPool for every session"""
+    engine = create_engine(
+        f"sqlite:///{settings.get_db_path()}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def run_request(session_factory, stcodes: list):
+    """One representative API request: district counts + detail + filter query"""
+    session = session_factory()
+    try:
+        session.query(
+            DaycareCenter.sigunname, func.count(DaycareCenter.id)
+        ).filter(DaycareCenter.crstatusname == "정상").group_by(
+            DaycareCenter.sigunname
+        ).all()
+
+        if stcodes:
+            session.query(DaycareCenter).filter(
+                DaycareCenter.stcode == random.choice(stcodes)
+            ).first()
+
+        session.query(DaycareCenter).filter(
+            DaycareCenter.crstatusname == "정상", DaycareCenter.plgrdco > 0
+        ).limit(settings.TOP_K).all()
+    finally:
+        session.close()
+
+
+def run_level(session_factory, concurrency: int, duration: float, stcodes: list) -> dict:
+    """Run `concurrency` worker threads for `duration` seconds"""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        nonlocal errors
+        local = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                run_request(session_factory, stcodes)
+                local.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        "errors": errors,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    """Main benchmark workflow"""
+    parser = argparse.ArgumentParser(description="SQLite concurrency benchmark")
+    parser.add_argument("--levels", default="1,4,8,16", help="Comma-separated thread counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per level")
+    parser.add_argument(
+        "--mode",
+        choices=["pooled", "legacy", "both"],
+        default="both",
+        help="Engine strategy to benchmark",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Database Concurrency Benchmark")
+    print("=" * 60)
+
+    db_path = settings.get_db_path()
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        print("   Please run 'python scripts/preprocess_data.py' first")
+        return
+
+    session = get_session()
+    stcodes = [row[0] for row in session.query(DaycareCenter.stcode).limit(1000).all()]
+    session.close()
+    print(f"   - Database: {db_path}")
+    print(f"   - Sample stcodes: {len(stcodes)}")
+
+    modes = ["legacy", "pooled"] if args.mode == "both" else [args.mode]
+    factories = {"pooled": get_session, "legacy": legacy_session}
+    levels = [int(level) for level in args.levels.split(",")]
+
+    print(
+        f"\n{'mode':8} {'threads':>7} {'requests':>9} {'rps':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'errors':>6} {'rss MB':>8}"
+    )
+    for mode in modes:
+        for concurrency in levels:
+            result = run_level(factories[mode], concurrency, args.duration, stcodes)
+            print(
+                f"{mode:8} {concurrency:>7} {result['requests']:>9} {result['rps']:>9.1f} "
+                f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                f"{result['errors']:>6} {result['max_rss_mb']:>8.1f}"
+            )
+
+    print("\n" + "=" * 60)
+    print("✅ Benchmark complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Search Concurrency Benchmark
+Throughput of the search workflow as the number of in-flight requests grows:
+awaited async workflow vs the blocking sync workflow on one event loop
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from config import settings
+from workflows.graph_builder import run_search_workflow, run_search_workflow_sync
+
+QUERIES = [
+    ("강남구 국공립 어린이집 추천해줘", {}),
+    ("놀이터가 있는 어린이집 찾아줘", {"district": "성북구"}),
+    ("송파구에 있는 직장 어린이집 중 CCTV가 많은 곳", {}),
+    ("야간연장 되는 어린이집", {"district": "강남구", "type": "국공립"}),
+]
+
+
+async def run_request(mode: str, client=None, url: str = None):
+    """One search request in the given mode"""
+    query, filters = random.choice(QUERIES)
+    if mode == "http":
+        response = await client.post(
+            f"{url}/api/v1/search", json={"query": query, "filters": filters}
+        )
+        response.raise_for_status()
+    elif mode == "async":
+        await run_search_workflow(query, filters)
+    else:
+        # Pre-async route behaviour: the sync workflow blocks the event loop
+        run_search_workflow_sync(query, filters)
+
+
+async def run_level(mode: str, concurrency: int, duration: float, client=None, url: str = None) -> dict:
+    """Keep `concurrency` requests in flight for `duration` seconds"""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await run_request(mode, client, url)
+                latencies.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+async def run_benchmark(modes: list, levels: list, duration: float, url: str = None):
+    client = None
+    if url:
+        import httpx
+
+        client = httpx.AsyncClient(timeout=120.0)
+
+    print(
+        f"\n{'mode':8} {'in-flight':>9} {'requests':>9} {'rps':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'errors':>6}"
+    )
+    try:
+        for mode in modes:
+            for concurrency in levels:
+                # Node progress output would drown the table
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = await run_level(mode, concurrency, duration, client, url)
+                print(
+                    f"{mode:8} {concurrency:>9} {result['requests']:>9} {result['rps']:>9.2f} "
+                    f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['errors']:>6}"
+                )
+    finally:
+        if client is not None:
+            await client.aclose()
+
+
+def main():
+    """Main benchmark workflow"""
+    parser = argparse.ArgumentParser(description="Search workflow concurrency benchmark")
+    parser.add_argument("--levels", default="1,4,8,16", help="Comma-separated in-flight request counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument(
+        "--mode",
+        choices=["async", "blocking", "both"],
+        default="both",
+        help="Workflow to benchmark in-process",
+    )
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Benchmark a running API server over HTTP instead (e.g. http://localhost:8000)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Search Concurrency Benchmark")
+    print("=" * 60)
+
+    if args.url:
+        modes = ["http"]
+        print(f"   - Server: {args.url}")
+    else:
+        db_path = settings.get_db_path()
+        if not db_path.exists():
+            print(f"❌ Database not found: {db_path}")
+            print("   Please run 'python scripts/preprocess_data.py' first")
+            return
+        modes = ["blocking", "async"] if args.mode == "both" else [args.mode]
+        print(f"   - Database: {db_path}")
+        if not (settings.OPENAI_API_KEY or settings.AOAI_API_KEY):
+            print("   [WARN] No LLM API key: analyzer/generator fall back immediately")
+
+    levels = [int(level) for level in args.levels.split(",")]
+    asyncio.run(run_benchmark(modes, levels, args.duration, args.url))
+
+    print("\n" + "=" * 60)
+    print("✅ Benchmark complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 """
 FAISS Vector Index Creation Script
-Creates FAISS index from daycare center embeddings
+Creates FAISS index from daycare center embeddings (one index, or one per
+region with --partition), or updates it from a change manifest written by
+preprocess_data.py
 """
 
+import argparse
 import json
 import sys
+from collections import defaultdict
 from pathlib import Path
 import numpy as np
 import faiss
@@ -14,18 +18,27 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "app"))
 
 from database import get_session, DaycareCenter
-from services import EmbeddingService
+from services import EmbeddingService, create_embedding_service
+from services.vector_store import (
+    read_region_manifest,
+    region_index_paths,
+    write_region_manifest,
+)
 from config import settings
+from utils.filters import region_code_for
 
 
-def load_daycare_data():
-    """Load daycare centers from database"""
+def load_daycare_data(regions: list = None):
+    """Load daycare centers from database (optionally only some regions)"""
     print("📂 Loading daycare centers from database...")
 
     session = get_session()
-    daycares = session.query(DaycareCenter).filter(
+    query = session.query(DaycareCenter).filter(
         DaycareCenter.crstatusname == "정상"  # Only active daycares
-    ).all()
+    )
+    if regions:
+        query = query.filter(DaycareCenter.region_code.in_(regions))
+    daycares = query.all()
 
     print(f"✅ Loaded {len(daycares)} daycare centers")
     session.close()
@@ -81,15 +94,17 @@ def create_faiss_index(embeddings: np.ndarray):
     return index
 
 
-def save_index(index, stcodes: list):
-    """Save FAISS index and metadata"""
+def save_index(index, stcodes: list, index_path: Path = None, metadata_path: Path = None):
+    """Save FAISS index and metadata (default: the single index from settings)"""
     print("\n💾 Saving FAISS index and metadata...")
 
+    index_path = index_path or settings.get_vector_index_path()
+    metadata_path = metadata_path or settings.get_vector_metadata_path()
+
     # Ensure directory exists
-    settings.VECTOR_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Save FAISS index
-    index_path = settings.get_vector_index_path()
     faiss.write_index(index, str(index_path))
     print(f"   ✓ Index saved to: {index_path}")
 
@@ -99,9 +114,9 @@ def save_index(index, stcodes: list):
         "dimension": index.d,
         "total_vectors": index.ntotal,
         "index_type": "IndexFlatL2",
+        "embedding_backend": settings.EMBEDDING_BACKEND,
     }
 
-    metadata_path = settings.get_vector_metadata_path()
     with open(metadata_path, "w", encoding="utf-8") as f:
         json.dump(metadata, f, ensure_ascii=False, indent=2)
     print(f"   ✓ Metadata saved to: {metadata_path}")
@@ -109,6 +124,153 @@ def save_index(index, stcodes: list):
     print(f"✅ Index and metadata saved successfully")
 
 
+def build_region_indexes(daycares: list, embedding_service: EmbeddingService) -> dict:
+    """
+    Build one index per region (시도) and record the region totals
+
+    Regions not present in daycares keep their existing index.
+
+    Returns:
+        {region code: vector count} of the regions built
+    """
+    by_region = defaultdict(list)
+    for daycare in daycares:
+        by_region[daycare.region_code or region_code_for(daycare.stcode)].append(daycare)
+
+    totals = read_region_manifest()
+    built = {}
+    dimension = None
+    for region, members in sorted(by_region.items()):
+        if region is None:
+            print(f"⚠️  Skipping {len(members)} centers without a region code")
+            continue
+        print(f"\n🗺️  Region {region}: {len(members)} centers")
+        embeddings, stcodes = generate_embeddings(members, embedding_service)
+        index = create_faiss_index(embeddings)
+        save_index(index, stcodes, *region_index_paths(region))
+        built[region] = totals[region] = index.ntotal
+        dimension = index.d
+
+    if dimension is not None:
+        path = write_region_manifest(totals, dimension)
+        print(f"\n✅ Region manifest saved: {path} ({len(totals)} regions)")
+    return built
+
+
+def apply_manifest(
+    changes: dict,
+    embedding_service: EmbeddingService,
+    index_path: Path = None,
+    metadata_path: Path = None,
+) -> int:
+    """
+    Apply one change manifest to one index
+
+    Vectors of closed centers and of centers whose embedding text changed are
+    removed; changed, inserted and reopened active centers are re-embedded and
+    appended. Everything else is left untouched.
+
+    Returns:
+        Number of vectors in the updated index
+    """
+    index_path = index_path or settings.get_vector_index_path()
+    metadata_path = metadata_path or settings.get_vector_metadata_path()
+
+    if index_path.exists():
+        index = faiss.read_index(str(index_path))
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            stcodes = json.load(f)["stcodes"]
+    else:
+        # New region in a partitioned layout
+        index = faiss.IndexFlatL2(settings.EMBEDDING_DIMENSION)
+        stcodes = []
+    positions = {stcode: i for i, stcode in enumerate(stcodes)}
+
+    # Drop outdated vectors (IndexFlat keeps the order of the remaining ones)
+    outdated = set(changes["closed"]) | set(changes["embedding_changed"])
+    remove = [positions[stcode] for stcode in outdated if stcode in positions]
+    if remove:
+        index.remove_ids(np.array(sorted(remove), dtype=np.int64))
+        stcodes = [stcode for stcode in stcodes if stcode not in outdated]
+    print(f"   - Removed vectors: {len(remove)}")
+
+    # Embed active centers whose vector is missing or outdated
+    candidates = set(changes["inserted"]) | set(changes["updated"]) | outdated
+    remaining = set(stcodes)
+    session = get_session()
+    try:
+        daycares = (
+            session.query(DaycareCenter)
+            .filter(
+                DaycareCenter.stcode.in_(sorted(candidates)),
+                DaycareCenter.crstatusname == "정상",
+            )
+            .all()
+        )
+    finally:
+        session.close()
+    daycares = [d for d in daycares if d.stcode not in remaining]
+
+    if daycares:
+        embeddings, new_stcodes = generate_embeddings(daycares, embedding_service)
+        index.add(embeddings)
+        stcodes.extend(new_stcodes)
+    print(f"   - Added vectors: {len(daycares)}")
+
+    save_index(index, stcodes, index_path, metadata_path)
+    return index.ntotal
+
+
+def update_index_from_manifest(manifest_path: Path, embedding_service: EmbeddingService) -> bool:
+    """
+    Update the existing index(es) for the rows a diff ingest changed
+
+    With per-region indexes the manifest is split by region and only the
+    affected regions are rewritten.
+
+    Returns:
+        True if an index was updated
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    totals = read_region_manifest()
+    if not totals:
+        if not settings.get_vector_index_path().exists() or not settings.get_vector_metadata_path().exists():
+            print("❌ No existing index to update - run without --manifest first")
+            return False
+        apply_manifest(manifest, embedding_service)
+        return True
+
+    keys = ["inserted", "updated", "closed", "embedding_changed"]
+    by_region = defaultdict(lambda: {key: [] for key in keys})
+    for key in keys:
+        for stcode in manifest[key]:
+            by_region[region_code_for(stcode)][key].append(stcode)
+
+    for region, changes in sorted(by_region.items(), key=lambda item: str(item[0])):
+        if region is None:
+            continue
+        print(f"\n🗺️  Region {region}")
+        totals[region] = apply_manifest(changes, embedding_service, *region_index_paths(region))
+
+    write_region_manifest(totals, settings.EMBEDDING_DIMENSION)
+    return True
+
+
+def verify_region_indexes():
+    """Verify per-region indexes against the region manifest"""
+    print("\n🔍 Verifying region indexes...")
+
+    for region, total in read_region_manifest().items():
+        index_path, metadata_path = region_index_paths(region)
+        index = faiss.read_index(str(index_path))
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            entries = len(json.load(f)["stcodes"])
+        status = "✓" if index.ntotal == total == entries else "✗"
+        print(f"   {status} Region {region}: {index.ntotal} vectors, {entries} metadata entries")
+
+
 def verify_index():
     """Verify the created index"""
     print("\n🔍 Verifying index...")
@@ -130,7 +292,7 @@ def verify_index():
 
     # Test search
     print("\n🔍 Testing search...")
-    embedding_service = EmbeddingService()
+    embedding_service = create_embedding_service()
     test_query = "강남구 국공립 어린이집"
     query_embedding = embedding_service.embed_text(test_query)
     query_embedding = np.array([query_embedding])
@@ -149,6 +311,24 @@ def verify_index():
 
 def main():
     """Main workflow"""
+    parser = argparse.ArgumentParser(description="Create or update the FAISS index")
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Change manifest from preprocess_data.py: only re-embed changed centers",
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="Build one index per region (시도) under VECTOR_REGION_DIR",
+    )
+    parser.add_argument(
+        "--region",
+        action="append",
+        help="With --partition: only (re)build this region code (repeatable)",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("FAISS Vector Index Creation")
     print("=" * 60)
@@ -163,21 +343,38 @@ def main():
     # Initialize embedding service
     print("\n1️⃣  Initializing embedding service...")
     try:
-        embedding_service = EmbeddingService()
+        embedding_service = create_embedding_service()
         print("✅ Embedding service initialized")
     except Exception as e:
         print(f"❌ Failed to initialize embedding service: {e}")
         print("   Please check your .env file and Azure OpenAI configuration")
         return
 
+    if args.manifest:
+        print(f"\n2️⃣  Updating index from manifest: {args.manifest}")
+        if update_index_from_manifest(args.manifest, embedding_service):
+            print("\n3️⃣  Verifying index...")
+            if read_region_manifest():
+                verify_region_indexes()
+            else:
+                verify_index()
+        return
+
     # Load data
     print("\n2️⃣  Loading daycare data...")
-    daycares = load_daycare_data()
+    daycares = load_daycare_data(args.region if args.partition else None)
 
     if not daycares:
         print("❌ No daycare centers found in database")
         return
 
+    if args.partition:
+        print("\n3️⃣  Building region indexes...")
+        built = build_region_indexes(daycares, embedding_service)
+        print(f"✅ Built {len(built)} region indexes ({sum(built.values()):,} vectors)")
+        verify_region_indexes()
+        return
+
     # Generate embeddings
     print("\n3️⃣  Generating embeddings...")
     embeddings, stcodes = generate_embeddings(daycares, embedding_service)
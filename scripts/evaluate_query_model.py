@@ -0,0 +1,74 @@
+"""
+Query Model Evaluation
+Agreement of the trained local query model with logged LLM analyzer outputs:
+intent, exact filters, per-slot accuracy, coverage at the serving threshold
+and latency
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from config import settings
+from services.query_model import QueryModel, evaluate_query_model, is_holdout, read_analysis_log
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Evaluate the local query analyzer model")
+    parser.add_argument("--log", type=Path, default=settings.get_analyzer_log_path(), help="Analyzer log (JSON Lines)")
+    parser.add_argument("--model", type=Path, default=settings.get_query_model_path(), help="Model file (.npz)")
+    parser.add_argument(
+        "--holdout", type=float, default=0.2, help="Evaluate only the held-out split used by training (0 = all)"
+    )
+    parser.add_argument(
+        "--thresholds", default="0.6,0.7,0.8,0.9", help="Comma-separated confidence thresholds"
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Query Model Evaluation")
+    print("=" * 60)
+
+    for path in (args.log, args.model):
+        if not path.exists():
+            print(f"❌ Not found: {path}")
+            sys.exit(1)
+
+    model = QueryModel.load(args.model)
+    records = read_analysis_log(args.log)
+    if args.holdout > 0:
+        records = [r for r in records if is_holdout(r["query"], args.holdout)]
+    print(f"   - Model: {args.model} ({model.meta.get('examples')} training queries)")
+    print(f"   - Evaluated queries: {len(records)}")
+    if not records:
+        print("❌ No evaluation examples")
+        sys.exit(1)
+
+    report = evaluate_query_model(model, records)
+    print("\n📊 Agreement with the LLM:")
+    print(f"   - Intent accuracy: {report['intent_accuracy']:.1%}")
+    print(f"   - Exact filter match: {report['filter_exact_match']:.1%}")
+    for slot, accuracy in report["slot_accuracy"].items():
+        print(f"     · {slot}: {accuracy:.1%}")
+    print(f"   - Latency: {report['latency_us']:.0f} µs/query")
+
+    print("\n📈 Coverage vs accuracy by threshold:")
+    for threshold in [float(value) for value in args.thresholds.split(",")]:
+        thresholded = evaluate_query_model(model, records, threshold)
+        served = thresholded["covered_accuracy"]
+        served = f"{served:.1%}" if served is not None else "-"
+        marker = "  ← ANALYZER_MODEL_MIN_CONFIDENCE" if threshold == settings.ANALYZER_MODEL_MIN_CONFIDENCE else ""
+        print(f"   - {threshold:.2f}: coverage {thresholded['coverage']:.1%}, accuracy {served}{marker}")
+
+    print("\n" + "=" * 60)
+    print("✅ Evaluation complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Open API fetch script
+Downloads the Seoul daycare dataset from the Open Data API into
+data/raw/seoul_daycare_raw.jsonl (skipped when the data has not changed)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from services.openapi_fetcher import OpenApiError, fetch_dataset
+from config import settings
+
+
+def main():
+    """Main fetch workflow"""
+    parser = argparse.ArgumentParser(description="Fetch daycare data from the Seoul Open API")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=settings.RAW_DATA_DIR / "seoul_daycare_raw.jsonl",
+        help="JSON Lines output (loadable with preprocess_data.py --file)",
+    )
+    parser.add_argument("--force", action="store_true", help="Fetch even if unchanged")
+    parser.add_argument("--url", help="API base URL (default: SEOUL_OPENAPI_URL)")
+    parser.add_argument("--service", help="Service name (default: SEOUL_OPENAPI_SERVICE)")
+    parser.add_argument("--page-size", type=int, help="Rows per request (default: OPENAPI_PAGE_SIZE)")
+    parser.add_argument(
+        "--concurrency", type=int, help="Pages fetched in parallel (default: OPENAPI_CONCURRENCY)"
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Seoul Open API Fetch")
+    print("=" * 60)
+
+    print(f"\n📡 Fetching {args.service or settings.SEOUL_OPENAPI_SERVICE} into {args.output}...")
+    try:
+        report = fetch_dataset(
+            args.output,
+            force=args.force,
+            base_url=args.url,
+            service=args.service,
+            page_size=args.page_size,
+            concurrency=args.concurrency,
+        )
+    except (ValueError, OpenApiError) as e:
+        print(f"❌ Fetch failed: {e}")
+        print("   Completed pages are kept; run again to resume")
+        sys.exit(1)
+
+    if report.status == "unchanged":
+        print(f"✅ Data unchanged ({report.total:,} rows, 기준일 {report.datastdrdt}), nothing to do")
+        return
+
+    print(f"✅ Fetched {report.records:,} rows in {report.pages} pages ({report.elapsed:.1f}s)")
+    print(f"   - Resumed pages: {report.pages_resumed}, retries: {report.retries}")
+    print(f"   - 기준일: {report.datastdrdt}")
+    print("\nNext: python scripts/preprocess_data.py && python scripts/create_index.py --manifest <manifest>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Synthetic dataset generation script
+Fits distributions from the real data (or built-in priors), writes N synthetic
+daycare centers into a separate SQLite database and builds a matching FAISS
+index with the offline hashing embedding backend, for scale and load tests
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import faiss
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+# Add app directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from database import (
+    Base,
+    DaycareCenter,
+    bump_data_version,
+    create_db_engine,
+    ensure_fulltext_index,
+)
+from services.embeddings import HashingEmbeddingService
+from services.ingest import (
+    bulk_upsert,
+    derive_columns,
+    iter_chunks,
+    iter_json_records,
+    normalize_chunk,
+)
+from services.selectivity import refresh_filter_statistics
+from services.stats_cube import refresh_stats_cube
+from services.features import refresh_feature_table
+from services.districts import refresh_district_centroids
+from services.synthetic import default_profile, fit_profile, generate_records
+from services.vector_store import region_index_paths, write_region_manifest
+from config import settings
+
+_EMBED_BATCH = 10000
+
+
+def load_source_frame(source: Path) -> pd.DataFrame:
+    """Daycare rows to fit from: a SQLite database or a raw JSON/JSONL dump"""
+    if source.suffix == ".db":
+        engine = create_db_engine(source, read_only=True)
+        frame = pd.read_sql_table(DaycareCenter.__tablename__, engine)
+        engine.dispose()
+        return frame
+
+    frames = []
+    for chunk in iter_chunks(iter_json_records(source), settings.INGEST_CHUNK_SIZE):
+        columns = normalize_chunk(chunk)
+        columns.update(derive_columns(columns))
+        frames.append(pd.DataFrame(columns))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def default_source() -> Path:
+    """Configured database if it has rows, else the default raw dump (None if neither)"""
+    db_path = settings.get_db_path()
+    if db_path.exists() and db_path.stat().st_size > 0:
+        try:
+            engine = create_db_engine(db_path, read_only=True)
+            with Session(engine) as session:
+                count = session.execute(select(func.count(DaycareCenter.id))).scalar()
+            engine.dispose()
+            if count:
+                return db_path
+        except Exception:
+            pass
+
+    raw_path = settings.get_raw_data_path()
+    return raw_path if raw_path.exists() else None
+
+
+def build_profile(source: Path, seed: int):
+    """Fit a profile from source, falling back to built-in priors"""
+    if source is None:
+        print("⚠️  No real data found, using built-in priors (Seoul districts)")
+        return default_profile()
+
+    print(f"📂 Fitting distributions from {source}...")
+    frame = load_source_frame(source)
+    try:
+        profile = fit_profile(frame, seed=seed)
+    except (KeyError, ValueError) as e:
+        print(f"⚠️  Cannot fit from {source} ({e}), using built-in priors")
+        return default_profile()
+
+    print(f"✅ Fitted from {len(frame):,} rows: {profile.summary()}")
+    return profile
+
+
+def load_database(db_path: Path, records, chunk_size: int):
+    """Create the synthetic database and load records (then statistics and FTS)"""
+    engine = create_db_engine(db_path, read_only=False)
+    Base.metadata.create_all(engine)
+
+    report = bulk_upsert(records, engine=engine, chunk_size=chunk_size)
+    ensure_fulltext_index(engine)
+
+    with Session(engine) as session:
+        version = bump_data_version(session)
+        stat_count = refresh_filter_statistics(session)
+        cube_count = refresh_stats_cube(session, version)
+        feature_count = refresh_feature_table(session)
+        district_count = refresh_district_centroids(session)
+        session.commit()
+
+    print(f"✅ Loaded {report.rows_written:,} rows ({report.rows_per_second:,.0f} rows/s)")
+    print(f"✅ Filter statistics: {stat_count} entries, stats cube: {cube_count} cells")
+    print(f"✅ Ranking features: {feature_count:,} centers")
+    print(f"✅ District centroids: {district_count} districts")
+    return engine
+
+
+def _write_index(index, stcodes: list, index_path: Path, metadata_path: Path):
+    """Save an index with the same metadata layout as create_index.py"""
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    faiss.write_index(index, str(index_path))
+    metadata = {
+        "stcodes": stcodes,
+        "dimension": index.d,
+        "total_vectors": index.ntotal,
+        "index_type": "IndexFlatL2",
+        "embedding_backend": HashingEmbeddingService.backend,
+    }
+    with open(metadata_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False)
+
+
+def build_indexes(engine, embedding_service: HashingEmbeddingService, mode: str, index_dir: Path) -> dict:
+    """
+    Embed active synthetic centers and build one index or one per region
+
+    Rows are streamed in region order so only one region's index is in memory.
+
+    Returns:
+        {region code or "all": vector count}
+    """
+    statement = (
+        select(DaycareCenter)
+        .where(DaycareCenter.crstatusname == "정상")
+        .order_by(DaycareCenter.region_code, DaycareCenter.id)
+        .execution_options(yield_per=_EMBED_BATCH)
+    )
+
+    totals = {}
+    current = None
+    index, stcodes = None, []
+
+    def flush():
+        if index is None:
+            return
+        if mode == "partition":
+            _write_index(index, stcodes, *region_index_paths(current, index_dir))
+        else:
+            _write_index(index, stcodes, index_dir / "faiss.index", index_dir / "metadata.json")
+        totals[current if mode == "partition" else "all"] = index.ntotal
+
+    with Session(engine) as session:
+        for partition in session.scalars(statement).partitions():
+            texts, codes = [], []
+            for daycare in partition:
+                region = daycare.region_code if mode == "partition" else "all"
+                if region != current:
+                    if texts:
+                        index.add(embedding_service.embed_batch(texts))
+                        stcodes.extend(codes)
+                        texts, codes = [], []
+                    flush()
+                    current, index, stcodes = region, faiss.IndexFlatL2(embedding_service.dimension), []
+                text = daycare.get_embedding_text()
+                if text:
+                    texts.append(text)
+                    codes.append(daycare.stcode)
+            if texts:
+                index.add(embedding_service.embed_batch(texts))
+                stcodes.extend(codes)
+        flush()
+
+    if mode == "partition" and totals:
+        write_region_manifest(totals, embedding_service.dimension, index_dir)
+    return totals
+
+
+def main():
+    """Main generation workflow"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic daycare dataset")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of synthetic centers")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=settings.PROCESSED_DATA_DIR / "synthetic.db",
+        help="Target SQLite database (must not be the configured DB_PATH)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--source",
+        type=Path,
+        help="Database (.db) or raw JSON/JSONL dump to fit from "
+        "(default: configured database, else the raw dump, else built-in priors)",
+    )
+    parser.add_argument(
+        "--index",
+        choices=["none", "single", "partition"],
+        default="partition",
+        help="FAISS index layout to build next to the database",
+    )
+    parser.add_argument(
+        "--index-dir",
+        type=Path,
+        help="Index output directory (default: <db name>_index next to the database)",
+    )
+    parser.add_argument("--dimension", type=int, default=256, help="Hashing embedding dimension")
+    parser.add_argument(
+        "--jsonl",
+        type=Path,
+        help="Also write the raw records as JSON Lines (loadable with preprocess_data.py)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=settings.INGEST_CHUNK_SIZE,
+        help="Records per columnar chunk / transaction",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Synthetic Daycare Dataset")
+    print("=" * 60)
+
+    db_path = args.db.resolve()
+    if db_path == settings.get_db_path().resolve():
+        print(f"❌ Refusing to overwrite the configured database: {db_path}")
+        return
+    if db_path.exists():
+        db_path.unlink()
+
+    print("\n1️⃣  Building profile...")
+    profile = build_profile(args.source or default_source(), args.seed)
+
+    print(f"\n2️⃣  Generating {args.rows:,} centers into {db_path}...")
+    started = time.perf_counter()
+    records = generate_records(profile, args.rows, seed=args.seed)
+    if args.jsonl:
+        args.jsonl.parent.mkdir(parents=True, exist_ok=True)
+        jsonl_file = open(args.jsonl, "w", encoding="utf-8")
+
+        def tee(records):
+            for record in records:
+                jsonl_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                yield record
+
+        records = tee(records)
+
+    engine = load_database(db_path, records, args.chunk_size)
+    if args.jsonl:
+        jsonl_file.close()
+        print(f"✅ Raw records written to {args.jsonl}")
+    print(f"   - Elapsed: {time.perf_counter() - started:.1f}s")
+
+    index_dir = args.index_dir or db_path.with_name(f"{db_path.stem}_index")
+    if args.index != "none":
+        print(f"\n3️⃣  Building {args.index} index with hashing embeddings (d={args.dimension})...")
+        started = time.perf_counter()
+        totals = build_indexes(engine, HashingEmbeddingService(args.dimension), args.index, index_dir)
+        print(f"✅ Indexed {sum(totals.values()):,} vectors in {len(totals)} index(es)")
+        print(f"   - Elapsed: {time.perf_counter() - started:.1f}s")
+    engine.dispose()
+
+    print("\n" + "=" * 60)
+    print("✅ Synthetic dataset ready. Serve it with:")
+    print(f"   DB_PATH={db_path}")
+    if args.index == "partition":
+        print(f"   VECTOR_REGION_DIR={index_dir}")
+    elif args.index == "single":
+        print(f"   VECTOR_INDEX_PATH={index_dir / 'faiss.index'}")
+        print(f"   VECTOR_METADATA_PATH={index_dir / 'metadata.json'}")
+    print("   EMBEDDING_BACKEND=hashing")
+    print(f"   EMBEDDING_DIMENSION={args.dimension}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
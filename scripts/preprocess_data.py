@@ -1,220 +1,198 @@
 """
 Data preprocessing script
-Loads Seoul daycare data from JSON and inserts into SQLite database
+Streams daycare data (one or more regional dumps) from JSON and applies it to
+SQLite as a diff (inserts, updates, closures) with a change manifest
 """
 
-import json
+import argparse
+import itertools
 import sys
 from pathlib import Path
-from datetime import datetime
 
 # Add app directory to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "app"))
 
-from database import init_db, get_session, DaycareCenter
+from database import init_db, get_session, DaycareCenter, DaycareHistory, bump_data_version
+from services.ingest import (
+    DERIVED_COLUMNS,
+    diff_ingest,
+    iter_json_records,
+    refresh_derived_columns,
+)
+from services.selectivity import refresh_filter_statistics
+from services.history import record_history
+from services.stats_cube import refresh_stats_cube
+from services.features import refresh_feature_table
+from services.districts import refresh_district_centroids
+from services.standing_queries import match_changes
 from config import settings
 
 
-def clean_value(value, value_type="str"):
-    """Clean and convert values from JSON"""
-    if value is None or value == "":
-        return None
+def insert_data(raw_data_paths: list, chunk_size: int = None, close_missing: bool = False):
+    """Stream records from the raw files and apply them as changes to the database"""
+    for path in raw_data_paths:
+        print(f"\n📥 Streaming records from: {path}")
 
-    if value_type == "int":
-        try:
-            return int(value)
-        except (ValueError, TypeError):
-            return None
-    elif value_type == "float":
-        try:
-            # Handle coordinate values
-            val = float(value)
-            # Filter out invalid coordinates (0.0 or default values)
-            if val == 0.0 or val == 37.566470 or val == 126.977963:
-                return None
-            return val
-        except (ValueError, TypeError):
-            return None
-    else:  # string
-        return str(value).strip() if value else None
-
-
-def load_json_data(file_path: Path):
-    """Load and parse JSON data"""
-    print(f"📂 Loading data from: {file_path}")
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Expected format: {"DESCRIPTION": {...}, "DATA": [...]}
-    if "DATA" not in data:
-        raise ValueError("Invalid JSON format: 'DATA' key not found")
-
-    records = data["DATA"]
-    print(f"✅ Loaded {len(records)} records from JSON")
-
-    return records
-
-
-def create_daycare_center(record: dict) -> DaycareCenter:
-    """Create DaycareCenter instance from JSON record"""
-
-    return DaycareCenter(
-        # Basic info
-        stcode=clean_value(record.get("stcode")),
-        crname=clean_value(record.get("crname")),
-        crtypename=clean_value(record.get("crtypename")),
-        crstatusname=clean_value(record.get("crstatusname")),
-        craddr=clean_value(record.get("craddr")),
-        sigunname=clean_value(record.get("sigunname")),
-        zipcode=clean_value(record.get("zipcode")),
-        la=clean_value(record.get("la"), "float"),
-        lo=clean_value(record.get("lo"), "float"),
-        crtelno=clean_value(record.get("crtelno")),
-        crfaxno=clean_value(record.get("crfaxno")),
-        crhome=clean_value(record.get("crhome")),
-        # Operation info
-        crcapat=clean_value(record.get("crcapat"), "int"),
-        crchcnt=clean_value(record.get("crchcnt"), "int"),
-        crcnfmdt=clean_value(record.get("crcnfmdt")),
-        crabldt=clean_value(record.get("crabldt")),
-        crpausebegindt=clean_value(record.get("crpausebegindt")),
-        crpauseenddt=clean_value(record.get("crpauseenddt")),
-        # Special services
-        crspec=clean_value(record.get("crspec")),
-        crcargbname=clean_value(record.get("crcargbname")),
-        # Facility info
-        nrtrroomcnt=clean_value(record.get("nrtrroomcnt"), "int"),
-        nrtrroomsize=clean_value(record.get("nrtrroomsize"), "float"),
-        plgrdco=clean_value(record.get("plgrdco"), "int"),
-        cctvinstlcnt=clean_value(record.get("cctvinstlcnt"), "int"),
-        # Staff info
-        chcrtescnt=clean_value(record.get("chcrtescnt"), "int"),
-        em_cnt_tot=clean_value(record.get("em_cnt_tot"), "int"),
-        em_cnt_a1=clean_value(record.get("em_cnt_a1"), "int"),
-        em_cnt_a2=clean_value(record.get("em_cnt_a2"), "int"),
-        em_cnt_a3=clean_value(record.get("em_cnt_a3"), "int"),
-        em_cnt_a4=clean_value(record.get("em_cnt_a4"), "int"),
-        em_cnt_a5=clean_value(record.get("em_cnt_a5"), "int"),
-        em_cnt_a6=clean_value(record.get("em_cnt_a6"), "int"),
-        em_cnt_a7=clean_value(record.get("em_cnt_a7"), "int"),
-        em_cnt_a8=clean_value(record.get("em_cnt_a8"), "int"),
-        em_cnt_a10=clean_value(record.get("em_cnt_a10"), "int"),
-        # Tenure
-        em_cnt_0y=clean_value(record.get("em_cnt_0y"), "int"),
-        em_cnt_1y=clean_value(record.get("em_cnt_1y"), "int"),
-        em_cnt_2y=clean_value(record.get("em_cnt_2y"), "int"),
-        em_cnt_4y=clean_value(record.get("em_cnt_4y"), "int"),
-        em_cnt_6y=clean_value(record.get("em_cnt_6y"), "int"),
-        # Children by age
-        child_cnt_tot=clean_value(record.get("child_cnt_tot"), "int"),
-        child_cnt_00=clean_value(record.get("child_cnt_00"), "int"),
-        child_cnt_01=clean_value(record.get("child_cnt_01"), "int"),
-        child_cnt_02=clean_value(record.get("child_cnt_02"), "int"),
-        child_cnt_03=clean_value(record.get("child_cnt_03"), "int"),
-        child_cnt_04=clean_value(record.get("child_cnt_04"), "int"),
-        child_cnt_05=clean_value(record.get("child_cnt_05"), "int"),
-        child_cnt_m2=clean_value(record.get("child_cnt_m2"), "int"),
-        child_cnt_m5=clean_value(record.get("child_cnt_m5"), "int"),
-        child_cnt_sp=clean_value(record.get("child_cnt_sp"), "int"),
-        # Classes by age
-        class_cnt_tot=clean_value(record.get("class_cnt_tot"), "int"),
-        class_cnt_00=clean_value(record.get("class_cnt_00"), "int"),
-        class_cnt_01=clean_value(record.get("class_cnt_01"), "int"),
-        class_cnt_02=clean_value(record.get("class_cnt_02"), "int"),
-        class_cnt_03=clean_value(record.get("class_cnt_03"), "int"),
-        class_cnt_04=clean_value(record.get("class_cnt_04"), "int"),
-        class_cnt_05=clean_value(record.get("class_cnt_05"), "int"),
-        class_cnt_m2=clean_value(record.get("class_cnt_m2"), "int"),
-        class_cnt_m5=clean_value(record.get("class_cnt_m5"), "int"),
-        class_cnt_sp=clean_value(record.get("class_cnt_sp"), "int"),
-        # Metadata
-        datastdrdt=clean_value(record.get("datastdrdt")),
-        work_dttm=clean_value(record.get("work_dttm")),
-    )
+    records = itertools.chain.from_iterable(iter_json_records(path) for path in raw_data_paths)
+    manifest = diff_ingest(records, chunk_size=chunk_size, close_missing=close_missing)
+    report = manifest.report
+
+    print(f"\n✅ Data diff applied!")
+    print(f"   - Read: {report.rows_read:,}")
+    print(f"   - Inserted: {len(manifest.inserted):,}")
+    print(f"   - Updated: {len(manifest.updated):,}")
+    print(f"   - Closed: {len(manifest.closed):,}")
+    print(f"   - Unchanged: {manifest.unchanged:,}")
+    print(f"   - Stale (older datastdrdt): {manifest.stale:,}")
+    print(f"   - Embedding text changed: {len(manifest.embedding_changed):,}")
+    print(f"   - Invalid (missing stcode/crname): {report.rows_invalid:,}")
+    print(f"   - Elapsed: {report.elapsed:.2f}s ({report.rows_per_second:,.0f} rows/s)")
 
+    return manifest
 
-def insert_data(records: list):
-    """Insert records into database"""
-    print(f"\n📥 Inserting {len(records)} records into database...")
 
+def refresh_statistics() -> int:
+    """
+    Bump the data version, recompute filter statistics, the stats cube, the
+    ranking features and the district centroids
+
+    Returns:
+        New data version
+    """
     session = get_session()
-    inserted = 0
-    skipped = 0
-    errors = 0
 
     try:
-        for i, record in enumerate(records, 1):
-            try:
-                # Check if record already exists
-                stcode = record.get("stcode")
-                existing = (
-                    session.query(DaycareCenter)
-                    .filter(DaycareCenter.stcode == stcode)
-                    .first()
-                )
-
-                if existing:
-                    skipped += 1
-                    continue
-
-                # Create new record
-                daycare = create_daycare_center(record)
-                session.add(daycare)
-                inserted += 1
-
-                # Commit in batches
-                if i % 100 == 0:
-                    session.commit()
-                    print(f"  ✓ Processed {i}/{len(records)} records...")
-
-            except Exception as e:
-                errors += 1
-                print(f"  ⚠️  Error processing record {i}: {e}")
-                continue
-
-        # Final commit
+        version = bump_data_version(session)
+        stat_count = refresh_filter_statistics(session)
+        cube_count = refresh_stats_cube(session, version)
+        feature_count = refresh_feature_table(session)
+        district_count = refresh_district_centroids(session)
         session.commit()
-        print(f"\n✅ Data insertion complete!")
-        print(f"   - Inserted: {inserted}")
-        print(f"   - Skipped (duplicates): {skipped}")
-        print(f"   - Errors: {errors}")
-
+        print(f"✅ Filter statistics refreshed: {stat_count} entries (data version {version})")
+        print(f"✅ Stats cube refreshed: {cube_count} cells")
+        print(f"✅ Ranking features refreshed: {feature_count:,} centers")
+        print(f"✅ District centroids refreshed: {district_count} districts")
+        return version
     except Exception as e:
         session.rollback()
-        print(f"❌ Database error: {e}")
+        print(f"❌ Statistics error: {e}")
         raise
     finally:
         session.close()
 
 
+def record_changes(manifest):
+    """Append changed centers to the history store (every center on first run)"""
+    session = get_session()
+    try:
+        bootstrap = session.query(DaycareHistory.id).first() is None
+    finally:
+        session.close()
+
+    stcodes = None if bootstrap else manifest.changed_stcodes
+    report = record_history(stcodes, manifest.data_version)
+    print(
+        f"✅ History recorded{' (bootstrap)' if bootstrap else ''}: "
+        f"{report.keyframes} keyframes, {report.deltas} deltas"
+    )
+    return report
+
+
+def match_standing_queries(manifest):
+    """Re-evaluate saved searches against the changed centers and emit events"""
+    session = get_session()
+    try:
+        report = match_changes(session, manifest.changed_stcodes, manifest.data_version)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"[WARN]  Standing queries not evaluated: {e}")
+        print("   Re-run with: python scripts/standing_queries.py match --manifest <manifest>")
+        return None
+    finally:
+        session.close()
+
+    print(
+        f"✅ Standing queries: {report.candidate_queries} evaluated for "
+        f"{report.changed_rows:,} changed centers ({report.matches} matches, {report.unmatches} unmatches)"
+    )
+    return report
+
+
 def main():
     """Main preprocessing workflow"""
+    parser = argparse.ArgumentParser(description="Load raw daycare data into SQLite")
+    parser.add_argument(
+        "--file",
+        type=Path,
+        nargs="+",
+        default=[settings.get_raw_data_path()],
+        help="Raw JSON ({'DATA': [...]}, array) or JSON Lines file(s), e.g. one per region",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=settings.INGEST_CHUNK_SIZE,
+        help="Records per columnar chunk / transaction",
+    )
+    parser.add_argument(
+        "--close-missing",
+        action="store_true",
+        help=(
+            "Treat the files as complete dumps of the regions they contain: "
+            "mark active centers of those regions missing from them as 폐지"
+        ),
+    )
+    parser.add_argument(
+        "--manifest-dir",
+        type=Path,
+        default=settings.PROCESSED_DATA_DIR / "manifests",
+        help="Directory for change manifests (changes_v<version>.json)",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
-    print("Seoul Daycare Data Preprocessing")
+    print("Daycare Data Preprocessing")
     print("=" * 60)
 
     # Initialize database
     print("\n1️⃣  Initializing database...")
-    init_db()
-
-    # Load JSON data
-    print("\n2️⃣  Loading JSON data...")
-    raw_data_path = settings.RAW_DATA_DIR / "seoul_daycare_raw.json"
-
-    if not raw_data_path.exists():
-        print(f"❌ Data file not found: {raw_data_path}")
+    added_columns = init_db()
+
+    # Existing databases: fill newly added derived columns
+    if any(column.split(".")[-1] in DERIVED_COLUMNS for column in added_columns):
+        updated = refresh_derived_columns()
+        print(f"✅ Derived columns backfilled for {updated:,} existing rows")
+
+    # Check raw data
+    print("\n2️⃣  Checking raw data...")
+    missing = [path for path in args.file if not path.exists()]
+    if missing:
+        print(f"❌ Data file not found: {', '.join(str(path) for path in missing)}")
         return
 
-    records = load_json_data(raw_data_path)
-
-    # Insert data
-    print("\n3️⃣  Inserting data into database...")
-    insert_data(records)
+    # Apply changes
+    print("\n3️⃣  Applying changes to database...")
+    manifest = insert_data(args.file, args.chunk_size, args.close_missing)
+
+    # Refresh planner statistics (only when something changed)
+    print("\n4️⃣  Refreshing statistics, stats cube, history and standing queries...")
+    if manifest.has_changes or added_columns:
+        manifest.data_version = refresh_statistics()
+        record_changes(manifest)
+        manifest_path = manifest.save(
+            args.manifest_dir / f"changes_v{manifest.data_version}.json"
+        )
+        print(f"✅ Change manifest saved: {manifest_path}")
+        match_standing_queries(manifest)
+        print("   Update the vector index with:")
+        print(f"   python scripts/create_index.py --manifest {manifest_path}")
+    else:
+        print("✅ No changes - data version, statistics and caches left as they are")
 
     # Verify
-    print("\n4️⃣  Verifying database...")
+    print("\n5️⃣  Verifying database...")
     session = get_session()
     total_count = session.query(DaycareCenter).count()
     print(f"✅ Total records in database: {total_count}")
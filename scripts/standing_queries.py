@@ -0,0 +1,140 @@
+"""
+Standing query management
+Register saved searches, list them, read their match/unmatch events and
+re-run the incremental matcher for a change manifest
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add app directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import func, select
+
+from database import StandingQueryMatch, init_db, session_scope
+from services.standing_queries import (
+    fetch_events,
+    list_standing_queries,
+    match_changes,
+    register_standing_query,
+    remove_standing_query,
+)
+
+
+def add(args):
+    """Register a standing query and record its current matches"""
+    try:
+        filters = json.loads(args.filters)
+    except json.JSONDecodeError as e:
+        print(f"❌ --filters is not valid JSON: {e}")
+        return
+
+    try:
+        with session_scope() as session:
+            standing = register_standing_query(
+                session,
+                filters,
+                query=args.query,
+                name=args.name,
+                subscriber=args.subscriber,
+                max_distance=args.max_distance,
+            )
+            matches = session.scalar(
+                select(func.count()).where(StandingQueryMatch.query_id == standing.id)
+            )
+            print(
+                f"✅ Standing query {standing.id} registered "
+                f"(partition {standing.partition_key}, {matches:,} current matches)"
+            )
+    except ValueError as e:
+        print(f"❌ {e}")
+
+
+def show(args):
+    """Print registered standing queries"""
+    with session_scope() as session:
+        queries = list_standing_queries(session)
+    if not queries:
+        print("No standing queries registered")
+    for q in queries:
+        text = f" \"{q['query']}\"" if q["query"] else ""
+        print(
+            f"  [{q['id']}] {q['name'] or '-'} ({q['subscriber'] or '-'}) "
+            f"{json.dumps(q['filters'], ensure_ascii=False)}{text} - {q['matches']:,} matches"
+        )
+
+
+def remove(args):
+    """Delete a standing query"""
+    with session_scope() as session:
+        removed = remove_standing_query(session, args.id)
+    print(f"✅ Standing query {args.id} removed" if removed else f"❌ Standing query {args.id} not found")
+
+
+def events(args):
+    """Print events after an event id"""
+    with session_scope() as session:
+        rows = fetch_events(session, args.query_id, args.after, args.limit)
+    for event in rows:
+        print(json.dumps(event, ensure_ascii=False))
+    if not rows:
+        print("No new events")
+
+
+def match(args):
+    """Re-run the matcher for the centers listed in a change manifest"""
+    with open(args.manifest, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    stcodes = manifest["inserted"] + manifest["updated"] + manifest["closed"]
+
+    with session_scope() as session:
+        report = match_changes(session, stcodes, manifest.get("data_version"))
+    print(f"✅ Standing queries matched: {json.dumps(report.to_dict())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage standing (saved) searches")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = commands.add_parser("add", help="Register a standing query")
+    add_parser.add_argument(
+        "--filters",
+        default="{}",
+        help='Search filters as JSON, e.g. \'{"district": "강남구", "age": "만1세", "has_vacancy": true}\'',
+    )
+    add_parser.add_argument("--query", help="Optional free text matched by embedding distance")
+    add_parser.add_argument("--name", help="Display name")
+    add_parser.add_argument("--subscriber", help="Who to notify")
+    add_parser.add_argument(
+        "--max-distance", type=float, help="Squared L2 limit for --query (default: STANDING_QUERY_MAX_DISTANCE)"
+    )
+    add_parser.set_defaults(handler=add)
+
+    list_parser = commands.add_parser("list", help="List standing queries")
+    list_parser.set_defaults(handler=show)
+
+    remove_parser = commands.add_parser("remove", help="Delete a standing query")
+    remove_parser.add_argument("id", type=int)
+    remove_parser.set_defaults(handler=remove)
+
+    events_parser = commands.add_parser("events", help="Print match/unmatch events")
+    events_parser.add_argument("--query-id", type=int, help="Only this standing query")
+    events_parser.add_argument("--after", type=int, default=0, help="Last event id already seen")
+    events_parser.add_argument("--limit", type=int, default=100)
+    events_parser.set_defaults(handler=events)
+
+    match_parser = commands.add_parser("match", help="Re-run the matcher for a change manifest")
+    match_parser.add_argument("--manifest", type=Path, required=True, help="changes_v<version>.json")
+    match_parser.set_defaults(handler=match)
+
+    args = parser.parse_args()
+    init_db()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Query Model Training
+Trains the local intent classifier and slot tagger on the logged LLM analyzer
+outputs (data/processed/analyzer_log.jsonl) and reports held-out agreement
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from config import settings
+from services.query_model import (
+    evaluate_query_model,
+    is_holdout,
+    read_analysis_log,
+    train_query_model,
+)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Train the local query analyzer model")
+    parser.add_argument("--log", type=Path, default=settings.get_analyzer_log_path(), help="Analyzer log (JSON Lines)")
+    parser.add_argument("--output", type=Path, default=settings.get_query_model_path(), help="Model file (.npz)")
+    parser.add_argument("--epochs", type=int, default=10, help="SGD passes")
+    parser.add_argument(
+        "--holdout", type=float, default=0.2, help="Share of queries held out for evaluation (0 = train on all)"
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Query Model Training")
+    print("=" * 60)
+
+    if not args.log.exists():
+        print(f"❌ Analyzer log not found: {args.log}")
+        print("   Run searches with an LLM key (ANALYZER_LOG_ENABLED=true) first")
+        sys.exit(1)
+
+    records = read_analysis_log(args.log)
+    train = [r for r in records if not is_holdout(r["query"], args.holdout)]
+    holdout = [r for r in records if is_holdout(r["query"], args.holdout)]
+    print(f"   - Logged queries: {len(records)} (train {len(train)}, holdout {len(holdout)})")
+    if not train:
+        print("❌ No training examples")
+        sys.exit(1)
+
+    model = train_query_model(train, epochs=args.epochs)
+    model.save(args.output)
+    print(f"[OK] Model saved: {args.output}")
+    print(f"   - Intents: {model.intent_model.labels}")
+    print(f"   - Tags: {model.tagger.labels}")
+
+    if holdout:
+        report = evaluate_query_model(model, holdout)
+        print("\n📊 Holdout agreement with the LLM:")
+        print(f"   - Intent accuracy: {report['intent_accuracy']:.1%}")
+        print(f"   - Exact filter match: {report['filter_exact_match']:.1%}")
+        print(f"   - Coverage at {settings.ANALYZER_MODEL_MIN_CONFIDENCE}: {report['coverage']:.1%}")
+        if report["covered_accuracy"] is not None:
+            print(f"   - Accuracy when served: {report['covered_accuracy']:.1%}")
+        print(f"   - Latency: {report['latency_us']:.0f} µs/query")
+
+    print("\n" + "=" * 60)
+    print("✅ Training complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
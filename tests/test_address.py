@@ -0,0 +1,66 @@
+"""
+Address Component Tests
+Road name / 동 parsing at ingest, dictionary lookup in queries, indexed filters
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import and_, create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, DaycareCenter
+from services.ingest import bulk_upsert, derive_columns, normalize_chunk
+from utils.address import extract_address_filters, parse_address
+from workflows.nodes.retriever import build_filter_conditions
+
+
+def test_parse_address():
+    assert parse_address("서울특별시 성북구 돌곶이로30길 23 (석관동, 래미안)") == {
+        "road": "돌곶이로", "dong": "석관동"}
+    assert parse_address("서울특별시 강남구 역삼1동 123-4") == {"road": None, "dong": "역삼동"}
+    assert parse_address("서울특별시 중구 을지로3가 5") == {"road": None, "dong": "을지로3가"}
+    assert parse_address("서울특별시 강남구 테헤란로 152") == {"road": "테헤란로", "dong": None}
+    assert parse_address(None) == {"road": None, "dong": None}
+
+    derived = derive_columns(normalize_chunk([
+        {"stcode": "1", "craddr": "서울특별시 성북구 돌곶이로30길 23 (석관동)"},
+        {"stcode": "2"},
+    ]))
+    assert derived["road_name"] == ["돌곶이로", None]
+    assert derived["dong_name"] == ["석관동", None]
+
+
+def test_extract_address_filters():
+    dongs, roads = {"역삼동": 3, "석관동": 2}, {"돌곶이로": 2, "테헤란로": 5}
+    assert extract_address_filters("돌곶이로 근처 국공립 어린이집", dongs, roads) == {"road": "돌곶이로"}
+    assert extract_address_filters("역삼1동에서 가까운 곳", dongs, roads) == {"dong": "역삼동"}
+    assert extract_address_filters("강남구 어린이집", dongs, roads) == {}
+
+
+def test_address_filters_use_index():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    bulk_upsert([
+        {"stcode": "1", "crname": "A", "crstatusname": "정상",
+         "craddr": "서울특별시 강남구 테헤란로 123 (역삼동)"},
+        {"stcode": "2", "crname": "B", "crstatusname": "정상",
+         "craddr": "서울특별시 성북구 돌곶이로30길 23 (석관동)"},
+    ], engine=engine, verbose=False)
+    session = sessionmaker(bind=engine)()
+
+    for filters, expected, index in [
+        ({"dong": "역삼1동"}, ["1"], "ix_daycare_status_dong"),
+        ({"road": "돌곶이로"}, ["2"], "ix_daycare_status_road"),
+    ]:
+        statement = select(DaycareCenter.stcode).where(and_(*build_filter_conditions(filters)))
+        assert list(session.scalars(statement)) == expected
+
+        sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(str(row) for row in session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+        assert index in plan, plan
+    session.close()
@@ -0,0 +1,65 @@
+"""
+Query Analysis Cache Tests
+Trivially different queries share one cached LLM analysis; entries expire
+and the cache reports hits and saved latency
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import pytest
+
+from config import settings
+from services.analysis_cache import AnalysisCache, canonicalize_query
+from workflows.nodes import analyzer
+from workflows.nodes.analyzer import query_analyzer_node
+
+RESULT = {"search_intent": "find_nearby", "filters": {"district": "강남구", "type": "국공립"}, "keywords": ["국공립"]}
+
+
+def test_canonical_queries_share_entries():
+    assert canonicalize_query("강남구 국공립 어린이집 추천해줘") == canonicalize_query("강남구  국공립어린이집 추천 해줘")
+    assert canonicalize_query("강남에 국립 어린이집 추천해줘") == canonicalize_query("강남구 국공립 어린이집 추천해줘")
+    assert canonicalize_query("서초구 국공립 어린이집") != canonicalize_query("강남구 국공립 어린이집")
+
+    cache = AnalysisCache(max_entries=2, ttl_seconds=60)
+    cache.put("강남구 국공립 어린이집 추천해줘", RESULT, elapsed_ms=800.0)
+    assert cache.get("강남구  국공립어린이집 추천 해줘") == RESULT
+    assert cache.get("서초구 국공립 어린이집") is None
+
+    cache.put("서초구 어린이집", RESULT, 500.0)
+    cache.put("마포구 어린이집", RESULT, 500.0)
+    report = cache.report()
+    assert (report["entries"], report["evicted"]) == (2, 1)
+    assert (report["hits"], report["misses"], report["hit_rate"], report["saved_ms"]) == (1, 1, 0.5, 800.0)
+
+    expiring = AnalysisCache(ttl_seconds=0.01)
+    expiring.put("강남구 어린이집", RESULT, 500.0)
+    time.sleep(0.02)
+    assert expiring.get("강남구 어린이집") is None
+    assert expiring.report()["expired"] == 1
+
+
+@pytest.fixture
+def offline_analyzer(monkeypatch):
+    """Analyzer node without the on-disk DB (address dictionary) or query model"""
+    monkeypatch.setattr(analyzer, "resolve_address_filters", lambda query: {})
+    monkeypatch.setattr(settings, "ANALYZER_MODEL_ENABLED", False)
+
+
+def test_node_serves_cached_llm_analysis(monkeypatch, offline_analyzer):
+    cache = AnalysisCache()
+    monkeypatch.setattr(analyzer, "get_analysis_cache", lambda: cache)
+    monkeypatch.setattr(settings, "ANALYZER_CACHE_ENABLED", True)
+
+    # Rules cannot explain "숲 체험", so the query would go to the LLM
+    cache.put("강남구에 숲 체험 하는 국공립 있어?", RESULT, 700.0)
+    state = query_analyzer_node({"query": "강남구  숲체험 하는 국립 있어?", "filters": {}})
+
+    assert state["metadata"]["query_analysis"]["source"] == "cache"
+    assert state["filters"] == {"district": "강남구", "type": "국공립"}
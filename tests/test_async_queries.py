@@ -0,0 +1,70 @@
+"""
+Async Query Tests
+Runs the async API queries against an in-memory aiosqlite database
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from database import Base, DaycareCenter
+from database.queries import (
+    fetch_daycare,
+    fetch_daycares,
+    fetch_districts,
+    fetch_statistics,
+    fetch_types,
+)
+
+
+async def run_queries():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        for i in range(6):
+            session.add(
+                DaycareCenter(
+                    stcode=f"S{i}",
+                    crname=f"테스트{i}어린이집",
+                    crtypename="국공립" if i < 2 else "민간",
+                    crstatusname="정상" if i < 5 else "폐지",
+                    sigunname="강남구" if i < 3 else "성북구",
+                )
+            )
+        await session.commit()
+
+        results = {
+            "districts": await fetch_districts(session),
+            "types": await fetch_types(session),
+            "stats": await fetch_statistics(session),
+            "detail": await fetch_daycare(session, "S1"),
+            "missing": await fetch_daycare(session, "nope"),
+            "compare": await fetch_daycares(session, ["S0", "S4", "nope"]),
+        }
+
+    await engine.dispose()
+    return results
+
+
+def test_async_queries():
+    results = asyncio.run(run_queries())
+
+    assert results["districts"] == [
+        {"name": "강남구", "count": 3},
+        {"name": "성북구", "count": 2},
+    ]
+    assert results["types"][0] == {"name": "민간", "count": 3}
+    assert results["stats"]["total"] == 5
+    assert results["detail"].crname == "테스트1어린이집"
+    assert results["missing"] is None
+    assert sorted(d.stcode for d in results["compare"]) == ["S0", "S4"]
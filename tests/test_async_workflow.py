@@ -0,0 +1,43 @@
+"""
+Async Workflow Tests
+Async node variants must produce the same state as the sync nodes
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import numpy as np
+
+from services.embeddings import HashingEmbeddingService
+from workflows.nodes import (
+    aanswer_generator_node,
+    answer_generator_node,
+    apost_processor_node,
+    aquery_analyzer_node,
+    post_processor_node,
+    query_analyzer_node,
+)
+
+
+def test_async_nodes_match_sync_nodes():
+    empty = {"query": " ", "filters": {"district": "강남구"}}
+    assert asyncio.run(aquery_analyzer_node(empty)) == query_analyzer_node(empty)
+
+    no_results = {"query": "강남구 어린이집", "search_results": [], "metadata": {}}
+    assert asyncio.run(aanswer_generator_node(no_results)) == answer_generator_node(no_results)
+
+    answered = {"answer": "검색 결과가 없습니다. 다시 시도해 주세요.", "search_results": []}
+    assert asyncio.run(apost_processor_node({**answered, "metadata": {}})) == post_processor_node(
+        {**answered, "metadata": {}}
+    )
+
+
+def test_async_embedding_matches_sync():
+    service = HashingEmbeddingService(dimension=32)
+    text = "강남구 국공립 어린이집 놀이터"
+    assert np.array_equal(asyncio.run(service.aembed_text(text)), service.embed_text(text))
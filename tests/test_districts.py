@@ -0,0 +1,106 @@
+"""
+District Graph Tests
+Centroids from center coordinates, nearest-district order and the filters
+(and shared query embedding) used when a search is widened to a neighbouring district
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy import and_, create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, DaycareCenter
+from services.districts import DistrictGraph, refresh_district_centroids
+from services.ingest import bulk_upsert
+from services.query_planner import PLAN_FILTER_FIRST
+from services.snapshot import DaycareSnapshot
+from workflows.nodes import retriever
+from workflows.nodes.retriever import build_filter_conditions
+
+RECORDS = [
+    {"stcode": "11110000001", "crname": "A", "crstatusname": "정상", "sigunname": "종로구", "la": "37.573", "lo": "126.979"},
+    {"stcode": "11110000002", "crname": "B", "crstatusname": "정상", "sigunname": "종로구", "la": "37.580", "lo": "126.990"},
+    # Mis-geocoded center: ignored for the centroid
+    {"stcode": "11110000003", "crname": "C", "crstatusname": "정상", "sigunname": "종로구", "la": "0", "lo": "0"},
+    {"stcode": "11140000004", "crname": "D", "crstatusname": "정상", "sigunname": "중구", "la": "37.564", "lo": "126.997"},
+    {"stcode": "11680000005", "crname": "E", "crstatusname": "정상", "sigunname": "강남구", "la": "37.517", "lo": "127.047"},
+    {"stcode": "26350000006", "crname": "F", "crstatusname": "정상", "sigunname": "해운대구", "la": "35.163", "lo": "129.164"},
+]
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    bulk_upsert(RECORDS, engine=engine, verbose=False)
+    return sessionmaker(bind=engine)()
+
+
+def test_neighbors_are_ordered_by_centroid_distance():
+    session = make_session()
+    assert refresh_district_centroids(session) == 4
+    session.commit()
+    graph = DistrictGraph.load(session)
+
+    neighbors = graph.neighbors("11110")
+    assert [code for code, _, _ in neighbors] == ["11140", "11680", "26350"]
+    assert 1 < neighbors[0][2] < 3  # 종로구 -> 중구 centroids ~2 km apart
+    assert [name for _, name, _ in graph.neighbors("11110", max_km=20)] == ["중구", "강남구"]
+    assert graph.neighbors("11110", limit=1)[0][1] == "중구"
+
+    # Non-Seoul names resolve through the graph
+    assert graph.code_for("해운대구") == "26350"
+    assert graph.neighbors("99999") == []
+    session.close()
+
+
+def test_neighbor_filter_uses_district_code():
+    session = make_session()
+    snapshot = DaycareSnapshot.load(session)
+
+    # Expansion keeps the other filters and pins the neighbour's code
+    filters = {"region": "서울", "district": "해운대구", "district_code": "26350"}
+    statement = select(DaycareCenter.crname).where(and_(*build_filter_conditions(filters)))
+    assert list(session.scalars(statement)) == ["F"]
+    assert snapshot.stcodes[snapshot.filter_mask(filters)].tolist() == ["26350000006"]
+    session.close()
+
+
+def test_neighbours_reuse_the_query_embedding(monkeypatch):
+    embedded = []
+
+    def embed_text(text):
+        embedded.append(text)
+        return np.ones(4, dtype=np.float32)
+
+    monkeypatch.setattr(
+        retriever,
+        "_expansion_targets",
+        lambda filters: [("11140", "중구", 2.0), ("11680", "강남구", 9.0)],
+    )
+    context = {
+        "filters": {"district": "종로구", "type": "국공립"},
+        "search_text": "종로구 국공립 어린이집",
+        "regions": ["11"],
+        "plan": SimpleNamespace(strategy=PLAN_FILTER_FIRST),
+        "vector_store": SimpleNamespace(embedding_service=SimpleNamespace(embed_text=embed_text)),
+    }
+
+    runs = []
+    expansion = retriever._expand_results(context, [], lambda ctx: runs.append(ctx) or [])
+
+    assert [step["district"] for step in expansion] == ["중구", "강남구"]
+    assert embedded == ["종로구 국공립 어린이집"]
+    assert [ctx["filters"] for ctx in runs] == [
+        {"district": "중구", "district_code": "11140", "type": "국공립"},
+        {"district": "강남구", "district_code": "11680", "type": "국공립"},
+    ]
+    assert all(ctx["search_text"] == context["search_text"] for ctx in runs)
+    assert runs[0]["query_embedding"] is runs[1]["query_embedding"]
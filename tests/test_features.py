@@ -0,0 +1,96 @@
+"""
+Ranking Feature Tests
+District percentiles of quality indicators and the weighted ranking score
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, desc, select
+from sqlalchemy.orm import Session
+
+from database import Base, DaycareCenter, DaycareFeatures
+from services.features import (
+    blend_with_relevance,
+    compute_features,
+    parse_ranking_weights,
+    quality_score_expression,
+    refresh_feature_table,
+)
+
+
+def center(stcode, district_code, children, teachers, **values):
+    return {
+        "stcode": stcode,
+        "district_code": district_code,
+        "crchcnt": children,
+        "em_cnt_a2": teachers,
+        **values,
+    }
+
+
+def test_percentiles_are_per_district_and_oriented():
+    frame = pd.DataFrame(
+        [
+            center("A", "11680", 20, 4),  # 5 children per teacher
+            center("B", "11680", 20, 2),  # 10
+            center("C", "11680", 20, 0),  # no teachers -> unknown
+            center("D", "11110", 30, 2),  # 15, alone in its district
+        ]
+    )
+    features = compute_features(frame).set_index("stcode")
+
+    assert features.loc["A", "children_per_teacher"] == 5
+    # Fewer children per teacher ranks higher within the district
+    assert features.loc["A", "staffing_pct"] > features.loc["B", "staffing_pct"]
+    assert pd.isna(features.loc["C", "staffing_pct"])
+    assert features.loc["D", "staffing_pct"] == 1.0
+
+    assert parse_ranking_weights("staffing=3,cctv=1") == {"staffing": 0.75, "cctv": 0.25}
+    with pytest.raises(ValueError):
+        parse_ranking_weights("price=1")
+
+    # Quality re-orders only within the re-rank depth
+    order = blend_with_relevance(["x", "y", "z"], {"x": 0.0, "y": 1.0, "z": 1.0}, weight=0.9, depth=2)
+    assert order == ["y", "x", "z"]
+
+
+def test_feature_table_orders_sql_candidates():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        for i, teachers in enumerate([1, 4, 2]):
+            session.add(
+                DaycareCenter(
+                    stcode=f"S{i}",
+                    crname=f"테스트{i}어린이집",
+                    crstatusname="정상",
+                    district_code="11680",
+                    crchcnt=20,
+                    em_cnt_a2=teachers,
+                )
+            )
+        session.add(DaycareCenter(stcode="S9", crname="폐지어린이집", crstatusname="폐지"))
+        session.commit()
+
+        assert refresh_feature_table(session) == 3
+        session.commit()
+
+        score = quality_score_expression({"staffing": 1.0}).label("quality_score")
+        statement = (
+            select(DaycareCenter.stcode, score)
+            .outerjoin(DaycareFeatures, DaycareFeatures.stcode == DaycareCenter.stcode)
+            .order_by(desc("quality_score"), DaycareCenter.id)
+        )
+        rows = session.execute(statement).all()
+
+    # Centers without features score neutral (between the district's ranks)
+    assert [row.stcode for row in rows] == ["S1", "S2", "S9", "S0"]
+    assert rows[2].quality_score == 0.5
@@ -0,0 +1,76 @@
+"""
+Filter Compilation Tests
+Derived code columns at ingest and indexed predicates in the retriever
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import and_, create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, DaycareCenter
+from services.ingest import bulk_upsert
+from workflows.nodes.retriever import build_filter_conditions
+
+RECORDS = [
+    {"stcode": "11680000001", "crname": "A", "crtypename": "국공립", "crstatusname": "정상",
+     "sigunname": "강남구", "class_cnt_01": "2", "crspec": "일반,야간연장"},
+    {"stcode": "11680000002", "crname": "B", "crtypename": "민간", "crstatusname": "정상",
+     "sigunname": "강남구", "class_cnt_04": "1", "crspec": "일반,장애아통합"},
+    {"stcode": "11290000003", "crname": "C", "crtypename": "국공립", "crstatusname": "정상",
+     "sigunname": "성북구", "class_cnt_00": "1", "crspec": "장애아전담"},
+    {"stcode": "11290000004", "crname": "D", "crtypename": "사회복지법인", "crstatusname": "폐지",
+     "sigunname": "성북구", "class_cnt_01": "1", "crspec": "일반"},
+]
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    bulk_upsert(RECORDS, engine=engine, verbose=False)
+    return sessionmaker(bind=engine)()
+
+
+def names(session, filters: dict) -> list:
+    conditions = build_filter_conditions(filters)
+    statement = select(DaycareCenter.crname).where(and_(*conditions)).order_by(DaycareCenter.crname)
+    return list(session.scalars(statement))
+
+
+def test_derived_columns():
+    session = make_session()
+    a = session.scalars(select(DaycareCenter).where(DaycareCenter.crname == "A")).one()
+    assert a.district_code == "11680"
+    assert a.type_code == 1
+    assert a.age_mask == 0b10
+    assert a.service_mask == 0b1000001  # 일반 | 야간연장
+    session.close()
+
+
+def test_compiled_filters_match_like_semantics():
+    session = make_session()
+    assert names(session, {"district": "강남구"}) == ["A", "B"]
+    assert names(session, {"district": "서울특별시 성북구"}) == ["C"]
+    assert names(session, {"type": "국공립"}) == ["A", "C"]
+    assert names(session, {"age": "만1세"}) == ["A"]
+    assert names(session, {"age": "유아"}) == ["B"]
+    assert names(session, {"special_service": "야간연장"}) == ["A"]
+    assert names(session, {"special_service": "장애아"}) == ["B", "C"]
+    # Unknown values fall back to LIKE
+    assert names(session, {"district": "없는구"}) == []
+    session.close()
+
+
+def test_district_type_filter_uses_composite_index():
+    session = make_session()
+    conditions = build_filter_conditions({"district": "강남구", "type": "국공립"})
+    statement = select(DaycareCenter.id).where(and_(*conditions))
+    compiled = statement.compile(compile_kwargs={"literal_binds": True})
+    plan = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    assert "ix_daycare_status_district_type" in " ".join(str(row) for row in plan)
+    session.close()
@@ -0,0 +1,79 @@
+"""
+Full-text Search Tests
+FTS5 trigram index, trigger sync and name lookups in the planner
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, ensure_fulltext_index, search_fulltext
+from services.ingest import bulk_upsert
+from services.query_planner import PLAN_FULLTEXT, choose_plan, extract_name_terms
+from services.selectivity import SelectivityStats
+
+RECORDS = [
+    {"stcode": "11680000001", "crname": "해맑은어린이집", "crtypename": "국공립",
+     "crstatusname": "정상", "sigunname": "강남구", "craddr": "서울특별시 강남구 테헤란로 1",
+     "crspec": "일반,야간연장"},
+    {"stcode": "11680000002", "crname": "꿈나무어린이집", "crtypename": "민간",
+     "crstatusname": "정상", "sigunname": "강남구", "craddr": "서울특별시 강남구 해맑은길 7",
+     "crspec": "일반"},
+    {"stcode": "11290000003", "crname": "해맑은숲어린이집", "crtypename": "가정",
+     "crstatusname": "폐지", "sigunname": "성북구", "craddr": "서울특별시 성북구 보문로 3",
+     "crspec": "일반"},
+]
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    assert ensure_fulltext_index(engine)
+    bulk_upsert(RECORDS, engine=engine, verbose=False)
+    return sessionmaker(bind=engine)()
+
+
+def test_name_match_outranks_address_match():
+    session = make_session()
+    hits = search_fulltext(session, "해맑은")
+    assert [hit["crname"] for hit in hits] == ["해맑은어린이집", "꿈나무어린이집"]
+    assert "<b>" in hits[0]["snippets"]["crname"]
+
+    hits = search_fulltext(session, "해맑은", active_only=False)
+    assert len(hits) == 3
+    session.close()
+
+
+def test_short_terms_and_trigger_sync():
+    session = make_session()
+    # 2-character terms are filtered with LIKE
+    assert [hit["crname"] for hit in search_fulltext(session, "강남 꿈나무")] == ["꿈나무어린이집"]
+    assert [hit["crname"] for hit in search_fulltext(session, "야간")] == ["해맑은어린이집"]
+
+    session.execute(
+        text("UPDATE daycare_centers SET crname = '별빛어린이집' WHERE stcode = '11680000002'")
+    )
+    session.commit()
+    assert [hit["crname"] for hit in search_fulltext(session, "별빛어린")] == ["별빛어린이집"]
+    assert search_fulltext(session, "꿈나무") == []
+    session.close()
+
+
+def test_planner_routes_named_daycares_to_fulltext():
+    assert extract_name_terms("강남구 해맑은어린이집 정보 알려줘") == ["해맑은"]
+    assert extract_name_terms("강남구 국공립어린이집 추천") == []
+    assert extract_name_terms("'꿈나무' 어디 있어?") == ["꿈나무"]
+
+    plan = choose_plan(
+        "해맑은어린이집 알려줘", [], {}, SelectivityStats({}), vector_available=False
+    )
+    assert plan.strategy == PLAN_FULLTEXT
+    assert plan.fulltext_terms == ["해맑은"]
+    assert plan.fallback is not None
+    assert plan.to_dict()["fallback"]["strategy"] == "sql_only"
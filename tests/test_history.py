@@ -0,0 +1,119 @@
+"""
+History Store Tests
+Keyframe/delta recording, as-of reads and time series
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from database import Base, DaycareHistory
+from services.history import record_history, state_as_of, time_series
+from services.ingest import diff_ingest
+
+
+def dump(date: str, enrollment: int, capacity: int = 40) -> list:
+    return [
+        {
+            "stcode": "11110000001",
+            "crname": "해맑은어린이집",
+            "crstatusname": "정상",
+            "crcapat": capacity,
+            "crchcnt": enrollment,
+            "datastdrdt": date,
+        },
+        {
+            "stcode": "11110000002",
+            "crname": "푸른어린이집",
+            "crstatusname": "정상",
+            "crcapat": 20,
+            "crchcnt": 15,
+            "datastdrdt": date,
+        },
+    ]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def ingest_rounds(engine, rounds):
+    for version, (date, enrollment, capacity) in enumerate(rounds, start=1):
+        manifest = diff_ingest(dump(date, enrollment, capacity), engine=engine, verbose=False)
+        stcodes = None if version == 1 else manifest.changed_stcodes
+        record_history(stcodes, data_version=version, engine=engine, keyframe_interval=3)
+
+
+def test_keyframes_and_deltas(engine):
+    ingest_rounds(
+        engine,
+        [
+            ("2024-01-01", 30, 40),
+            ("2024-02-01", 32, 40),
+            ("2024-03-01", 35, 40),
+            ("2024-04-01", 35, 45),
+        ],
+    )
+
+    with Session(engine) as session:
+        entries = list(
+            session.scalars(
+                select(DaycareHistory)
+                .where(DaycareHistory.stcode == "11110000001")
+                .order_by(DaycareHistory.data_version)
+            )
+        )
+        assert [e.is_keyframe for e in entries] == [True, False, False, True]
+        assert [e.chain_length for e in entries] == [0, 1, 2, 0]
+
+        # The unchanged center only has its bootstrap keyframe
+        count = session.scalar(
+            select(func.count()).where(DaycareHistory.stcode == "11110000002")
+        )
+        assert count == 1
+
+
+def test_state_as_of_and_time_series(engine):
+    ingest_rounds(
+        engine,
+        [
+            ("20240101", 30, 40),
+            ("20240201", 32, 40),
+            ("20240301", 35, 40),
+            ("20240401", 35, 45),
+        ],
+    )
+
+    with Session(engine) as session:
+        state = state_as_of(session, "11110000001", "2024-02-15")
+        assert state["as_of"] == "2024-02-01"
+        assert state["values"]["crchcnt"] == 32
+        assert state["values"]["crname"] == "해맑은어린이집"
+
+        assert state_as_of(session, "11110000001", "2023-12-31") is None
+        assert state_as_of(session, "11110000001")["values"]["crcapat"] == 45
+
+        points = time_series(session, "11110000001", ["crchcnt"], start="2024-02-15")
+        # First point in range, then only changes (04-01 keeps crchcnt at 35)
+        assert [(p["date"], p["crchcnt"]) for p in points] == [("2024-03-01", 35)]
+
+        points = time_series(session, "11110000001", ["crchcnt", "crcapat"])
+        assert [p["date"] for p in points] == [
+            "2024-01-01",
+            "2024-02-01",
+            "2024-03-01",
+            "2024-04-01",
+        ]
+
+        with pytest.raises(ValueError):
+            time_series(session, "11110000001", ["not_a_column"])
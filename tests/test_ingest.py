@@ -0,0 +1,129 @@
+"""
+Bulk Ingest Tests
+Streaming JSON parsing, columnar cleaning, ON CONFLICT upserts and diff ingest
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import create_engine, text
+
+from database import Base
+from services.ingest import bulk_upsert, diff_ingest, iter_json_records, normalize_chunk
+
+
+def make_records(count: int) -> list:
+    return [
+        {
+            "stcode": f"1111000{i:04d}",
+            "crname": f" 테스트{i}어린이집 ",
+            "crtypename": "국공립",
+            "crstatusname": "정상",
+            "la": "37.566470" if i == 0 else "37.5",
+            "crcapat": "20" if i % 2 else 20,
+            "plgrdco": "1.5",
+            "crspec": "",
+        }
+        for i in range(count)
+    ]
+
+
+def test_iter_json_records_formats(tmp_path):
+    records = make_records(50)
+
+    wrapped = tmp_path / "raw.json"
+    wrapped.write_text(
+        json.dumps({"DESCRIPTION": {"DATA_NAME": "x"}, "DATA": records}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    array = tmp_path / "raw_array.json"
+    array.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+    lines = tmp_path / "raw.jsonl"
+    lines.write_text(
+        "\n".join(json.dumps(r, ensure_ascii=False) for r in records), encoding="utf-8"
+    )
+
+    # A tiny read size forces records to span buffer refills
+    assert list(iter_json_records(wrapped, read_size=7)) == records
+    assert list(iter_json_records(array, read_size=13)) == records
+    assert list(iter_json_records(lines)) == records
+
+
+def test_normalize_chunk_rules():
+    columns = normalize_chunk(make_records(2))
+
+    assert columns["crname"] == ["테스트0어린이집", "테스트1어린이집"]
+    assert columns["crspec"] == [None, None]
+    assert columns["la"] == [None, 37.5]  # default coordinate dropped
+    assert columns["crcapat"] == [20, 20]
+    assert columns["plgrdco"] == [None, None]  # non-integral count rejected
+    assert columns["zipcode"] == [None, None]  # missing key
+
+
+def test_bulk_upsert_is_idempotent():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+
+    records = make_records(25) + [{"stcode": "", "crname": "no code"}]
+    report = bulk_upsert(records, engine=engine, chunk_size=10, verbose=False)
+    assert report.rows_read == 26
+    assert report.rows_written == 25
+    assert report.rows_invalid == 1
+
+    records[3]["crcapat"] = "99"
+    bulk_upsert(records, engine=engine, chunk_size=10, verbose=False)
+
+    with engine.connect() as connection:
+        count = connection.execute(text("SELECT COUNT(*) FROM daycare_centers")).scalar()
+        capacity = connection.execute(
+            text("SELECT crcapat FROM daycare_centers WHERE stcode = '11110000003'")
+        ).scalar()
+    assert count == 25
+    assert capacity == 99
+
+
+def test_diff_ingest_applies_only_changes(tmp_path):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    records = make_records(5)
+    for record in records:
+        record["datastdrdt"] = "2024-01-01"
+
+    first = diff_ingest(records, engine=engine, verbose=False)
+    assert len(first.inserted) == 5 and first.embedding_changed == first.inserted
+
+    changed = [dict(record, datastdrdt="2024-02-01", work_dttm="x") for record in records]
+    changed[0]["crcapat"] = "99"  # update, same embedding text
+    changed[1]["crspec"] = "야간연장"  # update, embedding text changes
+    changed[2]["crstatusname"] = "폐지"  # closure
+    changed[3]["crcapat"] = "1"
+    changed[3]["datastdrdt"] = "2023-12-01"  # older than stored: stale
+    del changed[4]  # missing from the dump
+
+    second = diff_ingest(changed, engine=engine, close_missing=True, verbose=False)
+    assert second.inserted == []
+    assert second.updated == ["11110000000", "11110000001"]
+    assert second.closed == ["11110000002", "11110000004"]
+    assert second.embedding_changed == ["11110000001"]
+    assert (second.stale, second.unchanged) == (1, 0)
+    assert second.save(tmp_path / "changes.json").exists()
+
+    with engine.connect() as connection:
+        rows = dict(
+            connection.execute(
+                text("SELECT stcode, crcapat || '/' || crstatusname FROM daycare_centers")
+            ).all()
+        )
+    assert rows["11110000000"] == "99/정상"
+    assert rows["11110000003"] == "20/정상"
+    assert rows["11110000004"] == "20/폐지"
+
+    # Re-applying the same dump changes nothing; the reappearing center reopens
+    third = diff_ingest(changed + [records[4]], engine=engine, verbose=False)
+    assert third.updated == ["11110000004"] and not third.closed
+    assert third.unchanged == 3
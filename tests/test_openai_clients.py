@@ -0,0 +1,45 @@
+"""
+Shared OpenAI Client Tests
+Call-type clients are cached views of one pooled client per mode
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from config import settings
+from services.openai_clients import (
+    CALL_ANALYZER,
+    CALL_EMBEDDING,
+    CALL_GENERATOR,
+    aclose_openai_clients,
+    call_options,
+    close_openai_clients,
+    get_openai_client,
+)
+
+
+def test_call_types_share_one_pool():
+    api_key = settings.OPENAI_API_KEY
+    settings.OPENAI_API_KEY = "sk-test"
+    try:
+        analyzer = get_openai_client(CALL_ANALYZER)
+        generator = get_openai_client(CALL_GENERATOR)
+        assert get_openai_client(CALL_ANALYZER) is analyzer
+        assert analyzer._client is generator._client
+        assert analyzer.max_retries == settings.OPENAI_ANALYZER_RETRIES
+        assert analyzer.timeout.read == settings.OPENAI_ANALYZER_TIMEOUT
+        assert generator.max_retries == settings.OPENAI_GENERATOR_RETRIES
+
+        async_embedding = get_openai_client(CALL_EMBEDDING, asynchronous=True)
+        assert async_embedding._client is not analyzer._client
+    finally:
+        close_openai_clients()
+        asyncio.run(aclose_openai_clients())
+        settings.OPENAI_API_KEY = api_key
+
+    assert call_options(CALL_EMBEDDING)["max_retries"] == settings.OPENAI_EMBEDDING_RETRIES
@@ -0,0 +1,110 @@
+"""
+Open API Fetcher Tests
+Runs the fetcher against a local stand-in for the Seoul Open API
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from services.ingest import iter_json_records
+from services.openapi_fetcher import fetch_dataset, parts_dir_for, state_path_for
+
+SERVICE = "ChildCareInfo"
+
+
+class StandInApi:
+    """Serves /{key}/json/ChildCareInfo/{start}/{end}/ from an in-memory row list"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+        self.fail_once = set()  # start rows answered with HTTP 503 the first time
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                _key, _format, service, start, end = self.path.strip("/").split("/")
+                start, end = int(start), int(end)
+                api.requests.append((start, end))
+
+                if start in api.fail_once:
+                    api.fail_once.discard(start)
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+
+                rows = api.rows[start - 1 : end]
+                body = {
+                    service: {
+                        "list_total_count": len(api.rows),
+                        "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다"},
+                        "row": rows,
+                    }
+                }
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def make_rows(count, datastdrdt="2024-01-15"):
+    return [
+        {"STCODE": f"11680{i:06d}", "CRNAME": f"테스트{i}어린이집", "DATASTDRDT": datastdrdt}
+        for i in range(count)
+    ]
+
+
+def test_fetch_pages_retries_and_skips_unchanged(tmp_path):
+    api = StandInApi(make_rows(23))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), api.handler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    options = {
+        "api_key": "test",
+        "base_url": f"http://127.0.0.1:{server.server_port}",
+        "service": SERVICE,
+        "page_size": 5,
+        "concurrency": 3,
+        "backoff": 0.01,
+    }
+    output = tmp_path / "raw.jsonl"
+
+    try:
+        api.fail_once = {11}
+        report = fetch_dataset(output, **options)
+        assert report.status == "fetched"
+        assert (report.total, report.records, report.pages, report.retries) == (23, 23, 5, 1)
+
+        records = list(iter_json_records(output))
+        assert [r["stcode"] for r in records] == [f"11680{i:06d}" for i in range(23)]
+        assert records[0]["datastdrdt"] == "2024-01-15"
+        assert state_path_for(output).exists() and not parts_dir_for(output).exists()
+
+        # Same total and 기준일: only the probe request is made
+        api.requests.clear()
+        assert fetch_dataset(output, **options).status == "unchanged"
+        assert api.requests == [(1, 1)]
+
+        # New 기준일: refetched
+        api.rows = make_rows(24, datastdrdt="2024-02-15")
+        report = fetch_dataset(output, **options)
+        assert (report.status, report.records) == ("fetched", 24)
+    finally:
+        server.shutdown()
+        server.server_close()
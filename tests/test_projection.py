@@ -0,0 +1,64 @@
+"""
+Field Projection Tests
+Presets, Core column selection and slim serialization
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from database.projection import FIELD_PRESETS, resolve_fields, serialize_row
+from database.queries import compare_statement, detail_statement
+from services.ingest import bulk_upsert
+
+RECORDS = [
+    {"stcode": "S1", "crname": "가", "crtypename": "국공립", "crstatusname": "정상",
+     "sigunname": "강남구", "crcapat": "40", "nrtrroomcnt": "3", "crfaxno": "02-000-0000"},
+    {"stcode": "S2", "crname": "나", "crtypename": "민간", "crstatusname": "정상",
+     "sigunname": "성북구", "crcapat": "20"},
+]
+
+
+def test_resolve_fields():
+    assert resolve_fields(None, "card") == FIELD_PRESETS["card"]
+    assert resolve_fields("crname,crcapat") == ["stcode", "crname", "crcapat"]
+    assert resolve_fields("card,crspec")[-1] == "crspec"
+    assert resolve_fields("full") == FIELD_PRESETS["full"]
+    with pytest.raises(ValueError):
+        resolve_fields("card,password")
+
+
+def test_statements_select_only_projected_columns():
+    fields = resolve_fields("card")
+    sql = str(detail_statement("S1", fields))
+    assert "crname" in sql and "crfaxno" not in sql and "created_at" not in sql
+
+    sql = str(compare_statement(["S1"], resolve_fields("compare")))
+    assert "nrtrroomcnt" in sql and "crfaxno" not in sql
+
+
+def test_serialized_rows():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    bulk_upsert(RECORDS, engine=engine, verbose=False)
+    session = sessionmaker(bind=engine)()
+
+    fields = resolve_fields("stcode,crname,crcapat,nrtrroomcnt")
+    rows = session.execute(compare_statement(["S1", "S2"], fields)).all()
+    assert sorted((serialize_row(row, fields) for row in rows), key=lambda r: r["stcode"]) == [
+        {"stcode": "S1", "crname": "가", "crcapat": 40, "nrtrroomcnt": 3},
+        {"stcode": "S2", "crname": "나", "crcapat": 20, "nrtrroomcnt": None},
+    ]
+
+    full = resolve_fields("full")
+    row = session.execute(detail_statement("S1", full)).first()
+    assert isinstance(serialize_row(row, full)["created_at"], str)
+    session.close()
@@ -0,0 +1,91 @@
+"""
+Slow-query Log Tests
+Fingerprinting, parameter binding, EXPLAIN QUERY PLAN capture and the
+admin token guarding the log endpoints
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from api.routes import router
+from config import settings
+from database import Base, DaycareCenter
+from database.query_log import SlowQueryLog, bind_parameters, fingerprint, instrument_engine
+
+
+def test_fingerprint_groups_values_and_in_lists():
+    a = fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?) AND name = 'x'  LIMIT 10")
+    b = fingerprint("SELECT * FROM t\nWHERE id IN (?, ?) AND name = 'it''s' LIMIT 5")
+    assert a == b == "SELECT * FROM t WHERE id IN (?+) AND name = ? LIMIT ?"
+
+    assert bind_parameters("SELECT ? , '?' , ?", ("a'b", None)) == "SELECT 'a''b' , '?' , NULL"
+
+
+def test_instrumented_engine_captures_plans():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    log = SlowQueryLog(threshold_ms=0.0)
+    instrument_engine(engine, log)
+
+    with Session(engine) as session:
+        for name in ("해맑은", "푸른"):
+            session.execute(
+                select(DaycareCenter.stcode).where(DaycareCenter.crname.like(f"%{name}%"))
+            ).all()
+        session.execute(
+            select(DaycareCenter.crname).where(DaycareCenter.stcode == "11110000001")
+        ).all()
+
+    report = log.report(sort="count")
+    assert report["statements"] == 3
+
+    like_query, stcode_query = report["queries"]
+    assert like_query["count"] == 2
+    assert "full_scan:daycare_centers" in like_query["flags"]
+    assert "'%해맑은%'" in like_query["slowest_sql"] or "'%푸른%'" in like_query["slowest_sql"]
+    assert stcode_query["flags"] == []
+    assert any("USING INDEX" in detail for detail in stcode_query["plan"])
+
+    log.reset()
+    assert log.report()["queries"] == []
+
+
+def test_plan_is_explained_once_per_fingerprint():
+    log = SlowQueryLog(threshold_ms=0.0)
+    explained = []
+
+    def explain():
+        explained.append(1)
+        # A slower execution arriving while the plan is captured
+        log.record("SELECT 1 WHERE x = ?", (2,), 9.0, explain)
+        return ["SCAN t"]
+
+    log.record("SELECT 1 WHERE x = ?", (1,), 5.0, explain)
+    assert len(explained) == 1
+    (query,) = log.report()["queries"]
+    assert query["count"] == 2 and query["plan"] == ["SCAN t"]
+    assert query["slowest_sql"] == "SELECT 1 WHERE x = 2"
+
+
+def test_admin_routes_need_the_token(monkeypatch):
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    client = TestClient(app)
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+    assert client.get("/api/v1/admin/slow-queries").status_code == 404
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/api/v1/admin/slow-queries").status_code == 401
+    assert client.delete("/api/v1/admin/analyzer-cache", headers={"X-Admin-Token": "x"}).status_code == 401
+    response = client.get("/api/v1/admin/slow-queries", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200 and "queries" in response.json()
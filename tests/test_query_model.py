@@ -0,0 +1,126 @@
+"""
+Local Query Model Tests
+A model trained on logged LLM analyzer outputs handles phrasings the rules
+cannot explain, without an LLM call
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import pytest
+
+from config import settings
+from services.query_model import (
+    QueryModel,
+    read_analysis_log,
+    record_analysis,
+    train_query_model,
+)
+from services.rule_analyzer import analyze_with_rules
+from workflows.nodes import analyzer
+from workflows.nodes.analyzer import aquery_analyzer_node, query_analyzer_node
+
+DISTRICTS = ["강남구", "서초구", "마포구", "성북구", "노원구", "송파구"]
+TYPES = ["국공립", "민간", "가정", "직장"]
+
+
+@pytest.fixture
+def analyzer_log(monkeypatch):
+    """Analyzer log switched on (it is opt-in)"""
+    monkeypatch.setattr(settings, "ANALYZER_LOG_ENABLED", True)
+
+
+def logged_records(log_path: Path) -> list:
+    """Synthetic LLM analyzer outputs, written through the analyzer log"""
+    for district in DISTRICTS:
+        for daycare_type in TYPES:
+            record_analysis(
+                f"{district[:-1]} 쪽 {daycare_type} 어린이집 괜찮은 데 알려줘",
+                {"search_intent": "find_nearby", "filters": {"district": district, "type": daycare_type},
+                 "keywords": [daycare_type]},
+                log_path,
+            )
+            record_analysis(
+                f"{district}에 숲 체험 하는 {daycare_type} 있어?",
+                {"search_intent": "filter_type", "filters": {"district": district, "type": daycare_type},
+                 "keywords": ["숲", "체험", daycare_type]},
+                log_path,
+            )
+    return read_analysis_log(log_path)
+
+
+def test_model_learns_llm_outputs(tmp_path, analyzer_log):
+    records = logged_records(tmp_path / "analyzer_log.jsonl")
+    assert len(records) == 48
+
+    model = train_query_model(records, dimension=2**14, epochs=8)
+    model.save(tmp_path / "query_model.npz")
+    model = QueryModel.load(tmp_path / "query_model.npz")
+
+    # Unseen district in a logged phrasing
+    analysis = model.analyze("은평 쪽 국공립 어린이집 괜찮은 데 알려줘")
+    assert analysis.search_intent == "find_nearby"
+    assert analysis.filters == {"district": "은평구", "type": "국공립"}
+    assert analysis.confidence >= settings.ANALYZER_MODEL_MIN_CONFIDENCE
+
+    analysis = model.analyze("서초구에 숲 체험 하는 가정 있어?")
+    assert analysis.search_intent == "filter_type"
+    assert analysis.keywords == ["숲", "체험", "가정"]
+
+    started = time.perf_counter()
+    for _ in range(100):
+        model.analyze("강남 쪽 민간 어린이집 괜찮은 데 알려줘")
+    assert (time.perf_counter() - started) / 100 < 0.001
+
+
+@pytest.fixture
+def offline_analyzer(monkeypatch):
+    """Analyzer node without the on-disk DB (address dictionary)"""
+    monkeypatch.setattr(analyzer, "resolve_address_filters", lambda query: {})
+
+
+def test_node_uses_model_after_rules(tmp_path, monkeypatch, offline_analyzer, analyzer_log):
+    records = logged_records(tmp_path / "analyzer_log.jsonl")
+    train_query_model(records, dimension=2**14, epochs=8).save(tmp_path / "query_model.npz")
+
+    query = "송파구에 숲 체험 하는 직장 있어?"
+    assert analyze_with_rules(query).confidence < settings.ANALYZER_RULES_MIN_CONFIDENCE
+
+    monkeypatch.setattr(settings, "QUERY_MODEL_PATH", str(tmp_path / "query_model.npz"))
+    state = query_analyzer_node({"query": query, "filters": {}})
+
+    assert state["metadata"]["query_analysis"]["source"] == "model"
+    assert state["filters"] == {"district": "송파구", "type": "직장"}
+
+
+def test_async_node_logs_llm_answers_only_when_enabled(tmp_path, monkeypatch, offline_analyzer):
+    answer = {"search_intent": "filter_type", "filters": {"district": "강남구"}, "keywords": ["숲"]}
+
+    async def create(**kwargs):
+        message = SimpleNamespace(content=json.dumps(answer, ensure_ascii=False))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(analyzer, "_chat_client", lambda asynchronous=False: (client, "model"))
+    monkeypatch.setattr(settings, "ANALYZER_MODEL_ENABLED", False)
+    monkeypatch.setattr(settings, "ANALYZER_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "ANALYZER_LOG_PATH", str(tmp_path / "analyzer_log.jsonl"))
+
+    state = {"query": "강남구 숲 체험 하는 곳", "filters": {}}
+    asyncio.run(aquery_analyzer_node(state))
+    assert not (tmp_path / "analyzer_log.jsonl").exists()
+
+    monkeypatch.setattr(settings, "ANALYZER_LOG_ENABLED", True)
+    result = asyncio.run(aquery_analyzer_node(state))
+    assert result["filters"] == {"district": "강남구"}
+    assert [record["query"] for record in read_analysis_log(tmp_path / "analyzer_log.jsonl")] == [
+        "강남구 숲 체험 하는 곳"
+    ]
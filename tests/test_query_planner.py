@@ -0,0 +1,94 @@
+"""
+Retrieval Planner Tests
+Checks selectivity statistics and plan selection on an in-memory database
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, DaycareCenter
+from services.selectivity import SelectivityStats, refresh_filter_statistics
+from services.query_planner import (
+    choose_plan,
+    has_semantic_content,
+    PLAN_SQL_ONLY,
+    PLAN_FILTER_FIRST,
+    PLAN_VECTOR_FIRST,
+)
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    for i in range(200):
+        district = "강남구" if i < 20 else "노원구"
+        session.add(
+            DaycareCenter(
+                stcode=f"S{i:04d}",
+                crname=f"테스트{i}어린이집",
+                crtypename="국공립" if i % 10 == 0 else "민간",
+                crstatusname="정상",
+                sigunname=district,
+                plgrdco=1 if i % 2 == 0 else 0,
+                cctvinstlcnt=i % 8,
+                class_cnt_01=1 if i % 4 == 0 else 0,
+                crspec="일반,장애아통합" if i % 5 == 0 else "일반",
+            )
+        )
+    session.commit()
+    return session
+
+
+def test_statistics_estimate_rows():
+    session = make_session()
+    refresh_filter_statistics(session)
+    session.commit()
+
+    stats = SelectivityStats.load(session)
+    assert stats.total == 200
+    assert stats.counts["district"]["강남구"] == 20
+    assert stats.counts["special_service"]["장애아통합"] == 40
+    assert stats.estimate_rows({"district": "강남구"}) == 20
+    assert round(stats.estimate_rows({"district": "강남구", "type": "국공립"})) == 2
+    assert stats.estimate_rows({"age": "만1세"}) == 50
+    session.close()
+
+
+def test_semantic_content_detection():
+    filters = {"district": "강남구", "type": "국공립"}
+    assert not has_semantic_content("강남구 국공립 어린이집 추천해줘", ["국공립", "추천"], filters)
+    assert has_semantic_content("숲 체험 어린이집", ["숲체험"], filters)
+
+
+def test_plan_selection():
+    session = make_session()
+    refresh_filter_statistics(session)
+    session.commit()
+    stats = SelectivityStats.load(session)
+
+    # Only filter words: no need to embed the query
+    plan = choose_plan("강남구 어린이집", ["강남구"], {"district": "강남구"}, stats, True, 200)
+    assert plan.strategy == PLAN_SQL_ONLY
+
+    # Selective filters with semantic content: score the subset exactly
+    plan = choose_plan("숲 체험", ["숲체험"], {"district": "강남구"}, stats, True, 200)
+    assert plan.strategy == PLAN_FILTER_FIRST
+
+    # No vector index: always SQL
+    plan = choose_plan("숲 체험", ["숲체험"], {}, stats, False)
+    assert plan.strategy == PLAN_SQL_ONLY
+
+    # Unfiltered query: scanning the index beats hydrating every row
+    plan = choose_plan("숲 체험", ["숲체험"], {}, stats, True, 200)
+    assert plan.strategy == PLAN_VECTOR_FIRST
+    assert plan.vector_top_k >= 10
+    session.close()
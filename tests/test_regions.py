@@ -0,0 +1,152 @@
+"""
+Region Partitioning Tests
+Region routing, region-scoped closures and per-region vector indexes
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import faiss
+import numpy as np
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from database import Base, DaycareCenter
+from services.ingest import diff_ingest
+from services.vector_store import (
+    PartitionedVectorStore,
+    region_index_paths,
+    write_region_manifest,
+)
+from utils.filters import resolve_location, route_regions
+
+
+def test_route_regions():
+    assert route_regions({}) == []
+    assert route_regions({"district": "강남구"}) == ["11"]
+    assert route_regions({"region": "부산광역시"}) == ["26"]
+    assert route_regions({"region": "경기도 성남시"}) == ["41"]
+
+    # Seoul district names are not resolved inside other regions
+    assert resolve_location({"region": "대구", "district": "중구"}) == ("27", "중구", None)
+    assert resolve_location({"district": "부산 해운대구"}) == ("26", "해운대구", None)
+
+
+def test_close_missing_is_scoped_to_dump_regions():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+
+    seoul = [
+        {"stcode": f"1168000000{i}", "crname": f"서울{i}", "crstatusname": "정상"} for i in range(3)
+    ]
+    busan = [
+        {"stcode": f"2635000000{i}", "crname": f"부산{i}", "crstatusname": "정상"} for i in range(3)
+    ]
+    diff_ingest(seoul + busan, engine=engine, verbose=False)
+
+    # A Busan-only dump closes the missing Busan center, not the Seoul ones
+    manifest = diff_ingest(busan[:2], engine=engine, close_missing=True, verbose=False)
+    assert manifest.closed == ["26350000002"]
+
+    with Session(engine) as session:
+        regions = dict(session.execute(select(DaycareCenter.stcode, DaycareCenter.region_code)).all())
+    assert regions["11680000000"] == "11"
+    assert regions["26350000001"] == "26"
+
+
+class StaticEmbeddings:
+    """Returns a fixed query vector (no API calls)"""
+
+    def __init__(self, vector):
+        self.vector = vector
+
+    def embed_text(self, text):
+        return self.vector
+
+
+def build_partitions(root_dir: Path, vectors: dict) -> dict:
+    totals = {}
+    for region, items in vectors.items():
+        index = faiss.IndexFlatL2(2)
+        index.add(np.array([v for _, v in items], dtype=np.float32))
+        index_path, metadata_path = region_index_paths(region, root_dir)
+        index_path.parent.mkdir(parents=True)
+        faiss.write_index(index, str(index_path))
+        metadata_path.write_text(json.dumps({"stcodes": [s for s, _ in items]}))
+        totals[region] = index.ntotal
+    write_region_manifest(totals, 2, root_dir)
+    return totals
+
+
+def test_partitioned_vector_store(tmp_path):
+    build_partitions(
+        tmp_path,
+        {
+            "11": [("11680000001", [0.0, 0.0]), ("11680000002", [5.0, 5.0])],
+            "26": [("26350000001", [1.0, 0.0]), ("26350000002", [9.0, 9.0])],
+        },
+    )
+    store = PartitionedVectorStore(tmp_path, StaticEmbeddings([0.9, 0.0]), max_loaded=1)
+
+    assert store.total_vectors() == 4
+    assert store.total_vectors(["26"]) == 2
+    assert store._loaded == {}  # nothing opened until a search
+
+    # Fan-out merges the per-region top-k by distance
+    hits = store.search("q", top_k=3)
+    assert [stcode for stcode, _ in hits] == ["26350000001", "11680000001", "11680000002"]
+
+    # A routed search only opens its region
+    hits = store.search("q", top_k=3, regions=["11"])
+    assert [stcode for stcode, _ in hits] == ["11680000001", "11680000002"]
+    assert list(store._loaded) == ["11"]
+
+    scored = store.score_stcodes("q", ["11680000002", "26350000001", "99999999999"])
+    assert [stcode for stcode, _ in scored] == ["26350000001", "11680000002"]
+    assert len(store._loaded) == 1  # LRU keeps max_loaded indexes open
+
+
+
+def test_fanout_loads_regions_in_parallel_once(tmp_path, monkeypatch):
+    import services.vector_store as vector_store_module
+
+    build_partitions(
+        tmp_path,
+        {
+            "11": [("11680000001", [0.0, 0.0])],
+            "26": [("26350000001", [1.0, 0.0])],
+            "27": [("27110000001", [2.0, 0.0])],
+        },
+    )
+    loads = []
+    # On a cold fan-out every load waits for the other two: loads serialized
+    # under one lock would break the barrier
+    barrier = threading.Barrier(3, timeout=5)
+
+    class CountingVectorStore(vector_store_module.VectorStoreService):
+        def __init__(self, index_path, *args, **kwargs):
+            loads.append(index_path.parent.name)
+            if barrier is not None:
+                barrier.wait()
+            super().__init__(index_path, *args, **kwargs)
+
+    monkeypatch.setattr(vector_store_module, "VectorStoreService", CountingVectorStore)
+    store = PartitionedVectorStore(tmp_path, StaticEmbeddings([0.0, 0.0]), max_loaded=1)
+    expected = ["11680000001", "26350000001", "27110000001"]
+
+    # More regions than the cap: each index is loaded once per fan-out
+    assert [stcode for stcode, _ in store.search("q", top_k=3)] == expected
+    assert sorted(loads) == ["11", "26", "27"]
+    assert len(store._loaded) == 1
+
+    kept = list(store._loaded)
+    loads.clear()
+    barrier = None
+    assert [stcode for stcode, _ in store.search("q", top_k=3)] == expected
+    assert sorted(loads) == sorted(set(["11", "26", "27"]) - set(kept))
@@ -0,0 +1,89 @@
+"""
+Rule-based Query Analyzer Tests
+Formulaic queries are parsed without the LLM; unknown words lower confidence
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import pytest
+
+from config import settings
+from services.rule_analyzer import analyze_with_rules
+from workflows.nodes import analyzer
+from workflows.nodes.analyzer import query_analyzer_node
+
+
+@pytest.fixture
+def offline_analyzer(monkeypatch):
+    """Analyzer node without the on-disk DB (address dictionary) or query model"""
+    monkeypatch.setattr(analyzer, "resolve_address_filters", lambda query: {})
+    monkeypatch.setattr(settings, "ANALYZER_MODEL_ENABLED", False)
+
+
+def test_formulaic_queries():
+    analysis = analyze_with_rules("강남구 국공립 만2세 놀이터")
+    assert analysis.search_intent == "find_nearby"
+    assert analysis.filters == {
+        "district": "강남구", "type": "국공립", "age": "만2세", "has_playground": True}
+    assert analysis.keywords == ["국공립", "놀이터"]
+    assert analysis.confidence == 1.0
+
+    # Spacing variants, typos and particles
+    assert analyze_with_rules("강남구  국공립어린이집 추천 해줘").filters == {"district": "강남구", "type": "국공립"}
+    assert analyze_with_rules("마표구에 있는 국 공립 어린이집").filters == {"district": "마포구", "type": "국공립"}
+    assert analyze_with_rules("두살 아기 야간 연장 되는 곳").filters == {"age": "만2세", "special_service": "야간연장"}
+    assert analyze_with_rules("CCTV 5대 이상 통학차량 있는 곳").filters == {"min_cctv": 5, "has_vehicle": True}
+    assert analyze_with_rules("돌곶이로 근처 국공립", {"road": "돌곶이로"}).confidence == 1.0
+
+
+def test_low_coverage_queries():
+    threshold = settings.ANALYZER_RULES_MIN_CONFIDENCE
+    assert analyze_with_rules("해운대구 국공립 어린이집").confidence < threshold
+    assert analyze_with_rules("강남구랑 서초구 비교해줘").confidence < threshold
+    assert analyze_with_rules("숲 체험 많이 하는 어린이집").search_intent == "unknown"
+    assert analyze_with_rules("우리집 근처 어린이집").confidence == 0.0
+
+
+def test_context_dependent_words_need_the_llm():
+    threshold = settings.ANALYZER_RULES_MIN_CONFIDENCE
+
+    # "회사 근처" is a location, not a workplace daycare; "영세한" is not an age
+    analysis = analyze_with_rules("회사 근처 어린이집 추천해줘")
+    assert "type" not in analysis.filters and analysis.confidence < threshold
+    analysis = analyze_with_rules("영세한 어린이집")
+    assert "age" not in analysis.filters and analysis.confidence < threshold
+
+    # Weekends, disabilities and cars are not services on their own
+    analysis = analyze_with_rules("주말에 상담 가능한 곳")
+    assert "special_service" not in analysis.filters and analysis.confidence < threshold
+    analysis = analyze_with_rules("장애 인식 교육 하는 어린이집")
+    assert "special_service" not in analysis.filters and analysis.confidence < threshold
+    analysis = analyze_with_rules("차량 많은 도로 피해서 어린이집 찾아줘")
+    assert "has_vehicle" not in analysis.filters and analysis.confidence < threshold
+    analysis = analyze_with_rules("아기 낮잠 잘 재워주는 곳")
+    assert "age" not in analysis.filters and analysis.confidence < threshold
+    assert analyze_with_rules("주말보육 통학차량").filters == {
+        "special_service": "휴일보육", "has_vehicle": True,
+    }
+
+    # Numbers match whole words
+    analysis = analyze_with_rules("11살")
+    assert "age" not in analysis.filters and analysis.confidence < threshold
+
+    # Confidence counts unexplained words, not characters
+    analysis = analyze_with_rules("부산 중구 국공립 어린이집")
+    assert analysis.filters == {"region": "부산광역시", "district": "중구", "type": "국공립"}
+    assert analysis.confidence == 1.0
+    assert analyze_with_rules("강남역 국공립").confidence < threshold
+
+
+def test_node_skips_llm_when_confident(offline_analyzer):
+    state = query_analyzer_node({"query": "성북구 가정 어린이집 찾아줘", "filters": {"has_vacancy": True}})
+    assert state["metadata"]["query_analysis"]["source"] == "rules"
+    assert state["filters"] == {"district": "성북구", "type": "가정", "has_vacancy": True}
+    assert state["search_intent"] == "find_nearby"
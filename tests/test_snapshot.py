@@ -0,0 +1,130 @@
+"""
+Columnar Snapshot Tests
+Mask filtering must match the SQL filters; rows must match to_dict();
+failed reloads keep the previous snapshot and are retried only after the interval
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import numpy as np
+import pytest
+from sqlalchemy import and_, create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from config import settings
+from database import Base, DaycareCenter, bump_data_version
+from services.ingest import bulk_upsert
+from services.snapshot import DaycareSnapshot, get_snapshot, reset_snapshot
+from workflows.nodes.retriever import build_filter_conditions
+
+RECORDS = [
+    {"stcode": "11680000001", "crname": "A", "crtypename": "국공립", "crstatusname": "정상",
+     "sigunname": "강남구", "class_cnt_01": "2", "crspec": "일반,야간연장",
+     "plgrdco": "1", "cctvinstlcnt": "8", "crcargbname": "운영",
+     "craddr": "서울특별시 강남구 테헤란로 123 (역삼동)"},
+    {"stcode": "11680000002", "crname": "B", "crtypename": "민간", "crstatusname": "정상",
+     "sigunname": "강남구", "class_cnt_04": "1", "crspec": "일반,장애아통합",
+     "plgrdco": "0", "cctvinstlcnt": "3", "la": "37.5", "lo": "127.0",
+     "craddr": "서울특별시 강남구 역삼1동 456-7"},
+    {"stcode": "11290000003", "crname": "C", "crtypename": "국공립", "crstatusname": "정상",
+     "sigunname": "성북구", "class_cnt_00": "1", "crspec": "장애아전담",
+     "craddr": "서울특별시 성북구 돌곶이로30길 23 (석관동)"},
+    {"stcode": "11290000004", "crname": "D", "crtypename": "사회복지법인", "crstatusname": "폐지",
+     "sigunname": "성북구", "class_cnt_01": "1", "crspec": "일반"},
+]
+
+FILTERS = [
+    {},
+    {"district": "강남구"},
+    {"district": "서울특별시 성북구"},
+    {"district": "없는구"},
+    {"type": "국공립"},
+    {"type": "법인"},
+    {"age": "만1세"},
+    {"age": "유아"},
+    {"has_playground": True},
+    {"min_cctv": 5},
+    {"has_vehicle": True},
+    {"special_service": "장애아"},
+    {"special_service": "방문"},
+    {"district": "강남구", "type": "국공립", "age": "영아"},
+    {"has_vacancy": True},
+    {"has_vacancy": True, "age": "만0세"},
+    {"dong": "역삼동"},
+    {"dong": "역삼1동"},
+    {"road": "돌곶이로"},
+    {"road": "돌곶이로30길", "type": "국공립"},
+]
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    bulk_upsert(RECORDS, engine=engine, verbose=False)
+    return sessionmaker(bind=engine)()
+
+
+def test_mask_matches_sql_filters():
+    session = make_session()
+    snapshot = DaycareSnapshot.load(session)
+    assert snapshot.size == 4
+
+    for filters in FILTERS:
+        statement = select(DaycareCenter.stcode).where(and_(*build_filter_conditions(filters)))
+        expected = sorted(session.scalars(statement))
+        actual = sorted(snapshot.stcodes[snapshot.filter_mask(filters)].tolist())
+        assert actual == expected, filters
+    session.close()
+
+
+def test_rows_match_orm_dicts():
+    session = make_session()
+    snapshot = DaycareSnapshot.load(session)
+    daycares = session.scalars(select(DaycareCenter).order_by(DaycareCenter.id)).all()
+
+    rows = snapshot.rows(np.arange(snapshot.size))
+    assert rows == [daycare.to_dict() for daycare in daycares]
+    assert snapshot.positions_for(["11290000003", "missing"]).tolist() == [2]
+    session.close()
+
+
+@pytest.fixture
+def fresh_snapshot():
+    reset_snapshot()
+    yield
+    reset_snapshot()
+
+
+def test_failed_reloads_are_cached(monkeypatch, fresh_snapshot):
+    session = make_session()
+    monkeypatch.setattr(settings, "SNAPSHOT_ENABLED", True)
+    monkeypatch.setattr(settings, "SNAPSHOT_VERSION_CHECK_SECONDS", 0.0)
+    loaded = get_snapshot(session)
+    assert loaded is not None
+
+    attempts = []
+
+    def failing_load(session, version=None):
+        attempts.append(version)
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(DaycareSnapshot, "load", failing_load)
+    bump_data_version(session)
+    session.commit()
+
+    # A failed reload keeps serving the previous snapshot
+    assert get_snapshot(session) is loaded
+    assert len(attempts) == 1
+
+    # Without a snapshot, the failure is remembered for the check interval
+    reset_snapshot()
+    monkeypatch.setattr(settings, "SNAPSHOT_VERSION_CHECK_SECONDS", 60.0)
+    assert get_snapshot(session) is None
+    assert get_snapshot(session) is None
+    assert len(attempts) == 2
+    session.close()
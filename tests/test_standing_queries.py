@@ -0,0 +1,92 @@
+"""
+Standing Query Tests
+Incremental matching of saved searches against the rows an ingest changed
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from services.embeddings import HashingEmbeddingService
+from services.ingest import bulk_upsert, diff_ingest
+from services.standing_queries import (
+    fetch_events,
+    list_standing_queries,
+    match_changes,
+    register_standing_query,
+)
+
+
+def center(stcode, name, district, enrolled, status="정상", crtypename="민간"):
+    return {
+        "stcode": stcode, "crname": name, "crtypename": crtypename, "crstatusname": status,
+        "sigunname": district, "class_cnt_01": "2", "child_cnt_01": str(enrolled),
+        "crcapat": "40", "crchcnt": "30", "craddr": f"서울특별시 {district}",
+    }
+
+
+RECORDS = [
+    center("11680000001", "햇살어린이집", "강남구", 7),
+    center("11680000002", "하늘어린이집", "강남구", 10),
+    center("11290000003", "숲속어린이집", "성북구", 10, crtypename="국공립"),
+]
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    bulk_upsert(RECORDS, engine=engine, verbose=False)
+    return engine, sessionmaker(bind=engine)()
+
+
+def test_changed_rows_emit_match_and_unmatch_events():
+    engine, session = make_session()
+    vacancy = register_standing_query(
+        session, {"district": "강남구", "age": "만1세", "has_vacancy": True}, name="강남 만1세 빈자리"
+    )
+    seongbuk = register_standing_query(session, {"district": "성북구", "has_playground": False})
+    session.commit()
+    assert [q["matches"] for q in list_standing_queries(session)] == [1, 1]
+
+    # 하늘 gains places, 햇살 closes; nothing changes in 성북구
+    manifest = diff_ingest(
+        [center("11680000002", "하늘어린이집", "강남구", 8), center("11680000001", "햇살어린이집", "강남구", 7, "폐지")],
+        engine=engine,
+        verbose=False,
+    )
+    report = match_changes(session, manifest.changed_stcodes, data_version=2)
+    session.commit()
+
+    assert report.changed_rows == 2
+    assert report.candidate_queries == 1  # the 성북구 search is never evaluated
+    events = [(e["query_id"], e["stcode"], e["event"]) for e in fetch_events(session)]
+    assert events == [
+        (vacancy.id, "11680000002", "match"),
+        (vacancy.id, "11680000001", "unmatch"),
+    ]
+    assert fetch_events(session, query_id=seongbuk.id) == []
+    # Re-running on the same rows is a no-op
+    assert match_changes(session, manifest.changed_stcodes).matches == 0
+    session.close()
+
+
+def test_query_text_matches_by_embedding_distance():
+    engine, session = make_session()
+    service = HashingEmbeddingService(dimension=64)
+    register_standing_query(
+        session, {"district": "강남구"}, query="햇살어린이집", max_distance=1.0, embedding_service=service
+    )
+    session.commit()
+    assert list_standing_queries(session)[0]["matches"] == 1
+
+    manifest = diff_ingest([center("11680000009", "햇살어린이집 분원", "강남구", 0)], engine=engine, verbose=False)
+    report = match_changes(session, manifest.changed_stcodes, embedding_service=service)
+    assert report.matches == 1
+    session.close()
@@ -0,0 +1,162 @@
+"""
+Stats Cube Tests
+Cube rollups must equal the live GROUP BY queries; reads never write the cube
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import pytest
+
+from database import Base, StatsCube, bump_data_version
+from database.queries import district_counts_statement, type_counts_statement
+from services.ingest import bulk_upsert
+import services.stats_cube as stats_cube
+from services.stats_cube import (
+    cube_statistics,
+    load_stats_cube,
+    name_counts,
+    refresh_stats_cube,
+    rollup,
+)
+
+RECORDS = [
+    {"stcode": "S1", "crname": "A", "crtypename": "국공립", "crstatusname": "정상",
+     "sigunname": "강남구", "class_cnt_01": "1", "class_cnt_02": "1", "plgrdco": "1",
+     "crcapat": "40", "crchcnt": "30", "chcrtescnt": "8"},
+    {"stcode": "S2", "crname": "B", "crtypename": "민간", "crstatusname": "정상",
+     "sigunname": "강남구", "class_cnt_04": "1", "crcapat": "20", "crchcnt": "20",
+     "cctvinstlcnt": "4"},
+    {"stcode": "S3", "crname": "C", "crtypename": "민간", "crstatusname": "정상",
+     "sigunname": "강남구", "class_cnt_04": "1", "crcapat": "30", "crchcnt": "15",
+     "cctvinstlcnt": "2"},
+    {"stcode": "S4", "crname": "D", "crtypename": "국공립", "crstatusname": "정상",
+     "sigunname": "성북구", "class_cnt_01": "1", "crcapat": "50", "crchcnt": "25"},
+    {"stcode": "S5", "crname": "E", "crtypename": "가정", "crstatusname": "폐지",
+     "sigunname": "성북구", "class_cnt_00": "1", "crcapat": "10"},
+]
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    bulk_upsert(RECORDS, engine=engine, verbose=False)
+    return sessionmaker(bind=engine)()
+
+
+def live_counts(session, statement) -> list:
+    return sorted((name, count) for name, count in session.execute(statement))
+
+
+def cube_counts(cells, dimension) -> list:
+    return sorted((c["name"], c["count"]) for c in name_counts(cells, dimension))
+
+
+def test_cube_matches_group_by_queries():
+    session = make_session()
+    cells = load_stats_cube(session)
+    session.commit()
+
+    assert cube_counts(cells, "district") == live_counts(session, district_counts_statement())
+    assert cube_counts(cells, "type") == live_counts(session, type_counts_statement())
+    assert name_counts(cells, "district")[0] == {"name": "강남구", "count": 3}
+    assert cube_statistics(cells)["total"] == 4
+    # S2 and S3 share every dimension
+    assert len([cell for cell in cells if cell["age_mask"] == 0]) == 3
+    # all + 2 classes + 영아 (S1), all + 만4세 + 유아 (S2/S3), all + 만1세 + 영아 (S4)
+    assert len(cells) == 10
+    session.close()
+
+
+def test_drilldown():
+    session = make_session()
+    cells = load_stats_cube(session)
+
+    groups = rollup(cells, ["district", "type"], {"district": "강남구"})
+    assert [(g["type"], g["center_count"], g["capacity_sum"]) for g in groups] == [
+        ("민간", 2, 50),
+        ("국공립", 1, 40),
+    ]
+    assert groups[0]["occupancy_rate"] == 0.7
+
+    by_age = {g["age"]: g["center_count"] for g in rollup(cells, ["age"])}
+    assert by_age == {"만1세": 2, "만2세": 1, "만4세": 2}
+
+    assert rollup(cells, [], {"age": "영아", "has_playground": True})[0]["staff_sum"] == 8
+    # S1 has two infant classes but is one infant center
+    assert rollup(cells, [], {"age": "영아"})[0]["center_count"] == 2
+    assert {g["age"]: g["center_count"] for g in rollup(cells, ["age"], {"age": "영아"})} == {
+        "만1세": 2, "만2세": 1,
+    }
+    with pytest.raises(ValueError):
+        rollup(cells, [], {"age": "만1세,만4세"})
+    assert rollup(cells, ["has_cctv"])[0] == {
+        "has_cctv": False, "center_count": 2, "capacity_sum": 90,
+        "enrollment_sum": 55, "staff_sum": 8, "occupancy_rate": 0.6111,
+    }
+    session.close()
+
+
+def test_stale_cube_is_computed_in_memory_until_refreshed():
+    session = make_session()
+    assert cube_statistics(load_stats_cube(session))["total"] == 4
+    session.commit()
+    assert session.query(StatsCube).count() == 0
+
+    refresh_stats_cube(session)
+    session.commit()
+    assert session.query(StatsCube).count() == 10
+
+    bulk_upsert(
+        [{"stcode": "S6", "crname": "F", "crtypename": "직장", "crstatusname": "정상",
+          "sigunname": "마포구"}],
+        engine=session.get_bind(),
+        verbose=False,
+    )
+    # Same version: cells are served from memory as loaded
+    assert cube_statistics(load_stats_cube(session))["total"] == 4
+
+    bump_data_version(session)
+    session.commit()
+    assert cube_statistics(load_stats_cube(session))["total"] == 5
+    session.commit()
+    assert session.query(StatsCube).count() == 10
+
+    refresh_stats_cube(session)
+    session.commit()
+    assert session.query(StatsCube).count() == 11
+    assert cube_statistics(load_stats_cube(session))["total"] == 5
+    session.close()
+
+
+def test_read_only_database_computes_once_per_version(tmp_path, monkeypatch):
+    path = tmp_path / "daycare.db"
+    writer = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=writer)
+    bulk_upsert(RECORDS, engine=writer, verbose=False)
+    with sessionmaker(bind=writer)() as session:
+        bump_data_version(session)  # cube is now stale
+        session.commit()
+    writer.dispose()
+
+    computed = []
+
+    def counting_compute(session):
+        computed.append(1)
+        return compute_stats_cube(session)
+
+    compute_stats_cube = stats_cube.compute_stats_cube
+    monkeypatch.setattr(stats_cube, "compute_stats_cube", counting_compute)
+
+    reader = create_engine(f"sqlite:///file:{path}?mode=ro&uri=true")
+    for _ in range(3):
+        with sessionmaker(bind=reader)() as session:
+            assert cube_statistics(load_stats_cube(session))["total"] == 4
+    assert len(computed) == 1
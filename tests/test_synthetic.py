@@ -0,0 +1,60 @@
+"""
+Synthetic Dataset Tests
+Offline hashing embeddings and the fitted record generator
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from database import Base, DaycareCenter
+from services.embeddings import HashingEmbeddingService
+from services.ingest import bulk_upsert
+from services.synthetic import default_profile, fit_profile, generate_records
+
+
+def test_hashing_embeddings_are_normalized_and_similar_for_shared_ngrams():
+    service = HashingEmbeddingService(dimension=128)
+    vectors = service.embed_batch(
+        ["강남구 국공립 어린이집", "강남구 국공립 어린이집 놀이터", "부산 해운대구 가정"]
+    )
+
+    assert vectors.shape == (3, 128)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    assert np.array_equal(service.embed_text("강남구"), service.embed_text("강남구"))
+
+
+def test_generated_records_follow_fitted_profile():
+    seed_records = list(generate_records(default_profile(), 400, seed=1))
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    bulk_upsert(seed_records, engine=engine, verbose=False)
+
+    profile = fit_profile(pd.read_sql_table("daycare_centers", engine))
+    records = list(generate_records(profile, 300, seed=7, start=400))
+
+    # Deterministic for a seed, unique synthetic codes
+    assert records == list(generate_records(profile, 300, seed=7, start=400))
+    assert len({record["stcode"] for record in records}) == 300
+    assert all(record["stcode"][5] == "S" for record in records)
+
+    # District and type combinations come from the source data
+    known = {(d[1], t) for d, t in ((profile.districts[i], t) for i, t in profile.pairs)}
+    assert all((r["sigunname"], r["crtypename"]) in known for r in records)
+    assert all(r["crchcnt"] <= r["crcapat"] for r in records if "crchcnt" in r)
+
+    bulk_upsert(records, engine=engine, verbose=False)
+    with Session(engine) as session:
+        assert session.execute(select(func.count(DaycareCenter.id))).scalar() == 700
+        assert session.execute(
+            select(func.count()).where(DaycareCenter.region_code != "11")
+        ).scalar() == 0
@@ -0,0 +1,67 @@
+"""
+Vacancy Estimate Tests
+Per-age spare places at ingest and the sorted availability query
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "app"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from database.queries import vacancy_statement
+from services.ingest import bulk_upsert, derive_columns, normalize_chunk
+from utils.filters import resolve_vacancy_columns
+from workflows.nodes.retriever import build_filter_conditions
+
+RECORDS = [
+    # 만1세 2반 (10석) 중 6명 + 영아 혼합반 1반 (5석) 중 3명, 정원 여유 20
+    {"stcode": "11680000001", "crname": "A", "crstatusname": "정상", "sigunname": "강남구",
+     "class_cnt_01": "2", "child_cnt_01": "6", "class_cnt_m2": "1", "child_cnt_m2": "3",
+     "crcapat": "40", "crchcnt": "20"},
+    # 만1세 1반 (5석) 중 4명
+    {"stcode": "11680000002", "crname": "B", "crstatusname": "정상", "sigunname": "강남구",
+     "class_cnt_01": "1", "child_cnt_01": "4", "crcapat": "30", "crchcnt": "20"},
+    # 만1세 반은 비었지만 정원이 찼음
+    {"stcode": "11290000003", "crname": "C", "crstatusname": "정상", "sigunname": "성북구",
+     "class_cnt_01": "2", "child_cnt_01": "0", "crcapat": "20", "crchcnt": "20"},
+    # 반 정보 없음 -> 알 수 없음
+    {"stcode": "11290000004", "crname": "D", "crstatusname": "정상", "sigunname": "성북구",
+     "crcapat": "20", "crchcnt": "5"},
+]
+
+
+def test_estimates_per_age():
+    derived = derive_columns(normalize_chunk(RECORDS))
+
+    # Own classes (10 - 6) plus mixed infant class (5 - 3)
+    assert derived["vacancy_01"][0] == 6
+    # Ages without own classes still get the mixed class places
+    assert derived["vacancy_00"][0] == 2
+    assert derived["vacancy_03"][0] == 0
+    # Capped by the facility-wide capacity
+    assert derived["vacancy_01"][2] == 0
+    assert derived["vacancy_01"][3] is None
+
+    assert resolve_vacancy_columns("영아") == ["vacancy_00", "vacancy_01", "vacancy_02"]
+    assert len(resolve_vacancy_columns()) == 6
+
+
+def test_vacancy_statement_sorts_by_estimate():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    bulk_upsert(RECORDS, engine=engine, verbose=False)
+    session = sessionmaker(bind=engine)()
+
+    statement = vacancy_statement(resolve_vacancy_columns("만1세"), fields=["stcode", "crname"])
+    assert [(row.crname, row.vacancy) for row in session.execute(statement)] == [("A", 6), ("B", 1)]
+
+    conditions = build_filter_conditions({"district": "강남구"})
+    statement = vacancy_statement(["vacancy_01"], conditions, min_vacancy=2, fields=["crname"])
+    assert [row.crname for row in session.execute(statement)] == ["A"]
+    session.close()
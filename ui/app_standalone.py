@@ -24,7 +24,8 @@ if hasattr(st, 'secrets'):
 # Import workflow components
 try:
     from workflows.graph_builder import run_search_workflow_sync
-    from database import get_session, DaycareCenter
+    from database import session_scope
+    from services.stats_cube import cube_statistics, load_stats_cube, name_counts
 except ImportError as e:
     st.error(f"""
     Import Error: {e}
@@ -97,34 +98,30 @@ if "selected_daycares" not in st.session_state:
 with st.sidebar:
     st.header("🔍 검색 옵션")
 
-    # Get districts from database
-    session = get_session()
+    # Load the aggregate cube once per rerun (districts, types and totals)
     try:
-        districts = session.query(DaycareCenter.sigunname).distinct().filter(
-            DaycareCenter.crstatusname == "정상"
-        ).all()
-        district_options = ["전체"] + sorted([d[0] for d in districts if d[0]])
+        with session_scope() as session:
+            cube_cells = load_stats_cube(session)
     except Exception as e:
+        cube_cells = None
+        cube_error = e
+
+    # Get districts from the cube
+    if cube_cells is not None:
+        district_options = ["전체"] + sorted(d["name"] for d in name_counts(cube_cells, "district"))
+    else:
         district_options = ["전체"]
-        st.sidebar.warning(f"시군구 목록 로드 실패: {e}")
-    finally:
-        session.close()
+        st.sidebar.warning(f"시군구 목록 로드 실패: {cube_error}")
 
     selected_district = st.selectbox("시군구", district_options, key="district_filter")
 
     # Type filter
     st.subheader("어린이집 유형")
-    session = get_session()
-    try:
-        types = session.query(DaycareCenter.crtypename).distinct().filter(
-            DaycareCenter.crstatusname == "정상"
-        ).all()
-        type_options = ["전체"] + sorted([t[0] for t in types if t[0]])
-    except Exception as e:
+    if cube_cells is not None:
+        type_options = ["전체"] + sorted(t["name"] for t in name_counts(cube_cells, "type"))
+    else:
         type_options = ["전체"]
-        st.sidebar.warning(f"유형 목록 로드 실패: {e}")
-    finally:
-        session.close()
+        st.sidebar.warning(f"유형 목록 로드 실패: {cube_error}")
 
     selected_type = st.selectbox("유형", type_options, key="type_filter")
 
@@ -136,16 +133,11 @@ with st.sidebar:
     # Statistics
     st.divider()
     st.subheader("📊 전체 통계")
-    session = get_session()
-    try:
-        total = session.query(DaycareCenter).filter(
-            DaycareCenter.crstatusname == "정상"
-        ).count()
+    if cube_cells is not None:
+        total = cube_statistics(cube_cells)["total"]
         st.metric("전체 어린이집", f"{total:,}개")
-    except Exception as e:
-        st.info(f"통계를 불러올 수 없습니다: {e}")
-    finally:
-        session.close()
+    else:
+        st.info(f"통계를 불러올 수 없습니다: {cube_error}")
 
 # Main content
 col1, col2 = st.columns([3, 1])